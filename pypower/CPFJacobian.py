@@ -0,0 +1,145 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Bordered Jacobian of the continuation power flow.
+"""
+
+from numpy import r_, zeros, ones, arange, conj, lexsort, bincount, \
+    cumsum, where, abs, dot, asarray, isfinite, any, all
+from numpy import flatnonzero as find
+
+from scipy.sparse import csc_matrix, vstack, hstack
+from scipy.sparse.linalg import splu, spsolve
+
+
+class CPFJacobian(object):
+    """Bordered Jacobian of the continuation power flow.
+
+    The linear systems solved by the predictor and the corrector of the
+    continuation power flow have the form::
+
+        [ J      dF_dlam ] [ dx   ]   [ f ]
+        [ dP_dV  dP_dlam ] [ dlam ] = [ g ]
+
+    where C{J} is the power flow Jacobian w.r.t. the voltage angles of the
+    PV and PQ buses and the voltage magnitudes of the PQ buses,
+    C{dF_dlam = -[real(Sxfr[pvpq]); imag(Sxfr[pq])]} and the last row holds
+    the derivatives of the parameterization function (see L{cpf_p_jac}).
+
+    The sparsity structure of C{J} is built once, from that of C{Ybus}, when
+    the object is created, and L{update} recomputes only its values for a
+    new voltage and factors it. L{solve} then solves the bordered system by
+    block elimination, reusing the factors of C{J} and the solution of
+    C{J w = dF_dlam}, so that a factorization can serve any number of
+    right hand sides and parameterization rows. If C{J} is singular, or the
+    Schur complement of the border vanishes, the full bordered matrix is
+    solved directly instead.
+
+    One object is meant to be shared by L{cpf_predictor} and
+    L{cpf_corrector} over a continuation run, so that the first corrector
+    iteration uses the factors computed by the predictor.
+
+    @see: L{runcpf}, L{cpf_predictor}, L{cpf_corrector}
+    """
+
+    def __init__(self, Ybus, Sxfr, pv, pq):
+        self.Ybus = Ybus
+        self.pv, self.pq = pv, pq
+        pvpq = r_[pv, pq]
+        nb = Ybus.shape[0]
+        npvpq, npq = len(pvpq), len(pq)
+        self.n = n = npvpq + npq
+
+        ## pattern of Ybus, with all diagonal elements
+        Y = Ybus.tocoo()
+        i = r_[Y.row, arange(nb)]
+        j = r_[Y.col, arange(nb)]
+        y = r_[Y.data, zeros(nb, complex)]
+        k = lexsort((j, i))
+        i, j, y = i[k], j[k], y[k]
+        first = r_[True, (i[1:] != i[:-1]) | (j[1:] != j[:-1])]
+        p = cumsum(first) - 1
+        self.i, self.j = i[first], j[first]
+        self.y = bincount(p, y.real) + 1j * bincount(p, y.imag)
+        self.diag = find(self.i == self.j)
+
+        ## position of each bus in the rows (columns) of the P & Q (Va & Vm)
+        ## blocks of J, -1 if not there
+        rP = -ones(nb, int)
+        rP[pvpq] = arange(npvpq)
+        rQ = -ones(nb, int)
+        rQ[pq] = npvpq + arange(npq)
+
+        ## J elements: row, column, element of the pattern, from dS/dVa (0)
+        ## or dS/dVm (1), real (0) or imaginary (1) part
+        rows, cols, src, wrt, part = [], [], [], [], []
+        for rmap, cmap, w, q in [(rP, rP, 0, 0), (rP, rQ, 1, 0),
+                                 (rQ, rP, 0, 1), (rQ, rQ, 1, 1)]:
+            e = find((rmap[self.i] >= 0) & (cmap[self.j] >= 0))
+            rows.append(rmap[self.i[e]])
+            cols.append(cmap[self.j[e]])
+            src.append(e)
+            wrt.append(w * ones(len(e), int))
+            part.append(q * ones(len(e), int))
+        rows, cols = r_[tuple(rows)], r_[tuple(cols)]
+        src, wrt, part = r_[tuple(src)], r_[tuple(wrt)], r_[tuple(part)]
+
+        ## order the elements for CSC storage
+        k = lexsort((rows, cols))
+        self.indices = rows[k]
+        self.indptr = r_[0, cumsum(bincount(cols, minlength=n))]
+        self.src, self.wrt, self.part = src[k], wrt[k], part[k]
+
+        self.dF_dlam = -r_[Sxfr[pvpq].real, Sxfr[pq].imag]
+
+        self.J = None
+        self.lu = None
+        self.w = None
+
+    def update(self, V):
+        """Computes the values of C{J} at voltage C{V} and factors it.
+        """
+        i, j, y = self.i, self.j, self.y
+        Ibus = self.Ybus.dot(V)
+        Vnorm = V / abs(V)
+
+        ## elements of dSbus_dV, as in dSbus_dV
+        dS_dVm = V[i] * conj(y * Vnorm[j])
+        dS_dVm[self.diag] += conj(Ibus) * Vnorm
+        dS_dVa = -1j * V[i] * conj(y * V[j])
+        dS_dVa[self.diag] += 1j * V * conj(Ibus)
+
+        dS = where(self.wrt == 0, dS_dVa[self.src], dS_dVm[self.src])
+        data = where(self.part == 0, dS.real, dS.imag)
+
+        n = self.n
+        self.J = csc_matrix((data, self.indices, self.indptr), shape=(n, n))
+        try:
+            self.lu = splu(self.J)
+            self.w = self.lu.solve(self.dF_dlam)
+            if not all(isfinite(self.w)):
+                self.lu = None
+        except RuntimeError:        ## J is singular
+            self.lu = None
+
+    def solve(self, dP_dV, dP_dlam, f, g):
+        """Solves the bordered system for the parameterization row
+        C{[dP_dV, dP_dlam]} and right hand side C{[f; g]}.
+
+        Returns the solution C{[dx; dlam]} as one vector.
+        """
+        dP_dV = asarray(dP_dV, float)
+        if self.lu is not None:
+            s = dP_dlam - dot(dP_dV, self.w)
+            if abs(s) > 1e-10 * (abs(dP_dlam) + dot(abs(dP_dV), abs(self.w))):
+                v = self.lu.solve(asarray(f, float)) if any(f) else zeros(self.n)
+                dlam = (g - dot(dP_dV, v)) / s
+                return r_[v - self.w * dlam, dlam]
+
+        ## singular J or Schur complement, solve the full bordered system
+        A = vstack([
+            hstack([self.J, csc_matrix(self.dF_dlam.reshape((-1, 1)))]),
+            csc_matrix(r_[dP_dV, dP_dlam].reshape((1, -1)))
+        ], format="csc")
+        return spsolve(A, r_[f, g])
@@ -0,0 +1,137 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Recorder of the trajectory of a continuation power flow.
+"""
+
+from os import replace
+
+from numpy import full, r_, nan, inf, asarray
+from numpy.lib.format import open_memmap
+
+
+class CPFTrajectory(object):
+    """Recorder of the trajectory of a continuation power flow.
+
+    Records the predicted and corrected bus voltages and values of lambda
+    of the continuation steps in preallocated buffers, which are grown
+    geometrically (doubled) when full, so that recording a step costs time
+    proportional to the number of recorded buses only. The buffers hold one
+    row per recorded step; L{results} returns their transposes, with one
+    column per step, as the C{V_p}, C{V_c}, C{lam_p} and C{lam_c} fields
+    of C{results['cpf']} returned by L{runcpf}.
+
+    C{rows} gives, for each recorded row of the voltage matrices, the
+    internal index of the bus to record, or -1 to fill the row with NaN,
+    e.g. for a bus which is not in the internal case.
+
+    If C{every} is greater than 1 only the initial point, every C{every}-th
+    step and the last step are recorded; C{max_lam} and C{iterations} are
+    always those of the full trace. If C{fname} is given the voltages are
+    stored in the memory-mapped C{.npy} files C{fname + '_V_p.npy'} and
+    C{fname + '_V_c.npy'} (in step x bus layout) instead of in memory.
+
+    @see: L{runcpf}, L{cpf_default_callback}
+    """
+
+    def __init__(self, rows, every=1, fname='', size=16):
+        self.rows = rows = asarray(rows, int)
+        self.ok = rows >= 0
+        self.every = max(int(every), 1)
+        self.fname = fname
+
+        self.n = 0              ## number of recorded steps
+        self.k = -1             ## last step
+        self.max_lam = -inf
+        self.steps = full(size, -1, int)
+        self.lam_p = full(size, nan)
+        self.lam_c = full(size, nan)
+        self.V_p = self._alloc('V_p', size)
+        self.V_c = self._alloc('V_c', size)
+        self.last = None        ## last step, if not recorded
+
+    def record(self, k, V_c, lam_c, V_p, lam_p):
+        """Records continuation step C{k} (0 for the initial point).
+        """
+        self.k = k
+        self.max_lam = max(self.max_lam, lam_c)
+        if k % self.every:
+            self.last = (k, V_c, lam_c, V_p, lam_p)
+        else:
+            self._store(k, V_c, lam_c, V_p, lam_p)
+
+    def results(self):
+        """Returns the recorded trajectory, in the form of
+        C{results['cpf']}.
+        """
+        if self.last is not None:
+            self._store(*self.last)
+        n = self.n
+        if self.fname and self.V_p.shape[0] > n:     ## trim the files
+            self.V_p = self._resize('V_p', n, n)
+            self.V_c = self._resize('V_c', n, n)
+
+        return {
+            'V_p': self.V_p[:n].T,
+            'lam_p': self.lam_p[:n],
+            'V_c': self.V_c[:n].T,
+            'lam_c': self.lam_c[:n],
+            'steps': self.steps[:n],
+            'max_lam': self.max_lam,
+            'iterations': self.k
+        }
+
+    def _store(self, k, V_c, lam_c, V_p, lam_p):
+        n = self.n
+        if n == len(self.steps):
+            size = 2 * n
+            self.steps = r_[self.steps, full(n, -1, int)]
+            self.lam_p = r_[self.lam_p, full(n, nan)]
+            self.lam_c = r_[self.lam_c, full(n, nan)]
+            self.V_p = self._resize('V_p', n, size)
+            self.V_c = self._resize('V_c', n, size)
+
+        rows, ok = self.rows, self.ok
+        self.steps[n] = k
+        self.lam_p[n] = lam_p
+        self.lam_c[n] = lam_c
+        self.V_p[n, ok] = V_p[rows[ok]]
+        self.V_c[n, ok] = V_c[rows[ok]]
+        self.n = n + 1
+        self.last = None
+
+    def _alloc(self, name, size):
+        shape = (size, len(self.rows))
+        if self.fname:
+            V = open_memmap('%s_%s.npy' % (self.fname, name), 'w+',
+                            complex, shape)
+            V[:] = nan
+        else:
+            V = full(shape, nan, complex)
+        return V
+
+    def _resize(self, name, n, size):
+        """Returns a buffer of C{size} rows holding the first C{n} of the
+        buffer C{name}.
+        """
+        V = getattr(self, name)
+        if not self.fname:
+            W = full((size, V.shape[1]), nan, complex)
+            W[:n] = V[:n]
+            return W
+
+        ## copy to a new file, which then replaces the old one
+        fname = '%s_%s.npy' % (self.fname, name)
+        W = open_memmap(fname + '.tmp', 'w+', complex, (size, V.shape[1]))
+        W[:n] = V[:n]
+        W[n:] = nan
+        W.flush()
+
+        ## close both maps, a mapped file can not be replaced on Windows
+        setattr(self, name, None)
+        V._mmap.close()
+        W._mmap.close()
+        del V, W
+        replace(fname + '.tmp', fname)
+        return open_memmap(fname, 'r+')
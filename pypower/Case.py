@@ -0,0 +1,133 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Typed PYPOWER case with named columns.
+"""
+
+from numpy import zeros, arange, asarray, int64, float64
+from numpy import flatnonzero as find
+
+from pypower import idx_bus, idx_gen, idx_brch
+
+from pypower.idx_bus import BUS_I, MU_VMIN
+from pypower.idx_gen import GEN_BUS, MU_QMIN
+from pypower.idx_brch import F_BUS, T_BUS, MU_ANGMAX
+
+
+def _columns(module, exclude=()):
+    return dict((k, v) for k, v in vars(module).items()
+                if k.isupper() and isinstance(v, int) and k not in exclude)
+
+## column names of each table and their indices
+COLUMNS = {
+    'bus':      _columns(idx_bus, ('PQ', 'PV', 'REF', 'NONE')),
+    'gen':      _columns(idx_gen),
+    'branch':   _columns(idx_brch)
+}
+
+## number of columns of each table, including all result columns
+WIDTH = {'bus': MU_VMIN + 1, 'gen': MU_QMIN + 1, 'branch': MU_ANGMAX + 1}
+
+
+class Case(object):
+    """Typed PYPOWER case with named columns.
+
+    Holds the C{bus}, C{gen} and C{branch} tables of a case as C{float64}
+    arrays in column-major (Fortran) order, with all of the result
+    columns (those of an OPF solution), so that each column is contiguous
+    and L{runpf} and L{opf} need not add columns. The bus of each branch
+    end and generator is kept as an C{int64} index of its row in C{bus}::
+
+        case = Case(case9())
+        Vm = case.col('bus', 'VM')      ## view, assign to modify the case
+        Ybus, Yf, Yt = makeYbus(case)   ## no bus renumbering needed
+        Sbus = makeSbus(case)
+        results, success = runpf(case)
+
+    A case dict, or the name of a case file, is converted with C{Case(ppc)},
+    which shares the tables of C{ppc} if they are already C{float64},
+    column-major and full width, and C{case.to_ppc()} returns a case dict
+    sharing the tables of the case. The results of L{runpf} and L{opf} for
+    a C{Case} keep its tables' order and width, so C{Case(results)} does
+    not copy them either. L{loadcase} accepts a C{Case} wherever a case
+    dict is accepted, and L{makeYbus} and L{makeSbus} a C{Case} in place of
+    C{baseMVA}, C{bus} and C{branch} or C{gen}.
+
+    The C{int64} indices C{f}, C{t} and C{gbus} are computed from the bus
+    numbers when the case is created. Call L{index} after changing bus
+    numbers or the buses of branches or generators.
+
+    @see: L{loadcase}, L{caseformat}
+    """
+
+    __slots__ = ('baseMVA', 'bus', 'gen', 'branch', 'gencost', 'areas',
+                 'extra', 'f', 't', 'gbus')
+
+    def __init__(self, ppc):
+        if not isinstance(ppc, dict) or ppc.get('version') != '2':
+            from pypower.loadcase import loadcase
+            ppc = loadcase(ppc, expect_gencost=False, expect_areas=False)
+
+        self.baseMVA = ppc['baseMVA']
+        self.bus = _table(ppc['bus'], WIDTH['bus'])
+        self.gen = _table(ppc['gen'], WIDTH['gen'])
+        self.branch = _table(ppc['branch'], WIDTH['branch'])
+        self.gencost = ppc.get('gencost')
+        self.areas = ppc.get('areas')
+
+        ## other keys of the case dict (userfcn, dcline, bus_name, ...)
+        self.extra = dict((k, v) for k, v in ppc.items() if k not in
+                          ('version', 'baseMVA', 'bus', 'gen', 'branch',
+                           'gencost', 'areas'))
+        self.index()
+
+    def index(self):
+        """Updates the C{int64} bus row indices C{f}, C{t} and C{gbus} of
+        the branch ends and generators from the bus numbers.
+        """
+        bus_i = self.bus[:, BUS_I].astype(int64)
+        n2i = zeros(bus_i.max() + 2 if len(bus_i) else 1, int64) - 1
+        n2i[bus_i] = arange(len(bus_i))
+
+        for name, table, col in (('f', 'branch', F_BUS),
+                                 ('t', 'branch', T_BUS),
+                                 ('gbus', 'gen', GEN_BUS)):
+            b = getattr(self, table)[:, col].astype(int64)
+            i = n2i[b.clip(-1, len(n2i) - 1)]
+            bad = find(i < 0)
+            if len(bad) > 0:
+                raise ValueError('Case: %s %d is at bus %d, which does not '
+                                 'exist' % (table, bad[0], b[bad[0]]))
+            i.flags.writeable = False
+            setattr(self, name, i)
+
+    def col(self, table, name):
+        """Returns the column C{name} (e.g. C{'VM'}) of C{table} (C{'bus'},
+        C{'gen'} or C{'branch'}) as a view.
+        """
+        return getattr(self, table)[:, COLUMNS[table][name]]
+
+    def to_ppc(self):
+        """Returns a PYPOWER case dict sharing the tables of the case.
+        """
+        ppc = dict(self.extra)
+        ppc.update(version='2', baseMVA=self.baseMVA, bus=self.bus,
+                   gen=self.gen, branch=self.branch)
+        if self.gencost is not None:
+            ppc['gencost'] = self.gencost
+        if self.areas is not None:
+            ppc['areas'] = self.areas
+        return ppc
+
+
+def _table(a, width):
+    """Returns C{a} as a C{float64} column-major array of at least C{width}
+    columns, C{a} itself if it already is one.
+    """
+    a = asarray(a)
+    if a.dtype == float64 and a.flags.f_contiguous and a.shape[1] >= width:
+        return a
+    m = zeros((a.shape[0], max(width, a.shape[1])), order='F')
+    m[:, :a.shape[1]] = a
+    return m
@@ -0,0 +1,287 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Edits recorded against a base case, applied copy-on-write.
+"""
+
+from numpy import asarray, unique, searchsorted, broadcast_to, \
+    concatenate, zeros, integer, r_, any
+
+from pypower._compat import PY2
+from pypower.Case import Case, COLUMNS
+from pypower.loadcase import loadcase
+from pypower.ext2int import ext2int
+from pypower.ext2int_index import copy_case
+from pypower.makeYbus import makeYbus
+from pypower.makeBdc import makeBdc
+from pypower.makeSbus import makeSbus
+from pypower.bustypes import bustypes
+
+from pypower.idx_bus import BUS_I, BUS_TYPE, PD, QD, GS, BS, VM, VA, VMAX, \
+    VMIN, PV, REF, NONE
+from pypower.idx_gen import GEN_BUS, PG, QG, QMAX, QMIN, VG, GEN_STATUS, \
+    PMAX, PMIN, PC1, PC2, QC1MIN, QC1MAX, QC2MIN, QC2MAX
+from pypower.idx_brch import F_BUS, T_BUS, BR_R, BR_X, BR_B, RATE_A, TAP, \
+    SHIFT, BR_STATUS, ANGMIN, ANGMAX
+
+
+if not PY2:
+    basestring = str
+
+
+## derived structures built by L{CaseDelta.derived}
+DERIVED = ('Ybus', 'Bbus', 'Sbus', 'bustypes')
+
+## everything that depends on the internal indexing of a case
+_ALL = ('order',) + DERIVED + ('V0', 'opf_bounds')
+
+## structures invalidated by a change of each column, columns not listed
+## (names, areas, zones, ratings B and C, results, ...) invalidate nothing
+DEPENDS = {
+    'bus': {
+        BUS_I:      _ALL,
+        BUS_TYPE:   ('bustypes', 'V0', 'opf_bounds'),   ## see _bus_type
+        PD:         ('Sbus', 'opf_bounds'),         ## DC power balance
+        QD:         ('Sbus', 'opf_bounds'),
+        GS:         ('Ybus', 'Sbus', 'opf_bounds'), ## DC injections
+        BS:         ('Ybus',),
+        VM:         ('V0',),
+        VA:         ('V0', 'opf_bounds'),   ## opf_bounds at REF buses
+        VMAX:       ('opf_bounds',),
+        VMIN:       ('opf_bounds',)
+    },
+    'gen': {
+        GEN_BUS:    ('order', 'Sbus', 'bustypes', 'V0', 'opf_bounds'),
+        PG:         ('Sbus',),
+        QG:         ('Sbus',),
+        VG:         ('V0',),
+        GEN_STATUS: ('order', 'Sbus', 'bustypes', 'V0', 'opf_bounds')
+    },
+    'branch': {
+        F_BUS:      ('order', 'Ybus', 'Bbus', 'opf_bounds'),
+        T_BUS:      ('order', 'Ybus', 'Bbus', 'opf_bounds'),
+        BR_R:       ('Ybus',),
+        BR_X:       ('Ybus', 'Bbus'),
+        BR_B:       ('Ybus',),
+        RATE_A:     ('opf_bounds',),
+        TAP:        ('Ybus', 'Bbus'),
+        SHIFT:      ('Ybus', 'Bbus'),
+        BR_STATUS:  ('order', 'Ybus', 'Bbus', 'opf_bounds'),
+        ANGMIN:     ('opf_bounds',),
+        ANGMAX:     ('opf_bounds',)
+    }
+}
+for _col in (QMAX, QMIN, PMAX, PMIN, PC1, PC2, QC1MIN, QC1MAX, QC2MIN,
+             QC2MAX):
+    DEPENDS['gen'][_col] = ('opf_bounds',)
+
+
+class CaseDelta(object):
+    """Edits recorded against a base case, applied copy-on-write.
+
+    Records changes of elements of the C{bus}, C{gen}, C{branch} and
+    C{gencost} matrices of a base case, by row (in external indexing) and
+    column, without modifying or copying the base case, a case dict or
+    L{Case} whose matrices are shared, or the name of a case file::
+
+        base = loadcase('case30')
+        d = CaseDelta(base)
+        d.set_load([4, 7], Pd=[30, 25])
+        d.set_status('branch', 10, 0)       ## trip a line
+        r, success = runpf(d.apply())
+
+    L{apply} returns a new case dict which shares the matrices of the base
+    case that are not edited, so a what-if copies only what it changes.
+    L{runpf} and L{opf} do not modify their input case, other callers must
+    not modify the shared matrices in place.
+
+    L{invalidated} tells which of the structures derived from the case the
+    edits change (C{'order'}, the internal indexing of L{ext2int},
+    C{'Ybus'}, C{'Bbus'}, C{'Sbus'}, C{'bustypes'}, C{'V0'}, the initial
+    voltages of the power flow, C{'opf_bounds'}, the limits of the OPF
+    variables and constraints, and C{'gencost'}), comparing the edited
+    values to the base values, so that caches keyed on the base case can
+    keep everything else. L{derived} builds the C{DERIVED} structures of
+    the edited case in internal indexing, reusing those of the base case
+    that are still valid::
+
+        cache = CaseDelta(base).derived()   ## Ybus, Bbus, ... of base
+        Ybus, Yf, Yt = d.derived(cache)['Ybus']
+
+    Edits apply in the order they are recorded, a later edit of an element
+    replacing an earlier one.
+
+    @see: L{Case}, L{ext2int_index}
+    """
+
+    def __init__(self, base):
+        if isinstance(base, basestring):
+            base = loadcase(base, expect_gencost=False, expect_areas=False)
+        elif isinstance(base, Case):
+            base = base.to_ppc()
+        self.base = copy_case(base)
+        self._edits = {}        ## (table, col) -> list of (rows, values)
+
+    def set(self, table, col, rows, values):
+        """Sets column C{col} (an index or name, e.g. C{'PD'}) of rows
+        C{rows} of C{table} (C{'bus'}, C{'gen'}, C{'branch'} or
+        C{'gencost'}) to C{values}, a scalar or one value per row.
+        """
+        if table not in ('bus', 'gen', 'branch', 'gencost') or \
+                table not in self.base:
+            raise ValueError('CaseDelta.set: the case has no %r table' %
+                             table)
+        if col in COLUMNS.get(table, {}):
+            col = COLUMNS[table][col]
+        n, m = self.base[table].shape
+        if not isinstance(col, (int, integer)) or not 0 <= col < m:
+            raise ValueError('CaseDelta.set: %s has no column %r' %
+                             (table, col))
+        rows = asarray(rows, int).ravel()
+        if any(rows < 0) or any(rows >= n):
+            raise ValueError('CaseDelta.set: %s has %d rows' % (table, n))
+        values = broadcast_to(asarray(values, float).ravel(), rows.shape)
+
+        self._edits.setdefault((table, col), []).append((rows,
+                                                         values.copy()))
+        return self
+
+    def set_load(self, rows, Pd=None, Qd=None):
+        """Sets the real (and reactive) demand of buses C{rows}, in MW
+        (MVAr).
+        """
+        if Pd is not None:
+            self.set('bus', PD, rows, Pd)
+        if Qd is not None:
+            self.set('bus', QD, rows, Qd)
+        return self
+
+    def set_dispatch(self, rows, Pg, Qg=None):
+        """Sets the real (and reactive) output of generators C{rows}, in MW
+        (MVAr).
+        """
+        self.set('gen', PG, rows, Pg)
+        if Qg is not None:
+            self.set('gen', QG, rows, Qg)
+        return self
+
+    def set_status(self, table, rows, status):
+        """Sets the status of rows C{rows} of C{table} (C{'gen'} or
+        C{'branch'}), 0 to take them out of service.
+        """
+        if table not in ('gen', 'branch'):
+            raise ValueError('CaseDelta.set_status: table must be '
+                             '\'gen\' or \'branch\'')
+        col = GEN_STATUS if table == 'gen' else BR_STATUS
+        return self.set(table, col, rows, status)
+
+    def changed(self, table):
+        """Returns the sorted rows of C{table} with edited elements.
+        """
+        rows = [r for (t, _), edits in self._edits.items() if t == table
+                for r, _ in edits]
+        return unique(concatenate(rows)) if rows else zeros(0, int)
+
+    def invalidated(self):
+        """Returns the set of structures derived from the base case which
+        the edits change.
+        """
+        inv = set()
+        for (table, col), edits in self._edits.items():
+            rows, new, old = self._values(table, col, edits)
+            if not any(new != old):
+                continue
+            if table == 'gencost':
+                inv.add('gencost')
+            elif table == 'bus' and col == BUS_TYPE:
+                inv.update(_bus_type(new, old))
+            elif table == 'bus' and col == VA:
+                ## the angles of REF buses are fixed in the OPF
+                inv.add('V0')
+                rows = rows[new != old]
+                bt = self.base['bus'][rows, BUS_TYPE]
+                if ('bus', BUS_TYPE) in self._edits:
+                    bt = r_[bt, self._edited('bus', BUS_TYPE, rows)]
+                if any(bt == REF):
+                    inv.add('opf_bounds')
+            else:
+                inv.update(DEPENDS[table].get(col, ()))
+        return inv
+
+    def apply(self):
+        """Returns the edited case, a case dict sharing the matrices of
+        the base case that are not edited.
+        """
+        ppc = copy_case(self.base)
+        tables = {}
+        for (table, col), edits in self._edits.items():
+            if table not in tables:
+                tables[table] = self.base[table].astype(float)
+            for rows, values in edits:
+                tables[table][rows, col] = values
+        ppc.update(tables)
+        return ppc
+
+    def derived(self, cache=None, names=DERIVED):
+        """Returns the C{names} structures of the edited case.
+
+        Returns a dict with, under each of C{names}, the value built by the
+        function of the same name for the edited case in internal indexing:
+        C{(Ybus, Yf, Yt)} from L{makeYbus}, C{(Bbus, Bf, Pbusinj, Pfinj)}
+        from L{makeBdc}, C{Sbus} from L{makeSbus} and C{(ref, pv, pq)} from
+        L{bustypes}. The values in C{cache}, a dict returned by C{derived}
+        for the base case, are reused unless L{invalidated} by the edits.
+        """
+        cache = cache or {}
+        inv = self.invalidated()
+        d = dict((k, cache[k]) for k in names if k in cache and
+                 k not in inv)
+        if len(d) < len(names):
+            ppc = ext2int(self.apply())
+            baseMVA, bus, gen, branch = \
+                ppc['baseMVA'], ppc['bus'], ppc['gen'], ppc['branch']
+            build = {
+                'Ybus':     lambda: makeYbus(baseMVA, bus, branch),
+                'Bbus':     lambda: makeBdc(baseMVA, bus, branch),
+                'Sbus':     lambda: makeSbus(baseMVA, bus, gen),
+                'bustypes': lambda: bustypes(bus, gen)
+            }
+            for k in names:
+                if k not in d:
+                    d[k] = build[k]()
+        return d
+
+    def _values(self, table, col, edits):
+        """Returns the edited rows of column C{col} of C{table} and their
+        edited and base values.
+        """
+        rows = unique(concatenate([r for r, _ in edits]))
+        return rows, self._edited(table, col, rows), \
+            self.base[table][rows, col]
+
+    def _edited(self, table, col, rows):
+        """Returns the edited values of column C{col} of C{table} at the
+        sorted rows C{rows}.
+        """
+        v = self.base[table][rows, col].astype(float)
+        for r, values in self._edits.get((table, col), ()):
+            k = searchsorted(rows, r).clip(0, max(len(rows) - 1, 0))
+            i = (rows[k] == r) if len(rows) else zeros(len(r), bool)
+            v[k[i]] = values[i]
+        return v
+
+
+def _bus_type(new, old):
+    """Returns the structures invalidated by changing bus types C{old} to
+    C{new}.
+    """
+    if any((new == NONE) != (old == NONE)):
+        return _ALL             ## bus isolated or reconnected
+    dep = ['bustypes']
+    ## generator voltage setpoints apply at PV and REF buses
+    if any(((new == PV) | (new == REF)) != ((old == PV) | (old == REF))):
+        dep.append('V0')
+    if any((new == REF) != (old == REF)):
+        dep.append('opf_bounds')
+    return dep
@@ -0,0 +1,134 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Compiled generator cost model.
+"""
+
+from numpy import array, zeros, arange, unique, diff, newaxis, where, Inf
+from numpy import flatnonzero as find
+
+from pypower.idx_cost import MODEL, NCOST, COST, PW_LINEAR, POLYNOMIAL
+
+
+class GenCostModel(object):
+    """Compiled generator cost model.
+
+    Compiles the rows of a C{gencost} matrix once into padded arrays so that
+    the cost of all generators, and its first and second derivatives, can
+    be evaluated without looping over generators, polynomial orders or
+    piece-wise linear segments::
+
+        gcm = GenCostModel(gencost)
+        f   = gcm.cost(Pg)          ## same as totcost(gencost, Pg)
+        df  = gcm.grad(Pg)
+        d2f = gcm.hess(Pg)
+
+    C{Pg} is in MW (works for C{Qg} too) and has one element per row of
+    C{gencost}. Polynomial costs are stored as a coefficient matrix with
+    the constant term in the first column, zero padded to the highest
+    order present, along with the coefficients of its first and second
+    derivatives. Piece-wise linear costs are stored as the slope and
+    intercept of each segment, and the segment containing each C{Pg} is
+    found by a vectorized C{searchsorted} of C{Pg} in the interior
+    breakpoints of its row, padded with C{Inf}. Outside of the first and
+    last breakpoints the first and last segments are extended.
+
+    @see: L{totcost}, L{polycost}, L{opf_costfcn}, L{opf_hessfcn}
+    """
+
+    def __init__(self, gencost):
+        gencost = array(gencost, float, ndmin=2)
+        if gencost.size == 0:
+            gencost = zeros((0, COST))
+        self.n = gencost.shape[0]
+        self.ipol = find(gencost[:, MODEL] == POLYNOMIAL)
+        self.ipwl = find(gencost[:, MODEL] == PW_LINEAR)
+
+        ## polynomial coefficients, constant term first, and derivatives
+        ncost = gencost[self.ipol, NCOST].astype(int)
+        maxN = max(ncost.max(), 1) if len(ncost) else 1
+        c = zeros((len(self.ipol), maxN))
+        for nc in unique(ncost):
+            k = find(ncost == nc)
+            if nc > 0:
+                c[k, :nc] = gencost[self.ipol[k], (COST + nc - 1):COST - 1:-1]
+        k = arange(1, maxN)
+        dc = zeros((len(self.ipol), maxN))
+        dc[:, :maxN - 1] = c[:, 1:] * k
+        d2c = zeros((len(self.ipol), maxN))
+        d2c[:, :maxN - 1] = dc[:, 1:] * k
+        self.coef = [c, dc, d2c]
+        self.pow = arange(maxN)
+
+        ## piece-wise linear segments
+        npts = gencost[self.ipwl, NCOST].astype(int)
+        maxp = max(npts.max(), 2) if len(npts) else 2
+        p = zeros((len(self.ipwl), maxp))
+        y = zeros((len(self.ipwl), maxp))
+        for npt in unique(npts):
+            k = find(npts == npt)
+            p[k, :npt] = gencost[self.ipwl[k], COST:COST + 2 * npt:2]
+            y[k, :npt] = gencost[self.ipwl[k], COST + 1:COST + 2 * npt:2]
+        valid = arange(maxp - 1) < (npts - 1)[:, newaxis]   ## real segments
+        dp = diff(p)
+        self.slope = where(valid, diff(y) / where(valid, dp, 1), 0)
+        self.icept = where(valid, y[:, :-1] - self.slope * p[:, :-1], 0)
+
+        ## interior breakpoints, padded with Inf beyond the last segment
+        self.brk = where(arange(1, maxp - 1) < (npts - 1)[:, newaxis],
+                         p[:, 1:maxp - 1], Inf)
+
+    def _segment(self, x):
+        """Returns the index of the segment containing each pwl C{x}.
+
+        Row-wise C{searchsorted(brk, x, 'right')} of the padded breakpoints.
+        """
+        return (self.brk <= x[:, newaxis]).sum(1)
+
+    def _poly(self, x, der):
+        """Returns the C{der}-th derivative of the polynomial costs at C{x}.
+        """
+        return (self.coef[der] * x[:, newaxis] ** self.pow).sum(1)
+
+    def cost(self, x):
+        """Returns the cost of each row at C{x}.
+        """
+        f = zeros(self.n)
+        if len(self.ipol):
+            f[self.ipol] = self._poly(x[self.ipol], 0)
+        if len(self.ipwl):
+            xw = x[self.ipwl]
+            k = self._segment(xw)
+            i = arange(len(self.ipwl))
+            f[self.ipwl] = self.slope[i, k] * xw + self.icept[i, k]
+        return f
+
+    def grad(self, x):
+        """Returns the first derivative of the cost of each row at C{x}.
+        """
+        df = zeros(self.n)
+        if len(self.ipol):
+            df[self.ipol] = self._poly(x[self.ipol], 1)
+        if len(self.ipwl):
+            k = self._segment(x[self.ipwl])
+            df[self.ipwl] = self.slope[arange(len(self.ipwl)), k]
+        return df
+
+    def hess(self, x):
+        """Returns the second derivative of the cost of each row at C{x}.
+
+        Piece-wise linear costs have a zero second derivative.
+        """
+        d2f = zeros(self.n)
+        if len(self.ipol):
+            d2f[self.ipol] = self._poly(x[self.ipol], 2)
+        return d2f
+
+    def polycost(self, x):
+        """Returns the cost of each row at C{x}, zero for pwl rows.
+        """
+        f = zeros(self.n)
+        if len(self.ipol):
+            f[self.ipol] = self._poly(x[self.ipol], 0)
+        return f
@@ -0,0 +1,240 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Optimal power flow session for repeated solves of one network.
+"""
+
+from time import time
+
+from numpy import array, asarray, zeros, r_, c_, ix_, any
+
+from pypower.loadcase import loadcase
+from pypower.ppoption import ppoption
+from pypower.ext2int import ext2int
+from pypower.int2ext import int2ext
+from pypower.opf_setup import opf_setup
+from pypower.opf_execute import opf_execute
+from pypower.pqcost import pqcost
+from pypower.makeAvl import makeAvl
+from pypower.makeApq import makeApq
+from pypower.makeAy import makeAy
+from pypower.makeYbus import makeYbus
+
+from pypower.idx_bus import PD, QD, MU_VMIN
+from pypower.idx_gen import PG, QG, PMIN, PMAX, QMIN, QMAX, MU_PMAX, \
+    MU_PMIN, MU_QMIN
+from pypower.idx_brch import PF, QF, PT, QT, MU_SF, MU_ST, MU_ANGMIN, \
+    MU_ANGMAX
+from pypower.idx_cost import MODEL, NCOST, COST, PW_LINEAR, POLYNOMIAL
+
+
+class OPFSession(object):
+    """Optimal power flow session for repeated solves of one network.
+
+    Converts the case to internal indexing and builds its OPF model object
+    with L{opf_setup} once, so that the OPF can be solved repeatedly for
+    different loads, generator limits and costs without redoing the setup::
+
+        s = OPFSession(ppc, ppopt)
+        r1 = s.solve()
+        s.set_load(1.1 * ppc['bus'][:, PD])
+        r2 = s.solve()
+
+    The C{set_*} methods take data in external indexing, with one element
+    per row of the bus or gen matrix of the case (elements of out-of-service
+    equipment are ignored), and patch only the affected data of the OPF
+    model: the power balance constraints of the DC OPF (the AC OPF reads
+    the loads from the case), the generator variable bounds and PQ
+    capability and constant power factor constraints, and the generator
+    costs and piece-wise linear cost constraints. The network (bus voltage
+    limits, branches) and the structure of the costs, i.e. the cost model
+    of each generator and number of piece-wise linear cost points, must not
+    change. The bus admittance matrices of the AC OPF are built once.
+
+    L{solve} returns a C{results} dict in the form returned by L{opf}. If
+    C{OPF_WARM_START} is set in C{ppopt}, each solve starts from the
+    solution of the previous one.
+
+    @see: L{opf}, L{opf_setup}, L{opf_execute}
+    """
+
+    def __init__(self, casedata, ppopt=None):
+        t0 = time()
+        ppc = loadcase(casedata)
+        self.ppopt = ppoption(ppopt)
+
+        ## add zero columns to bus, gen, branch for multipliers, etc if needed
+        nb = ppc['bus'].shape[0]
+        nl = ppc['branch'].shape[0]
+        ng = ppc['gen'].shape[0]
+        if ppc['bus'].shape[1] < MU_VMIN + 1:
+            ppc['bus'] = c_[ppc['bus'],
+                            zeros((nb, MU_VMIN + 1 - ppc['bus'].shape[1]))]
+
+        if ppc['gen'].shape[1] < MU_QMIN + 1:
+            ppc['gen'] = c_[ppc['gen'],
+                            zeros((ng, MU_QMIN + 1 - ppc['gen'].shape[1]))]
+
+        if ppc['branch'].shape[1] < MU_ANGMAX + 1:
+            ppc['branch'] = c_[ppc['branch'],
+                               zeros((nl, MU_ANGMAX + 1 -
+                                      ppc['branch'].shape[1]))]
+
+        self.nb0, self.ng0 = nb, ng     ## external dimensions
+
+        ##-----  convert to internal numbering, build the OPF model  -----
+        ppc = ext2int(ppc)
+        self.om = om = opf_setup(ppc, self.ppopt)
+        self.ppc = om.get_ppc()
+        o = self.ppc['order']
+        ## external indices of in-service buses and gens, in internal order
+        self.ibus = o['bus']['status']['on']
+        self.igen = o['gen']['status']['on'][o['gen']['e2i']]
+
+        if not self.ppopt['PF_DC']:
+            ## admittance matrices, used by pipsopf_solver
+            Ybus, Yf, Yt = makeYbus(self.ppc['baseMVA'], self.ppc['bus'],
+                                    self.ppc['branch'])
+            om.userdata('Ybus', Ybus)
+            om.userdata('Yf', Yf)
+            om.userdata('Yt', Yt)
+
+        self.et_setup = time() - t0
+
+    def set_load(self, Pd, Qd=None):
+        """Sets the real (and reactive) demand of each bus, in MW (MVAr).
+        """
+        bus = self.ppc['bus']
+        Pd = asarray(Pd, float)[self.ibus]
+        if self.ppopt['PF_DC']:
+            ## shift the bounds of the power balance constraints
+            dPd = (Pd - bus[:, PD]) / self.ppc['baseMVA']
+            lin = self.om.lin['data']
+            lin['l']['Pmis'] = lin['l']['Pmis'] - dPd
+            lin['u']['Pmis'] = lin['u']['Pmis'] - dPd
+        bus[:, PD] = Pd
+        if Qd is not None:
+            bus[:, QD] = asarray(Qd, float)[self.ibus]
+
+    def set_gen_limits(self, Pmin=None, Pmax=None, Qmin=None, Qmax=None):
+        """Sets the real and reactive power limits of each generator.
+
+        Limits not given are left unchanged. Raises C{ValueError} if the
+        number of PQ capability curve or constant power factor constraints
+        would change.
+        """
+        gen = self.ppc['gen']
+        baseMVA = self.ppc['baseMVA']
+        for col, val in [(PMIN, Pmin), (PMAX, Pmax),
+                         (QMIN, Qmin), (QMAX, Qmax)]:
+            if val is not None:
+                gen[:, col] = asarray(val, float)[self.igen]
+
+        var = self.om.var['data']
+        var['vl']['Pg'] = gen[:, PMIN] / baseMVA
+        var['vu']['Pg'] = gen[:, PMAX] / baseMVA
+        if not self.ppopt['PF_DC']:
+            var['vl']['Qg'] = gen[:, QMIN] / baseMVA
+            var['vu']['Qg'] = gen[:, QMAX] / baseMVA
+
+            ## PQ capability curves and constant power factor loads
+            Avl, lvl, uvl, _ = makeAvl(baseMVA, gen)
+            Apqh, ubpqh, Apql, ubpql, Apqdata = makeApq(baseMVA, gen)
+            self._patch_lin('vl', Avl, uvl, lvl)
+            self._patch_lin('PQh', Apqh, ubpqh)
+            self._patch_lin('PQl', Apql, ubpql)
+            self.om.userdata('Apqdata', Apqdata)
+
+    def set_gencost(self, gencost):
+        """Sets the generator cost matrix, in the format of C{gencost}.
+
+        Raises C{ValueError} if the cost model of a generator or number of
+        points of a piece-wise linear cost changes.
+        """
+        gencost = array(gencost, float)
+        ng = self.ppc['gen'].shape[0]
+        if gencost.shape[0] > self.ng0:     ## reactive power costs
+            gencost = gencost[r_[self.igen, self.ng0 + self.igen], :]
+        else:
+            gencost = gencost[self.igen, :]
+
+        ## same conversions as opf_setup
+        if self.ppopt['PF_DC']:
+            gencost, _ = pqcost(gencost, ng)
+        pwl1 = self.om.userdata('pwl1')
+        if len(pwl1) > 0:
+            x0, y0 = gencost[pwl1, COST], gencost[pwl1, COST + 1]
+            x1, y1 = gencost[pwl1, COST + 2], gencost[pwl1, COST + 3]
+            m = (y1 - y0) / (x1 - x0)
+            gencost[pwl1, MODEL] = POLYNOMIAL
+            gencost[pwl1, NCOST] = 2
+            gencost[pwl1, COST:COST + 2] = c_[m, y0 - m * x0]
+
+        old = self.ppc['gencost']
+        ipwl = old[:, MODEL] == PW_LINEAR
+        if gencost.shape[0] != old.shape[0] or \
+                any(gencost[:, MODEL] != old[:, MODEL]) or \
+                any(gencost[ipwl, NCOST] != old[ipwl, NCOST]):
+            raise ValueError('OPFSession.set_gencost: the cost model and '
+                             'number of cost points of each generator must '
+                             'not change')
+
+        ## piece-wise linear cost constraints
+        if self.om.getN('var', 'y') > 0:
+            nq = 0 if self.ppopt['PF_DC'] else ng
+            q1 = array([]) if self.ppopt['PF_DC'] else ng
+            Ay, by = makeAy(self.ppc['baseMVA'], ng, gencost, 1, q1,
+                            1 + ng + nq)
+            self._patch_lin('ycon', Ay, by)
+
+        self.ppc['gencost'] = gencost
+        self.om.user_data.pop('gencost_model', None)
+
+    def solve(self):
+        """Solves the OPF, returns a C{results} dict as L{opf} does.
+        """
+        t0 = time()
+        om = self.om
+
+        results, success, raw = opf_execute(om, self.ppopt)
+
+        ## start the next solve from this solution
+        if success and self.ppopt['OPF_WARM_START']:
+            vv, _, _, _ = om.get_idx()
+            for name in om.var['order']:
+                om.var['data']['v0'][name] = \
+                    results['x'][vv['i1'][name]:vv['iN'][name]].copy()
+
+        results = int2ext(results)
+
+        ## zero out result fields of out-of-service gens & branches
+        off = results['order']['gen']['status']['off']
+        if len(off) > 0:
+            results['gen'][ix_(off, [PG, QG, MU_PMAX, MU_PMIN])] = 0
+
+        off = results['order']['branch']['status']['off']
+        if len(off) > 0:
+            results['branch'][ix_(off, [PF, QF, PT, QT, MU_SF, MU_ST,
+                                        MU_ANGMIN, MU_ANGMAX])] = 0
+
+        results['et'] = time() - t0
+        results['success'] = success
+        results['raw'] = raw
+
+        return results
+
+    def _patch_lin(self, name, A, u, l=None):
+        """Replaces the data of the linear constraint set C{name}.
+
+        The lower bounds are left unchanged if C{l} is not given.
+        """
+        if self.om.getN('lin', name) != (0 if A is None else A.shape[0]):
+            raise ValueError('OPFSession: the number of %s constraints must '
+                             'not change' % name)
+        lin = self.om.lin['data']
+        if name in lin['A']:
+            lin['A'][name] = A
+            lin['u'][name] = u
+            if l is not None:
+                lin['l'][name] = l
@@ -0,0 +1,296 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Solves an area-decomposed optimal power flow by ADMM.
+"""
+
+from sys import stdout
+from time import time
+
+from multiprocessing import Pool, cpu_count
+
+from numpy import ones, zeros, arange, unique, setdiff1d, r_, c_, pi, sqrt, Inf
+from numpy import flatnonzero as find
+
+from scipy.sparse import eye, csr_matrix as sparse
+
+from pypower.loadcase import loadcase
+from pypower.ppoption import ppoption
+from pypower.ext2int import ext2int
+from pypower.int2ext import int2ext
+from pypower.opf import opf
+
+from pypower.idx_bus import BUS_TYPE, PV, BUS_AREA, PD, QD, GS, BS, VM, VA, \
+    MU_VMIN
+from pypower.idx_gen import GEN_BUS, QMAX, QMIN, VG, MBASE, GEN_STATUS, \
+    PMAX, PMIN, MU_QMIN
+from pypower.idx_brch import F_BUS, T_BUS, MU_ANGMAX
+from pypower.idx_cost import MODEL, POLYNOMIAL, NCOST
+
+
+def admmopf(casedata, ppopt=None, rho=1e5, max_it=500, tol=1e-4,
+            adapt_it=20, workers=1):
+    """Solves an area-decomposed optimal power flow by ADMM.
+
+    Splits the case into one sub-case per area, as given by the C{BUS_AREA}
+    column of the bus matrix, and solves the AC or DC (if C{PF_DC} is set in
+    C{ppopt}) optimal power flow of the whole system by the alternating
+    direction method of multipliers (ADMM), with the OPF of each area solved
+    independently by L{opf}.
+
+    Each sub-case contains the buses, generators and branches of its area,
+    together with the tie lines to neighbouring areas and a copy of each
+    neighbouring bus at the other end of a tie line. A copy has no load and
+    a free, zero cost generator that absorbs the tie line flows. The
+    voltage angle (and, for the AC OPF, the magnitude) of each bus at
+    either end of a tie line is a consensus variable, which the original
+    bus and all of its copies must agree on. These consensus constraints
+    are relaxed with an augmented Lagrangian term, added to the cost of each
+    sub-case as a generalized quadratic user cost (C{N}, C{fparm}, C{H}).
+
+    In each iteration, the area OPFs are solved concurrently in a pool of
+    C{workers} processes (0 means one per CPU), each warm started from its
+    previous solution, the consensus values are updated to the average of
+    the copies and the multipliers are updated with the consensus errors.
+    For the first C{adapt_it} iterations, the penalty parameter C{rho} (in
+    $/hr per rad**2 or p.u.**2) is doubled whenever the primal residual is
+    more than 10 times the dual residual, each taken relative to the size
+    of the consensus variables and of the multipliers. It is never
+    decreased, which can stall the AC OPF, and is held fixed after that. The
+    iterations stop when the primal residual (the norm of the consensus
+    errors) and the dual residual divided by C{rho} (the norm of the change
+    in the consensus values) are both below C{tol}, or after C{max_it}
+    iterations.
+
+    Returns a C{results} dict in the form returned by L{opf}, with the
+    voltages, dispatch and multipliers of each bus and generator taken from
+    its own area, the flows of each branch taken from the area of its
+    "from" bus and C{success} set if the iterations converged and all area
+    OPFs were solved successfully, along with the key C{admm}:
+        - C{it}     number of iterations
+        - C{r}      primal residual of each iteration
+        - C{s}      dual residual of each iteration
+        - C{rho}    penalty parameter of each iteration
+        - C{area}   area numbers
+        - C{et}     C{it x na} matrix of area OPF solve times, in seconds
+
+    @see: L{opf}, L{opf_setup}
+    """
+    ##----- initialization -----
+    t0 = time()         ## start timer
+
+    ppopt = ppoption(ppopt)
+    dc = ppopt['PF_DC']
+    verbose = ppopt['VERBOSE']
+    ppopt_a = ppoption(ppopt, VERBOSE=0, OUT_ALL=0)
+
+    ## process pool for solving the area OPFs concurrently
+    nw = workers if workers > 0 else cpu_count()
+
+    ## add zero columns to bus, gen, branch for multipliers, etc if needed
+    ppc = loadcase(casedata)
+    nb = ppc['bus'].shape[0]
+    nl = ppc['branch'].shape[0]
+    ng = ppc['gen'].shape[0]
+    if ppc['bus'].shape[1] < MU_VMIN + 1:
+        ppc['bus'] = c_[ppc['bus'],
+                        zeros((nb, MU_VMIN + 1 - ppc['bus'].shape[1]))]
+
+    if ppc['gen'].shape[1] < MU_QMIN + 1:
+        ppc['gen'] = c_[ppc['gen'],
+                        zeros((ng, MU_QMIN + 1 - ppc['gen'].shape[1]))]
+
+    if ppc['branch'].shape[1] < MU_ANGMAX + 1:
+        ppc['branch'] = c_[ppc['branch'],
+                           zeros((nl, MU_ANGMAX + 1 - ppc['branch'].shape[1]))]
+
+    ##-----  convert to internal numbering, remove out-of-service stuff  -----
+    ppc = ext2int(ppc)
+    baseMVA, bus, gen, branch, gencost = \
+        ppc['baseMVA'], ppc['bus'], ppc['gen'], ppc['branch'], ppc['gencost']
+    nb = bus.shape[0]
+    ng = gen.shape[0]
+
+    ## boundary buses, at either end of a tie line
+    area = bus[:, BUS_AREA]
+    areas = unique(area)
+    na = len(areas)
+    f = branch[:, F_BUS].astype(int)
+    t = branch[:, T_BUS].astype(int)
+    tie = find(area[f] != area[t])
+    bb = unique(r_[f[tie], t[tie]])
+    nbb = len(bb)
+    kbb = -ones(nb, int)
+    kbb[bb] = arange(nbb)       ## consensus index of each boundary bus
+    nv = 1 if dc else 2         ## consensus on Va, or on Va and Vm
+
+    ##-----  build the area sub-cases  -----
+    sub = []
+    for a in areas:
+        own = find(area == a)
+        il = find((area[f] == a) | (area[t] == a))
+        fb = setdiff1d(r_[f[il], t[il]], own)   ## copies of foreign buses
+        ib = r_[own, fb]
+        ig = find(area[gen[:, GEN_BUS].astype(int)] == a)
+        nbs, nfb, ngs = len(ib), len(fb), len(ig)
+
+        ## copies of foreign buses have no load and a free generator
+        sbus = bus[ib, :].copy()
+        sbus[len(own):, [PD, QD, GS, BS]] = 0
+        sbus[len(own):, BUS_TYPE] = PV
+        dummy = zeros((nfb, gen.shape[1]))
+        dummy[:, GEN_BUS] = fb
+        dummy[:, [PMAX, QMAX]] = Inf
+        dummy[:, [PMIN, QMIN]] = -Inf
+        dummy[:, VG] = 1
+        dummy[:, MBASE] = baseMVA
+        dummy[:, GEN_STATUS] = 1
+        zcost = zeros((nfb, gencost.shape[1]))
+        zcost[:, MODEL] = POLYNOMIAL
+        zcost[:, NCOST] = 1
+        if gencost.shape[0] > ng:       ## reactive power costs
+            sgencost = r_[gencost[ig, :], zcost, gencost[ng + ig, :], zcost]
+        else:
+            sgencost = r_[gencost[ig, :], zcost]
+
+        ## selects the consensus variables of the area, Va (and Vm)
+        ## columns of AC OPF vars in the order of the sub-case
+        pos = find(kbb[ib] >= 0)        ## boundary buses in sub-case
+        nc = len(pos)
+        col = r_[pos, nbs + pos][:nv * nc]
+        N = sparse((ones(nv * nc), (arange(nv * nc), col)),
+                   (nv * nc, 2 * nbs + 2 * (ngs + nfb)))
+
+        sppc = {'version': '2', 'baseMVA': baseMVA, 'bus': sbus,
+                'gen': r_[gen[ig, :], dummy], 'branch': branch[il, :].copy(),
+                'gencost': sgencost, 'N': N, 'Cw': zeros(nv * nc),
+                'fparm': c_[ones(nv * nc), zeros(nv * nc),
+                            zeros(nv * nc), ones(nv * nc)],
+                'H': sparse((nv * nc, nv * nc))}
+
+        sub.append({'ppc': sppc, 'own': own, 'ig': ig, 'il': il, 'pos': pos,
+                    'kc': r_[kbb[ib[pos]], nbb + kbb[ib[pos]]][:nv * nc],
+                    'lam': zeros(nv * nc), 'w': zeros(nv * nc)})
+
+    ## initial consensus values, from the case
+    z = r_[bus[bb, VA] * pi / 180, bus[bb, VM]][:nv * nbb]
+    ncopy = zeros(nv * nbb)
+    for s in sub:
+        ncopy[s['kc']] += 1
+
+    ##-----  ADMM iterations  -----
+    pool = Pool(nw) if nw > 1 else None
+    r_hist, s_hist, rho_hist, et = [], [], [], []
+    converged = False
+    for it in range(max_it):
+        ## solve the area OPFs, with the augmented Lagrangian terms
+        ##    rho/2 * ||w - (z - lam/rho)||^2
+        cases = []
+        for s in sub:
+            s['ppc']['fparm'][:, 1] = z[s['kc']] - s['lam'] / rho
+            s['ppc']['H'] = rho * eye(len(s['kc']), format='csr')
+            cases.append((s['ppc'], ppopt_a, s['pos'], nv))
+        if pool is None:
+            res = [_admm_area(c) for c in cases]
+        else:
+            res = pool.map(_admm_area, cases)
+
+        ## update consensus values and multipliers
+        zsum = zeros(nv * nbb)
+        for s, rs in zip(sub, res):
+            s['w'] = rs['w']
+            s['res'] = rs
+            zsum[s['kc']] += rs['w'] + s['lam'] / rho
+        z_prev = z
+        z = zsum / ncopy
+        r2, w2, l2 = 0, 0, 0
+        for s in sub:
+            err = s['w'] - z[s['kc']]
+            s['lam'] = s['lam'] + rho * err
+            r2 += sum(err**2)
+            w2 += sum(s['w']**2)
+            l2 += sum(s['lam']**2)
+        rk = sqrt(r2)
+        sk = rho * sqrt(sum(ncopy * (z - z_prev)**2))
+
+        r_hist.append(rk)
+        s_hist.append(sk)
+        rho_hist.append(rho)
+        et.append([rs['et'] for rs in res])
+        if verbose > 1:
+            stdout.write('ADMM iteration %3d : r = %10.3e   s = %10.3e   '
+                         'rho = %g\n' % (it + 1, rk, sk, rho))
+
+        if rk < tol and sk / rho < tol:
+            converged = True
+            break
+
+        ## warm start the next area OPFs from this solution
+        for s, rs in zip(sub, res):
+            for key in ['bus', 'gen']:
+                s['ppc'][key] = rs[key]
+        ppopt_a = ppoption(ppopt_a, OPF_WARM_START=1)
+
+        ## increase rho while the primal residual is large compared to the
+        ## dual residual, both relative to the size of the consensus
+        ## variables and of the multipliers
+        if it + 1 < adapt_it:
+            rrel = rk / max(sqrt(w2), sqrt(sum(ncopy * z**2)))
+            srel = sk / max(sqrt(l2), 1e-10)
+            if rrel > 10 * srel:
+                rho = 2 * rho
+
+    if pool is not None:
+        pool.close()
+        pool.join()
+
+    ##-----  assemble the solution of the whole system  -----
+    success = converged
+    fobj = 0
+    for s in sub:
+        rs = s['res']
+        success = success and rs['success']
+        fobj += rs['f']
+        no, ngs = len(s['own']), len(s['ig'])
+        bus[s['own'], :] = rs['bus'][:no, :bus.shape[1]]
+        gen[s['ig'], :] = rs['gen'][:ngs, :gen.shape[1]]
+        ## flows of each branch from the area of its "from" bus
+        k = find(area[f[s['il']]] == area[s['own'][0]])
+        branch[s['il'][k], :] = rs['branch'][k, :branch.shape[1]]
+    bus[:, BUS_TYPE] = ppc['bus'][:, BUS_TYPE]
+
+    if verbose:
+        stdout.write('ADMM OPF %s in %d iterations, %d areas\n' %
+                     ('converged' if converged else 'did not converge',
+                      len(r_hist), na))
+
+    results = ppc
+    results['bus'], results['gen'], results['branch'] = bus, gen, branch
+    results['f'] = fobj
+    results['success'] = success
+    results['et'] = time() - t0
+    results['admm'] = {'it': len(r_hist), 'r': r_hist, 's': s_hist,
+                       'rho': rho_hist, 'area': areas, 'et': et}
+
+    return int2ext(results)
+
+
+def _admm_area(args):
+    """Solves the OPF of a single area sub-case.
+
+    Returns the consensus variables, generator cost (without the augmented
+    Lagrangian terms) and solution of the sub-case and the solve time.
+    """
+    t0 = time()
+    sppc, ppopt, pos, nv = args
+    r = opf(sppc, ppopt)
+
+    ## consensus variables and value of the augmented Lagrangian terms
+    w = r_[r['bus'][pos, VA] * pi / 180, r['bus'][pos, VM]][:nv * len(pos)]
+    d = w - sppc['fparm'][:, 1]
+    penalty = (sppc['H'] * d).dot(d) / 2
+
+    return {'w': w, 'success': r['success'], 'bus': r['bus'],
+            'gen': r['gen'], 'branch': r['branch'], 'et': time() - t0,
+            'f': r['f'] - penalty}
@@ -1,15 +1,23 @@
 """Callback functions for CPF
 """
 
-from numpy import c_, r_, amax, argmax, array
+from numpy import r_, amax, argmax, array, arange, ones
 from scipy.sparse import issparse
 
+from pypower.CPFTrajectory import CPFTrajectory
+
+from pypower.idx_bus import BUS_I
+
 import sys
 import os
 
 
 def cpf_default_callback(k, V_c, lam_c, V_p, lam_p, cb_data, cb_state, cb_args, results=None, is_final=False):
     """Default callback function for CPF
+
+    Records the trajectory in a L{CPFTrajectory}, in C{cb_state["trajectory"]},
+    as selected by the C{CPF_TRACE_*} options, and returns it in the final
+    C{results}.
     """
 
     # initialize plotting options
@@ -46,69 +54,95 @@ def cpf_default_callback(k, V_c, lam_c, V_p, lam_p, cb_data, cb_state, cb_args,
     # -----  FINAL call  -----
     if is_final:
         # assemble results struct
-        results = cb_state
-        results["max_lam"] = amax(cb_state["lam_c"])
+        results = cb_state["trajectory"].results()
         results["iterations"] = k
 
         # finish final lambda-V nose curve plot
         if plot_level:
-            plt.plot(cb_state["lam_c"],
-                     abs(cb_state["V_c"][idx, :]), '-', color=(0.25, 0.25, 1))
-            plt.axis([0, amax([1, amax(cb_state["lam_p"]), amax(cb_state["lam_c"])])*1.05, 0,
-                      amax([1, amax(abs(cb_state["V_p"][idx])), amax(abs(cb_state["V_c"][idx]))*1.05])])
+            plot = cb_state["plot"]
+            plt.plot(plot["lam_c"], plot["Vm_c"], '-', color=(0.25, 0.25, 1))
+            plt.axis([0, amax([1, amax(plot["lam_p"]), amax(plot["lam_c"])])*1.05, 0,
+                      amax([1, amax(plot["Vm_p"]), amax(plot["Vm_c"])*1.05])])
             plt.pause(sys.float_info.epsilon)
             plt.ioff()
 
     elif k == 0:
         # initialize state
+        ppopt = cb_data["ppopt"]
+        trajectory = CPFTrajectory(_trace_rows(cb_data["ppc_target"], ppopt["CPF_TRACE_BUSES"]),
+                                   ppopt["CPF_TRACE_EVERY"], ppopt["CPF_TRACE_MMAP"])
+        trajectory.record(k, V_c, lam_c, V_p, lam_p)
         cb_state = {
-            "V_p": V_p,
-            "lam_p": lam_p,
-            "V_c": V_c,
-            "lam_c": lam_c,
+            "trajectory": trajectory,
             "iterations": 0
         }
 
         # initialize lambda-V nose curve plot
         if plot_level:
+            plot = cb_state["plot"] = {
+                "lam_p": [lam_p],
+                "Vm_p": [abs(V_p[idx])],
+                "lam_c": [lam_c],
+                "Vm_c": [abs(V_c[idx])]
+            }
             plt.ion()
-            plt.plot(cb_state["lam_p"],
-                     abs(cb_state["V_p"][idx]), '-', color=(0.25, 0.25, 1))
+            plt.plot(plot["lam_p"], plot["Vm_p"], '-', color=(0.25, 0.25, 1))
             plt.title('Voltage at Bus %d' % idx_e)
             plt.xlabel('$\\lambda$')
             plt.ylabel('Voltage Magnitude')
-            plt.axis([0, amax([1, amax(cb_state["lam_p"]), amax(cb_state["lam_c"])])*1.05, 0,
-                      amax([1, amax(abs(cb_state["V_p"][idx])), amax(abs(cb_state["V_c"][idx]))*1.05])])
+            plt.axis([0, amax([1, amax(plot["lam_p"]), amax(plot["lam_c"])])*1.05, 0,
+                      amax([1, amax(plot["Vm_p"]), amax(plot["Vm_c"])*1.05])])
             plt.pause(sys.float_info.epsilon)
 
     # -----  ITERATION call  -----
     else:
         # update state
-        cb_state["V_p"] = c_[cb_state["V_p"], V_p]
-        cb_state["lam_p"] = r_[cb_state["lam_p"], lam_p]
-        cb_state["V_c"] = c_[cb_state["V_c"], V_c]
-        cb_state["lam_c"] = r_[cb_state["lam_c"], lam_c]
+        cb_state["trajectory"].record(k, V_c, lam_c, V_p, lam_p)
         cb_state["iterations"] = k
 
         # plot single step of the lambda-V nose curve
+        if plot_level:
+            plot = cb_state["plot"]
+            plot["lam_p"].append(lam_p)
+            plot["Vm_p"].append(abs(V_p[idx]))
+            plot["lam_c"].append(lam_c)
+            plot["Vm_c"].append(abs(V_c[idx]))
         if plot_level > 1:
-            plt.plot(r_[cb_state["lam_c"][k-1], cb_state["lam_p"][k]],
-                     r_[abs(cb_state["V_c"][idx, k-1]),
-                        abs(cb_state["V_p"][idx, k])],
+            plt.plot(r_[plot["lam_c"][k-1], plot["lam_p"][k]],
+                     r_[plot["Vm_c"][k-1], plot["Vm_p"][k]],
                      '-', color=0.85*array([1, 0.75, 0.75]))
-            plt.plot(r_[cb_state["lam_p"][k], cb_state["lam_c"][k]],
-                     r_[abs(cb_state["V_p"][idx, k]),
-                        abs(cb_state["V_c"][idx, k])],
+            plt.plot(r_[plot["lam_p"][k], plot["lam_c"][k]],
+                     r_[plot["Vm_p"][k], plot["Vm_c"][k]],
                      '-', color=0.85*array([0.75, 1, 0.75]))
-            plt.plot(cb_state["lam_p"][k], abs(cb_state["V_p"][idx, k]),
+            plt.plot(plot["lam_p"][k], plot["Vm_p"][k],
                      'x', color=0.85*array([1, 0.75, 0.75]))
-            plt.plot(cb_state["lam_c"][k], abs(
-                cb_state["V_c"][idx, k]), '-o', markerfacecolor='none', color=(0.25, 0.25, 1))
-            plt.axis([0, amax([1, amax(cb_state["lam_p"]), amax(cb_state["lam_c"])])*1.05, 0,
-                      amax([1, amax(abs(cb_state["V_p"][idx])), amax(abs(cb_state["V_c"][idx]))*1.05])])
+            plt.plot(plot["lam_c"][k], plot["Vm_c"][k], '-o',
+                     markerfacecolor='none', color=(0.25, 0.25, 1))
+            plt.axis([0, amax([1, amax(plot["lam_p"]), amax(plot["lam_c"])])*1.05, 0,
+                      amax([1, amax(plot["Vm_p"]), amax(plot["Vm_c"])*1.05])])
             plt.pause(sys.float_info.epsilon)
-            
+
         if plot_level > 2:
             os.system("pause")
 
     return cb_state, results
+
+
+def _trace_rows(ppc, buses):
+    """Returns the internal indices of the buses recorded by the default
+    callback, in external order, -1 for buses not in the internal case.
+    """
+    o = ppc["order"]
+    bus_i = o["ext"]["bus"][:, BUS_I].astype(int)
+    on = o["bus"]["status"]["on"]
+    rows = -ones(len(bus_i), int)
+    rows[on] = arange(len(on))
+    if len(buses) == 0:     # all buses
+        return rows
+
+    row = dict(zip(bus_i, range(len(bus_i))))
+    try:
+        return rows[[row[b] for b in buses]]
+    except KeyError as b:
+        raise ValueError('cpf_default_callback: %s is not a valid bus number '
+                         'for PPOPT["CPF_TRACE_BUSES"]' % b)
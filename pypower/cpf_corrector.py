@@ -1,19 +1,21 @@
 ''' Solves the corrector step of a continuation power flow using a
 full Newton method with selected parameterization scheme.
-'''
 
-from numpy import r_, angle, conj, linalg, inf, array, exp
+If a L{CPFJacobian} object that already holds factors (e.g. the one
+passed to L{cpf_predictor}) is given in C{jac}, its factors are used for
+the first Newton iteration instead of refactoring the Jacobian.
+'''
 
-from scipy.sparse import vstack, hstack
-from scipy.sparse.linalg import spsolve
+from numpy import r_, angle, conj, linalg, inf, exp
 
 from pypower.ppoption import ppoption
 from pypower.cpf_p import cpf_p
-from pypower.dSbus_dV import dSbus_dV
 from pypower.cpf_p_jac import cpf_p_jac
+from pypower.CPFJacobian import CPFJacobian
 
 def cpf_corrector(Ybus, Sbus, V0, ref, pv, pq,
-                  lam0, Sxfr, Vprv, lamprv, z, step, parameterization, ppopt):
+                  lam0, Sxfr, Vprv, lamprv, z, step, parameterization, ppopt,
+                  jac=None):
 
     # default arguments
     if ppopt is None:
@@ -32,6 +34,12 @@ def cpf_corrector(Ybus, Sbus, V0, ref, pv, pq,
     Vm = abs(V)
     lam = lam0
 
+    # bordered Jacobian, if given its current factors (e.g. from the
+    # predictor) are used for the first iteration
+    if jac is None:
+        jac = CPFJacobian(Ybus, Sxfr, pv, pq)
+    factored = jac.J is not None
+
     # set up indexing for updating V
     pvpq = r_[pv, pq]
     npv = len(pv)
@@ -43,8 +51,7 @@ def cpf_corrector(Ybus, Sbus, V0, ref, pv, pq,
     j4 = j2 + npq   # j1:j2 - V angle of pv buses
     j5 = j4
     j6 = j4 + npq   # j5:j6 - V mag of pq buses
-    j7 = j6
-    j8 = j6 + 1    # j7:j8 - lambda
+    j7 = j6         # j7 - lambda
 
     # evaluate F(x0, lam0), including Sxfr transfer/loading
 
@@ -74,29 +81,13 @@ def cpf_corrector(Ybus, Sbus, V0, ref, pv, pq,
         i = i + 1
 
         # evaluate Jacobian
-        dSbus_dVm, dSbus_dVa = dSbus_dV(Ybus, V)
+        if i > 1 or not factored:
+            jac.update(V)
 
-        j11 = dSbus_dVa[array([pvpq]).T, pvpq].real
-        j12 = dSbus_dVm[array([pvpq]).T, pq].real
-        j21 = dSbus_dVa[array([pq]).T, pvpq].imag
-        j22 = dSbus_dVm[array([pq]).T, pq].imag
-
-        J = vstack([
-            hstack([j11, j12]),
-            hstack([j21, j22])
-        ], format="csr")
-
-        dF_dlam = -r_[Sxfr[pvpq].real, Sxfr[pq].imag].reshape((-1,1))
         dP_dV, dP_dlam = cpf_p_jac(parameterization, z, V, lam, Vprv, lamprv, pv, pq)
 
-        # augment J with real/imag -Sxfr and z^T
-        J = vstack([
-            hstack([J, dF_dlam]),
-            hstack([dP_dV, dP_dlam])
-        ], format="csr")
-
         # compute update step
-        dx = -1 * spsolve(J, F)
+        dx = -1 * jac.solve(dP_dV, dP_dlam, F[:-1], F[-1])
 
         # update voltage
         if npv:
@@ -109,7 +100,7 @@ def cpf_corrector(Ybus, Sbus, V0, ref, pv, pq,
         Va = angle(V)
 
         # update lambda
-        lam = lam + dx[j7:j8]
+        lam = lam + dx[j7]
 
         # evalute F(x, lam)
         mis = V * conj(Ybus.dot(V)) - Sbus - lam*Sxfr
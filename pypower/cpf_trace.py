@@ -0,0 +1,326 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Traces the continuation curve of a continuation power flow.
+"""
+
+from numpy import r_, zeros, linalg, angle, conj, maximum, sort, inf, \
+    isfinite
+from numpy import flatnonzero as find
+
+from pypower.ppoption import ppoption
+from pypower.cpf_predictor import cpf_predictor
+from pypower.cpf_corrector import cpf_corrector
+from pypower.CPFJacobian import CPFJacobian
+
+
+def cpf_trace(Ybus, Sbus, Sxfr, V, ref, pv, pq, ppopt=None, callbacks=None,
+              cb_data=None, lims=None):
+    """Traces the continuation curve of a continuation power flow.
+
+    Starting from the power flow solution C{V} for the base case injections
+    C{Sbus} (lambda = 0), traces the solutions for the injections
+    C{Sbus + lambda * Sxfr} by predictor-corrector continuation steps, as
+    controlled by the C{CPF_*} options in C{ppopt}, until the stopping
+    criterion C{CPF_STOP_AT} is met or a corrector fails. All quantities
+    are in internal indexing.
+
+    The functions in the list C{callbacks} are called with the initial
+    point, after each continuation step and, if no corrector failed, once
+    more at the end to assemble the results (see L{cpf_default_callback}),
+    with C{cb_data} and the C{CPF_USER_CALLBACK_ARGS} option.
+
+    If C{lims} is given, the continuation watches for the limits it holds
+    (all in p.u.) being reached:
+        - C{Qmin}, C{Qmax}, C{Qd}, C{dQd}: total reactive power limits of
+          the generators at each bus, and the reactive load at lambda = 0
+          and its change per unit lambda. A PV bus whose generator reactive
+          power reaches a limit is switched to a PQ bus with the generation
+          held at the limit, and the continuation goes on.
+        - C{Vmin}, C{Vmax}: voltage magnitude limits of each bus. The
+          continuation stops when the voltage of a PQ bus reaches a limit.
+        - C{Yf}, C{Yt}, C{f}, C{t}, C{Smax}: branch admittance matrices,
+          "from" and "to" bus indices and apparent power flow limits of
+          each branch (0 = unlimited). The continuation stops when a flow
+          reaches its limit.
+    When a limit is passed within a step, the step is solved again from the
+    previous point with the step size found by regula falsi (Illinois)
+    iterations on the largest limit violation, until the violation is
+    within C{CPF_EVENT_TOL}, so that the event is located without
+    retracing the curve. The step size is left unchanged for the following
+    step.
+
+    Returns the final voltage C{V}, the final C{lam}, a success flag and
+    the C{cpf_results} dict assembled by the callbacks, which holds only the
+    number of corrector iterations in C{iterations} if a corrector failed.
+    If C{lims} is given, C{cpf_results} also holds the list of C{events},
+    each a dict with the step C{k}, the value C{lam} of lambda, the
+    C{type} ('QMAX', 'QMIN', 'VMAX', 'VMIN' or 'FLOW') and the internal bus
+    or branch index C{idx} of the limit reached.
+
+    @see: L{runcpf}, L{runcpf_multi}
+    """
+    ppopt = ppoption(ppopt)
+    if callbacks is None:
+        callbacks = []
+
+    # options
+    verbose = ppopt["VERBOSE"]
+    step = ppopt["CPF_STEP"]
+    parameterization = ppopt["CPF_PARAMETERIZATION"]
+    adapt_step = ppopt["CPF_ADAPT_STEP"]
+    cb_args = ppopt["CPF_USER_CALLBACK_ARGS"]
+    ev_tol = ppopt["CPF_EVENT_TOL"]
+
+    if verbose > 2:
+        ppopt_pf = ppoption(ppopt, VERBOSE=max(0, verbose-1))
+    else:
+        ppopt_pf = ppoption(ppopt, VERBOSE=max(0, verbose-2))
+
+    lam = 0
+    lamprv = lam    # lam at previous step
+    Vprv = V    # V at previous step
+    continuation = 1
+    cont_steps = 0
+    success = True
+    i = 0
+
+    cb_state = {}
+
+    # invoke callbacks
+    for k in range(len(callbacks)):
+        cb_state, _ = callbacks[k](cont_steps, V, lam, V, lam,
+                                   cb_data, cb_state, cb_args)
+
+    if linalg.norm(Sxfr) == 0:
+        if verbose:
+            print('base case and target case have identical load and generation\n')
+
+        continuation = 0
+        V0 = V
+        lam0 = lam
+
+    # tangent predictor z = [dx;dlam]
+    z = zeros(2*len(V)+1)
+    z[-1] = 1.0
+    ## bordered Jacobian shared by predictor & corrector
+    jac = CPFJacobian(Ybus, Sxfr, pv, pq)
+
+    ## limits, injections are modified when a PV bus reaches a Q limit
+    events = []
+    if lims:
+        Sbus, Sxfr = Sbus.copy(), Sxfr.copy()
+        E = _events(V, lam, Ybus, pv, pq, lims)
+
+    while continuation:
+        cont_steps = cont_steps + 1
+        # prediction for next step
+        zprv, Vpp, lampp = z.copy(), Vprv, lamprv
+        V0, lam0, z = cpf_predictor(V, lam, Ybus, Sxfr, pv, pq, step, z,
+                                    Vprv, lamprv, parameterization, jac)
+
+        # save previous voltage, lambda before updating
+        Vprv = V
+        lamprv = lam
+
+        # correction
+        V, success, i, lam = cpf_corrector(Ybus, Sbus, V0, ref, pv, pq,
+                                           lam0, Sxfr, Vprv, lamprv, z, step, parameterization, ppopt_pf,
+                                           jac)
+
+        if not success:
+            continuation = 0
+            if verbose:
+                print('step %3d : lambda = %6.3f, corrector did not converge in %d iterations\n' % (
+                    cont_steps, lam, i))
+            break
+
+        if verbose > 2:
+            print('step %3d : lambda = %6.3f\n' % (cont_steps, lam))
+        elif verbose > 1:
+            print('step %3d : lambda = %6.3f, %2d corrector Newton steps\n' %
+                  (cont_steps, lam, i))
+
+        # locate limits reached within the step
+        located = []
+        if lims:
+            Eprv, E = E, _events(V, lam, Ybus, pv, pq, lims)
+            cand = find(isfinite(Eprv) & (Eprv <= 0))   ## watched limits
+            if len(cand) and max(E[cand]) > ev_tol:
+                ## regula falsi on the step size, step size s gives the
+                ## largest violation e
+                lo, elo = 0, max(Eprv[cand])
+                hi, ehi = step, max(E[cand])
+                side = 0
+                bisect = False
+                for it in range(20):
+                    if bisect:
+                        s = (lo + hi) / 2
+                    else:
+                        s = hi - ehi * (hi - lo) / (ehi - elo)
+                    V0s, lam0s, zs = cpf_predictor(Vprv, lamprv, Ybus, Sxfr, pv, pq,
+                                                   s, zprv.copy(), Vpp, lampp,
+                                                   parameterization, jac)
+                    Vs, ok, i, lams = cpf_corrector(Ybus, Sbus, V0s, ref, pv, pq,
+                                                    lam0s, Sxfr, Vprv, lamprv, zs, s,
+                                                    parameterization, ppopt_pf, jac)
+                    if not ok:
+                        ## no violation known at hi, bisect until there is
+                        hi, side, bisect = s, 0, True
+                        continue
+                    V, lam, V0, lam0, z = Vs, lams, V0s, lam0s, zs
+                    E = _events(V, lam, Ybus, pv, pq, lims)
+                    e = max(E[cand])
+                    if abs(e) <= ev_tol:
+                        break
+                    if e > 0:
+                        hi, ehi, bisect = s, e, False
+                        if side == 1:
+                            elo = elo / 2
+                        side = 1
+                    else:
+                        lo, elo = s, e
+                        if side == -1:
+                            ehi = ehi / 2
+                        side = -1
+                located = cand[E[cand] >= -ev_tol]
+                if verbose > 1:
+                    print('step %3d : lambda = %6.3f, limit located in %d corrector solves\n' %
+                          (cont_steps, lam, it + 1))
+
+        # invoke callbacks
+        for k in range(len(callbacks)):
+            cb_state, _ = callbacks[k](cont_steps, V, lam, V0, lam0,
+                                       cb_data, cb_state, cb_args)
+
+        # handle limits reached, switch PV buses at Q limits to PQ
+        nb = len(V)
+        for j in located:
+            if j < nb:          ## Q limit of PV bus j
+                Qd = lims["Qd"][j] + lam * lims["dQd"][j]
+                Qg = (V[j] * conj(Ybus[j, :].dot(V))).imag + Qd
+                if Qg - lims["Qmax"][j] > lims["Qmin"][j] - Qg:
+                    ev, Qlim = 'QMAX', lims["Qmax"][j]
+                else:
+                    ev, Qlim = 'QMIN', lims["Qmin"][j]
+                pv = pv[pv != j]
+                pq = sort(r_[pq, j])
+                Sbus[j] = Sbus[j].real + 1j * (Qlim - lims["Qd"][j])
+                Sxfr[j] = Sxfr[j].real - 1j * lims["dQd"][j]
+                idx = j
+                if verbose:
+                    print('step %3d : lambda = %6.3f, internal bus %d reached %s, switched to PQ\n' %
+                          (cont_steps, lam, j, ev))
+            elif j < 2 * nb:    ## voltage limit of PQ bus
+                idx = j - nb
+                Vm = abs(V[idx])
+                ev = 'VMAX' if Vm - lims["Vmax"][idx] > lims["Vmin"][idx] - Vm else 'VMIN'
+                continuation = 0
+                if verbose:
+                    print('\nReached %s at internal bus %d in %d continuation steps\n' %
+                          (ev, idx, cont_steps))
+            else:               ## branch flow limit
+                idx, ev = j - 2 * nb, 'FLOW'
+                continuation = 0
+                if verbose:
+                    print('\nReached flow limit of internal branch %d in %d continuation steps\n' %
+                          (idx, cont_steps))
+            events.append({'k': cont_steps, 'lam': lam, 'type': ev, 'idx': idx})
+        if len(located):
+            jac = CPFJacobian(Ybus, Sxfr, pv, pq)
+            E = _events(V, lam, Ybus, pv, pq, lims)
+            if not continuation:
+                break
+
+        if isinstance(ppopt["CPF_STOP_AT"], str):
+            if ppopt["CPF_STOP_AT"].upper() == "FULL":
+                if abs(lam) < 1e-8:     # traced the full continuation curve
+                    if verbose:
+                        print(
+                            '\nTraced full continuation curve in %d continuation steps\n' % cont_steps)
+                    continuation = 0
+                elif lam < lamprv and lam - step < 0:    # next step will overshoot
+                    step = lam      # modify step-size
+                    parameterization = 1    # change to natural parameterization
+                    adapt_step = False      # disable step-adaptivity
+
+            else:   # == 'NOSE'
+                if lam < lamprv:    # reached the nose point
+                    if verbose:
+                        print(
+                            '\nReached steady state loading limit in %d continuation steps\n' % cont_steps)
+                    continuation = 0
+
+        else:
+            if lam < lamprv:
+                if verbose:
+                    print(
+                        '\nReached steady state loading limit in %d continuation steps\n' % cont_steps)
+                continuation = 0
+            elif abs(ppopt["CPF_STOP_AT"] - lam) < 1e-8:     # reached desired lambda
+                if verbose:
+                    print('\nReached desired lambda %3.2f in %d continuation steps\n' % (
+                        ppopt["CPF_STOP_AT"], cont_steps))
+                continuation = 0
+            # will reach desired lambda in next step
+            elif lam + step > ppopt["CPF_STOP_AT"]:
+                step = ppopt["CPF_STOP_AT"] - lam   # modify step-size
+                parameterization = 1    # change to natural parameterization
+                adapt_step = False      # disable step-adaptivity
+
+        if adapt_step and continuation and not len(located):
+            pvpq = r_[pv, pq]
+            # Adapt stepsize
+            cpf_error = linalg.norm(r_[angle(V[pq]), abs(
+                V[pvpq]), lam] - r_[angle(V0[pq]), abs(V0[pvpq]), lam0], inf)
+            if cpf_error < ppopt["CPF_ERROR_TOL"]:
+                # Increase stepsize
+                step = step * ppopt["CPF_ERROR_TOL"] / cpf_error
+                if step > ppopt["CPF_STEP_MAX"]:
+                    step = ppopt["CPF_STEP_MAX"]
+            else:
+                # decrese stepsize
+                step = step * ppopt["CPF_ERROR_TOL"] / cpf_error
+                if step < ppopt["CPF_STEP_MIN"]:
+                    step = ppopt["CPF_STEP_MIN"]
+
+    # invoke callbacks
+    if success:
+        cpf_results = {}
+        for k in range(len(callbacks)):
+            cb_state, cpf_results = callbacks[k](cont_steps, V, lam, V0, lam0,
+                                                 cb_data, cb_state, cb_args, results=cpf_results, is_final=True)
+    else:
+        cpf_results = {}
+        cpf_results["iterations"] = i
+    if lims:
+        cpf_results["events"] = events
+
+    return V, lam, success, cpf_results
+
+
+def _events(V, lam, Ybus, pv, pq, lims):
+    """Returns the limit violations at C{V} and C{lam}.
+
+    The vector holds the reactive power limit violation of the generators
+    at each bus, the voltage limit violation of each bus and the flow
+    limit violation of each branch, -Inf for limits not watched.
+    """
+    nb = len(V)
+    E = zeros(2 * nb) - inf
+    if "Qmax" in lims:
+        Qd = lims["Qd"] + lam * lims["dQd"]
+        Qg = (V * conj(Ybus.dot(V))).imag + Qd
+        E[pv] = maximum(Qg[pv] - lims["Qmax"][pv], lims["Qmin"][pv] - Qg[pv])
+    if "Vmax" in lims:
+        Vm = abs(V[pq])
+        E[nb + pq] = maximum(Vm - lims["Vmax"][pq], lims["Vmin"][pq] - Vm)
+    if "Smax" in lims:
+        Smax = lims["Smax"]
+        Sf = abs(V[lims["f"]] * conj(lims["Yf"].dot(V)))
+        St = abs(V[lims["t"]] * conj(lims["Yt"].dot(V)))
+        EF = maximum(Sf, St) - Smax
+        EF[Smax <= 0] = -inf
+        E = r_[E, EF]
+    return E
@@ -0,0 +1,210 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Solves a DC optimal power flow for a batch of load vectors.
+"""
+
+from sys import stdout
+
+from time import time
+
+from numpy import zeros, ones, arange, asarray, atleast_2d, dot, r_, \
+    isnan, any, abs
+from numpy import flatnonzero as find
+
+from scipy.sparse import vstack, bmat, csc_matrix, eye
+from scipy.sparse.linalg import splu
+
+from pypower.loadcase import loadcase
+from pypower.ppoption import ppoption
+from pypower.ext2int import ext2int
+from pypower.opf_setup import opf_setup
+from pypower.dcopf_solver import dcopf_qp_cost, dcopf_qp_opt
+from pypower.pipsopf_solver import interior_x0
+from pypower.qps_pypower import qps_pypower
+
+from pypower.idx_bus import PD
+
+
+def dcopf_param(casedata, Pd, ppopt=None, max_it=10):
+    """Solves a DC optimal power flow for a batch of load vectors.
+
+    Solves the DC OPF for the case C{casedata} for each row of C{Pd}, an
+    C{ns x nb} matrix of real power demands (in MW) for the buses, in the
+    (external) order of the bus matrix. Since only the right-hand side of
+    the power balance constraints changes from one load vector to the
+    next, the OPF model and the QP matrices are built only once.
+
+    The first load vector is solved with L{qps_pypower}, using the solver
+    selected by C{OPF_ALG_DC} in C{ppopt}. Each subsequent load vector is
+    solved by a primal active-set method starting from the active set of
+    the previous solution, which requires only one solve of the KKT system
+    of the equality and active inequality constraints. The LU factors of
+    the KKT matrix are reused as long as the active set does not change.
+    If the active set does not settle in C{max_it} iterations, or the KKT
+    matrix is singular (e.g. at a degenerate vertex of an LP), the QP is
+    solved from scratch with L{qps_pypower}.
+
+    Returns a dict with keys:
+        - C{Pg}         C{ns x ng} generator real power output (MW)
+        - C{Pf}         C{ns x nl} branch real power flow at from end (MW)
+        - C{lam}        C{ns x nb} locational marginal prices ($/MWh)
+        - C{f}          objective function value for each load vector
+        - C{success}    C{True} for each load vector solved successfully
+        - C{nfact}      number of KKT matrix factorizations
+        - C{nqp}        number of full QP solves
+        - C{et}         elapsed time in seconds
+
+    Generators and branches that are out of service have zero output
+    and flow, isolated buses have a price of zero.
+
+    @see: L{rundcopf}, L{dcopf_solver}
+    """
+    ##----- initialization -----
+    t0 = time()         ## start timer
+
+    ppc = loadcase(casedata)
+    ppopt = ppoption(ppopt, PF_DC=True)
+    verbose = ppopt['VERBOSE']
+    tol = ppopt['OPF_VIOLATION']
+
+    Pd = atleast_2d(asarray(Pd, float))
+    ns = Pd.shape[0]
+    nb0 = ppc['bus'].shape[0]
+    ng0 = ppc['gen'].shape[0]
+    nl0 = ppc['branch'].shape[0]
+
+    ##-----  build the OPF model and the QP once  -----
+    ppc = ext2int(ppc)
+    o = ppc['order']
+    baseMVA = ppc['baseMVA']
+    ib = o['bus']['status']['on']                       ## ext idx of int bus
+    ig = o['gen']['status']['on'][o['gen']['e2i']]     ## ext idx of int gen
+    il = o['branch']['status']['on']                    ## ext idx of int branch
+
+    om = opf_setup(ppc, ppopt)
+    om.build_cost_params()
+    vv, ll, _, _ = om.get_idx()
+    Bf = om.userdata('Bf')
+    Pfinj = om.userdata('Pfinj')
+
+    A, l, u = om.linear_constraints()
+    x0, xmin, xmax = om.getv()
+    HH, CC, C0 = dcopf_qp_cost(om)
+    opt = dcopf_qp_opt(ppopt, HH.count_nonzero() == 0)
+    nx = len(x0)
+
+    ## all constraints, variable bounds as identity rows of A
+    AA = vstack([A, eye(nx, nx, format='csr')], 'csr')
+    ll0 = r_[l, xmin]
+    uu0 = r_[u, xmax]
+    ieq = find(ll0 == uu0)          ## equality constraints, always active
+
+    ## power balance rows, l = u = -Pd / baseMVA + b0
+    ipmis = arange(ll['i1']['Pmis'], ll['iN']['Pmis'])
+    b0 = l[ipmis] + ppc['bus'][:, PD] / baseMVA
+
+    ## results
+    Pg = zeros((ns, ng0))
+    Pf = zeros((ns, nl0))
+    lam = zeros((ns, nb0))
+    f = zeros(ns)
+    success = zeros(ns, bool)
+
+    nfact = 0
+    nqp = 0
+    lu = None                       ## LU factors of current KKT matrix
+    act_u = act_l = None            ## current active set (upper, lower)
+    for s in range(ns):
+        ## bounds for this load vector
+        lls = ll0.copy()
+        uus = uu0.copy()
+        lls[ipmis] = uus[ipmis] = b0 - Pd[s, ib] / baseMVA
+
+        x = None
+        if act_u is not None:
+            for _ in range(max_it):
+                ## active rows, y = mu_u - mu_l is multiplier of A(ia, :)
+                ia = r_[ieq, act_u, act_l]
+                if lu is None:
+                    K = bmat([[HH, AA[ia, :].T], [AA[ia, :], None]], 'csc')
+                    try:
+                        lu = splu(csc_matrix(K))
+                    except RuntimeError:    ## singular KKT matrix
+                        break
+                    nfact = nfact + 1
+                xy = lu.solve(r_[-CC, lls[ieq], uus[act_u], lls[act_l]])
+                if any(isnan(xy)):
+                    break
+                xs, y = xy[:nx], xy[nx:]
+                neq, nu = len(ieq), len(act_u)
+
+                ## primal feasibility of inactive constraints and
+                ## sign of multipliers of active ones
+                Ax = AA * xs
+                viol_u = find(Ax - uus > tol)
+                viol_l = find(lls - Ax > tol)
+                drop_u = find(y[neq:neq + nu] < -tol)
+                drop_l = find(y[neq + nu:] > tol)
+                if not (len(viol_u) or len(viol_l) or len(drop_u) or len(drop_l)):
+                    x = xs
+                    break
+
+                ## update the active set, refactor
+                act_u = r_[act_u[_keep(len(act_u), drop_u)], viol_u]
+                act_l = r_[act_l[_keep(len(act_l), drop_l)], viol_l]
+                lu = None
+
+        if x is None:
+            ##-----  solve from scratch  -----
+            if (opt['alg'] == 200) or (opt['alg'] == 250):
+                x0 = interior_x0(om)
+            x, _, info, _, lmbda = qps_pypower(HH, CC, A, lls[:len(l)],
+                    uus[:len(l)], lls[len(l):], uus[len(l):], x0, opt)
+            nqp = nqp + 1
+            if info != 1:
+                if verbose:
+                    stdout.write('dcopf_param: load vector %d not solved\n' % s)
+                lu = act_u = act_l = None
+                continue
+            y = r_[lmbda['mu_u'] - lmbda['mu_l'],
+                   lmbda['upper'] - lmbda['lower']]
+
+            ## active inequality constraints
+            mu_tol = 1e-6 * max(1, abs(CC).max())
+            act_u = find((r_[lmbda['mu_u'], lmbda['upper']] > mu_tol) &
+                         (ll0 != uu0))
+            act_l = find((r_[lmbda['mu_l'], lmbda['lower']] > mu_tol) &
+                         (ll0 != uu0))
+            lu = None
+
+            ## multipliers in the order of the KKT system
+            y = y[r_[ieq, act_u, act_l]]
+
+        ## package up the results for this load vector
+        Va = x[vv['i1']['Va']:vv['iN']['Va']]
+        Pg[s, ig] = x[vv['i1']['Pg']:vv['iN']['Pg']] * baseMVA
+        Pf[s, il] = (Bf * Va + Pfinj) * baseMVA
+        lam[s, ib] = y[_pos(ieq, ipmis)] / baseMVA
+        f[s] = 0.5 * dot(x, HH * x) + dot(CC, x) + C0
+        success[s] = True
+
+    return {'Pg': Pg, 'Pf': Pf, 'lam': lam, 'f': f, 'success': success,
+            'nfact': nfact, 'nqp': nqp, 'et': time() - t0}
+
+
+def _keep(n, drop):
+    """Returns a boolean mask of the C{n} elements not in C{drop}.
+    """
+    keep = ones(n, bool)
+    keep[drop] = False
+    return keep
+
+
+def _pos(a, b):
+    """Returns the positions in the index vector C{a} of the indices C{b}.
+    """
+    pos = -ones(max(r_[a, b].max() + 1, 1), int)
+    pos[a] = arange(len(a))
+    return pos[b]
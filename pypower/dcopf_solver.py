@@ -10,23 +10,20 @@ from sys import stderr
 from copy import deepcopy
 
 from numpy import \
-    array, zeros, ones, any, diag, r_, pi, Inf, isnan, arange, c_, dot
+    array, zeros, ones, any, diag, r_, pi, isnan, arange, c_, dot
 
 from numpy import flatnonzero as find
 
 from scipy.sparse import vstack, hstack, csr_matrix as sparse
 
-from pypower.idx_bus import BUS_TYPE, REF, VA, LAM_P, LAM_Q, MU_VMAX, MU_VMIN
+from pypower.idx_bus import VA, LAM_P, LAM_Q, MU_VMAX, MU_VMIN
 from pypower.idx_gen import PG, MU_PMAX, MU_PMIN, MU_QMAX, MU_QMIN
 from pypower.idx_brch import PF, PT, QF, QT, RATE_A, MU_SF, MU_ST
-from pypower.idx_cost import MODEL, POLYNOMIAL, PW_LINEAR, NCOST, COST
+from pypower.idx_cost import MODEL, POLYNOMIAL, NCOST, COST
 
-from pypower.util import sub2ind, have_fcn
-from pypower.ipopt_options import ipopt_options
-from pypower.cplex_options import cplex_options
-from pypower.mosek_options import mosek_options
-from pypower.gurobi_options import gurobi_options
+from pypower.util import have_fcn
 from pypower.qps_pypower import qps_pypower
+from pypower.pipsopf_solver import interior_x0
 
 
 def dcopf_solver(om, ppopt, out_opt=None):
@@ -73,44 +70,52 @@ def dcopf_solver(om, ppopt, out_opt=None):
     if out_opt is None:
         out_opt = {}
 
-    ## options
-    verbose = ppopt['VERBOSE']
-    alg     = ppopt['OPF_ALG_DC']
+    ## linear constraints & variable bounds
+    A, l, u = om.linear_constraints()
+    x0, xmin, xmax = om.getv()
 
-    if alg == 0:
-        if have_fcn('cplex'):        ## use CPLEX by default, if available
-            alg = 500
-        elif have_fcn('mosek'):      ## if not, then MOSEK, if available
-            alg = 600
-        elif have_fcn('gurobi'):     ## if not, then Gurobi, if available
-            alg = 700
-        else:                        ## otherwise PIPS
-            alg = 200
+    ## quadratic cost of the form f = 1/2 * X'*HH*X + CC'*X + C0
+    HH, CC, C0 = dcopf_qp_cost(om)
+
+    ## set up input for QP solver
+    opt = dcopf_qp_opt(ppopt, HH.count_nonzero() == 0)
+    alg = opt['alg']
+    if ((alg == 200) or (alg == 250)) and not ppopt['OPF_WARM_START']:
+        ## try to select an interior initial point
+        x0 = interior_x0(om)
+
+    ##-----  run opf  -----
+    x, f, info, output, lmbda = \
+            qps_pypower(HH, CC, A, l, u, xmin, xmax, x0, opt)
+
+    return dcopf_results(om, x, f, C0, info, output, lmbda)
+
+
+def dcopf_qp_cost(om):
+    """Builds the quadratic cost of a DC OPF.
+
+    Returns C{HH}, C{CC} and C{C0} such that the total cost of the DC OPF
+    specified by the OPF model object C{om} is C{1/2 * X'*HH*X + CC'*X + C0},
+    where C{X} is the full vector of optimization variables. The polynomial
+    and piece-wise linear generator costs are combined with the user defined
+    costs, so L{opf_model.build_cost_params} must be called first.
 
+    @see: L{dcopf_solver}
+    """
     ## unpack data
     ppc = om.get_ppc()
-    baseMVA, bus, gen, branch, gencost = \
-        ppc["baseMVA"], ppc["bus"], ppc["gen"], ppc["branch"], ppc["gencost"]
+    baseMVA, gencost = ppc["baseMVA"], ppc["gencost"]
     cp = om.get_cost_params()
     N, H, Cw = cp["N"], cp["H"], cp["Cw"]
     fparm = array(c_[cp["dd"], cp["rh"], cp["kk"], cp["mm"]])
-    Bf = om.userdata('Bf')
-    Pfinj = om.userdata('Pfinj')
-    vv, ll, _, _ = om.get_idx()
+    vv, _, _, _ = om.get_idx()
 
     ## problem dimensions
     ipol = find(gencost[:, MODEL] == POLYNOMIAL) ## polynomial costs
-    ipwl = find(gencost[:, MODEL] == PW_LINEAR)  ## piece-wise linear costs
-    nb = bus.shape[0]              ## number of buses
-    nl = branch.shape[0]           ## number of branches
     nw = N.shape[0]                ## number of general cost vars, w
     ny = om.getN('var', 'y')       ## number of piece-wise linear costs
     nxyz = om.getN('var')          ## total number of control vars of all types
 
-    ## linear constraints & variable bounds
-    A, l, u = om.linear_constraints()
-    x0, xmin, xmax = om.getv()
-
     ## set up objective function of the form: f = 1/2 * X'*HH*X + CC'*X
     ## where X = [x;y;z]. First set up as quadratic function of w,
     ## f = 1/2 * w'*HHw*w + CCw'*w, where w = diag(M) * (N*X - Rhat). We
@@ -180,25 +185,35 @@ def dcopf_solver(om, ppopt, out_opt=None):
     CC = MN.T * (CCw - HMR)
     C0 = 0.5 * dot(MR, HMR) + sum(polycf[:, 2])  # Constant term of cost.
 
-    ## set up input for QP solver
-    opt = {'alg': alg, 'verbose': verbose}
-    if (alg == 200) or (alg == 250):
-        ## try to select an interior initial point
-        Varefs = bus[bus[:, BUS_TYPE] == REF, VA] * (pi / 180.0)
-
-        lb, ub = xmin.copy(), xmax.copy()
-        lb[xmin == -Inf] = -1e10   ## replace Inf with numerical proxies
-        ub[xmax ==  Inf] =  1e10
-        x0 = (lb + ub) / 2;
-        # angles set to first reference angle
-        x0[vv["i1"]["Va"]:vv["iN"]["Va"]] = Varefs[0]
-        if ny > 0:
-            ipwl = find(gencost[:, MODEL] == PW_LINEAR)
-            # largest y-value in CCV data
-            c = gencost.flatten('F')[sub2ind(gencost.shape, ipwl,
-                                NCOST + 2 * gencost[ipwl, NCOST])]
-            x0[vv["i1"]["y"]:vv["iN"]["y"]] = max(c) + 0.1 * abs(max(c))
+    return HH, CC, C0
 
+
+def dcopf_qp_opt(ppopt, lp=False):
+    """Returns the L{qps_pypower} options dict used to solve a DC OPF.
+
+    The solver is selected by C{OPF_ALG_DC} in C{ppopt}, choosing the first
+    one available if it is 0 (see L{ppoption}). HiGHS is only chosen
+    automatically if C{lp} is true, i.e. the cost has no quadratic terms.
+    The resolved algorithm code is returned in the C{alg} key.
+
+    @see: L{dcopf_solver}
+    """
+    alg = ppopt['OPF_ALG_DC']
+
+    if alg == 0:
+        if have_fcn('cplex'):        ## use CPLEX by default, if available
+            alg = 500
+        elif have_fcn('mosek'):      ## if not, then MOSEK, if available
+            alg = 600
+        elif have_fcn('gurobi'):     ## if not, then Gurobi, if available
+            alg = 700
+        elif lp and have_fcn('highs'):  ## if not, then HiGHS for an LP
+            alg = 800
+        else:                        ## otherwise PIPS
+            alg = 200
+
+    opt = {'alg': alg, 'verbose': ppopt['VERBOSE']}
+    if (alg == 200) or (alg == 250):
         ## set up options
         feastol = ppopt['PDIPM_FEASTOL']
         gradtol = ppopt['PDIPM_GRADTOL']
@@ -216,19 +231,48 @@ def dcopf_solver(om, ppopt, out_opt=None):
                              'max_red': max_red,
                              'cost_mult': 1  }
     elif alg == 400:
+        from pypower.ipopt_options import ipopt_options
         opt['ipopt_opt'] = ipopt_options([], ppopt)
     elif alg == 500:
+        from pypower.cplex_options import cplex_options
         opt['cplex_opt'] = cplex_options([], ppopt)
     elif alg == 600:
+        from pypower.mosek_options import mosek_options
         opt['mosek_opt'] = mosek_options([], ppopt)
     elif alg == 700:
+        from pypower.gurobi_options import gurobi_options
         opt['grb_opt'] = gurobi_options([], ppopt)
+    elif alg == 800:
+        opt['highs_opt'] = {}
     else:
         raise ValueError("Unrecognised solver [%d]." % alg)
 
-    ##-----  run opf  -----
-    x, f, info, output, lmbda = \
-            qps_pypower(HH, CC, A, l, u, xmin, xmax, x0, opt)
+    return opt
+
+
+def dcopf_results(om, x, f, C0, info, output, lmbda):
+    """Packages the solution of a DC OPF QP into a C{results} dict.
+
+    Takes the solution C{x}, objective value C{f} (without the constant
+    term C{C0}), exit flag C{info}, solver C{output} and multipliers
+    C{lmbda} in the form returned by L{qps_pypower} and returns the
+    C{results}, C{success} and C{raw} outputs of L{dcopf_solver}.
+
+    @see: L{dcopf_solver}
+    """
+    ## unpack data
+    ppc = om.get_ppc()
+    baseMVA, bus, gen, branch = \
+        ppc["baseMVA"], ppc["bus"], ppc["gen"], ppc["branch"]
+    Bf = om.userdata('Bf')
+    Pfinj = om.userdata('Pfinj')
+    vv, ll, _, _ = om.get_idx()
+
+    ## problem dimensions
+    nb = bus.shape[0]              ## number of buses
+    nl = branch.shape[0]           ## number of branches
+    ny = om.getN('var', 'y')       ## number of piece-wise linear costs
+
     success = (info == 1)
 
     ##-----  calculate return values  -----
@@ -0,0 +1,213 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Solves an N-1 security-constrained DC optimal power flow.
+"""
+
+from sys import stdout, stderr
+
+from time import time
+
+from numpy import arange, zeros, abs, r_, c_, ix_, newaxis, Inf
+from numpy import flatnonzero as find
+
+from scipy.sparse import csr_matrix as sparse
+
+from pypower.loadcase import loadcase
+from pypower.ppoption import ppoption
+from pypower.ext2int import ext2int
+from pypower.int2ext import int2ext
+from pypower.opf_setup import opf_setup
+from pypower.opf_execute import opf_execute
+from pypower.makeBdc import makeBdc
+from pypower.makePTDF import makePTDF
+from pypower.makeLODF import makeLODF
+
+from pypower.idx_bus import MU_VMIN
+from pypower.idx_gen import PG, QG, MU_QMIN, MU_PMAX, MU_PMIN
+from pypower.idx_brch import F_BUS, T_BUS, RATE_A, PF, QF, PT, QT, MU_SF, \
+    MU_ST, MU_ANGMIN, MU_ANGMAX
+
+
+def dcscopf(casedata, ppopt=None):
+    """Solves an N-1 security-constrained DC optimal power flow.
+
+    Minimizes the DC OPF cost subject to the branch flow limits (C{RATE_A})
+    holding both in the base case and after the outage of any single
+    in-service branch whose loss does not island part of the network.
+
+    Rather than adding all post-contingency limits up front, the problem is
+    solved by constraint generation. The base DC OPF is solved and the
+    post-contingency flows of all monitored branches for all contingencies
+    are evaluated at once from the line outage distribution factors,
+    C{F + LODF * diag(F)}. Only the violated post-contingency limits are
+    added to the OPF model, as a linear constraint set named C{scopf<i>}
+    on the C{Va} variables for round C{i}, and the OPF is re-solved,
+    warm started from the previous solution, until no limit is violated
+    by more than C{OPF_VIOLATION} or C{OPF_SCOPF_MAX_IT} rounds have been
+    added.
+
+    Returns a C{results} dict in the form returned by L{opf}, with the
+    additional key C{scopf}:
+        - C{rounds}     list with a dict for each solve, with keys
+            - C{et}     elapsed time of the round in seconds
+            - C{f}      objective function value
+            - C{nc}     number of post-contingency constraints in the model
+            - C{nviol}  number of violated post-contingency limits found
+        - C{binding}    C{nb x 3} matrix of binding post-contingency limits,
+                        each row containing the (external) index of the
+                        monitored branch, the index of the outaged branch
+                        and the shadow price of the limit in $/MW
+        - C{skipped}    indices of the branches that were not considered
+                        as contingencies because their outage islands
+                        part of the network
+
+    C{success} is C{False} if the base OPF or any of the re-solves fails,
+    or if violations remain after C{OPF_SCOPF_MAX_IT} rounds.
+
+    @see: L{opf}, L{rundcopf}, L{makeLODF}
+    """
+    ##----- initialization -----
+    t0 = time()         ## start timer
+
+    ppc = loadcase(casedata)
+    ppopt = ppoption(ppopt, PF_DC=True)
+    verbose = ppopt['VERBOSE']
+    max_it = ppopt['OPF_SCOPF_MAX_IT']
+    tol = ppopt['OPF_VIOLATION']
+
+    ## add zero columns to bus, gen, branch for multipliers, etc if needed
+    nb = ppc['bus'].shape[0]
+    nl = ppc['branch'].shape[0]
+    ng = ppc['gen'].shape[0]
+    if ppc['bus'].shape[1] < MU_VMIN + 1:
+        ppc['bus'] = c_[ppc['bus'],
+                        zeros((nb, MU_VMIN + 1 - ppc['bus'].shape[1]))]
+
+    if ppc['gen'].shape[1] < MU_QMIN + 1:
+        ppc['gen'] = c_[ppc['gen'],
+                        zeros((ng, MU_QMIN + 1 - ppc['gen'].shape[1]))]
+
+    if ppc['branch'].shape[1] < MU_ANGMAX + 1:
+        ppc['branch'] = c_[ppc['branch'],
+                           zeros((nl, MU_ANGMAX + 1 - ppc['branch'].shape[1]))]
+
+    ##-----  convert to internal numbering, remove out-of-service stuff  -----
+    ppc = ext2int(ppc)
+    baseMVA, bus, branch = ppc['baseMVA'], ppc['bus'], ppc['branch']
+    nl = branch.shape[0]
+    ## external index of each internal branch
+    e2i_br = ppc['order']['branch']['status']['on']
+
+    ##-----  construct OPF model object  -----
+    om = opf_setup(ppc, ppopt)
+    vv, _, _, _ = om.get_idx()
+
+    ## DC branch flows, F = Bf * Va + Pfinj, and outage distribution factors
+    _, Bf, _, Pfinj = makeBdc(baseMVA, bus, branch)
+    PTDF = makePTDF(baseMVA, bus, branch)
+    LODF = makeLODF(branch, PTDF)
+
+    ## only branches whose outage does not island a bus are contingencies
+    f = branch[:, F_BUS].astype(int)
+    t = branch[:, T_BUS].astype(int)
+    h = PTDF[arange(nl), f] - PTDF[arange(nl), t]
+    kc = find(abs(1 - h) > 1e-5)
+    skipped = e2i_br[find(abs(1 - h) <= 1e-5)]
+
+    ## post-contingency flow limits (p.u.), zero RATE_A means unlimited
+    flow_max = branch[:, RATE_A] / baseMVA
+    flow_max[flow_max == 0] = Inf
+
+    added = zeros((nl, nl), bool)   ## (monitored, outaged) pairs in model
+    pairs = {}                      ## (monitored, outaged) of each set
+    rounds = []
+    nc = 0
+    it = 0
+    while True:
+        t1 = time()
+        results, success, raw = opf_execute(om, ppopt)
+        if not success:
+            rounds.append({'et': time() - t1, 'f': results['f'], 'nc': nc,
+                           'nviol': 0})
+            if verbose:
+                stderr.write('dcscopf: OPF failed in round %d\n' % it)
+            break
+
+        ## post-contingency flows, column j is the outage of branch kc[j]
+        Va = results['x'][vv['i1']['Va']:vv['iN']['Va']]
+        F = Bf * Va + Pfinj
+        Fc = F[:, newaxis] + LODF[:, kc] * F[kc]
+        viol = (abs(Fc) > flow_max[:, newaxis] + tol) & ~added[:, kc]
+        il, jc = viol.nonzero()
+        ik = kc[jc]
+
+        rounds.append({'et': time() - t1, 'f': results['f'], 'nc': nc,
+                       'nviol': len(il)})
+        if verbose:
+            stdout.write('SCOPF round %d: f = %.4f, %d contingency '
+                         'constraints, %d violations, %.3f seconds\n' %
+                         (it, results['f'], nc, len(il), rounds[-1]['et']))
+
+        if len(il) == 0:
+            break
+        if it == max_it:
+            success = False
+            if verbose:
+                stderr.write('dcscopf: %d post-contingency violations '
+                             'remain after %d rounds\n' % (len(il), it))
+            break
+
+        ## Fc(l, k) = Bf(l, :) * Va + Pfinj(l) + LODF(l, k) * F(k)
+        lodf = LODF[il, ik]
+        n = len(il)
+        D = sparse((lodf, (arange(n), arange(n))), (n, n))
+        A = Bf[il, :] + D * Bf[ik, :]
+        off = Pfinj[il] + lodf * Pfinj[ik]
+
+        it = it + 1
+        name = 'scopf%d' % it
+        om.add_constraints(name, A, -flow_max[il] - off,
+                           flow_max[il] - off, ['Va'])
+        added[il, ik] = True
+        pairs[name] = (il, ik)
+        nc = nc + n
+
+        ## warm start from the current solution
+        for v in om.var['order']:
+            om.var['data']['v0'][v] = results['x'][vv['i1'][v]:vv['iN'][v]]
+        ppopt = ppoption(ppopt, OPF_WARM_START=True)
+
+    ## binding post-contingency limits
+    binding = zeros((0, 3))
+    for name in pairs:
+        if name not in results.get('lin', {}).get('mu', {}).get('l', {}):
+            continue
+        mu = results['lin']['mu']['u'][name] - results['lin']['mu']['l'][name]
+        k = find(abs(mu) > 1e-6)
+        il, ik = pairs[name]
+        binding = r_[binding,
+                     c_[e2i_br[il[k]], e2i_br[ik[k]], mu[k] / baseMVA]]
+
+    ##-----  revert to original ordering, including out-of-service stuff  -----
+    results = int2ext(results)
+
+    ## zero out result fields of out-of-service gens & branches
+    off = results['order']['gen']['status']['off']
+    if len(off) > 0:
+        results['gen'][ix_(off, [PG, QG, MU_PMAX, MU_PMIN])] = 0
+
+    off = results['order']['branch']['status']['off']
+    if len(off) > 0:
+        results['branch'][ix_(off, [PF, QF, PT, QT, MU_SF, MU_ST,
+                                    MU_ANGMIN, MU_ANGMAX])] = 0
+
+    ##-----  finish preparing output  -----
+    results['et'] = time() - t0
+    results['success'] = success
+    results['raw'] = raw
+    results['scopf'] = {'rounds': rounds, 'binding': binding,
+                        'skipped': skipped}
+
+    return results
@@ -11,16 +11,15 @@ from warnings import warn
 
 from copy import deepcopy
 
-from numpy import array, zeros, argsort, arange, concatenate
+from numpy import zeros, arange
 from numpy import flatnonzero as find
 
-from scipy.sparse import issparse, vstack, hstack, csr_matrix as sparse
-
 from pypower.idx_bus import PQ, PV, REF, NONE, BUS_I, BUS_TYPE
-from pypower.idx_gen import GEN_BUS, GEN_STATUS
-from pypower.idx_brch import F_BUS, T_BUS, BR_STATUS
+from pypower.idx_gen import GEN_BUS
+from pypower.idx_brch import F_BUS, T_BUS
 from pypower.idx_area import PRICE_REF_BUS
 
+from pypower.ext2int_index import ext2int_index, copy_case
 from pypower.e2i_field import e2i_field
 from pypower.e2i_data import e2i_data
 
@@ -48,33 +47,24 @@ def ext2int(ppc, val_or_field=None, ordering=None, dim=0):
     the reverse conversions. If the case is already using internal
     numbering it is returned unchanged.
 
+    The original data matrices are shared with the input case, not
+    copied, and the indexing information is computed once per topology
+    by L{ext2int_index}.
+
     Example::
         ppc = ext2int(ppc)
 
-    @see: L{int2ext}, L{e2i_field}, L{e2i_data}
+    @see: L{int2ext}, L{e2i_field}, L{e2i_data}, L{ext2int_index}
 
     @author: Ray Zimmerman (PSERC Cornell)
     """
-    ppc = deepcopy(ppc)
     if val_or_field is None:  # nargin == 1
+        ppc = copy_case(ppc)
         first = 'order' not in ppc
         if first or ppc["order"]["state"] == 'e':
             ## initialize order
             if first:
-                o = {
-                        'ext':      {
-                                'bus':      None,
-                                'branch':   None,
-                                'gen':      None
-                            },
-                        'bus':      { 'e2i':      None,
-                                      'i2e':      None,
-                                      'status':   {} },
-                        'gen':      { 'e2i':      None,
-                                      'i2e':      None,
-                                      'status':   {} },
-                        'branch':   { 'status': {} }
-                    }
+                o = {}
             else:
                 o = ppc["order"]
 
@@ -89,18 +79,19 @@ def ext2int(ppc, val_or_field=None, ordering=None, dim=0):
             else:
                 dc = False
 
-            ## save data matrices with external ordering
+            ## save data matrices with external ordering, these are
+            ## shared with the input case and never modified
             if 'ext' not in o: o['ext'] = {}
-            ## Note: these dictionaries contain mixed float/int data, 
+            ## Note: these dictionaries contain mixed float/int data,
             ## so don't cast them all astype(int) for numpy/scipy indexing
-            o["ext"]["bus"]    = ppc["bus"].copy()
-            o["ext"]["branch"] = ppc["branch"].copy()
-            o["ext"]["gen"]    = ppc["gen"].copy()
+            o["ext"]["bus"]    = ppc["bus"]
+            o["ext"]["branch"] = ppc["branch"]
+            o["ext"]["gen"]    = ppc["gen"]
             if 'areas' in ppc:
                 if len(ppc["areas"]) == 0: ## if areas field is empty
                     del ppc['areas']       ## delete it (so it's ignored)
                 else:                      ## otherwise
-                    o["ext"]["areas"] = ppc["areas"].copy()  ## save it
+                    o["ext"]["areas"] = ppc["areas"]  ## save it
 
             ## check that all buses have a valid BUS_TYPE
             bt = ppc["bus"][:, BUS_TYPE]
@@ -109,67 +100,28 @@ def ext2int(ppc, val_or_field=None, ordering=None, dim=0):
                 sys.stderr.write('ext2int: bus %d has an invalid BUS_TYPE\n' % err)
 
             ## determine which buses, branches, gens are connected and
-            ## in-service
-            n2i = sparse((range(nb), (ppc["bus"][:, BUS_I], zeros(nb))),
-                         shape=(max(ppc["bus"][:, BUS_I].astype(int)) + 1, 1))
-            n2i = (array( n2i.todense().flatten() )[0, :]).astype(int) # as 1D array
-            bs = (bt != NONE)                               ## bus status
-            o["bus"]["status"]["on"]  = find(  bs )         ## connected
-            o["bus"]["status"]["off"] = find( ~bs )         ## isolated
-            gs = ( (ppc["gen"][:, GEN_STATUS] > 0) &          ## gen status
-                    bs[ n2i[ppc["gen"][:, GEN_BUS].astype(int)] ] )
-            o["gen"]["status"]["on"]  = find(  gs )    ## on and connected
-            o["gen"]["status"]["off"] = find( ~gs )    ## off or isolated
-            brs = ( ppc["branch"][:, BR_STATUS].astype(int) &  ## branch status
-                    bs[n2i[ppc["branch"][:, F_BUS].astype(int)]] &
-                    bs[n2i[ppc["branch"][:, T_BUS].astype(int)]] ).astype(bool)
-            o["branch"]["status"]["on"]  = find(  brs ) ## on and conn
-            o["branch"]["status"]["off"] = find( ~brs )
+            ## in-service, the consecutive bus numbering and the gen
+            ## ordering, cached by topology
+            o.update(ext2int_index(ppc["bus"], ppc["gen"], ppc["branch"],
+                                   ppc.get("areas")))
+
+            ## keep only stuff that is "in", as new matrices
+            ppc["bus"] = ppc["bus"][o["bus"]["status"]["on"], :]
+            ppc["branch"] = ppc["branch"][o["branch"]["status"]["on"], :]
+            ## gens in order of increasing bus number
+            ppc["gen"] = ppc["gen"][o["gen"]["status"]["on"][o["gen"]["e2i"]], :]
             if 'areas' in ppc:
-                ar = bs[ n2i[ppc["areas"][:, PRICE_REF_BUS].astype(int)] ]
-                o["areas"] = {"status": {}}
-                o["areas"]["status"]["on"]  = find(  ar )
-                o["areas"]["status"]["off"] = find( ~ar )
-
-            ## delete stuff that is "out"
-            if len(o["bus"]["status"]["off"]) > 0:
-#                ppc["bus"][o["bus"]["status"]["off"], :] = array([])
-                ppc["bus"] = ppc["bus"][o["bus"]["status"]["on"], :]
-            if len(o["branch"]["status"]["off"]) > 0:
-#                ppc["branch"][o["branch"]["status"]["off"], :] = array([])
-                ppc["branch"] = ppc["branch"][o["branch"]["status"]["on"], :]
-            if len(o["gen"]["status"]["off"]) > 0:
-#                ppc["gen"][o["gen"]["status"]["off"], :] = array([])
-                ppc["gen"] = ppc["gen"][o["gen"]["status"]["on"], :]
-            if 'areas' in ppc and (len(o["areas"]["status"]["off"]) > 0):
-#                ppc["areas"][o["areas"]["status"]["off"], :] = array([])
                 ppc["areas"] = ppc["areas"][o["areas"]["status"]["on"], :]
 
-            ## update size
-            nb = ppc["bus"].shape[0]
-
             ## apply consecutive bus numbering
-            o["bus"]["i2e"] = ppc["bus"][:, BUS_I].copy()
-            o["bus"]["e2i"] = zeros(max(o["bus"]["i2e"]).astype(int) + 1)
-            o["bus"]["e2i"][o["bus"]["i2e"].astype(int)] = arange(nb)
-            ppc["bus"][:, BUS_I] = \
-                o["bus"]["e2i"][ ppc["bus"][:, BUS_I].astype(int) ].copy()
-            ppc["gen"][:, GEN_BUS] = \
-                o["bus"]["e2i"][ ppc["gen"][:, GEN_BUS].astype(int) ].copy()
-            ppc["branch"][:, F_BUS] = \
-                o["bus"]["e2i"][ ppc["branch"][:, F_BUS].astype(int) ].copy()
-            ppc["branch"][:, T_BUS] = \
-                o["bus"]["e2i"][ ppc["branch"][:, T_BUS].astype(int) ].copy()
+            e2i = o["bus"]["e2i"]
+            ppc["bus"][:, BUS_I] = e2i[ ppc["bus"][:, BUS_I].astype(int) ]
+            ppc["gen"][:, GEN_BUS] = e2i[ ppc["gen"][:, GEN_BUS].astype(int) ]
+            ppc["branch"][:, F_BUS] = e2i[ ppc["branch"][:, F_BUS].astype(int) ]
+            ppc["branch"][:, T_BUS] = e2i[ ppc["branch"][:, T_BUS].astype(int) ]
             if 'areas' in ppc:
                 ppc["areas"][:, PRICE_REF_BUS] = \
-                    o["bus"]["e2i"][ ppc["areas"][:,
-                        PRICE_REF_BUS].astype(int) ].copy()
-
-            ## reorder gens in order of increasing bus number
-            o["gen"]["e2i"] = argsort(ppc["gen"][:, GEN_BUS])
-            o["gen"]["i2e"] = argsort(o["gen"]["e2i"])
-
-            ppc["gen"] = ppc["gen"][o["gen"]["e2i"].astype(int), :]
+                    e2i[ ppc["areas"][:, PRICE_REF_BUS].astype(int) ]
 
             if 'int' in o:
                 del o['int']
@@ -196,6 +148,7 @@ def ext2int(ppc, val_or_field=None, ordering=None, dim=0):
             if 'userfcn' in ppc:
                 ppc = run_userfcn(ppc['userfcn'], 'ext2int', ppc)
     else:                    ## convert extra data
+        ppc = deepcopy(ppc)
         if isinstance(val_or_field, str) or isinstance(val_or_field, list):
             ## field
             warn('Calls of the form ppc = ext2int(ppc, '
@@ -0,0 +1,143 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Index vectors and case copies for converting between external and
+internal indexing.
+"""
+
+from collections import OrderedDict
+from copy import deepcopy
+from hashlib import sha1
+
+from numpy import zeros, arange, argsort, ascontiguousarray, int64
+from numpy import flatnonzero as find
+
+from pypower.idx_bus import NONE, BUS_I, BUS_TYPE
+from pypower.idx_gen import GEN_BUS, GEN_STATUS
+from pypower.idx_brch import F_BUS, T_BUS, BR_STATUS
+from pypower.idx_area import PRICE_REF_BUS
+
+
+## number of topologies whose index vectors are cached
+ORDER_CACHE_SIZE = 16
+
+## data matrices, replaced but never modified in place by ext2int and int2ext
+MATRICES = ('bus', 'gen', 'branch', 'areas', 'gencost', 'A', 'N')
+
+## index vectors under the 'order' key, shared read-only
+ORDERINGS = ('bus', 'gen', 'branch', 'areas')
+
+_cache = OrderedDict()
+
+
+def ext2int_index(bus, gen, branch, areas=None):
+    """Returns the index vectors for converting a case to internal indexing.
+
+    Returns a dict with the keys C{'bus'}, C{'gen'}, C{'branch'} and, if
+    C{areas} is given, C{'areas'}, each holding the C{'status'} dict of
+    the indices of the connected and in-service (C{'on'}) and isolated or
+    out-of-service (C{'off'}) rows of the matrix, and for the buses and
+    generators the C{'e2i'} and C{'i2e'} vectors mapping external to
+    internal indices (bus numbers) and back, as stored under the
+    C{'order'} key by L{ext2int}.
+
+    The vectors depend only on the topology of the case: the bus numbers
+    and types (whether isolated), the generator buses and status, the
+    branch ends and status and the area reference buses. They are
+    computed once per topology, for the last C{ORDER_CACHE_SIZE}
+    topologies, and shared, read-only, by the returned dicts.
+
+    @see: L{ext2int}, L{int2ext}
+    """
+    cols = [bus[:, BUS_I], bus[:, BUS_TYPE] == NONE,
+            gen[:, GEN_BUS], gen[:, GEN_STATUS] > 0,
+            branch[:, F_BUS], branch[:, T_BUS], branch[:, BR_STATUS] != 0]
+    if areas is not None:
+        cols.append(areas[:, PRICE_REF_BUS])
+    h = sha1()
+    for c in cols:
+        h.update(ascontiguousarray(c, float))
+    key = (len(bus), len(gen), len(branch), len(cols), h.hexdigest())
+
+    index = _cache.pop(key, None)
+    if index is None:
+        index = _index(bus, gen, branch, areas)
+        if len(_cache) >= ORDER_CACHE_SIZE:
+            _cache.popitem(last=False)
+    _cache[key] = index     ## most recently used last
+
+    ## new dicts, sharing the vectors
+    o = {}
+    for k, v in index.items():
+        o[k] = dict(v, status=dict(v['status']))
+    return o
+
+
+def _index(bus, gen, branch, areas):
+    nb = bus.shape[0]
+
+    ## determine which buses, branches, gens are connected and in-service
+    n2i = zeros(bus[:, BUS_I].astype(int).max() + 1, int64)
+    n2i[bus[:, BUS_I].astype(int)] = arange(nb)
+    bs = bus[:, BUS_TYPE] != NONE                       ## bus status
+    gs = (gen[:, GEN_STATUS] > 0) & \
+        bs[n2i[gen[:, GEN_BUS].astype(int)]]            ## gen status
+    brs = (branch[:, BR_STATUS].astype(int) &           ## branch status
+           bs[n2i[branch[:, F_BUS].astype(int)]] &
+           bs[n2i[branch[:, T_BUS].astype(int)]]).astype(bool)
+
+    index = {
+        'bus':      {'status': {'on': find(bs), 'off': find(~bs)}},
+        'gen':      {'status': {'on': find(gs), 'off': find(~gs)}},
+        'branch':   {'status': {'on': find(brs), 'off': find(~brs)}}
+    }
+    if areas is not None:
+        ar = bs[n2i[areas[:, PRICE_REF_BUS].astype(int)]]
+        index['areas'] = {'status': {'on': find(ar), 'off': find(~ar)}}
+
+    ## consecutive bus numbering
+    i2e = bus[index['bus']['status']['on'], BUS_I]
+    e2i = zeros(i2e.astype(int).max() + 1)
+    e2i[i2e.astype(int)] = arange(len(i2e))
+    index['bus']['i2e'] = i2e
+    index['bus']['e2i'] = e2i
+
+    ## gens in order of increasing bus number
+    gbus = e2i[gen[index['gen']['status']['on'], GEN_BUS].astype(int)]
+    index['gen']['e2i'] = argsort(gbus)
+    index['gen']['i2e'] = argsort(index['gen']['e2i'])
+
+    ## shared by all cases with this topology
+    for v in index.values():
+        for a in list(v.values()) + list(v['status'].values()):
+            if not isinstance(a, dict):
+                a.flags.writeable = False
+
+    return index
+
+
+def copy_case(ppc):
+    """Returns a copy of a PYPOWER case dict sharing its data matrices.
+
+    The data matrices (C{MATRICES}) of the case and of the C{'ext'} and
+    C{'int'} dicts under its C{'order'} key, and the index vectors under
+    its C{'order'} key, are shared with C{ppc}, everything else is deep
+    copied. Used by L{ext2int} and L{int2ext}, which replace these
+    matrices rather than modifying them, instead of deep copying the
+    whole case.
+
+    @see: L{ext2int}, L{int2ext}
+    """
+    c = _copy(ppc, MATRICES + ('order',))
+    if 'order' in ppc:
+        o = ppc['order']
+        c['order'] = _copy(o, ORDERINGS + ('ext', 'int'))
+        for k in ('ext', 'int'):
+            if k in o:
+                c['order'][k] = _copy(o[k], MATRICES)
+    return c
+
+
+def _copy(d, shared):
+    return dict((k, v if k in shared else deepcopy(v)) for k, v in d.items())
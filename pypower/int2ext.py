@@ -11,11 +11,14 @@ from warnings import warn
 
 from copy import deepcopy
 
+from numpy import empty_like, ix_
+
 from pypower.idx_bus import BUS_I
 from pypower.idx_gen import GEN_BUS
 from pypower.idx_brch import F_BUS, T_BUS
 from pypower.idx_area import PRICE_REF_BUS
 
+from pypower.ext2int_index import copy_case
 from pypower.run_userfcn import run_userfcn
 
 from pypower.i2e_field import i2e_field
@@ -31,7 +34,8 @@ def int2ext(ppc, val_or_field=None, oldval=None, ordering=None, dim=0):
     buses, generators and branches that were removed because of being
     isolated or off-line, and reverts to the original generator ordering
     and original bus numbering. This requires that the 'order' key
-    created by L{ext2int} be in place.
+    created by L{ext2int} be in place. The internal data matrices, kept
+    under the 'order' key, are shared with the input case, not copied.
 
     Example::
         ppc = int2ext(ppc)
@@ -40,11 +44,11 @@ def int2ext(ppc, val_or_field=None, oldval=None, ordering=None, dim=0):
 
     @author: Ray Zimmerman (PSERC Cornell)
     """
-    ppc = deepcopy(ppc)
     if val_or_field is None: # nargin == 1
         if 'order' not in ppc:
             sys.stderr.write('int2ext: ppc does not have the "order" field '
                 'required for conversion back to external numbering.\n')
+        ppc = copy_case(ppc)
         o = ppc["order"]
 
         if o["state"] == 'i':
@@ -52,56 +56,35 @@ def int2ext(ppc, val_or_field=None, oldval=None, ordering=None, dim=0):
             if 'userfcn' in ppc:
                 ppc = run_userfcn(ppc["userfcn"], 'int2ext', ppc)
 
-            ## save data matrices with internal ordering & restore originals
+            ## save data matrices with internal ordering
             o["int"] = {}
-            o["int"]["bus"]    = ppc["bus"].copy()
-            o["int"]["branch"] = ppc["branch"].copy()
-            o["int"]["gen"]    = ppc["gen"].copy()
-            ppc["bus"]     = o["ext"]["bus"].copy()
-            ppc["branch"]  = o["ext"]["branch"].copy()
-            ppc["gen"]     = o["ext"]["gen"].copy()
+            o["int"]["bus"]    = ppc["bus"]
+            o["int"]["branch"] = ppc["branch"]
+            o["int"]["gen"]    = ppc["gen"]
+
+            ## restore originals, updated with the internal data (in bus,
+            ## branch, gen and areas only) but the original bus numbers
+            ppc["bus"] = _restore(o["ext"]["bus"], ppc["bus"],
+                                  o["bus"]["status"], [BUS_I])
+            ppc["branch"] = _restore(o["ext"]["branch"], ppc["branch"],
+                                     o["branch"]["status"], [F_BUS, T_BUS])
+            ppc["gen"] = _restore(o["ext"]["gen"],
+                                  ppc["gen"][o["gen"]["i2e"], :],
+                                  o["gen"]["status"], [GEN_BUS])
             if 'gencost' in ppc:
-                o["int"]["gencost"] = ppc["gencost"].copy()
+                o["int"]["gencost"] = ppc["gencost"]
                 ppc["gencost"] = o["ext"]["gencost"].copy()
             if 'areas' in ppc:
-                o["int"]["areas"] = ppc["areas"].copy()
-                ppc["areas"] = o["ext"]["areas"].copy()
+                o["int"]["areas"] = ppc["areas"]
+                ppc["areas"] = _restore(o["ext"]["areas"], ppc["areas"],
+                                        o["areas"]["status"], [PRICE_REF_BUS])
             if 'A' in ppc:
-                o["int"]["A"] = ppc["A"].copy()
+                o["int"]["A"] = ppc["A"]
                 ppc["A"] = o["ext"]["A"].copy()
             if 'N' in ppc:
-                o["int"]["N"] = ppc["N"].copy()
+                o["int"]["N"] = ppc["N"]
                 ppc["N"] = o["ext"]["N"].copy()
 
-            ## update data (in bus, branch and gen only)
-            ppc["bus"][o["bus"]["status"]["on"], :] = \
-                o["int"]["bus"]
-            ppc["branch"][o["branch"]["status"]["on"], :] = \
-                o["int"]["branch"]
-            ppc["gen"][o["gen"]["status"]["on"], :] = \
-                o["int"]["gen"][o["gen"]["i2e"], :]
-            if 'areas' in ppc:
-                ppc["areas"][o["areas"]["status"]["on"], :] = \
-                    o["int"]["areas"]
-
-            ## revert to original bus numbers
-            ppc["bus"][o["bus"]["status"]["on"], BUS_I] = \
-                o["bus"]["i2e"] \
-                    [ ppc["bus"][o["bus"]["status"]["on"], BUS_I].astype(int) ]
-            ppc["branch"][o["branch"]["status"]["on"], F_BUS] = \
-                o["bus"]["i2e"][ ppc["branch"] \
-                    [o["branch"]["status"]["on"], F_BUS].astype(int) ]
-            ppc["branch"][o["branch"]["status"]["on"], T_BUS] = \
-                o["bus"]["i2e"][ ppc["branch"] \
-                    [o["branch"]["status"]["on"], T_BUS].astype(int) ]
-            ppc["gen"][o["gen"]["status"]["on"], GEN_BUS] = \
-                o["bus"]["i2e"][ ppc["gen"] \
-                    [o["gen"]["status"]["on"], GEN_BUS].astype(int) ]
-            if 'areas' in ppc:
-                ppc["areas"][o["areas"]["status"]["on"], PRICE_REF_BUS] = \
-                    o["bus"]["i2e"][ ppc["areas"] \
-                    [o["areas"]["status"]["on"], PRICE_REF_BUS].astype(int) ]
-
             if 'ext' in o: del o['ext']
             o["state"] = 'e'
             ppc["order"] = o
@@ -109,6 +92,7 @@ def int2ext(ppc, val_or_field=None, oldval=None, ordering=None, dim=0):
             sys.stderr.write('int2ext: ppc claims it is already using '
                          'external numbering.\n')
     else:                    ## convert extra data
+        ppc = deepcopy(ppc)
         if isinstance(val_or_field, str) or isinstance(val_or_field, list):
             ## field (key)
             warn('Calls of the form MPC = INT2EXT(MPC, ''FIELD_NAME'', ...) have been deprecated. Please replace INT2EXT with I2E_FIELD.')
@@ -125,6 +109,19 @@ def int2ext(ppc, val_or_field=None, oldval=None, ordering=None, dim=0):
     return ppc
 
 
+def _restore(ext, int_, status, cols):
+    """Returns a new copy of the external matrix C{ext} with the rows
+    C{status['on']} replaced by the internal matrix C{int_}, except for the
+    (bus number) columns C{cols}.
+    """
+    on, off = status["on"], status["off"]
+    m = empty_like(ext)     ## same dtype and memory layout
+    m[off, :] = ext[off, :]
+    m[on, :] = int_
+    m[ix_(on, cols)] = ext[ix_(on, cols)]
+    return m
+
+
 def int2ext1(i2e, bus, gen, branch, areas):
     """Converts from the consecutive internal bus numbers back to the originals
     using the mapping provided by the I2E vector returned from C{ext2int}.
@@ -0,0 +1,75 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Loads a case dict from a binary case cache.
+"""
+
+import json
+
+from os import stat, replace
+from os.path import join, exists
+
+from numpy import load
+
+from pypower.save_case_cache import case_cache_key
+
+
+def load_case_cache(cachedir, source='', mmap_mode='c'):
+    """Loads a case dict from a binary case cache.
+
+    Reads the case dict saved by L{save_case_cache} in the directory
+    C{cachedir}. The arrays are memory-mapped with the given C{mmap_mode}
+    (see C{numpy.load}), by default copy-on-write, so that no data is
+    read until used and changes to the arrays are not written back to the
+    cache. Use C{mmap_mode=None} to read them into memory.
+
+    If the name of the case file C{source} is given, the cache is only used
+    if it was saved for that file and the file has not changed since: its
+    size must match the key of the cache, and its SHA-1 hash too if its
+    modification time does not (the modification time in the key is then
+    updated).
+
+    Returns the case dict, or C{None} if there is no valid cache.
+
+    @see: L{save_case_cache}, L{loadcase}
+    """
+    metafile = join(cachedir, 'case.json')
+    if not exists(metafile):
+        return None
+    try:
+        with open(metafile) as fd:
+            meta = json.load(fd)
+
+        if source:
+            key = meta.get('key')
+            st = stat(source)
+            if key is None or key['size'] != st.st_size:
+                return None
+            if key['mtime'] != st.st_mtime_ns:
+                ## touched, check the contents
+                new = case_cache_key(source)
+                if new['sha1'] != key['sha1']:
+                    return None
+                meta['key'] = new
+                with open(metafile + '.tmp', 'w') as fd:
+                    json.dump(meta, fd)
+                replace(metafile + '.tmp', metafile)
+
+        return _load(cachedir, meta, mmap_mode)
+    except (IOError, OSError, ValueError, KeyError):
+        return None
+
+
+def _load(path, meta, mmap_mode):
+    d = dict(meta['values'])
+    for k in meta['arrays']:
+        fname = join(path, k + '.npy')
+        try:
+            d[k] = load(fname, mmap_mode, allow_pickle=False)
+        except ValueError:      ## empty arrays can not be mapped
+            d[k] = load(fname, allow_pickle=False)
+    for k in meta['dicts']:
+        with open(join(path, k, 'case.json')) as fd:
+            d[k] = _load(join(path, k), json.load(fd), mmap_mode)
+    return d
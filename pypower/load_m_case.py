@@ -0,0 +1,206 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Reads a MATPOWER case file (M-file).
+"""
+
+import re
+import warnings
+
+from numpy import fromstring, zeros
+
+## first line of the case function, e.g. "function mpc = case9"
+_FUNCTION = re.compile(r'\s*function\s+(\[?)\s*([\w\s,]*?)\s*\]?\s*=')
+
+## assignment to a case field (version 2) or variable (version 1)
+_ASSIGN = re.compile(r'\s*(?:(\w+)\.)?(\w+)\s*(\(?)[^=]*=\s*(.*)$')
+
+## quoted string, with '' as an escaped quote
+_STRING = re.compile(r"'((?:[^']|'')*)'")
+
+## separators of the values and rows of a numeric block
+_SEP = str.maketrans(',;\t\n', '    ')
+
+## separators of the values of a numeric block, rows kept on their own lines
+_ROWS = str.maketrans(',;\t', ' \n ')
+
+
+def load_m_case(fname):
+    """Reads a MATPOWER case file (M-file) into a PYPOWER case dict.
+
+    Reads the case defined in the MATPOWER M-file C{fname} without
+    running it, with a streaming tokenizer that reads the file line by
+    line, skipping comments, and collects the text of each matrix
+    assignment, e.g. C{mpc.bus = [ ... ];}. Each numeric matrix is then
+    parsed in bulk with C{numpy.fromstring}, rows being separated by line
+    breaks or semicolons, so files of 100k buses are read in a couple of
+    seconds.
+
+    All fields assigned in the file are returned, e.g. C{version},
+    C{baseMVA}, C{bus}, C{gen}, C{branch}, C{gencost}, C{areas} and
+    C{dcline}, as scalars, strings, 2-D arrays or, for cell arrays such
+    as C{bus_name}, lists of strings. Version 1 case files, which return
+    the matrices as individual variables, are read with C{version} set to
+    '1'; they are converted by L{loadcase}.
+
+    Only literal assignments are supported: a file modifying a field
+    afterwards, e.g. C{mpc.branch(:, 6) = 0;}, raises a C{ValueError}, as
+    does a matrix with rows of different lengths.
+
+    @see: L{loadcase}
+    """
+    s = {}
+    var = None          ## name of the case struct (version 2)
+    field = None        ## field of the block being read
+    chunks = []         ## text of the block being read
+    cell = False        ## block is a cell array
+
+    with open(fname) as fd:
+        for line in fd:
+            if field is not None:
+                ## inside a block
+                if cell:
+                    strings, end = _cell_line(line)
+                    chunks.extend(strings)
+                else:
+                    line = _strip(line)
+                    end = line.find(']')
+                    chunks.append(line if end < 0 else line[:end])
+                if end >= 0:
+                    s[field] = chunks if cell else _matrix(chunks, field)
+                    field = None
+                continue
+
+            line = _strip(line, True)
+            if not line.strip():
+                continue
+
+            if var is None and 'version' not in s:
+                m = _FUNCTION.match(line)
+                if m is not None:
+                    if m.group(1):      ## [baseMVA, bus, ...] = case
+                        s['version'] = '1'
+                    else:
+                        var = m.group(2)
+                    continue
+
+            m = _ASSIGN.match(line)
+            if m is None:
+                continue
+            struct, name, index, rhs = m.groups()
+            if struct != var:
+                continue        ## not a field of the case
+            if index:
+                raise ValueError('load_m_case: unsupported assignment to '
+                                 '%s in %s' % (name, fname))
+
+            rhs = rhs.strip()
+            if rhs.startswith('['):
+                chunks = []
+                cell = False
+                rhs = rhs[1:]
+                end = rhs.find(']')
+                chunks.append(rhs if end < 0 else rhs[:end])
+                if end >= 0:
+                    s[name] = _matrix(chunks, name)
+                else:
+                    field = name
+            elif rhs.startswith('{'):
+                strings, end = _cell_line(rhs[1:], '}')
+                chunks = strings
+                cell = True
+                if end >= 0:
+                    s[name] = chunks
+                else:
+                    field = name
+            elif rhs.startswith("'"):
+                m = _STRING.match(rhs)
+                s[name] = m.group(1).replace("''", "'") if m else rhs
+            else:
+                try:
+                    s[name] = float(rhs.rstrip(';').strip())
+                except ValueError:
+                    pass        ## expression, e.g. a function call
+
+    if field is not None:
+        raise ValueError('load_m_case: unterminated matrix %s in %s' %
+                         (field, fname))
+
+    return s
+
+
+def _strip(line, strings=False):
+    """Removes a comment from a line, keeping its line break.
+    """
+    if strings and "'" in line:
+        ## skip quoted strings, which may contain a comment character
+        k = 0
+        for m in _STRING.finditer(line):
+            i = _comment(line, k, m.start())
+            if i >= 0:
+                break
+            k = m.end()
+        else:
+            i = _comment(line, k, len(line))
+    else:
+        i = _comment(line, 0, len(line))
+
+    if i < 0:
+        return line
+    return line[:i] + '\n' if line.endswith('\n') else line[:i]
+
+
+def _comment(line, start, end):
+    """Returns the position of the first comment character of
+    C{line[start:end]}, or -1.
+    """
+    i = line.find('%', start, end)
+    j = line.find('#', start, end)
+    if j >= 0 and (i < 0 or j < i):
+        i = j
+    return i
+
+
+def _cell_line(line, close='}'):
+    """Returns the strings of a line of a cell array and the position of
+    its closing brace, or -1.
+    """
+    strings = []
+    k = 0
+    for m in _STRING.finditer(line):
+        if _comment(line, k, m.start()) >= 0 or \
+                line.find(close, k, m.start()) >= 0:
+            break
+        strings.append(m.group(1).replace("''", "'"))
+        k = m.end()
+    rest = _strip(line[k:])
+    end = rest.find(close)
+    return strings, (end if end < 0 else k + end)
+
+
+def _matrix(chunks, name):
+    """Parses the text of a numeric matrix into a 2-D array.
+    """
+    ## each chunk is a line, so a line break ends a row
+    text = '\n'.join(chunks)
+    with warnings.catch_warnings():
+        ## raised by fromstring for text that is not a number
+        warnings.simplefilter('error', DeprecationWarning)
+        try:
+            A = fromstring(text.translate(_SEP), sep=' ')
+        except DeprecationWarning:
+            raise ValueError('load_m_case: %s is not a numeric matrix'
+                             % name)
+    if len(A) == 0:
+        return zeros((0, 0))
+
+    ## number of columns of each row
+    nc = set(len(row.split()) for row in
+             text.translate(_ROWS).split('\n')) - set([0])
+    if len(nc) != 1:
+        raise ValueError('load_m_case: rows of %s have different lengths'
+                         % name)
+    nc = nc.pop()
+
+    return A.reshape((-1, nc))
@@ -7,7 +7,7 @@
 
 import sys
 
-from os.path import basename, splitext, exists
+from os.path import basename, splitext, exists, getsize
 
 from copy import deepcopy
 
@@ -16,6 +16,11 @@ from numpy import array, zeros, ones, c_
 from scipy.io import loadmat
 
 from pypower._compat import PY2
+from pypower.Case import Case
+from pypower.load_case_cache import load_case_cache
+from pypower.load_m_case import load_m_case
+from pypower.psse2ppc import psse2ppc
+from pypower.save_case_cache import save_case_cache
 from pypower.idx_gen import PMIN, MU_PMAX, MU_PMIN, MU_QMAX, MU_QMIN, APF
 from pypower.idx_brch import PF, QF, PT, QT, MU_SF, MU_ST, BR_STATUS
 
@@ -23,19 +28,27 @@ from pypower.idx_brch import PF, QF, PT, QT, MU_SF, MU_ST, BR_STATUS
 if not PY2:
     basestring = str
 
+## minimum size (bytes) of case files cached by default
+CACHE_MIN_SIZE = 1 << 20
+
 
 def loadcase(casefile,
-        return_as_obj=True, expect_gencost=True, expect_areas=True):
+        return_as_obj=True, expect_gencost=True, expect_areas=True,
+        cache=None):
     """Returns the individual data matrices or an dict containing them
     as values.
 
     Here C{casefile} is either a dict containing the keys C{baseMVA}, C{bus},
-    C{gen}, C{branch}, C{areas}, C{gencost}, or a string containing the name
-    of the file. If C{casefile} contains the extension '.mat' or '.py', then
-    the explicit file is searched. If C{casefile} containts no extension, then
-    L{loadcase} looks for a '.mat' file first, then for a '.py' file.  If the
-    file does not exist or doesn't define all matrices, the function returns
-    an exit code as follows:
+    C{gen}, C{branch}, C{areas}, C{gencost}, a L{Case}, converted with
+    C{Case.to_ppc} and so sharing its data matrices, or a string containing
+    the name of the file. If C{casefile} contains the extension '.mat', '.py' or '.m',
+    then the explicit file is searched. If C{casefile} containts no extension,
+    then L{loadcase} looks for a '.mat' file first, then for a '.py' file,
+    then for a MATPOWER '.m' case file, which is read with L{load_m_case}.
+    PSS/E RAW files, with the explicit extension '.raw', are read with
+    L{psse2ppc}.
+    If the file does not exist or doesn't define all matrices, the function
+    returns an exit code as follows:
 
         0.  all variables successfully defined
         1.  input argument is not a string or dict
@@ -49,6 +62,18 @@ def loadcase(casefile,
     assumed to be a PYPOWER case file in version 1 format, and will be
     converted to version 2 format.
 
+    Case files are parsed only once: the case is saved with
+    L{save_case_cache} in the directory C{<file>.cache} next to the file
+    (e.g. C{case9.py.cache}) and later calls load it from there with
+    L{load_case_cache}, as long as the file has not changed, with the data
+    matrices memory-mapped copy-on-write. By default (C{cache=None}) this
+    is done for files of at least C{CACHE_MIN_SIZE} bytes (1 MB), if
+    C{cache} is C{True} for all files and if C{False} for none. Cases that
+    can not be cached, or caches that can not be written, are loaded from
+    the file as usual. A case saved in this format with L{savecase}
+    can be loaded directly, by giving the name of its directory, ending
+    with '.cache'.
+
     @author: Carlos E. Murillo-Sanchez (PSERC Cornell & Universidad
     Autonoma de Manizales)
     @author: Ray Zimmerman (PSERC Cornell)
@@ -58,11 +83,13 @@ def loadcase(casefile,
         expect_areas = False
 
     info = 0
+    cached = False
+    use_cache = False
 
     # read data into case object
     if isinstance(casefile, basestring):
         # check for explicit extension
-        if casefile.endswith(('.py', '.mat')):
+        if casefile.endswith(('.py', '.mat', '.m', '.raw', '.cache')):
             rootname, extension = splitext(casefile)
             fname = basename(rootname)
         else:
@@ -72,14 +99,33 @@ def loadcase(casefile,
                 extension = '.mat'
             elif exists(casefile + '.py'):
                 extension = '.py'
+            elif exists(casefile + '.m'):
+                extension = '.m'
             else:
                 info = 2
             fname = basename(rootname)
 
         lasterr = ''
 
+        ## binary case cache
+        if info == 0 and extension == '.cache':
+            ppc = load_case_cache(casefile)
+            cached = ppc is not None
+            if not cached:
+                info = 2
+        elif info == 0 and return_as_obj:
+            source = rootname + extension
+            if cache is None:
+                use_cache = exists(source) and \
+                    getsize(source) >= CACHE_MIN_SIZE
+            else:
+                use_cache = bool(cache)
+            if use_cache:
+                ppc = load_case_cache(source + '.cache', source)
+                cached = ppc is not None
+
         ## attempt to read file
-        if info == 0:
+        if info == 0 and not cached:
             if extension == '.mat':       ## from MAT file
                 try:
                     d = loadmat(rootname + extension, struct_as_record=True)
@@ -158,14 +204,28 @@ def loadcase(casefile,
                 if info == 4 and exists(rootname + '.py'):
                     info = 5
                     err5 = lasterr
+            elif extension in ('.m', '.raw'):   ## MATPOWER or PSS/E file
+                try:
+                    if extension == '.m':
+                        s = load_m_case(rootname + extension)
+                    else:
+                        s = psse2ppc(rootname + extension)
+                except IOError as e:
+                    info = 2
+                    lasterr = str(e)
+                except ValueError as e:
+                    info = 5
+                    lasterr = str(e)
 
     elif isinstance(casefile, dict):
         s = deepcopy(casefile)
+    elif isinstance(casefile, Case):
+        s = casefile.to_ppc()
     else:
         info = 1
 
     # check contents of dict
-    if info == 0:
+    if info == 0 and not cached:
         # check for required keys
         if (s['baseMVA'] is None or s['bus'] is None \
             or s['gen'] is None or s['branch'] is None) or \
@@ -179,7 +239,7 @@ def loadcase(casefile,
                 del s['areas']
 
             ## all fields present, copy to ppc
-            ppc = deepcopy(s)
+            ppc = s if isinstance(casefile, Case) else deepcopy(s)
             if not hasattr(ppc, 'version'):  ## hmm, struct with no 'version' field
                 if ppc['gen'].shape[1] < 21:    ## version 2 has 21 or 25 cols
                     ppc['version'] = '1'
@@ -191,6 +251,12 @@ def loadcase(casefile,
                 ppc['gen'], ppc['branch'] = ppc_1to2(ppc['gen'], ppc['branch']);
                 ppc['version'] = '2'
 
+            if use_cache:
+                try:
+                    save_case_cache(ppc, source + '.cache', source)
+                except (IOError, OSError, ValueError):
+                    pass    ## load from the file next time
+
     if info == 0:  # no errors
         if return_as_obj:
             return ppc
@@ -8,31 +8,43 @@
 import sys
 from sys import stderr
 
-from optparse import OptionParser, OptionGroup, OptionValueError
-
-from pypower.api import \
-    ppver, ppoption, runpf, runopf, runuopf, runopf_w_res
+from importlib import import_module
 
-from pypower.api import \
-    case4gs, case6ww, case9, case9Q, case14, case24_ieee_rts, case30, \
-    case30Q, case30pwl, case39, case57, case118, case300, t_case30_userfcns
+from optparse import OptionParser, OptionGroup, OptionValueError
 
-from pypower.ppoption import \
+from pypower.ppver import ppver
+from pypower.ppoption import ppoption, \
     PF_OPTIONS, OPF_OPTIONS, OUTPUT_OPTIONS, PDIPM_OPTIONS
 
-from pypower.t.test_pypower import test_pf, test_opf
-
 
 TYPE_MAP = {bool: 'choice', float: 'float', int: 'int'}
 
 AFFIRMATIVE = ('True', 'Yes', 'true', 'yes', '1', 'Y', 'y')
 NEGATIVE = ('False', 'No', 'false', 'no', '0', 'N', 'n')
 
-CASES = {'case4gs': case4gs, 'case6ww': case6ww, 'case9': case9,
-    'case9Q': case9Q, 'case14': case14, 'case24_ieee_rts': case24_ieee_rts,
-    'case30': case30, 'case30Q': case30Q, 'case30pwl': case30pwl,
-    'case39': case39, 'case57': case57, 'case118': case118, 'case300': case300,
-    'case30_userfcns': t_case30_userfcns}
+
+def lazy_case(module):
+    """Returns a function returning the case defined by the function of
+    the same name in C{module}, which is only imported when it is called.
+    """
+    def case():
+        m = import_module(module)
+        return getattr(m, module.rsplit('.', 1)[-1])()
+    case.__name__ = module.rsplit('.', 1)[-1]
+    return case
+
+
+## built-in cases, imported when used
+CASES = dict([(name, lazy_case(module)) for name, module in [
+    ('case4gs', 'pypower.case4gs'), ('case6ww', 'pypower.case6ww'),
+    ('case9', 'pypower.case9'), ('case9Q', 'pypower.case9Q'),
+    ('case14', 'pypower.case14'),
+    ('case24_ieee_rts', 'pypower.case24_ieee_rts'),
+    ('case30', 'pypower.case30'), ('case30Q', 'pypower.case30Q'),
+    ('case30pwl', 'pypower.case30pwl'), ('case39', 'pypower.case39'),
+    ('case57', 'pypower.case57'), ('case118', 'pypower.case118'),
+    ('case300', 'pypower.case300'),
+    ('case30_userfcns', 'pypower.t.t_case30_userfcns')]])
 
 
 def option_callback(option, opt, value, parser, *args, **kw_args):
@@ -170,7 +182,10 @@ def pf(args=sys.argv[1:]):
     options, casedata, ppopt, fname, solvedcase = \
             parse_options(args, usage)
     if options.test:
+        from pypower.t.test_pypower import test_pf
         sys.exit(test_pf())
+
+    from pypower.runpf import runpf
     _, success = runpf(casedata, ppopt, fname, solvedcase)
     exit(success)
 
@@ -181,15 +196,19 @@ def opf(args=sys.argv[1:]):
             parse_options(args, usage, True)
 
     if options.test:
+        from pypower.t.test_pypower import test_opf
         sys.exit(test_opf())
 
     if options.uopf:
         if options.w_res:
             stderr.write('uopf and opf_w_res are mutex\n')
+        from pypower.runuopf import runuopf
         r = runuopf(casedata, ppopt, fname, solvedcase)
     elif options.w_res:
+        from pypower.runopf_w_res import runopf_w_res
         r = runopf_w_res(casedata, ppopt, fname, solvedcase)
     else:
+        from pypower.runopf import runopf
         r = runopf(casedata, ppopt, fname, solvedcase)
     exit(r['success'])
 
@@ -8,23 +8,34 @@
 from numpy import ones, flatnonzero as find
 from scipy.sparse import csr_matrix as sparse
 
+from pypower.Case import Case
 from pypower.idx_bus import PD, QD
 from pypower.idx_gen import GEN_BUS, PG, QG, GEN_STATUS
 
 
-def makeSbus(baseMVA, bus, gen):
+def makeSbus(baseMVA, bus=None, gen=None):
     """Builds the vector of complex bus power injections.
 
     Returns the vector of complex bus power injections, that is, generation
     minus load. Power is expressed in per unit.
 
+    Given a L{Case} instead of C{baseMVA}, C{bus} and C{gen}, the vector is
+    built for all of its buses, in the order of its C{bus} table, using its
+    bus indices of the generators.
+
     @see: L{makeYbus}
 
     @author: Ray Zimmerman (PSERC Cornell)
     """
-    ## generator info
-    on = find(gen[:, GEN_STATUS] > 0)      ## which generators are on?
-    gbus = gen[on, GEN_BUS]                   ## what buses are they at?
+    if isinstance(baseMVA, Case):
+        case = baseMVA
+        baseMVA, bus, gen = case.baseMVA, case.bus, case.gen
+        on = find(gen[:, GEN_STATUS] > 0)  ## which generators are on?
+        gbus = case.gbus[on]                  ## what buses are they at?
+    else:
+        ## generator info
+        on = find(gen[:, GEN_STATUS] > 0)  ## which generators are on?
+        gbus = gen[on, GEN_BUS]               ## what buses are they at?
 
     ## form net complex bus power injection vector
     nb = bus.shape[0]
@@ -10,11 +10,12 @@ from sys import stderr
 from numpy import ones, conj, nonzero, any, exp, pi, r_
 from scipy.sparse import csr_matrix
 
+from pypower.Case import Case
 from pypower.idx_bus import BUS_I, GS, BS
 from pypower.idx_brch import F_BUS, T_BUS, BR_R, BR_X, BR_B, BR_STATUS, SHIFT, TAP
 
 
-def makeYbus(baseMVA, bus, branch):
+def makeYbus(baseMVA, bus=None, branch=None):
     """Builds the bus admittance matrix and branch admittance matrices.
 
     Returns the full bus admittance matrix (i.e. for all buses) and the
@@ -23,18 +24,30 @@ def makeYbus(baseMVA, bus, branch):
     "from" and "to" buses respectively of each line. Does appropriate
     conversions to p.u.
 
+    Given a L{Case} instead of C{baseMVA}, C{bus} and C{branch}, the
+    matrices are built for all of its buses, in the order of its C{bus}
+    table, using its bus indices of the branch ends.
+
     @see: L{makeSbus}
 
     @author: Ray Zimmerman (PSERC Cornell)
     """
+    if isinstance(baseMVA, Case):
+        case = baseMVA
+        baseMVA, bus, branch = case.baseMVA, case.bus, case.branch
+        f, t = case.f, case.t
+    else:
+        f = branch[:, F_BUS]                       ## list of "from" buses
+        t = branch[:, T_BUS]                       ## list of "to" buses
+
+        ## check that bus numbers are equal to indices to bus (one set of bus nums)
+        if any(bus[:, BUS_I] != list(range(bus.shape[0]))):
+            stderr.write('buses must appear in order by bus number\n')
+
     ## constants
     nb = bus.shape[0]          ## number of buses
     nl = branch.shape[0]       ## number of lines
 
-    ## check that bus numbers are equal to indices to bus (one set of bus nums)
-    if any(bus[:, BUS_I] != list(range(nb))):
-        stderr.write('buses must appear in order by bus number\n')
-
     ## for each branch, compute the elements of the branch admittance matrix where
     ##
     ##      | If |   | Yff  Yft |   | Vf |
@@ -63,8 +76,6 @@ def makeYbus(baseMVA, bus, branch):
     Ysh = (bus[:, GS] + 1j * bus[:, BS]) / baseMVA
 
     ## build connection matrices
-    f = branch[:, F_BUS]                           ## list of "from" buses
-    t = branch[:, T_BUS]                           ## list of "to" buses
     ## connection matrix for line & from buses
     Cf = csr_matrix((ones(nl), (range(nl), f)), (nl, nb))
     ## connection matrix for line & to buses
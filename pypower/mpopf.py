@@ -0,0 +1,317 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Solves a multi-period optimal power flow with ramp constraints.
+"""
+
+from time import time
+
+from numpy import ones, zeros, arange, asarray, outer, tile, dot, \
+    r_, c_, ix_, isnan, any, Inf
+from numpy import flatnonzero as find
+
+from scipy.sparse import block_diag, kron, vstack, csr_matrix as sparse
+
+from pypower.loadcase import loadcase
+from pypower.ppoption import ppoption
+from pypower.ext2int import ext2int
+from pypower.int2ext import int2ext
+from pypower.opf_setup import opf_setup
+from pypower.opf_execute import opf_package
+from pypower.opf_costfcn import opf_costfcn
+from pypower.opf_consfcn import opf_consfcn
+from pypower.opf_hessfcn import opf_hessfcn
+from pypower.dcopf_solver import dcopf_qp_cost, dcopf_qp_opt, dcopf_results
+from pypower.pipsopf_solver import pipsopf_opt, pipsopf_results, interior_x0
+from pypower.qps_pypower import qps_pypower
+from pypower.makeYbus import makeYbus
+from pypower.pips import pips
+
+from pypower.idx_bus import PD, QD, MU_VMIN
+from pypower.idx_gen import PG, QG, RAMP_30, MU_PMAX, MU_PMIN, MU_QMIN
+from pypower.idx_brch import RATE_A, PF, QF, PT, QT, MU_SF, MU_ST, \
+    MU_ANGMIN, MU_ANGMAX
+
+
+def mpopf(casedata, load, ppopt=None, ramp=None, dt=1.0):
+    """Solves a multi-period optimal power flow with ramp constraints.
+
+    Solves the AC or DC (if C{PF_DC} is set in C{ppopt}) optimal power flow
+    for C{nt} consecutive periods as a single optimization problem, in which
+    the real power output of each generator may not change by more than its
+    ramp limit from one period to the next.
+
+    The load in each period is given by C{load}, which is either a vector of
+    C{nt} scale factors applied to the real and reactive demand of every
+    bus, or an C{nt x nb} matrix of real power demand (in MW) for each bus
+    in the (external) order of the bus matrix. In the latter case the
+    reactive demand of each bus is scaled with its real demand, keeping the
+    power factor constant.
+
+    C{ramp} is an optional vector with the maximum change in real power
+    output (in MW) of each generator between consecutive periods, in
+    external generator order, with C{Inf} for unconstrained units. By
+    default it is taken from the C{RAMP_30} column of the gen matrix for
+    periods of C{dt} hours, with a C{RAMP_30} of zero meaning no limit.
+
+    An OPF model object is built by L{opf_setup} for each period and the
+    variable sets (C{Va}, C{Vm}, C{Pg}, C{Qg}, C{y}, ...) of all periods
+    are stacked. The constraint Jacobians and the cost and Lagrangian
+    Hessians of the individual periods are assembled as block diagonal
+    sparse matrices and the ramp constraints are added as a block sparse
+    difference of the C{Pg} variables of adjacent periods. The whole
+    problem is solved once, with L{qps_pypower} for the DC OPF and with
+    L{pips} for the AC OPF.
+
+    Returns a C{results} dict with the following keys:
+        - C{period}     list of C{nt} results dicts, one for each period,
+                        in the form returned by L{opf} (external indexing)
+        - C{f}          total objective function value of all periods
+        - C{success}    C{True} if the solver converged successfully
+        - C{et}         elapsed time in seconds
+        - C{ramp}
+            - C{lim}    ramp limits used, in MW per period
+            - C{mu}     shadow prices on ramp limits, in $/MW, as
+                        C{(nt-1) x ng} matrices
+                - C{l}  lower (ramp down) limits
+                - C{u}  upper (ramp up) limits
+        - C{raw}        raw solver output of the combined problem
+
+    @see: L{opf}, L{opf_setup}, L{opf_model}
+    """
+    ##----- initialization -----
+    t0 = time()         ## start timer
+
+    ppc = loadcase(casedata)
+    ppopt = ppoption(ppopt)
+    dc = ppopt['PF_DC']
+
+    ## add zero columns to bus, gen, branch for multipliers, etc if needed
+    nb = ppc['bus'].shape[0]
+    nl = ppc['branch'].shape[0]
+    ng = ppc['gen'].shape[0]
+    if ppc['bus'].shape[1] < MU_VMIN + 1:
+        ppc['bus'] = c_[ppc['bus'],
+                        zeros((nb, MU_VMIN + 1 - ppc['bus'].shape[1]))]
+
+    if ppc['gen'].shape[1] < MU_QMIN + 1:
+        ppc['gen'] = c_[ppc['gen'],
+                        zeros((ng, MU_QMIN + 1 - ppc['gen'].shape[1]))]
+
+    if ppc['branch'].shape[1] < MU_ANGMAX + 1:
+        ppc['branch'] = c_[ppc['branch'],
+                           zeros((nl, MU_ANGMAX + 1 - ppc['branch'].shape[1]))]
+
+    ## ramp limits in MW per period, external gen order
+    if ramp is None:
+        ramp = 2 * dt * ppc['gen'][:, RAMP_30]
+        ramp[ramp == 0] = Inf
+    ramp = asarray(ramp, float)
+
+    ##-----  convert to internal numbering, remove out-of-service stuff  -----
+    ppc = ext2int(ppc)
+    o = ppc['order']
+    baseMVA = ppc['baseMVA']
+    nb = ppc['bus'].shape[0]
+    ng = ppc['gen'].shape[0]
+
+    ## demand for each period, in internal bus order
+    load = asarray(load, float)
+    nt = load.shape[0]
+    Pd0 = ppc['bus'][:, PD]
+    Qd0 = ppc['bus'][:, QD]
+    if load.ndim == 1:              ## scale factors
+        Pd = outer(load, Pd0)
+        Qd = outer(load, Qd0)
+    else:                           ## bus demands, MW
+        Pd = load[:, o['bus']['status']['on']]
+        Qd = tile(Qd0, (nt, 1))
+        k = find(Pd0 != 0)
+        Qd[:, k] = Qd[:, k] * Pd[:, k] / Pd0[k]
+
+    ##-----  construct an OPF model object for each period  -----
+    oms = []
+    for t in range(nt):
+        ppc_t = ppc.copy()
+        for key in ['bus', 'gen', 'branch', 'gencost']:
+            ppc_t[key] = ppc[key].copy()
+        ppc_t['bus'][:, PD] = Pd[t, :]
+        ppc_t['bus'][:, QD] = Qd[t, :]
+
+        om = opf_setup(ppc_t, ppopt)
+        om.build_cost_params()
+        oms.append(om)
+
+    vv, _, _, _ = oms[0].get_idx()
+    nx = oms[0].getN('var')     ## number of variables per period
+    nlin = oms[0].getN('lin')   ## number of linear constraints per period
+
+    ## stacked variable bounds and linear constraints
+    x0 = zeros(nt * nx)
+    xmin = zeros(nt * nx)
+    xmax = zeros(nt * nx)
+    As, ls, us = [], [], []
+    for t, om in enumerate(oms):
+        x0[t * nx:(t + 1) * nx], xmin[t * nx:(t + 1) * nx], \
+            xmax[t * nx:(t + 1) * nx] = om.getv()
+        A, l, u = om.linear_constraints()
+        As.append(A if A is not None else sparse((0, nx)))
+        ls.append(l)
+        us.append(u)
+
+    ## inter-period ramp constraints,
+    ##  -ramp <= Pg(t) - Pg(t-1) <= ramp,  t = 2..nt
+    ramp_int = ramp[o['gen']['status']['on']][o['gen']['e2i']]
+    ir = find(ramp_int < Inf)   ## internal indices of ramp limited gens
+    nr = len(ir)
+    S = sparse((ones(nr), (arange(nr), vv['i1']['Pg'] + ir)), (nr, nx))
+    D = sparse((r_[-ones(nt - 1), ones(nt - 1)],
+                (r_[arange(nt - 1), arange(nt - 1)],
+                 r_[arange(nt - 1), arange(1, nt)])), (nt - 1, nt))
+    Ar = kron(D, S, 'csr')
+    ur = tile(ramp_int[ir] / baseMVA, nt - 1)
+
+    A = vstack([block_diag(As, 'csr'), Ar], 'csr')
+    l = r_[r_[tuple(ls)], -ur]
+    u = r_[r_[tuple(us)], ur]
+
+    ##-----  solve the combined problem  -----
+    if dc:
+        HHs, CC, C0 = [], [], []
+        for om in oms:
+            HH_t, CC_t, C0_t = dcopf_qp_cost(om)
+            HHs.append(HH_t)
+            CC.append(CC_t)
+            C0.append(C0_t)
+        HH = block_diag(HHs, 'csr')
+
+        opt = dcopf_qp_opt(ppopt, HH.count_nonzero() == 0)
+        alg = opt['alg']
+        if (alg == 200) or (alg == 250):
+            ## try to select an interior initial point
+            x0 = r_[tuple([interior_x0(om) for om in oms])]
+
+        x, f, info, output, lmbda = \
+            qps_pypower(HH, r_[tuple(CC)], A, l, u, xmin, xmax, x0, opt)
+        success = (info == 1)
+        if not any(isnan(x)):
+            f = f + sum(C0)
+    else:
+        ppc_t = oms[0].get_ppc()
+        Ybus, Yf, Yt = makeYbus(baseMVA, ppc_t['bus'], ppc_t['branch'])
+        il = find((ppc_t['branch'][:, RATE_A] != 0) &
+                  (ppc_t['branch'][:, RATE_A] < 1e10))
+        nl2 = len(il)
+        Yfl, Ytl = Yf[il, :], Yt[il, :]
+
+        def f_fcn(x, return_hessian=False):
+            f = 0
+            df = zeros(nt * nx)
+            for t, om in enumerate(oms):
+                f_t, df[t * nx:(t + 1) * nx] = \
+                    opf_costfcn(x[t * nx:(t + 1) * nx], om)
+                f = f + f_t
+            return f, df
+
+        def gh_fcn(x):
+            h, g, dh, dg = [], [], [], []
+            for t, om in enumerate(oms):
+                h_t, g_t, dh_t, dg_t = opf_consfcn(x[t * nx:(t + 1) * nx], om,
+                                                   Ybus, Yfl, Ytl, ppopt, il)
+                h.append(h_t.flatten())
+                g.append(g_t)
+                dh.append(dh_t)
+                dg.append(dg_t)
+            dh = block_diag(dh, 'csr') if nl2 > 0 else None
+            return r_[tuple(h)], r_[tuple(g)], dh, block_diag(dg, 'csr')
+
+        def hess_fcn(x, lmbda, cost_mult):
+            Lxx = []
+            for t, om in enumerate(oms):
+                lmbda_t = {
+                    'eqnonlin':
+                        lmbda['eqnonlin'][2 * nb * t:2 * nb * (t + 1)],
+                    'ineqnonlin':
+                        lmbda['ineqnonlin'][2 * nl2 * t:2 * nl2 * (t + 1)]
+                }
+                Lxx.append(opf_hessfcn(x[t * nx:(t + 1) * nx], lmbda_t, om,
+                                       Ybus, Yfl, Ytl, ppopt, il, cost_mult))
+            return block_diag(Lxx, 'csr')
+
+        x0 = r_[tuple([interior_x0(om) for om in oms])]
+        opt = pipsopf_opt(ppopt)
+        solution = pips(f_fcn, x0, A, l, u, xmin, xmax, gh_fcn, hess_fcn, opt)
+        x, f, info, lmbda, output = solution["x"], solution["f"], \
+                solution["eflag"], solution["lmbda"], solution["output"]
+        success = (info > 0)
+
+        alg = ppopt['OPF_ALG']
+        if alg == 0:
+            alg = 560
+
+    output['alg'] = alg
+
+    ##-----  package up results for each period  -----
+    period = []
+    for t, om in enumerate(oms):
+        ix = arange(t * nx, (t + 1) * nx)
+        il_t = arange(t * nlin, (t + 1) * nlin)
+        lmbda_t = {
+            'mu_l': lmbda['mu_l'][il_t],
+            'mu_u': lmbda['mu_u'][il_t],
+            'lower': lmbda['lower'][ix],
+            'upper': lmbda['upper'][ix]
+        }
+        x_t = x[ix]
+        if dc:
+            f_t = 0.5 * dot(x_t, HHs[t] * x_t) + dot(CC[t], x_t)
+            results, _, raw = dcopf_results(om, x_t, f_t, C0[t], info,
+                                            output, lmbda_t)
+        else:
+            if 'eqnonlin' in lmbda:
+                lmbda_t['eqnonlin'] = \
+                    lmbda['eqnonlin'][2 * nb * t:2 * nb * (t + 1)]
+            if 'ineqnonlin' in lmbda:
+                lmbda_t['ineqnonlin'] = \
+                    lmbda['ineqnonlin'][2 * nl2 * t:2 * nl2 * (t + 1)]
+            f_t, _ = opf_costfcn(x_t, om)
+            results, _, raw = pipsopf_results(om, x_t, f_t, info, output,
+                                              lmbda_t, Yf, Yt, il)
+        results, raw = opf_package(om, ppopt, results, success, raw, alg)
+
+        ##-----  revert to original ordering, incl. out-of-service stuff  -----
+        results = int2ext(results)
+
+        ## zero out result fields of out-of-service gens & branches
+        off = results['order']['gen']['status']['off']
+        if len(off) > 0:
+            results['gen'][ix_(off, [PG, QG, MU_PMAX, MU_PMIN])] = 0
+
+        off = results['order']['branch']['status']['off']
+        if len(off) > 0:
+            results['branch'][ix_(off, [PF, QF, PT, QT, MU_SF, MU_ST,
+                                        MU_ANGMIN, MU_ANGMAX])] = 0
+
+        results['success'] = success
+        results['raw'] = raw
+        period.append(results)
+
+    ## shadow prices on ramp limits, external gen order
+    nlr = nt * nlin
+    gon = o['gen']['status']['on'][o['gen']['e2i'][ir]]
+    mu_l = zeros((nt - 1, len(ramp)))
+    mu_u = zeros((nt - 1, len(ramp)))
+    mu_l[:, gon] = lmbda['mu_l'][nlr:].reshape((nt - 1, nr)) / baseMVA
+    mu_u[:, gon] = lmbda['mu_u'][nlr:].reshape((nt - 1, nr)) / baseMVA
+
+    et = time() - t0
+
+    return {
+        'period': period,
+        'f': f,
+        'success': success,
+        'et': et,
+        'ramp': {'lim': ramp, 'mu': {'l': mu_l, 'u': mu_u}},
+        'raw': {'xr': x, 'info': info, 'output': output}
+    }
@@ -11,6 +11,7 @@ from numpy import array
 from scipy.sparse import issparse
 
 from pypower._compat import PY2
+from pypower.Case import Case
 from pypower.ppoption import ppoption
 from pypower.loadcase import loadcase
 
@@ -51,7 +52,8 @@ def opf_args(*args):
       which defines the data matrices baseMVA, bus, gen, branch, and
       gencost (areas is not used at all, it is only included for
       backward compatibility of the API).
-      2. a dict (ppc) containing the data matrices as fields.
+      2. a dict (ppc) containing the data matrices as fields, or a
+      L{Case}.
       3. the individual data matrices themselves.
 
     The optional user parameters for user constraints (C{A, l, u}), user costs
@@ -88,8 +90,8 @@ def opf_args(*args):
     nargin = len(args)
 
     userfcn = array([])
-    ## passing filename or dict
-    if isinstance(args[0], basestring) or isinstance(args[0], dict):
+    ## passing filename, dict or Case
+    if isinstance(args[0], (basestring, dict, Case)):
         # ----opf( baseMVA,     bus,   gen, branch, areas, gencost,    Au, lbu,  ubu, ppopt,  N, fparm, H, Cw, z0, zl, zu)
         # 12  opf(casefile,      Au,   lbu,    ubu, ppopt,       N, fparm,    H,  Cw,    z0, zl,    zu)
         # 9   opf(casefile,      Au,   lbu,    ubu, ppopt,       N, fparm,    H,  Cw)
@@ -334,7 +336,12 @@ def opf_args2(*args):
     baseMVA, bus, gen, branch, gencost, Au, lbu, ubu, \
         ppopt, N, fparm, H, Cw, z0, zl, zu, userfcn, areas = opf_args(*args)
 
-    ppc = args[0] if isinstance(args[0], dict) else {}
+    if isinstance(args[0], dict):
+        ppc = args[0]
+    elif isinstance(args[0], Case):
+        ppc = args[0].to_ppc()
+    else:
+        ppc = {}
 
     ppc['baseMVA'] = baseMVA
     ppc['bus'] = bus
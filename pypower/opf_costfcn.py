@@ -5,13 +5,10 @@
 """Evaluates objective function, gradient and Hessian for OPF.
 """
 
-from numpy import array, ones, zeros, arange, r_, dot, flatnonzero as find
+from numpy import ones, zeros, arange, r_, dot, flatnonzero as find
 from scipy.sparse import issparse, csr_matrix as sparse
 
-from pypower.idx_cost import MODEL, POLYNOMIAL
-
-from pypower.totcost import totcost
-from pypower.polycost import polycost
+from pypower.GenCostModel import GenCostModel
 
 
 def opf_costfcn(x, om, return_hessian=False):
@@ -52,16 +49,19 @@ def opf_costfcn(x, om, return_hessian=False):
     Pg = x[vv["i1"]["Pg"]:vv["iN"]["Pg"]]  ## active generation in p.u.
     Qg = x[vv["i1"]["Qg"]:vv["iN"]["Qg"]]  ## reactive generation in p.u.
 
+    ## generator costs, compiled once per OPF model
+    gcm = om.userdata('gencost_model')
+    if not isinstance(gcm, GenCostModel):
+        gcm = GenCostModel(gencost)
+        om.userdata('gencost_model', gcm)
+    ngc = gcm.n                ## number of rows of gencost (ng or 2*ng)
+
     ##----- evaluate objective function -----
     ## polynomial cost of P and Q
-    # use totcost only on polynomial cost in the minimization problem
+    # use only polynomial cost in the minimization problem
     # formulation, pwl cost is the sum of the y variables.
-    ipol = find(gencost[:, MODEL] == POLYNOMIAL)   ## poly MW and MVAr costs
-    xx = r_[ Pg, Qg ] * baseMVA
-    if any(ipol):
-        f = sum( totcost(gencost[ipol, :], xx[ipol]) )  ## cost of poly P or Q
-    else:
-        f = 0
+    xx = r_[ Pg, Qg ][:ngc] * baseMVA
+    f = sum( gcm.polycost(xx) )         ## cost of poly P or Q
 
     ## piecewise linear cost of P and Q
     if ny > 0:
@@ -102,7 +102,7 @@ def opf_costfcn(x, om, return_hessian=False):
 
     ## polynomial cost of P and Q
     df_dPgQg = zeros(2 * ng)        ## w.r.t p.u. Pg and Qg
-    df_dPgQg[ipol] = baseMVA * polycost(gencost[ipol, :], xx[ipol], 1)
+    df_dPgQg[gcm.ipol] = baseMVA * gcm.grad(xx)[gcm.ipol]
     df = zeros(nxyz)
     df[iPg] = df_dPgQg[:ng]
     df[iQg] = df_dPgQg[ng:ng + ng]
@@ -140,24 +140,11 @@ def opf_costfcn(x, om, return_hessian=False):
         return f, df
 
     ## ---- evaluate cost Hessian -----
-    pcost = gencost[range(ng), :]
-    if gencost.shape[0] > ng:
-        qcost = gencost[ng + 1:2 * ng, :]
-    else:
-        qcost = array([])
-
-    ## polynomial generator costs
-    d2f_dPg2 = zeros(ng)               ## w.r.t. p.u. Pg
-    d2f_dQg2 = zeros(ng)               ## w.r.t. p.u. Qg
-    ipolp = find(pcost[:, MODEL] == POLYNOMIAL)
-    d2f_dPg2[ipolp] = \
-            baseMVA**2 * polycost(pcost[ipolp, :], Pg[ipolp]*baseMVA, 2)
-    if any(qcost):          ## Qg is not free
-        ipolq = find(qcost[:, MODEL] == POLYNOMIAL)
-        d2f_dQg2[ipolq] = \
-                baseMVA**2 * polycost(qcost[ipolq, :], Qg[ipolq] * baseMVA, 2)
+    ## polynomial generator costs, w.r.t. p.u. Pg and Qg
+    d2f_dPgQg2 = zeros(2 * ng)
+    d2f_dPgQg2[:ngc] = baseMVA**2 * gcm.hess(xx)
     i = r_[iPg, iQg].T
-    d2f = sparse((r_[d2f_dPg2, d2f_dQg2], (i, i)), (nxyz, nxyz))
+    d2f = sparse((d2f_dPgQg2, (i, i)), (nxyz, nxyz))
 
     ## generalized cost
     if N is not None and issparse(N):
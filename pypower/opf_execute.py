@@ -12,7 +12,6 @@ from numpy import array, arange, pi, zeros, r_
 from pypower.ppver import ppver
 from pypower.dcopf_solver import dcopf_solver
 from pypower.pipsopf_solver import pipsopf_solver
-from pypower.ipoptopf_solver import ipoptopf_solver
 from pypower.update_mupq import update_mupq
 from pypower.makeYbus import makeYbus
 from pypower.opf_consfcn import opf_consfcn
@@ -42,9 +41,6 @@ def opf_execute(om, ppopt):
     ## build user-defined costs
     om.build_cost_params()
 
-    ## get indexing
-    vv, ll, nn, _ = om.get_idx()
-
     if verbose > 0:
         v = ppver('all')
         stdout.write('PYPOWER Version %s, %s' % (v['Version'], v['Date']))
@@ -82,6 +78,7 @@ def opf_execute(om, ppopt):
         elif alg == 580:                              ## IPOPT
             try:
                 __import__('pyipopt')
+                from pypower.ipoptopf_solver import ipoptopf_solver
                 results, success, raw = ipoptopf_solver(om, ppopt)
             except ImportError:
                 raise ImportError('OPF_ALG %d requires IPOPT '
@@ -93,6 +90,29 @@ def opf_execute(om, ppopt):
     if ('output' not in raw) or ('alg' not in raw['output']):
         raw['output']['alg'] = alg
 
+    results, raw = opf_package(om, ppopt, results, success, raw, alg)
+
+    return results, success, raw
+
+
+def opf_package(om, ppopt, results, success, raw, alg=0):
+    """Completes the C{results} of an OPF solver for an OPF model object.
+
+    Takes the C{results}, C{success} and C{raw} outputs of an OPF solver
+    such as L{dcopf_solver} or L{pipsopf_solver} and adds the generator
+    voltage set points, PQ capability curve and angle limit multipliers,
+    any requested derivatives and the named variable, constraint and cost
+    blocks of C{om}. C{alg} is the OPF algorithm code used to solve the
+    problem. Returns the updated C{results} and C{raw} dicts, which
+    are still in internal indexing.
+
+    @see: L{opf_execute}
+    """
+    dc = ppopt['PF_DC']        ## 1 = DC OPF, 0 = AC OPF
+
+    ## get indexing
+    vv, ll, nn, _ = om.get_idx()
+
     if success:
         if not dc:
             ## copy bus voltages back to gen matrix
@@ -196,4 +216,4 @@ def opf_execute(om, ppopt):
         raw['xr'] = r_[raw['xr'][:nx], y, raw['xr'][nx:]]
         results['x'] = r_[results['x'][:nx], y, results['x'][nx:]]
 
-    return results, success, raw
+    return results, raw
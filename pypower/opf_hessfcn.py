@@ -5,14 +5,13 @@
 """Evaluates Hessian of Lagrangian for AC OPF.
 """
 
-from numpy import array, zeros, ones, exp, arange, r_, flatnonzero as find
+from numpy import zeros, ones, exp, arange, r_, flatnonzero as find
 from scipy.sparse import vstack, hstack, issparse, csr_matrix as sparse
 
 from pypower.idx_gen import PG, QG
 from pypower.idx_brch import F_BUS, T_BUS
-from pypower.idx_cost import MODEL, POLYNOMIAL
 
-from pypower.polycost import polycost
+from pypower.GenCostModel import GenCostModel
 from pypower.d2Sbus_dV2 import d2Sbus_dV2
 from pypower.dSbr_dV import dSbr_dV
 from pypower.dIbr_dV import dIbr_dV
@@ -91,27 +90,20 @@ def opf_hessfcn(x, lmbda, om, Ybus, Yf, Yt, ppopt, il=None, cost_mult=1.0):
     Vm = x[vv["i1"]["Vm"]:vv["iN"]["Vm"]]
     V = Vm * exp(1j * Va)
     nxtra = nxyz - 2 * nb
-    pcost = gencost[arange(ng), :]
-    if gencost.shape[0] > ng:
-        qcost = gencost[arange(ng, 2 * ng), :]
-    else:
-        qcost = array([])
+
+    ## generator costs, compiled once per OPF model
+    gcm = om.userdata('gencost_model')
+    if not isinstance(gcm, GenCostModel):
+        gcm = GenCostModel(gencost)
+        om.userdata('gencost_model', gcm)
 
     ## ----- evaluate d2f -----
-    d2f_dPg2 = zeros(ng)#sparse((ng, 1))               ## w.r.t. p.u. Pg
-    d2f_dQg2 = zeros(ng)#sparse((ng, 1))               ## w.r.t. p.u. Qg
-    ipolp = find(pcost[:, MODEL] == POLYNOMIAL)
-    d2f_dPg2[ipolp] = \
-            baseMVA**2 * polycost(pcost[ipolp, :], Pg[ipolp] * baseMVA, 2)
-    if any(qcost):          ## Qg is not free
-        ipolq = find(qcost[:, MODEL] == POLYNOMIAL)
-        d2f_dQg2[ipolq] = \
-                baseMVA**2 * polycost(qcost[ipolq, :], Qg[ipolq] * baseMVA, 2)
+    d2f_dPgQg2 = zeros(2 * ng)          ## w.r.t. p.u. Pg and Qg
+    d2f_dPgQg2[:gcm.n] = \
+            baseMVA**2 * gcm.hess(r_[Pg, Qg][:gcm.n] * baseMVA)
     i = r_[arange(vv["i1"]["Pg"], vv["iN"]["Pg"]),
            arange(vv["i1"]["Qg"], vv["iN"]["Qg"])]
-#    d2f = sparse((vstack([d2f_dPg2, d2f_dQg2]).toarray().flatten(),
-#                  (i, i)), shape=(nxyz, nxyz))
-    d2f = sparse((r_[d2f_dPg2, d2f_dQg2], (i, i)), (nxyz, nxyz))
+    d2f = sparse((d2f_dPgQg2, (i, i)), (nxyz, nxyz))
 
     ## generalized cost
     if issparse(N) and N.nnz > 0:
@@ -164,43 +156,46 @@ def opf_hessfcn(x, lmbda, om, Ybus, Yf, Yt, ppopt, il=None, cost_mult=1.0):
     nmu = int(len(lmbda["ineqnonlin"]) / 2)
     muF = lmbda["ineqnonlin"][:nmu]
     muT = lmbda["ineqnonlin"][nmu:nmu + nmu]
-    if ppopt['OPF_FLOW_LIM'] == 2:       ## current
-        dIf_dVa, dIf_dVm, dIt_dVa, dIt_dVm, If, It = dIbr_dV(branch, Yf, Yt, V)
-        Hfaa, Hfav, Hfva, Hfvv = d2AIbr_dV2(dIf_dVa, dIf_dVm, If, Yf, V, muF)
-        Htaa, Htav, Htva, Htvv = d2AIbr_dV2(dIt_dVa, dIt_dVm, It, Yt, V, muT)
+    if nl2 == 0:                         ## no flow limits monitored
+        d2H = sparse((nxyz, nxyz))
     else:
-        f = branch[il, F_BUS].astype(int)    ## list of "from" buses
-        t = branch[il, T_BUS].astype(int)    ## list of "to" buses
-        ## connection matrix for line & from buses
-        Cf = sparse((ones(nl2), (arange(nl2), f)), (nl2, nb))
-        ## connection matrix for line & to buses
-        Ct = sparse((ones(nl2), (arange(nl2), t)), (nl2, nb))
-        dSf_dVa, dSf_dVm, dSt_dVa, dSt_dVm, Sf, St = \
-                dSbr_dV(branch[il,:], Yf, Yt, V)
-        if ppopt['OPF_FLOW_LIM'] == 1:     ## real power
-            Hfaa, Hfav, Hfva, Hfvv = d2ASbr_dV2(dSf_dVa.real, dSf_dVm.real,
-                                                Sf.real, Cf, Yf, V, muF)
-            Htaa, Htav, Htva, Htvv = d2ASbr_dV2(dSt_dVa.real, dSt_dVm.real,
-                                                St.real, Ct, Yt, V, muT)
-        else:                  ## apparent power
-            Hfaa, Hfav, Hfva, Hfvv = \
-                    d2ASbr_dV2(dSf_dVa, dSf_dVm, Sf, Cf, Yf, V, muF)
-            Htaa, Htav, Htva, Htvv = \
-                    d2ASbr_dV2(dSt_dVa, dSt_dVm, St, Ct, Yt, V, muT)
-
-    d2H = vstack([
-            hstack([
-                vstack([hstack([Hfaa, Hfav]),
-                        hstack([Hfva, Hfvv])]) +
-                vstack([hstack([Htaa, Htav]),
-                        hstack([Htva, Htvv])]),
-                sparse((2 * nb, nxtra))
-            ]),
-            hstack([
-                sparse((nxtra, 2 * nb)),
-                sparse((nxtra, nxtra))
-            ])
-        ], "csr")
+        if ppopt['OPF_FLOW_LIM'] == 2:       ## current
+            dIf_dVa, dIf_dVm, dIt_dVa, dIt_dVm, If, It = dIbr_dV(branch, Yf, Yt, V)
+            Hfaa, Hfav, Hfva, Hfvv = d2AIbr_dV2(dIf_dVa, dIf_dVm, If, Yf, V, muF)
+            Htaa, Htav, Htva, Htvv = d2AIbr_dV2(dIt_dVa, dIt_dVm, It, Yt, V, muT)
+        else:
+            f = branch[il, F_BUS].astype(int)    ## list of "from" buses
+            t = branch[il, T_BUS].astype(int)    ## list of "to" buses
+            ## connection matrix for line & from buses
+            Cf = sparse((ones(nl2), (arange(nl2), f)), (nl2, nb))
+            ## connection matrix for line & to buses
+            Ct = sparse((ones(nl2), (arange(nl2), t)), (nl2, nb))
+            dSf_dVa, dSf_dVm, dSt_dVa, dSt_dVm, Sf, St = \
+                    dSbr_dV(branch[il,:], Yf, Yt, V)
+            if ppopt['OPF_FLOW_LIM'] == 1:     ## real power
+                Hfaa, Hfav, Hfva, Hfvv = d2ASbr_dV2(dSf_dVa.real, dSf_dVm.real,
+                                                    Sf.real, Cf, Yf, V, muF)
+                Htaa, Htav, Htva, Htvv = d2ASbr_dV2(dSt_dVa.real, dSt_dVm.real,
+                                                    St.real, Ct, Yt, V, muT)
+            else:                  ## apparent power
+                Hfaa, Hfav, Hfva, Hfvv = \
+                        d2ASbr_dV2(dSf_dVa, dSf_dVm, Sf, Cf, Yf, V, muF)
+                Htaa, Htav, Htva, Htvv = \
+                        d2ASbr_dV2(dSt_dVa, dSt_dVm, St, Ct, Yt, V, muT)
+
+        d2H = vstack([
+                hstack([
+                    vstack([hstack([Hfaa, Hfav]),
+                            hstack([Hfva, Hfvv])]) +
+                    vstack([hstack([Htaa, Htav]),
+                            hstack([Htva, Htvv])]),
+                    sparse((2 * nb, nxtra))
+                ]),
+                hstack([
+                    sparse((nxtra, 2 * nb)),
+                    sparse((nxtra, nxtra))
+                ])
+            ], "csr")
 
     ##-----  do numerical check using (central) finite differences  -----
     if 0:
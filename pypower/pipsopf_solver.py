@@ -5,9 +5,12 @@
 """Solves AC optimal power flow using PIPS.
 """
 
-from numpy import ones, zeros, Inf, pi, exp, conj, r_
+from numpy import ones, zeros, Inf, pi, exp, conj, r_, maximum, \
+    union1d, setdiff1d
 from numpy import flatnonzero as find
 
+from scipy.sparse import issparse
+
 from pypower.idx_bus import BUS_TYPE, REF, VM, VA, MU_VMAX, MU_VMIN, LAM_P, LAM_Q
 from pypower.idx_brch import F_BUS, T_BUS, RATE_A, PF, QF, PT, QT, MU_SF, MU_ST
 from pypower.idx_gen import GEN_BUS, PG, QG, VG, MU_PMAX, MU_PMIN, MU_QMAX, MU_QMIN
@@ -54,6 +57,16 @@ def pipsopf_solver(om, ppopt, out_opt=None):
         - info   solver specific termination code
         - output solver specific output information
 
+    If the C{OPF_FLOW_SCREEN} option is non-zero, the flow limits of only
+    those branches loaded above that fraction of C{RATE_A} at the initial
+    bus voltages are included in the first solve. The flows of all limited
+    branches are then checked at the solution, the limits of any violated
+    branches are added, and the OPF is re-solved starting from the previous
+    solution, until no limit is violated by more than C{OPF_VIOLATION} or
+    C{OPF_FLOW_SCREEN_MAX_IT} re-solves have been done. The number of
+    monitored branches in each solve is returned in C{raw['output']['screen']}.
+    Unmonitored branches have zero flow limit multipliers.
+
     @see: L{opf}, L{pips}
 
     @author: Ray Zimmerman (PSERC Cornell)
@@ -66,6 +79,113 @@ def pipsopf_solver(om, ppopt, out_opt=None):
         out_opt = {}
 
     ## options
+    opt = pipsopf_opt(ppopt)
+
+    ## unpack data
+    ppc = om.get_ppc()
+    baseMVA, bus, branch = ppc["baseMVA"], ppc["bus"], ppc["branch"]
+
+    ## linear constraints
+    A, l, u = om.linear_constraints()
+
+    ## bounds on optimization vars
+    x0, xmin, xmax = om.getv()
+    vv, _, _, _ = om.get_idx()
+
+    ## build admittance matrices, unless stored in the OPF model
+    Ybus = om.userdata('Ybus')
+    if issparse(Ybus):
+        Yf, Yt = om.userdata('Yf'), om.userdata('Yt')
+    else:
+        Ybus, Yf, Yt = makeYbus(baseMVA, bus, branch)
+
+    ## try to select an interior initial point, unless warm starting
+    ## from the initial values stored in the OPF model
+    if not ppopt['OPF_WARM_START']:
+        x0 = interior_x0(om)
+
+    ## find branches with flow limits
+    il = find((branch[:, RATE_A] != 0) & (branch[:, RATE_A] < 1e10))
+
+    ## flow screening, monitor only the heavily loaded branches at first
+    screen = ppopt['OPF_FLOW_SCREEN']
+    ilim = il
+    if screen > 0:
+        V0 = bus[:, VM] * exp(1j * pi / 180 * bus[:, VA])
+        il = ilim[branch_loading(baseMVA, branch[ilim, :], Yf[ilim, :],
+                                 Yt[ilim, :], V0, ppopt) > screen]
+
+    ##-----  run opf  -----
+    f_fcn = lambda x, return_hessian=False: opf_costfcn(x, om, return_hessian)
+    nmon = []
+    while True:
+        gh_fcn = lambda x: opf_consfcn(x, om, Ybus, Yf[il, :], Yt[il,:], ppopt, il)
+        hess_fcn = lambda x, lmbda, cost_mult: opf_hessfcn(x, lmbda, om, Ybus, Yf[il, :], Yt[il, :], ppopt, il, cost_mult)
+
+        solution = pips(f_fcn, x0, A, l, u, xmin, xmax, gh_fcn, hess_fcn, opt)
+        x, f, info, lmbda, output = solution["x"], solution["f"], \
+                solution["eflag"], solution["lmbda"], solution["output"]
+        nmon.append(len(il))
+
+        if screen <= 0 or info <= 0:
+            break
+
+        ## check the flows of all limited branches in one pass
+        V = x[vv["i1"]["Vm"]:vv["iN"]["Vm"]] * \
+            exp(1j * x[vv["i1"]["Va"]:vv["iN"]["Va"]])
+        loading = branch_loading(baseMVA, branch[ilim, :], Yf[ilim, :],
+                                 Yt[ilim, :], V, ppopt)
+        iviol = setdiff1d(ilim[loading > 1 + ppopt['OPF_VIOLATION']], il)
+        if len(iviol) == 0:
+            break
+        if len(nmon) > ppopt['OPF_FLOW_SCREEN_MAX_IT']:
+            info = 0        ## limits still violated, not a valid solution
+            break
+
+        ## add violated limits and re-solve from the previous solution
+        il = union1d(il, iviol)
+        x0 = x
+
+    if screen > 0:
+        output['screen'] = nmon
+
+    return pipsopf_results(om, x, f, info, output, lmbda, Yf, Yt, il)
+
+
+def branch_loading(baseMVA, branch, Yf, Yt, V, ppopt):
+    """Returns the loading of branches as a fraction of C{RATE_A}.
+
+    Computes the flows at both ends of each row of C{branch} for bus
+    voltages C{V}, using the rows C{Yf} and C{Yt} of the branch admittance
+    matrices, and returns the larger of the two relative to C{RATE_A}, as
+    apparent power, active power or current depending on C{OPF_FLOW_LIM}.
+
+    @see: L{pipsopf_solver}
+    """
+    flow_max = branch[:, RATE_A] / baseMVA
+    If = Yf * V
+    It = Yt * V
+    if ppopt['OPF_FLOW_LIM'] == 2:       ## current magnitude
+        Ff = abs(If)
+        Ft = abs(It)
+    else:
+        Sf = V[branch[:, F_BUS].astype(int)] * conj(If)
+        St = V[branch[:, T_BUS].astype(int)] * conj(It)
+        if ppopt['OPF_FLOW_LIM'] == 1:   ## active power
+            Ff = abs(Sf.real)
+            Ft = abs(St.real)
+        else:                            ## apparent power
+            Ff = abs(Sf)
+            Ft = abs(St)
+
+    return maximum(Ff, Ft) / flow_max
+
+
+def pipsopf_opt(ppopt):
+    """Returns the L{pips} options dict used to solve an AC OPF.
+
+    @see: L{pipsopf_solver}
+    """
     verbose = ppopt['VERBOSE']
     feastol = ppopt['PDIPM_FEASTOL']
     gradtol = ppopt['PDIPM_GRADTOL']
@@ -86,34 +206,33 @@ def pipsopf_solver(om, ppopt, out_opt=None):
              'cost_mult': 1e-4,
              'verbose': verbose  }
 
-    ## unpack data
-    ppc = om.get_ppc()
-    baseMVA, bus, gen, branch, gencost = \
-        ppc["baseMVA"], ppc["bus"], ppc["gen"], ppc["branch"], ppc["gencost"]
-    vv, _, nn, _ = om.get_idx()
+    return opt
 
-    ## problem dimensions
-    nb = bus.shape[0]          ## number of buses
-    nl = branch.shape[0]       ## number of branches
-    ny = om.getN('var', 'y')   ## number of piece-wise linear costs
 
-    ## linear constraints
-    A, l, u = om.linear_constraints()
+def interior_x0(om):
+    """Selects an interior initial point for an interior point OPF solver.
 
-    ## bounds on optimization vars
-    _, xmin, xmax = om.getv()
+    Returns a starting value of the optimization vector for the OPF model
+    object C{om} at the midpoint of the variable bounds (using numerical
+    proxies for infinite bounds), with all voltage angles set to the angle
+    of the first reference bus and any piece-wise linear cost variables
+    set above the largest cost in the CCV data.
 
-    ## build admittance matrices
-    Ybus, Yf, Yt = makeYbus(baseMVA, bus, branch)
+    @see: L{pipsopf_solver}, L{dcopf_solver}
+    """
+    ppc = om.get_ppc()
+    bus, gencost = ppc["bus"], ppc["gencost"]
+    vv, _, _, _ = om.get_idx()
+    ny = om.getN('var', 'y')   ## number of piece-wise linear costs
+    _, xmin, xmax = om.getv()
 
-    ## try to select an interior initial point
     ll, uu = xmin.copy(), xmax.copy()
     ll[xmin == -Inf] = -1e10   ## replace Inf with numerical proxies
     uu[xmax ==  Inf] =  1e10
     x0 = (ll + uu) / 2
     Varefs = bus[bus[:, BUS_TYPE] == REF, VA] * (pi / 180)
-    ## angles set to first reference angle
-    x0[vv["i1"]["Va"]:vv["iN"]["Va"]] = Varefs[0]
+    ## angles set to first reference angle, if any
+    x0[vv["i1"]["Va"]:vv["iN"]["Va"]] = Varefs[0] if len(Varefs) else 0
     if ny > 0:
         ipwl = find(gencost[:, MODEL] == PW_LINEAR)
 #         PQ = r_[gen[:, PMAX], gen[:, QMAX]]
@@ -122,18 +241,31 @@ def pipsopf_solver(om, ppopt, out_opt=None):
         x0[vv["i1"]["y"]:vv["iN"]["y"]] = max(c) + 0.1 * abs(max(c))
 #        x0[vv["i1"]["y"]:vv["iN"]["y"]] = c + 0.1 * abs(c)
 
-    ## find branches with flow limits
-    il = find((branch[:, RATE_A] != 0) & (branch[:, RATE_A] < 1e10))
-    nl2 = len(il)           ## number of constrained lines
+    return x0
 
-    ##-----  run opf  -----
-    f_fcn = lambda x, return_hessian=False: opf_costfcn(x, om, return_hessian)
-    gh_fcn = lambda x: opf_consfcn(x, om, Ybus, Yf[il, :], Yt[il,:], ppopt, il)
-    hess_fcn = lambda x, lmbda, cost_mult: opf_hessfcn(x, lmbda, om, Ybus, Yf[il, :], Yt[il, :], ppopt, il, cost_mult)
 
-    solution = pips(f_fcn, x0, A, l, u, xmin, xmax, gh_fcn, hess_fcn, opt)
-    x, f, info, lmbda, output = solution["x"], solution["f"], \
-            solution["eflag"], solution["lmbda"], solution["output"]
+def pipsopf_results(om, x, f, info, output, lmbda, Yf, Yt, il):
+    """Packages the solution of an AC OPF into a C{results} dict.
+
+    Takes the solution C{x}, objective value C{f}, exit flag C{info},
+    solver C{output} and multipliers C{lmbda} in the form returned by
+    L{pips}, the full branch admittance matrices C{Yf} and C{Yt} and the
+    indices C{il} of the branches with flow limits, and returns the
+    C{results}, C{success} and C{raw} outputs of L{pipsopf_solver}.
+
+    @see: L{pipsopf_solver}
+    """
+    ## unpack data
+    ppc = om.get_ppc()
+    baseMVA, bus, gen, branch = \
+        ppc["baseMVA"], ppc["bus"], ppc["gen"], ppc["branch"]
+    vv, _, nn, _ = om.get_idx()
+
+    ## problem dimensions
+    nb = bus.shape[0]          ## number of buses
+    nl = branch.shape[0]       ## number of branches
+    ny = om.getN('var', 'y')   ## number of piece-wise linear costs
+    nl2 = len(il)              ## number of constrained lines
 
     success = (info > 0)
 
@@ -5,7 +5,8 @@
 """Used to set and retrieve a PYPOWER options vector.
 """
 
-from numpy import Inf
+## numpy.Inf, without importing NumPy for the command line interface
+Inf = float('inf')
 
 
 PF_OPTIONS = [
@@ -67,7 +68,28 @@ True - adaptive step size enabled'''),
     ('cpf_user_callback', '', """string or cell array of strings
 with names of user callback functions see 'help cpf_default_callback'"""),
 
-    ('cpf_user_callback_args', '', 'struct passed to user-defined callback functions')
+    ('cpf_user_callback_args', '', 'struct passed to user-defined callback functions'),
+
+    ('cpf_enforce_q_lims', False, '''enforce generator reactive power limits,
+switching PV buses to PQ when a limit is reached'''),
+
+    ('cpf_enforce_v_lims', False, '''stop when the voltage of a PQ bus reaches
+its VMIN or VMAX limit'''),
+
+    ('cpf_enforce_flow_lims', False, '''stop when a branch flow reaches its
+RATE_A limit'''),
+
+    ('cpf_event_tol', 1e-4, '''tolerance (p.u.) for locating the point where a
+limit is reached'''),
+
+    ('cpf_trace_buses', '', '''bus numbers of the buses whose voltages are
+recorded in the CPF results, '' = all buses'''),
+
+    ('cpf_trace_every', 1, '''record only every n-th continuation step
+(and the last one) in the CPF results'''),
+
+    ('cpf_trace_mmap', '', '''if not empty, record the CPF voltages in
+memory-mapped files <cpf_trace_mmap>_V_p.npy and <cpf_trace_mmap>_V_c.npy''')
 ]
 
 OPF_OPTIONS = [
@@ -98,7 +120,7 @@ step-controlled primal/dual interior point method'''),
 
     ('opf_alg_dc', 0, '''solver to use for DC OPF:
 0 - choose default solver based on availability in the
-following order, 600, 500, 200.
+following order, 500, 600, 700, 800 (LP only), 200.
 200 - PIPS, Python Interior Point Solver
 primal/dual interior point method,
 250 - PIPS-sc, step-controlled variant of PIPS
@@ -108,7 +130,36 @@ available from: https://projects.coin-or.org/Ipopt/
 600 - MOSEK, requires Python interface to MOSEK solver
 available from: http://www.mosek.com/
 700 - GUROBI, requires Python interface to Gurobi optimizer
-available from: http://www.gurobi.com/''')
+available from: http://www.gurobi.com/
+800 - HiGHS, via SciPy (1.9 or later), LP costs only'''),
+
+    ('opf_warm_start', False, 'start the OPF solver from the initial '
+     'values of the variables in the OPF model instead of an interior '
+     'point (PIPS)'),
+
+    ('opf_scopf', False, 'solve the N-1 security-constrained DC OPF by '
+     'adding violated post-contingency flow limits iteratively '
+     '(DC OPF only)'),
+
+    ('opf_scopf_max_it', 10, 'maximum number of SCOPF constraint '
+     'generation rounds'),
+
+    ('opf_flow_screen', 0, 'AC OPF (PIPS) branch flow screening, 0 = off, '
+     'otherwise start with only the flow limits of branches loaded above '
+     'this fraction of RATE_A at the initial voltages, adding violated '
+     'limits and re-solving from the previous solution'),
+
+    ('opf_flow_screen_max_it', 10, 'maximum number of flow screening '
+     're-solves'),
+
+    ('uopf_workers', 1, 'number of processes used by uopf to evaluate '
+     'decommitment candidates concurrently, 0 = one per CPU'),
+
+    ('uopf_early_term', False, 'end each uopf stage with the first batch '
+     'of candidates (by MU_PMIN) that lowers the cost'),
+
+    ('uopf_milp', False, 'in uopf, choose the committed units with the DC '
+     'unit commitment MILP of ucopf instead of the decommitment heuristic')
 ]
 
 OUTPUT_OPTIONS = [
@@ -154,6 +205,11 @@ OUTPUT_OPTIONS = [
 
     ('out_qg_lim', 1, 'control output of gen Q limit info'),
 
+    ('out_format', 'text', '''format of the results output by runpf and runopf:
+'text' - printed report (see printpf),
+'csv', 'npz', 'jsonl' - tables exported to the file given by
+    fname instead (see results_export)'''),
+
 #    ('out_raw', False, 'print raw data'),
 
     ('return_raw_der', 0, '''return constraint and derivative info
@@ -9,10 +9,12 @@ from sys import stdout
 
 from numpy import \
     ones, zeros, r_, sort, exp, pi, diff, arange, min, \
-    argmin, argmax, logical_or, real, imag, any
+    argmin, argmax, logical_or, real, imag, any, asarray
 
 from numpy import flatnonzero as find
 
+from scipy.sparse import csr_matrix as sparse
+
 from pypower.idx_bus import BUS_I, BUS_TYPE, PD, QD, GS, BS, BUS_AREA, \
     VM, VA, VMAX, VMIN, LAM_P, LAM_Q, MU_VMAX, MU_VMIN, REF
 from pypower.idx_gen import GEN_BUS, PG, QG, QMAX, QMIN, GEN_STATUS, \
@@ -141,9 +143,14 @@ def printpf(baseMVA, bus=None, gen=None, branch=None, f=None, success=None,
         branch[:, r_[BR_R, BR_B]]   = zeros((nl, 2))
 
     ## parameters
-    ties = find(bus[e2i[branch[:, F_BUS].astype(int)], BUS_AREA] !=
-                   bus[e2i[branch[:, T_BUS].astype(int)], BUS_AREA])
-                            ## area inter-ties
+    isld = isload(gen)
+    gbus = e2i[gen[:, GEN_BUS].astype(int)]       ## gen bus indices
+    fbus = e2i[branch[:, F_BUS].astype(int)]      ## "from" bus indices
+    tbus = e2i[branch[:, T_BUS].astype(int)]      ## "to" bus indices
+    garea = bus[gbus, BUS_AREA]
+    farea = bus[fbus, BUS_AREA]
+    tarea = bus[tbus, BUS_AREA]
+    ties = find(farea != tarea)             ## area inter-ties
     tap = ones(nl)                           ## default tap ratio = 1 for lines
     xfmr = find(branch[:, TAP])           ## indices of transformers
     tap[xfmr] = branch[xfmr, TAP]            ## include transformer tap ratios
@@ -153,21 +160,20 @@ def printpf(baseMVA, bus=None, gen=None, branch=None, f=None, success=None,
     ## area numbers
     s_areas = sorted_areas[r_[1, find(diff(sorted_areas)) + 1]]
     nzsh = find((bus[:, GS] != 0.0) | (bus[:, BS] != 0.0))
-    allg = find( ~isload(gen) )
-    ong  = find( (gen[:, GEN_STATUS] > 0) & ~isload(gen) )
-    onld = find( (gen[:, GEN_STATUS] > 0) &  isload(gen) )
+    allg = find( ~isld )
+    ong  = find( (gen[:, GEN_STATUS] > 0) & ~isld )
+    onld = find( (gen[:, GEN_STATUS] > 0) &  isld )
     V = bus[:, VM] * exp(-1j * pi / 180 * bus[:, VA])
     out = find(branch[:, BR_STATUS] == 0)        ## out-of-service branches
     nout = len(out)
     if isDC:
         loss = zeros(nl)
     else:
-        loss = baseMVA * abs(V[e2i[ branch[:, F_BUS].astype(int) ]] / tap -
-                             V[e2i[ branch[:, T_BUS].astype(int) ]])**2 / \
+        loss = baseMVA * abs(V[fbus] / tap - V[tbus])**2 / \
                     (branch[:, BR_R] - 1j * branch[:, BR_X])
 
-    fchg = abs(V[e2i[ branch[:, F_BUS].astype(int) ]] / tap)**2 * branch[:, BR_B] * baseMVA / 2
-    tchg = abs(V[e2i[ branch[:, T_BUS].astype(int) ]]      )**2 * branch[:, BR_B] * baseMVA / 2
+    fchg = abs(V[fbus] / tap)**2 * branch[:, BR_B] * baseMVA / 2
+    tchg = abs(V[tbus]      )**2 * branch[:, BR_B] * baseMVA / 2
     loss[out] = zeros(nout)
     fchg[out] = zeros(nout)
     tchg[out] = zeros(nout)
@@ -242,25 +248,26 @@ def printpf(baseMVA, bus=None, gen=None, branch=None, f=None, success=None,
         fd.write('\nArea  # of      # of Gens        # of Loads         # of    # of   # of   # of')
         fd.write('\n Num  Buses   Total  Online   Total  Fixed  Disp    Shunt   Brchs  Xfmrs   Ties')
         fd.write('\n----  -----   -----  ------   -----  -----  -----   -----   -----  -----  -----')
-        for i in range(len(s_areas)):
-            a = s_areas[i]
+        rows = []
+        for a in s_areas:
             ib = find(bus[:, BUS_AREA] == a)
-            ig = find((bus[e2i[gen[:, GEN_BUS].astype(int)], BUS_AREA] == a) & ~isload(gen))
-            igon = find((bus[e2i[gen[:, GEN_BUS].astype(int)], BUS_AREA] == a) & (gen[:, GEN_STATUS] > 0) & ~isload(gen))
-            ildon = find((bus[e2i[gen[:, GEN_BUS].astype(int)], BUS_AREA] == a) & (gen[:, GEN_STATUS] > 0) & isload(gen))
+            ig = find((garea == a) & ~isld)
+            igon = find((garea == a) & (gen[:, GEN_STATUS] > 0) & ~isld)
+            ildon = find((garea == a) & (gen[:, GEN_STATUS] > 0) & isld)
             inzld = find((bus[:, BUS_AREA] == a) & logical_or(bus[:, PD], bus[:, QD]))
             inzsh = find((bus[:, BUS_AREA] == a) & logical_or(bus[:, GS], bus[:, BS]))
-            ibrch = find((bus[e2i[branch[:, F_BUS].astype(int)], BUS_AREA] == a) & (bus[e2i[branch[:, T_BUS].astype(int)], BUS_AREA] == a))
-            in_tie = find((bus[e2i[branch[:, F_BUS].astype(int)], BUS_AREA] == a) & (bus[e2i[branch[:, T_BUS].astype(int)], BUS_AREA] != a))
-            out_tie = find((bus[e2i[branch[:, F_BUS].astype(int)], BUS_AREA] != a) & (bus[e2i[branch[:, T_BUS].astype(int)], BUS_AREA] == a))
+            ibrch = find((farea == a) & (tarea == a))
+            in_tie = find((farea == a) & (tarea != a))
+            out_tie = find((farea != a) & (tarea == a))
             if not any(xfmr + 1):
                 nxfmr = 0
             else:
-                nxfmr = len(find((bus[e2i[branch[xfmr, F_BUS].astype(int)], BUS_AREA] == a) & (bus[e2i[branch[xfmr, T_BUS].astype(int)], BUS_AREA] == a)))
-            fd.write('\n%3d  %6d   %5d  %5d   %5d  %5d  %5d   %5d   %5d  %5d  %5d' %
+                nxfmr = len(find((farea[xfmr] == a) & (tarea[xfmr] == a)))
+            rows.append('%3d  %6d   %5d  %5d   %5d  %5d  %5d   %5d   %5d  %5d  %5d' %
                 (a, len(ib), len(ig), len(igon), \
                 len(inzld)+len(ildon), len(inzld), len(ildon), \
                 len(inzsh), len(ibrch), nxfmr, len(in_tie)+len(out_tie)))
+        _write_rows(fd, rows)
 
         fd.write('\n----  -----   -----  ------   -----  -----  -----   -----   -----  -----  -----')
         fd.write('\nTot: %6d   %5d  %5d   %5d  %5d  %5d   %5d   %5d  %5d  %5d' %
@@ -270,14 +277,15 @@ def printpf(baseMVA, bus=None, gen=None, branch=None, f=None, success=None,
         fd.write('\nArea      Total Gen Capacity           On-line Gen Capacity         Generation')
         fd.write('\n Num     MW           MVAr            MW           MVAr             MW    MVAr')
         fd.write('\n----   ------  ------------------   ------  ------------------    ------  ------')
-        for i in range(len(s_areas)):
-            a = s_areas[i]
-            ig = find((bus[e2i[gen[:, GEN_BUS].astype(int)], BUS_AREA] == a) & ~isload(gen))
-            igon = find((bus[e2i[gen[:, GEN_BUS].astype(int)], BUS_AREA] == a) & (gen[:, GEN_STATUS] > 0) & ~isload(gen))
-            fd.write('\n%3d   %7.1f  %7.1f to %-7.1f  %7.1f  %7.1f to %-7.1f   %7.1f %7.1f' %
+        rows = []
+        for a in s_areas:
+            ig = find((garea == a) & ~isld)
+            igon = find((garea == a) & (gen[:, GEN_STATUS] > 0) & ~isld)
+            rows.append('%3d   %7.1f  %7.1f to %-7.1f  %7.1f  %7.1f to %-7.1f   %7.1f %7.1f' %
                 (a, sum(gen[ig, PMAX]), sum(gen[ig, QMIN]), sum(gen[ig, QMAX]),
                 sum(gen[igon, PMAX]), sum(gen[igon, QMIN]), sum(gen[igon, QMAX]),
                 sum(gen[igon, PG]), sum(gen[igon, QG]) ))
+        _write_rows(fd, rows)
 
         fd.write('\n----   ------  ------------------   ------  ------------------    ------  ------')
         fd.write('\nTot:  %7.1f  %7.1f to %-7.1f  %7.1f  %7.1f to %-7.1f   %7.1f %7.1f' %
@@ -289,17 +297,18 @@ def printpf(baseMVA, bus=None, gen=None, branch=None, f=None, success=None,
         fd.write('\n Num      MW     MVAr       MW     MVAr       MW     MVAr       MW     MVAr')
         fd.write('\n----    ------  ------    ------  ------    ------  ------    ------  ------')
         Qlim = (gen[:, QMIN] == 0) * gen[:, QMAX] + (gen[:, QMAX] == 0) * gen[:, QMIN]
-        for i in range(len(s_areas)):
-            a = s_areas[i]
-            ildon = find((bus[e2i[gen[:, GEN_BUS].astype(int)], BUS_AREA] == a) & (gen[:, GEN_STATUS] > 0) & isload(gen))
+        rows = []
+        for a in s_areas:
+            ildon = find((garea == a) & (gen[:, GEN_STATUS] > 0) & isld)
             inzld = find((bus[:, BUS_AREA] == a) & logical_or(bus[:, PD], bus[:, QD]))
-            fd.write('\n%3d    %7.1f %7.1f   %7.1f %7.1f   %7.1f %7.1f   %7.1f %7.1f' %
+            rows.append('%3d    %7.1f %7.1f   %7.1f %7.1f   %7.1f %7.1f   %7.1f %7.1f' %
                 (a, -sum(gen[ildon, PMIN]),
                 -sum(Qlim[ildon]),
                 -sum(gen[ildon, PG]), -sum(gen[ildon, QG]),
                 sum(bus[inzld, PD]), sum(bus[inzld, QD]),
                 -sum(gen[ildon, PG]) + sum(bus[inzld, PD]),
                 -sum(gen[ildon, QG]) + sum(bus[inzld, QD]) ))
+        _write_rows(fd, rows)
 
         fd.write('\n----    ------  ------    ------  ------    ------  ------    ------  ------')
         fd.write('\nTot:   %7.1f %7.1f   %7.1f %7.1f   %7.1f %7.1f   %7.1f %7.1f' %
@@ -313,13 +322,14 @@ def printpf(baseMVA, bus=None, gen=None, branch=None, f=None, success=None,
         fd.write('\nArea      Shunt Inj        Branch      Series Losses      Net Export')
         fd.write('\n Num      MW     MVAr     Charging      MW     MVAr       MW     MVAr')
         fd.write('\n----    ------  ------    --------    ------  ------    ------  ------')
-        for i in range(len(s_areas)):
-            a = s_areas[i]
+        bron = branch[:, BR_STATUS].astype(bool)
+        rows = []
+        for a in s_areas:
             inzsh   = find((bus[:, BUS_AREA] == a) & logical_or(bus[:, GS], bus[:, BS]))
-            ibrch   = find((bus[e2i[branch[:, F_BUS].astype(int)], BUS_AREA] == a) & (bus[e2i[branch[:, T_BUS].astype(int)], BUS_AREA] == a) & branch[:, BR_STATUS].astype(bool))
-            in_tie  = find((bus[e2i[branch[:, F_BUS].astype(int)], BUS_AREA] != a) & (bus[e2i[branch[:, T_BUS].astype(int)], BUS_AREA] == a) & branch[:, BR_STATUS].astype(bool))
-            out_tie = find((bus[e2i[branch[:, F_BUS].astype(int)], BUS_AREA] == a) & (bus[e2i[branch[:, T_BUS].astype(int)], BUS_AREA] != a) & branch[:, BR_STATUS].astype(bool))
-            fd.write('\n%3d    %7.1f %7.1f    %7.1f    %7.2f %7.2f   %7.1f %7.1f' %
+            ibrch   = find((farea == a) & (tarea == a) & bron)
+            in_tie  = find((farea != a) & (tarea == a) & bron)
+            out_tie = find((farea == a) & (tarea != a) & bron)
+            rows.append('%3d    %7.1f %7.1f    %7.1f    %7.2f %7.2f   %7.1f %7.1f' %
                 (a, -sum(bus[inzsh, VM]**2 * bus[inzsh, GS]),
                  sum(bus[inzsh, VM]**2 * bus[inzsh, BS]),
                  sum(fchg[ibrch]) + sum(tchg[ibrch]) + sum(fchg[out_tie]) + sum(tchg[in_tie]),
@@ -327,6 +337,7 @@ def printpf(baseMVA, bus=None, gen=None, branch=None, f=None, success=None,
                  sum(imag(loss[ibrch])) + sum(imag(loss[r_[in_tie, out_tie]])) / 2,
                  sum(branch[in_tie, PT])+sum(branch[out_tie, PF]) - sum(real(loss[r_[in_tie, out_tie]])) / 2,
                  sum(branch[in_tie, QT])+sum(branch[out_tie, QF]) - sum(imag(loss[r_[in_tie, out_tie]])) / 2  ))
+        _write_rows(fd, rows)
 
         fd.write('\n----    ------  ------    --------    ------  ------    ------  ------')
         fd.write('\nTot:   %7.1f %7.1f    %7.1f    %7.2f %7.2f       -       -' %
@@ -338,8 +349,8 @@ def printpf(baseMVA, bus=None, gen=None, branch=None, f=None, success=None,
     ## generator data
     if OUT_GEN:
         if isOPF:
-            genlamP = bus[e2i[gen[:, GEN_BUS].astype(int)], LAM_P]
-            genlamQ = bus[e2i[gen[:, GEN_BUS].astype(int)], LAM_Q]
+            genlamP = bus[gbus, LAM_P]
+            genlamQ = bus[gbus, LAM_Q]
 
         fd.write('\n================================================================================')
         fd.write('\n|     Generator Data                                                           |')
@@ -350,14 +361,15 @@ def printpf(baseMVA, bus=None, gen=None, branch=None, f=None, success=None,
         if isOPF: fd.write('     P         Q    ')
         fd.write('\n----  -----  ------  --------  --------')
         if isOPF: fd.write('  --------  --------')
-        for k in range(len(ong)):
-            i = ong[k]
-            fd.write('\n%3d %6d     %2d ' % (i, gen[i, GEN_BUS], gen[i, GEN_STATUS]))
-            if (gen[i, GEN_STATUS] > 0) & logical_or(gen[i, PG], gen[i, QG]):
-                fd.write('%10.2f%10.2f' % (gen[i, PG], gen[i, QG]))
-            else:
-                fd.write('       -         -  ')
-            if isOPF: fd.write('%10.2f%10.2f' % (genlamP[i], genlamQ[i]))
+        g = gen[ong]
+        rows = _join(
+            _fmt('%3d %6d     %2d ', ong, g[:, GEN_BUS], g[:, GEN_STATUS]),
+            _pick((g[:, GEN_STATUS] > 0) & logical_or(g[:, PG], g[:, QG]),
+                  _fmt('%10.2f%10.2f', g[:, PG], g[:, QG]),
+                  '       -         -  '),
+            _fmt('%10.2f%10.2f', genlamP[ong], genlamQ[ong]) if isOPF else ''
+        )
+        _write_rows(fd, rows)
 
         fd.write('\n                     --------  --------')
         fd.write('\n            Total: %9.2f%10.2f' % (sum(gen[ong, PG]), sum(gen[ong, QG])))
@@ -372,15 +384,15 @@ def printpf(baseMVA, bus=None, gen=None, branch=None, f=None, success=None,
             if isOPF: fd.write('     P         Q    ')
             fd.write('\n----  -----  ------  --------  --------')
             if isOPF: fd.write('  --------  --------')
-            for k in range(len(onld)):
-                i = onld[k]
-                fd.write('\n%3d %6d     %2d ' % (i, gen[i, GEN_BUS], gen[i, GEN_STATUS]))
-                if (gen[i, GEN_STATUS] > 0) & logical_or(gen[i, PG], gen[i, QG]):
-                    fd.write('%10.2f%10.2f' % (-gen[i, PG], -gen[i, QG]))
-                else:
-                    fd.write('       -         -  ')
-
-                if isOPF: fd.write('%10.2f%10.2f' % (genlamP[i], genlamQ[i]))
+            g = gen[onld]
+            rows = _join(
+                _fmt('%3d %6d     %2d ', onld, g[:, GEN_BUS], g[:, GEN_STATUS]),
+                _pick((g[:, GEN_STATUS] > 0) & logical_or(g[:, PG], g[:, QG]),
+                      _fmt('%10.2f%10.2f', -g[:, PG], -g[:, QG]),
+                      '       -         -  '),
+                _fmt('%10.2f%10.2f', genlamP[onld], genlamQ[onld]) if isOPF else ''
+            )
+            _write_rows(fd, rows)
             fd.write('\n                     --------  --------')
             fd.write('\n            Total: %9.2f%10.2f' % (-sum(gen[onld, PG]), -sum(gen[onld, QG])))
             fd.write('\n')
@@ -396,35 +408,27 @@ def printpf(baseMVA, bus=None, gen=None, branch=None, f=None, success=None,
         if isOPF: fd.write('     P        Q   ')
         fd.write('\n----- ------- --------  --------  --------  --------  --------')
         if isOPF: fd.write('  -------  -------')
-        for i in range(nb):
-            fd.write('\n%5d%7.3f%9.3f' % tuple(bus[i, [BUS_I, VM, VA]]))
-            if bus[i, BUS_TYPE] == REF:
-                fd.write('*')
-            else:
-                fd.write(' ')
-            g  = find((gen[:, GEN_STATUS] > 0) & (gen[:, GEN_BUS] == bus[i, BUS_I]) &
-                        ~isload(gen))
-            ld = find((gen[:, GEN_STATUS] > 0) & (gen[:, GEN_BUS] == bus[i, BUS_I]) &
-                        isload(gen))
-            if any(g + 1):
-                fd.write('%9.2f%10.2f' % (sum(gen[g, PG]), sum(gen[g, QG])))
-            else:
-                fd.write('      -         -  ')
-
-            if logical_or(bus[i, PD], bus[i, QD]) | any(ld + 1):
-                if any(ld + 1):
-                    fd.write('%10.2f*%9.2f*' % (bus[i, PD] - sum(gen[ld, PG]),
-                                                bus[i, QD] - sum(gen[ld, QG])))
-                else:
-                    fd.write('%10.2f%10.2f ' % tuple(bus[i, [PD, QD]]))
-            else:
-                fd.write('       -         -   ')
-            if isOPF:
-                fd.write('%9.3f' % bus[i, LAM_P])
-                if abs(bus[i, LAM_Q]) > ptol:
-                    fd.write('%8.3f' % bus[i, LAM_Q])
-                else:
-                    fd.write('     -')
+        ## per bus totals of on-line generators and dispatchable loads
+        Cg = sparse((ones(len(ong)), (gbus[ong], ong)), (nb, ng))
+        Cl = sparse((ones(len(onld)), (gbus[onld], onld)), (nb, ng))
+        hasld = Cl * ones(ng) > 0
+        rows = _join(
+            _fmt('%5d%7.3f%9.3f', bus[:, BUS_I], bus[:, VM], bus[:, VA]),
+            _pick(bus[:, BUS_TYPE] == REF, '*', ' '),
+            _pick(Cg * ones(ng) > 0,
+                  _fmt('%9.2f%10.2f', Cg * gen[:, PG], Cg * gen[:, QG]),
+                  '      -         -  '),
+            _pick(hasld,
+                  _fmt('%10.2f*%9.2f*', bus[:, PD] - Cl * gen[:, PG],
+                                        bus[:, QD] - Cl * gen[:, QG]),
+                  _pick(logical_or(bus[:, PD], bus[:, QD]),
+                        _fmt('%10.2f%10.2f ', bus[:, PD], bus[:, QD]),
+                        '       -         -   ')),
+            _fmt('%9.3f', bus[:, LAM_P]) if isOPF else '',
+            _pick(abs(bus[:, LAM_Q]) > ptol, _fmt('%8.3f', bus[:, LAM_Q]),
+                  '     -') if isOPF else ''
+        )
+        _write_rows(fd, rows)
         fd.write('\n                        --------  --------  --------  --------')
         fd.write('\n               Total: %9.2f %9.2f %9.2f %9.2f' %
             (sum(gen[ong, PG]), sum(gen[ong, QG]),
@@ -440,11 +444,10 @@ def printpf(baseMVA, bus=None, gen=None, branch=None, f=None, success=None,
         fd.write('\nBrnch   From   To    From Bus Injection   To Bus Injection     Loss (I^2 * Z)  ')
         fd.write('\n  #     Bus    Bus    P (MW)   Q (MVAr)   P (MW)   Q (MVAr)   P (MW)   Q (MVAr)')
         fd.write('\n-----  -----  -----  --------  --------  --------  --------  --------  --------')
-        for i in range(nl):
-            fd.write('\n%4d%7d%7d%10.2f%10.2f%10.2f%10.2f%10.3f%10.2f' %
-                (i, branch[i, F_BUS], branch[i, T_BUS],
-                     branch[i, PF], branch[i, QF], branch[i, PT], branch[i, QT],
-                     loss[i].real, loss[i].imag))
+        _write_rows(fd, _fmt('%4d%7d%7d%10.2f%10.2f%10.2f%10.2f%10.3f%10.2f',
+            arange(nl), branch[:, F_BUS], branch[:, T_BUS],
+            branch[:, PF], branch[:, QF], branch[:, PT], branch[:, QT],
+            loss.real, loss.imag))
         fd.write('\n                                                             --------  --------')
         fd.write('\n                                                    Total:%10.3f%10.2f' %
                 (sum(real(loss)), sum(imag(loss))))
@@ -464,24 +467,16 @@ def printpf(baseMVA, bus=None, gen=None, branch=None, f=None, success=None,
             fd.write('\n================================================================================')
             fd.write('\nBus #  Vmin mu    Vmin    |V|   Vmax    Vmax mu')
             fd.write('\n-----  --------   -----  -----  -----   --------')
-            for i in range(nb):
-                if (OUT_V_LIM == 2) | (OUT_V_LIM == 1 &
-                             ((bus[i, VM] < bus[i, VMIN] + ctol) |
-                              (bus[i, VM] > bus[i, VMAX] - ctol) |
-                              (bus[i, MU_VMIN] > ptol) |
-                              (bus[i, MU_VMAX] > ptol))):
-                    fd.write('\n%5d' % bus[i, BUS_I])
-                    if ((bus[i, VM] < bus[i, VMIN] + ctol) |
-                            (bus[i, MU_VMIN] > ptol)):
-                        fd.write('%10.3f' % bus[i, MU_VMIN])
-                    else:
-                        fd.write('      -   ')
-
-                    fd.write('%8.3f%7.3f%7.3f' % tuple(bus[i, [VMIN, VM, VMAX]]))
-                    if (bus[i, VM] > bus[i, VMAX] - ctol) | (bus[i, MU_VMAX] > ptol):
-                        fd.write('%10.3f' % bus[i, MU_VMAX])
-                    else:
-                        fd.write('      -    ')
+            lo = (bus[:, VM] < bus[:, VMIN] + ctol) | (bus[:, MU_VMIN] > ptol)
+            hi = (bus[:, VM] > bus[:, VMAX] - ctol) | (bus[:, MU_VMAX] > ptol)
+            k = find((OUT_V_LIM == 2) | (OUT_V_LIM == 1 & (lo | hi)))
+            b, lo, hi = bus[k], lo[k], hi[k]
+            _write_rows(fd, _join(
+                _fmt('%5d', b[:, BUS_I]),
+                _pick(lo, _fmt('%10.3f', b[:, MU_VMIN]), '      -   '),
+                _fmt('%8.3f%7.3f%7.3f', b[:, VMIN], b[:, VM], b[:, VMAX]),
+                _pick(hi, _fmt('%10.3f', b[:, MU_VMAX]), '      -    ')
+            ))
             fd.write('\n')
 
         ## generator P constraints
@@ -507,25 +502,8 @@ def printpf(baseMVA, bus=None, gen=None, branch=None, f=None, success=None,
             fd.write('\n Gen   Bus                Active Power Limits')
             fd.write('\n  #     #    Pmin mu    Pmin       Pg       Pmax    Pmax mu')
             fd.write('\n----  -----  -------  --------  --------  --------  -------')
-            for k in range(len(ong)):
-                i = ong[k]
-                if (OUT_PG_LIM == 2) | ((OUT_PG_LIM == 1) &
-                            ((gen[i, PG] < gen[i, PMIN] + ctol) |
-                             (gen[i, PG] > gen[i, PMAX] - ctol) |
-                             (gen[i, MU_PMIN] > ptol) | (gen[i, MU_PMAX] > ptol))):
-                    fd.write('\n%4d%6d ' % (i, gen[i, GEN_BUS]))
-                    if (gen[i, PG] < gen[i, PMIN] + ctol) | (gen[i, MU_PMIN] > ptol):
-                        fd.write('%8.3f' % gen[i, MU_PMIN])
-                    else:
-                        fd.write('     -  ')
-                    if gen[i, PG]:
-                        fd.write('%10.2f%10.2f%10.2f' % tuple(gen[i, [PMIN, PG, PMAX]]))
-                    else:
-                        fd.write('%10.2f       -  %10.2f' % tuple(gen[i, [PMIN, PMAX]]))
-                    if (gen[i, PG] > gen[i, PMAX] - ctol) | (gen[i, MU_PMAX] > ptol):
-                        fd.write('%9.3f' % gen[i, MU_PMAX])
-                    else:
-                        fd.write('      -  ')
+            _write_rows(fd, _gen_limit_rows(gen, ong, '%4d%6d ',
+                        PG, PMIN, PMAX, MU_PMIN, MU_PMAX, OUT_PG_LIM, ctol, ptol))
             fd.write('\n')
 
         ## generator Q constraints
@@ -537,27 +515,8 @@ def printpf(baseMVA, bus=None, gen=None, branch=None, f=None, success=None,
             fd.write('\nGen  Bus              Reactive Power Limits')
             fd.write('\n #    #   Qmin mu    Qmin       Qg       Qmax    Qmax mu')
             fd.write('\n---  ---  -------  --------  --------  --------  -------')
-            for k in range(len(ong)):
-                i = ong[k]
-                if (OUT_QG_LIM == 2) | ((OUT_QG_LIM == 1) &
-                            ((gen[i, QG] < gen[i, QMIN] + ctol) |
-                             (gen[i, QG] > gen[i, QMAX] - ctol) |
-                             (gen[i, MU_QMIN] > ptol) |
-                             (gen[i, MU_QMAX] > ptol))):
-                    fd.write('\n%3d%5d' % (i, gen[i, GEN_BUS]))
-                    if (gen[i, QG] < gen[i, QMIN] + ctol) | (gen[i, MU_QMIN] > ptol):
-                        fd.write('%8.3f' % gen[i, MU_QMIN])
-                    else:
-                        fd.write('     -  ')
-                    if gen[i, QG]:
-                        fd.write('%10.2f%10.2f%10.2f' % tuple(gen[i, [QMIN, QG, QMAX]]))
-                    else:
-                        fd.write('%10.2f       -  %10.2f' % tuple(gen[i, [QMIN, QMAX]]))
-
-                    if (gen[i, QG] > gen[i, QMAX] - ctol) | (gen[i, MU_QMAX] > ptol):
-                        fd.write('%9.3f' % gen[i, MU_QMAX])
-                    else:
-                        fd.write('      -  ')
+            _write_rows(fd, _gen_limit_rows(gen, ong, '%3d%5d',
+                        QG, QMIN, QMAX, MU_QMIN, MU_QMAX, OUT_QG_LIM, ctol, ptol))
             fd.write('\n')
 
         ## dispatchable load P constraints
@@ -581,27 +540,8 @@ def printpf(baseMVA, bus=None, gen=None, branch=None, f=None, success=None,
             fd.write('\nGen  Bus               Active Power Limits')
             fd.write('\n #    #   Pmin mu    Pmin       Pg       Pmax    Pmax mu')
             fd.write('\n---  ---  -------  --------  --------  --------  -------')
-            for k in range(len(onld)):
-                i = onld[k]
-                if (OUT_PG_LIM == 2) | ((OUT_PG_LIM == 1) &
-                            ((gen[i, PG] < gen[i, PMIN] + ctol) |
-                             (gen[i, PG] > gen[i, PMAX] - ctol) |
-                             (gen[i, MU_PMIN] > ptol) |
-                             (gen[i, MU_PMAX] > ptol))):
-                    fd.write('\n%3d%5d' % (i, gen[i, GEN_BUS]))
-                    if (gen[i, PG] < gen[i, PMIN] + ctol) | (gen[i, MU_PMIN] > ptol):
-                        fd.write('%8.3f' % gen[i, MU_PMIN])
-                    else:
-                        fd.write('     -  ')
-                    if gen[i, PG]:
-                        fd.write('%10.2f%10.2f%10.2f' % gen[i, [PMIN, PG, PMAX]])
-                    else:
-                        fd.write('%10.2f       -  %10.2f' % gen[i, [PMIN, PMAX]])
-
-                    if (gen[i, PG] > gen[i, PMAX] - ctol) | (gen[i, MU_PMAX] > ptol):
-                        fd.write('%9.3f' % gen[i, MU_PMAX])
-                    else:
-                        fd.write('      -  ')
+            _write_rows(fd, _gen_limit_rows(gen, onld, '%3d%5d',
+                        PG, PMIN, PMAX, MU_PMIN, MU_PMAX, OUT_PG_LIM, ctol, ptol))
             fd.write('\n')
 
         ## dispatchable load Q constraints
@@ -613,28 +553,8 @@ def printpf(baseMVA, bus=None, gen=None, branch=None, f=None, success=None,
             fd.write('\nGen  Bus              Reactive Power Limits')
             fd.write('\n #    #   Qmin mu    Qmin       Qg       Qmax    Qmax mu')
             fd.write('\n---  ---  -------  --------  --------  --------  -------')
-            for k in range(len(onld)):
-                i = onld[k]
-                if (OUT_QG_LIM == 2) | ((OUT_QG_LIM == 1) &
-                            ((gen[i, QG] < gen[i, QMIN] + ctol) |
-                             (gen[i, QG] > gen[i, QMAX] - ctol) |
-                             (gen[i, MU_QMIN] > ptol) |
-                             (gen[i, MU_QMAX] > ptol))):
-                    fd.write('\n%3d%5d' % (i, gen(i, GEN_BUS)))
-                    if (gen[i, QG] < gen[i, QMIN] + ctol) | (gen[i, MU_QMIN] > ptol):
-                        fd.write('%8.3f' % gen[i, MU_QMIN])
-                    else:
-                        fd.write('     -  ')
-
-                    if gen[i, QG]:
-                        fd.write('%10.2f%10.2f%10.2f' % gen[i, [QMIN, QG, QMAX]])
-                    else:
-                        fd.write('%10.2f       -  %10.2f' % gen[i, [QMIN, QMAX]])
-
-                    if (gen[i, QG] > gen[i, QMAX] - ctol) | (gen[i, MU_QMAX] > ptol):
-                        fd.write('%9.3f' % gen[i, MU_QMAX])
-                    else:
-                        fd.write('      -  ')
+            _write_rows(fd, _gen_limit_rows(gen, onld, '%3d%5d',
+                        QG, QMIN, QMAX, MU_QMIN, MU_QMAX, OUT_QG_LIM, ctol, ptol))
             fd.write('\n')
 
         ## line flow constraints
@@ -643,8 +563,8 @@ def printpf(baseMVA, bus=None, gen=None, branch=None, f=None, success=None,
             Ft = branch[:, PT]
             strg = '\n  #     Bus    Pf  mu     Pf      |Pmax|      Pt      Pt  mu   Bus'
         elif ppopt['OPF_FLOW_LIM'] == 2:   ## |I| limit
-            Ff = abs( (branch[:, PF] + 1j * branch[:, QF]) / V[e2i[branch[:, F_BUS].astype(int)]] )
-            Ft = abs( (branch[:, PT] + 1j * branch[:, QT]) / V[e2i[branch[:, T_BUS].astype(int)]] )
+            Ff = abs( (branch[:, PF] + 1j * branch[:, QF]) / V[fbus] )
+            Ft = abs( (branch[:, PT] + 1j * branch[:, QT]) / V[tbus] )
             strg = '\n  #     Bus   |If| mu    |If|     |Imax|     |It|    |It| mu   Bus'
         else:                ## |S| limit
             Ff = abs(branch[:, PF] + 1j * branch[:, QF])
@@ -662,24 +582,20 @@ def printpf(baseMVA, bus=None, gen=None, branch=None, f=None, success=None,
             fd.write('\nBrnch   From     "From" End        Limit       "To" End        To')
             fd.write(strg)
             fd.write('\n-----  -----  -------  --------  --------  --------  -------  -----')
-            for i in range(nl):
-                if (OUT_LINE_LIM == 2) | ((OUT_LINE_LIM == 1) &
-                       (((branch[i, RATE_A] != 0) & (abs(Ff[i]) > branch[i, RATE_A] - ctol)) |
-                        ((branch[i, RATE_A] != 0) & (abs(Ft[i]) > branch[i, RATE_A] - ctol)) |
-                        (branch[i, MU_SF] > ptol) | (branch[i, MU_ST] > ptol))):
-                    fd.write('\n%4d%7d' % (i, branch[i, F_BUS]))
-                    if (Ff[i] > branch[i, RATE_A] - ctol) | (branch[i, MU_SF] > ptol):
-                        fd.write('%10.3f' % branch[i, MU_SF])
-                    else:
-                        fd.write('      -   ')
-
-                    fd.write('%9.2f%10.2f%10.2f' %
-                        (Ff[i], branch[i, RATE_A], Ft[i]))
-                    if (Ft[i] > branch[i, RATE_A] - ctol) | (branch[i, MU_ST] > ptol):
-                        fd.write('%10.3f' % branch[i, MU_ST])
-                    else:
-                        fd.write('      -   ')
-                    fd.write('%6d' % branch[i, T_BUS])
+            k = find((OUT_LINE_LIM == 2) | ((OUT_LINE_LIM == 1) &
+                   (((branch[:, RATE_A] != 0) & (abs(Ff) > branch[:, RATE_A] - ctol)) |
+                    ((branch[:, RATE_A] != 0) & (abs(Ft) > branch[:, RATE_A] - ctol)) |
+                    (branch[:, MU_SF] > ptol) | (branch[:, MU_ST] > ptol))))
+            br, Ff, Ft = branch[k], Ff[k], Ft[k]
+            _write_rows(fd, _join(
+                _fmt('%4d%7d', k, br[:, F_BUS]),
+                _pick((Ff > br[:, RATE_A] - ctol) | (br[:, MU_SF] > ptol),
+                      _fmt('%10.3f', br[:, MU_SF]), '      -   '),
+                _fmt('%9.2f%10.2f%10.2f', Ff, br[:, RATE_A], Ft),
+                _pick((Ft > br[:, RATE_A] - ctol) | (br[:, MU_ST] > ptol),
+                      _fmt('%10.3f', br[:, MU_ST]), '      -   '),
+                _fmt('%6d', br[:, T_BUS])
+            ))
             fd.write('\n')
 
     ## execute userfcn callbacks for 'printpf' stage
@@ -687,3 +603,58 @@ def printpf(baseMVA, bus=None, gen=None, branch=None, f=None, success=None,
         if not isOPF:  ## turn off option for all constraints if it isn't an OPF
             ppopt = ppoption(ppopt, 'OUT_ALL_LIM', 0)
         run_userfcn(results["userfcn"], 'printpf', results, fd, ppopt)
+
+
+def _fmt(fmt, *cols):
+    """Formats the rows of the columns C{cols} with C{fmt}.
+    """
+    return [fmt % row for row in zip(*[asarray(c).tolist() for c in cols])]
+
+
+def _pick(mask, a, b):
+    """Returns C{a[i]} for the rows where C{mask} is true and C{b[i]}
+    elsewhere, where a string C{a} or C{b} is used for all rows.
+    """
+    n = len(mask)
+    if isinstance(a, str):
+        a = [a] * n
+    if isinstance(b, str):
+        b = [b] * n
+    return [x if m else y for m, x, y in zip(asarray(mask).tolist(), a, b)]
+
+
+def _join(*cols):
+    """Concatenates the columns of strings C{cols} row by row, where a
+    string is used for all rows.
+    """
+    n = max([len(c) for c in cols if not isinstance(c, str)])
+    cols = [[c] * n if isinstance(c, str) else c for c in cols]
+    return [''.join(row) for row in zip(*cols)]
+
+
+def _write_rows(fd, rows):
+    """Writes the rows of a table to C{fd}, each on a new line.
+    """
+    if rows:
+        fd.write('\n' + '\n'.join(rows))
+
+
+def _gen_limit_rows(gen, idx, fmt, X, XMIN, XMAX, MU_XMIN, MU_XMAX,
+                    out_lim, ctol, ptol):
+    """Returns the rows of a generator limits table, for the quantity in
+    column C{X} of the generators C{idx} with limits in the columns C{XMIN}
+    and C{XMAX} and their shadow prices in C{MU_XMIN} and C{MU_XMAX}.
+    """
+    g = gen[idx]
+    lo = (g[:, X] < g[:, XMIN] + ctol) | (g[:, MU_XMIN] > ptol)
+    hi = (g[:, X] > g[:, XMAX] - ctol) | (g[:, MU_XMAX] > ptol)
+    k = find((out_lim == 2) | ((out_lim == 1) & (lo | hi)))
+    g, lo, hi = g[k], lo[k], hi[k]
+    return _join(
+        _fmt(fmt, idx[k], g[:, GEN_BUS]),
+        _pick(lo, _fmt('%8.3f', g[:, MU_XMIN]), '     -  '),
+        _pick(g[:, X] != 0,
+              _fmt('%10.2f%10.2f%10.2f', g[:, XMIN], g[:, X], g[:, XMAX]),
+              _fmt('%10.2f       -  %10.2f', g[:, XMIN], g[:, XMAX])),
+        _pick(hi, _fmt('%9.3f', g[:, MU_XMAX]), '      -  ')
+    )
@@ -0,0 +1,457 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Reads a PSS/E RAW case file into a PYPOWER case dict.
+"""
+
+import csv
+import re
+import sys
+
+from numpy import arange, empty, zeros, ones, full, r_, bincount, where, \
+    isnan, sqrt, maximum, abs as npabs
+
+from pypower.idx_bus import BUS_I, BUS_TYPE, PD, QD, GS, BS, BUS_AREA, \
+    VM, VA, BASE_KV, ZONE, VMAX, VMIN, PQ, NONE
+from pypower.idx_gen import GEN_BUS, PG, QG, QMAX, QMIN, VG, MBASE, \
+    GEN_STATUS, PMAX, PMIN, APF
+from pypower.idx_brch import F_BUS, T_BUS, BR_R, BR_X, BR_B, RATE_A, \
+    RATE_B, RATE_C, TAP, SHIFT, BR_STATUS, ANGMIN, ANGMAX
+
+
+## number of records parsed at a time
+BLOCK = 10000
+
+## data sections of the RAW file, up to the last one read
+SECTIONS = {
+    33: ['bus', 'load', 'fixed shunt', 'generator', 'branch', 'transformer',
+         'area', 'two-terminal dc', 'vsc dc', 'impedance correction',
+         'multi-terminal dc', 'multi-section line', 'zone', 'inter-area',
+         'owner', 'facts', 'switched shunt'],
+    34: ['bus', 'load', 'fixed shunt', 'generator', 'branch',
+         'switching device', 'transformer', 'area', 'two-terminal dc',
+         'vsc dc', 'impedance correction', 'multi-terminal dc',
+         'multi-section line', 'zone', 'inter-area', 'owner', 'facts',
+         'switched shunt']
+}
+
+## sections with data that is not converted
+IGNORED = ('switching device', 'two-terminal dc', 'vsc dc',
+           'multi-terminal dc', 'facts')
+
+NAN = float('nan')
+
+## (column, default) of the fields read from the records of each section,
+## by revision, NaN defaults being filled in by the conversion
+COLUMNS = {
+    33: {
+        ##          I       BASKV    IDE     AREA    ZONE    VM      VA
+        ##          NVHI      NVLO
+        'bus':      [(0, 0), (2, 0), (3, 1), (4, 1), (5, 1), (7, 1), (8, 0),
+                     (9, 1.1), (10, 0.9)],
+        ##          I       STATUS  PL      QL      IP      IQ      YP
+        ##          YQ
+        'load':     [(0, 0), (2, 1), (5, 0), (6, 0), (7, 0), (8, 0), (9, 0),
+                     (10, 0)],
+        ##          I       STATUS  GL      BL
+        'fixed shunt': [(0, 0), (2, 1), (3, 0), (4, 0)],
+        ##          I       PG      QG      QT           QB
+        ##          VS      MBASE        STAT     PT           PB
+        'generator': [(0, 0), (2, 0), (3, 0), (4, 9999), (5, -9999),
+                      (6, 1), (8, NAN), (14, 1), (16, 9999),
+                      (17, -9999)],
+        ##          I       J       R       X       B       RATEA   RATEB
+        ##          RATEC   ST
+        'branch':   [(0, 0), (1, 0), (3, 0), (4, 0), (5, 0), (6, 0), (7, 0),
+                     (8, 0), (13, 1)],
+        ##          I       ISW
+        'area':     [(0, 0), (1, 0)],
+        ##          I       STAT    BINIT
+        'switched shunt': [(0, 0), (3, 1), (9, 0)]
+    },
+    34: {
+        'generator': [(0, 0), (2, 0), (3, 0), (4, 9999), (5, -9999),
+                      (6, 1), (9, NAN), (15, 1), (17, 9999),
+                      (18, -9999)],
+        ##          ...                                     RATE1   RATE2
+        ##          RATE3   ST
+        'branch':   [(0, 0), (1, 0), (3, 0), (4, 0), (5, 0), (7, 0), (8, 0),
+                     (9, 0), (23, 1)],
+        'switched shunt': [(0, 0), (3, 1), (10, 0)]
+    }
+}
+for _k in ('bus', 'load', 'fixed shunt', 'area'):
+    COLUMNS[34][_k] = COLUMNS[33][_k]
+
+## fields of the lines of transformer records, the same for both revisions
+XFMR_COLUMNS = [
+    ##  I       J       K       CW      CZ      CM      MAG1    MAG2
+    ##  STAT
+    [(0, 0), (1, 0), (2, 0), (4, 1), (5, 1), (6, 1), (7, 0), (8, 0),
+     (11, 1)],
+    ##  R1-2    X1-2    SBASE1-2   R2-3    X2-3    SBASE2-3   R3-1
+    ##  X3-1    SBASE3-1   VMSTAR  ANSTAR
+    [(0, 0), (1, 0), (2, NAN), (3, 0), (4, 0), (5, NAN), (6, 0),
+     (7, 0), (8, NAN), (9, 1), (10, 0)],
+    ##  WINDV     NOMV    ANG     RATA    RATB    RATC
+    [(0, NAN), (1, 0), (2, 0), (3, 0), (4, 0), (5, 0)]
+]
+
+## end of a section, or of the data ('Q')
+_END = re.compile(r"\s*[0Q]\s*($|[,/\s])")
+
+## field of a record written without commas
+_TOKEN = re.compile(r"'[^']*'|[^\s,']+")
+
+
+def psse2ppc(rawfile, verbose=False):
+    """Reads a PSS/E RAW case file into a PYPOWER case dict.
+
+    Reads the bus, load, fixed shunt, generator, branch, transformer, area
+    and switched shunt data of the PSS/E RAW file C{rawfile}, of revision
+    33 or 34, and returns it as a PYPOWER case dict (version 2), with the
+    keys C{baseMVA}, C{bus}, C{gen}, C{branch}, C{areas} and C{bus_name}.
+
+    The file is read in a single pass: each section is streamed in blocks
+    of C{BLOCK} records, of which only the fields used are parsed, column
+    by column, into arrays. Bus numbers are mapped once to bus indices,
+    with a vector as in L{ext2int}, which is used to aggregate the loads
+    and shunts at their buses and to drop records of unknown buses.
+
+    Loads are converted to constant power at the voltage magnitude of the
+    bus, fixed and switched shunts (at C{BINIT}) and transformer
+    magnetizing admittances to bus shunts. Two-winding transformers become
+    branches with the turns ratio C{WINDV1/WINDV2} and the phase shift
+    C{ANG1} as C{TAP} and C{SHIFT}, for the winding data codes C{CW} and
+    impedance codes C{CZ} 1 to 3 and the magnetizing admittance codes
+    C{CM} 1 and 2, with the impedance moved to the winding 2 side of the
+    transformer. Three-winding transformers become three branches to a
+    new star point bus, numbered after the largest bus number. Two-terminal
+    and multi-terminal DC lines, VSC DC lines and FACTS devices are not
+    converted, a warning being written if there are any.
+
+    Raises a C{ValueError} for other revisions.
+
+    @see: L{loadcase}
+    """
+    with open(rawfile) as fd:
+        line = _next(fd)
+        baseMVA, rev = _parse([_clean(line)], [(1, 100), (2, 33)])[0]
+        rev = int(rev)
+        if rev not in SECTIONS:
+            raise ValueError('psse2ppc: PSS/E RAW revision %d of %s is not '
+                             'supported, only 33 and 34' % (rev, rawfile))
+        fd.readline()   ## case titles
+        fd.readline()
+
+        data = {}
+        names = []
+        for section in SECTIONS[rev]:
+            if section == 'transformer':
+                data[section] = _read_xfmr(fd)
+            elif section in COLUMNS[rev]:
+                data[section] = _read(fd, COLUMNS[rev][section],
+                                      names if section == 'bus' else None)
+            else:
+                n = _skip(fd)
+                if n and section in IGNORED:
+                    sys.stderr.write('psse2ppc: %d lines of %s data '
+                                     'ignored\n' % (n, section))
+            if verbose:
+                sys.stdout.write('%-22s %d\n' %
+                                 (section, _count(data, section)))
+
+    return _convert(data, names, baseMVA)
+
+
+def _next(fd):
+    """Returns the next line of data, skipping the comment lines (C{@!}).
+    """
+    line = fd.readline()
+    while line.startswith('@!'):
+        line = fd.readline()
+    return line
+
+
+def _lines(fd):
+    """Yields the cleaned lines of a section, up to its end.
+    """
+    while True:
+        line = _next(fd)
+        if not line or _END.match(line):
+            return
+        yield _clean(line)
+
+
+def _clean(line):
+    """Removes the comment from a record and separates its fields with
+    commas.
+    """
+    i = line.find('/')
+    while i >= 0:
+        if line.count("'", 0, i) % 2 == 0:
+            line = line[:i]
+            break
+        i = line.find('/', i + 1)
+    if ',' not in line:
+        line = ','.join(_TOKEN.findall(line))
+    return line
+
+
+def _parse(lines, cols, names=None):
+    """Parses the fields C{cols} of the records C{lines}, column by column,
+    into a 2-D array.
+    """
+    rows = list(csv.reader(lines, quotechar="'", skipinitialspace=True))
+    A = empty((len(rows), len(cols)))
+    for j, (k, d) in enumerate(cols):
+        A[:, j] = [r[k] if len(r) > k and r[k].strip() else d for r in rows]
+    if names is not None:
+        names.extend([r[1].strip() if len(r) > 1 else '' for r in rows])
+    return A
+
+
+def _read(fd, cols, names=None):
+    """Reads a section in blocks of C{BLOCK} records.
+    """
+    blocks = []
+    lines = []
+    for line in _lines(fd):
+        lines.append(line)
+        if len(lines) == BLOCK:
+            blocks.append(_parse(lines, cols, names))
+            lines = []
+    blocks.append(_parse(lines, cols, names))
+    return r_[tuple(blocks)] if len(blocks) > 1 else blocks[0]
+
+
+def _read_xfmr(fd):
+    """Reads the transformer section, whose records have four lines for
+    two-winding and five lines for three-winding transformers.
+
+    Returns a list of 2-D arrays for each, one per line.
+    """
+    xfmr = ([[] for _ in range(4)], [[] for _ in range(5)])
+    blocks = ([], [])
+    for line in _lines(fd):
+        k = next(csv.reader([line], quotechar="'",
+                            skipinitialspace=True))[2:3]
+        w = int(k[0].strip() not in ('', '0')) if k else 0
+        lines = [line] + [_clean(_next(fd)) for _ in range(3 + w)]
+        for l, x in zip(lines, xfmr[w]):
+            x.append(l)
+        if len(xfmr[w][0]) == BLOCK:
+            blocks[w].append(_parse_xfmr(xfmr[w]))
+            xfmr[w][:] = [[] for _ in xfmr[w]]
+
+    data = []
+    for w in (0, 1):
+        blocks[w].append(_parse_xfmr(xfmr[w]))
+        data.append([r_[tuple(b)] for b in zip(*blocks[w])])
+    return data
+
+
+def _parse_xfmr(lines):
+    cols = XFMR_COLUMNS + [XFMR_COLUMNS[2]] * (len(lines) - 3)
+    return [_parse(l, c) for l, c in zip(lines, cols)]
+
+
+def _skip(fd):
+    """Skips a section, returning its number of lines.
+    """
+    n = 0
+    for _ in _lines(fd):
+        n += 1
+    return n
+
+
+def _count(data, section):
+    if section == 'transformer' and section in data:
+        return sum([len(x[0]) for x in data[section]])
+    return len(data.get(section, ()))
+
+
+def _index(e2i, i, section):
+    """Maps the bus numbers C{i} to bus indices, -1 for unknown buses.
+    """
+    i = i.astype(int)
+    idx = full(len(i), -1)
+    k = (i >= 0) & (i < len(e2i))
+    idx[k] = e2i[i[k]]
+    if (idx < 0).any():
+        sys.stderr.write('psse2ppc: %d %s records with unknown buses '
+                         'ignored\n' % ((idx < 0).sum(), section))
+    return idx
+
+
+def _ratio(cw, windv, nomv, basekv):
+    """Returns the off-nominal turns ratio of a transformer winding.
+    """
+    kv = where(basekv > 0, basekv, 1)
+    windv = where(isnan(windv), where(cw == 2, kv, 1), windv)
+    t = where(cw == 2, windv / kv, windv)
+    return where((cw == 3) & (nomv > 0), t * nomv / kv, t)
+
+
+def _impedance(cz, r, x, sbase, nomv, basekv, baseMVA):
+    """Returns the resistance and reactance of a transformer winding pair
+    in p.u. on the system base.
+    """
+    sbase = where(isnan(sbase) | (sbase <= 0), baseMVA, sbase)
+    ## load loss (W) and impedance magnitude
+    r = where(cz == 3, r / 1e6 / sbase, r)
+    x = where(cz == 3, sqrt(maximum(x**2 - r**2, 0)), x)
+    ## from winding base
+    kv = where(basekv > 0, basekv, 1)
+    s = where(cz == 1, 1, baseMVA / sbase *
+              where(nomv > 0, (nomv / kv)**2, 1))
+    return r * s, x * s
+
+
+def _branches(f, t, r, x, rates, tap, shift, status):
+    """Returns branch data.
+    """
+    branch = zeros((len(f), ANGMAX + 1))
+    branch[:, F_BUS] = f
+    branch[:, T_BUS] = t
+    branch[:, BR_R] = r
+    branch[:, BR_X] = x
+    branch[:, [RATE_A, RATE_B, RATE_C]] = rates
+    branch[:, TAP] = tap
+    branch[:, SHIFT] = shift
+    branch[:, BR_STATUS] = status
+    branch[:, ANGMIN] = -360
+    branch[:, ANGMAX] = 360
+    return branch
+
+
+def _convert(data, names, baseMVA):
+    ##-----  buses  -----
+    b = data['bus']
+    nb = b.shape[0]
+    i2e = b[:, 0].astype(int)
+    e2i = -ones(i2e.max() + 1 if nb else 1, int)
+    e2i[i2e] = arange(nb)
+
+    bus = zeros((nb, VMIN + 1))
+    bus[:, BUS_I] = i2e
+    bus[:, [BASE_KV, BUS_TYPE, BUS_AREA, ZONE, VM, VA, VMAX, VMIN]] = b[:, 1:]
+
+    ## loads at the bus voltage
+    ld = data['load']
+    idx = _index(e2i, ld[:, 0], 'load')
+    k = (idx >= 0) & (ld[:, 1] == 1)
+    idx, ld = idx[k], ld[k]
+    vm = bus[idx, VM]
+    bus[:, PD] = bincount(idx, ld[:, 2] + ld[:, 4] * vm + ld[:, 6] * vm**2, nb)
+    bus[:, QD] = bincount(idx, ld[:, 3] + ld[:, 5] * vm - ld[:, 7] * vm**2, nb)
+
+    ## shunts
+    sh = data['fixed shunt']
+    idx = _index(e2i, sh[:, 0], 'fixed shunt')
+    k = (idx >= 0) & (sh[:, 1] == 1)
+    bus[:, GS] = bincount(idx[k], sh[k, 2], nb)
+    bus[:, BS] = bincount(idx[k], sh[k, 3], nb)
+    sh = data['switched shunt']
+    idx = _index(e2i, sh[:, 0], 'switched shunt')
+    k = (idx >= 0) & (sh[:, 1] == 1)
+    bus[:, BS] += bincount(idx[k], sh[k, 2], nb)
+
+    ##-----  generators  -----
+    g = data['generator']
+    g = g[_index(e2i, g[:, 0], 'generator') >= 0]
+    gen = zeros((g.shape[0], APF + 1))
+    gen[:, [GEN_BUS, PG, QG, QMAX, QMIN, VG]] = g[:, :6]
+    gen[:, MBASE] = where(isnan(g[:, 6]), baseMVA, g[:, 6])
+    gen[:, GEN_STATUS] = g[:, 7] > 0
+    gen[:, PMAX] = g[:, 8]
+    gen[:, PMIN] = g[:, 9]
+
+    ##-----  branches  -----
+    br = data['branch']
+    br[:, 1] = npabs(br[:, 1])      ## metered end
+    br = br[(_index(e2i, br[:, 0], 'branch') >= 0) &
+            (_index(e2i, br[:, 1], 'branch') >= 0)]
+    branches = [_branches(br[:, 0], br[:, 1], br[:, 2], br[:, 3], br[:, 5:8],
+                          0, 0, br[:, 8] > 0)]
+    branches[0][:, BR_B] = br[:, 4]
+
+    ##-----  two-winding transformers  -----
+    x1, x2, w1, w2 = data['transformer'][0]
+    x1[:, 1] = npabs(x1[:, 1])
+    fi = _index(e2i, x1[:, 0], 'transformer')
+    ti = _index(e2i, x1[:, 1], 'transformer')
+    k = (fi >= 0) & (ti >= 0)
+    x1, x2, w1, w2, fi, ti = x1[k], x2[k], w1[k], w2[k], fi[k], ti[k]
+    cw, cz = x1[:, 3], x1[:, 4]
+    kv1, kv2 = bus[fi, BASE_KV], bus[ti, BASE_KV]
+    t1 = _ratio(cw, w1[:, 0], w1[:, 1], kv1)
+    t2 = _ratio(cw, w2[:, 0], w2[:, 1], kv2)
+    r, x = _impedance(cz, x2[:, 0], x2[:, 1], x2[:, 2], w1[:, 1], kv1,
+                      baseMVA)
+    branches.append(_branches(x1[:, 0], x1[:, 1], r * t2**2, x * t2**2,
+                              w1[:, 3:6], t1 / t2, w1[:, 2], x1[:, 8] > 0))
+    _magnetizing(bus, fi, x1, x2[:, 2], x1[:, 8] > 0, baseMVA)
+
+    ##-----  three-winding transformers  -----
+    x1, x2, w1, w2, w3 = data['transformer'][1]
+    for j in (1, 2):
+        x1[:, j] = npabs(x1[:, j])
+    idx = [_index(e2i, x1[:, j], 'transformer') for j in range(3)]
+    k = (idx[0] >= 0) & (idx[1] >= 0) & (idx[2] >= 0)
+    x1, x2, w1, w2, w3 = x1[k], x2[k], w1[k], w2[k], w3[k]
+    idx = [i[k] for i in idx]
+    n3 = x1.shape[0]
+    cw, cz, stat = x1[:, 3], x1[:, 4], x1[:, 8]
+    kv = [bus[i, BASE_KV] for i in idx]
+    w = [w1, w2, w3]
+
+    ## star point buses
+    star = (bus[:, BUS_I].max() + 1 if nb else 1) + arange(n3)
+    sbus = zeros((n3, VMIN + 1))
+    sbus[:, BUS_I] = star
+    sbus[:, BUS_TYPE] = where(stat == 0, NONE, PQ)
+    sbus[:, [BUS_AREA, ZONE, BASE_KV]] = \
+        bus[idx[0]][:, [BUS_AREA, ZONE, BASE_KV]]
+    sbus[:, VM] = x2[:, 9]
+    sbus[:, VA] = x2[:, 10]
+    sbus[:, VMAX] = 1.1
+    sbus[:, VMIN] = 0.9
+    bus = r_[bus, sbus]
+    names = names + [''] * n3
+
+    ## star impedances from those of the winding pairs 1-2, 2-3, 3-1
+    z = [_impedance(cz, x2[:, 3 * p], x2[:, 3 * p + 1], x2[:, 3 * p + 2],
+                    w[p][:, 1], kv[p], baseMVA) for p in range(3)]
+    for p in range(3):
+        q, s = (p + 1) % 3, (p + 2) % 3
+        r = (z[p][0] + z[s][0] - z[q][0]) / 2
+        x = (z[p][1] + z[s][1] - z[q][1]) / 2
+        on = (stat != 0) & (stat != (4, 2, 3)[p])
+        branches.append(_branches(x1[:, p], star, r, x, w[p][:, 3:6],
+                                  _ratio(cw, w[p][:, 0], w[p][:, 1], kv[p]),
+                                  w[p][:, 2], on))
+    _magnetizing(bus, idx[0], x1, x2[:, 2], (stat != 0) & (stat != 4),
+                 baseMVA)
+
+    ##-----  areas  -----
+    areas = data['area'][:, :2]
+
+    return {'version': '2', 'baseMVA': baseMVA, 'bus': bus, 'gen': gen,
+            'branch': r_[tuple(branches)], 'areas': areas, 'bus_name': names}
+
+
+def _magnetizing(bus, idx, x1, sbase, on, baseMVA):
+    """Adds the magnetizing admittance of transformers to the shunts of
+    their winding 1 buses.
+    """
+    cm, g, b = x1[on, 5], x1[on, 6], x1[on, 7]
+    sbase = where(isnan(sbase[on]), baseMVA, sbase[on])
+    ## no load loss (W) and exciting current (p.u.)
+    g = where(cm == 2, g / 1e6 / baseMVA, g)
+    y = b * sbase / baseMVA
+    b = where(cm == 2, -sqrt(maximum(y**2 - g**2, 0)), b)
+    nb = bus.shape[0]
+    bus[:, GS] += bincount(idx[on], g * baseMVA, nb)
+    bus[:, BS] += bincount(idx[on], b * baseMVA, nb)
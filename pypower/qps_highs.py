@@ -0,0 +1,226 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Linear Program Solver based on HiGHS.
+"""
+
+from sys import stdout, stderr
+
+from numpy import Inf, NaN, ones, zeros, r_, c_, dot, finfo, abs, \
+    minimum, maximum, array
+from numpy import flatnonzero as find
+
+from scipy.sparse import issparse, vstack, csr_matrix as sparse
+
+
+EPS = finfo(float).eps
+
+
+def qps_highs(H, c, A, l, u, xmin=None, xmax=None, x0=None, opt=None):
+    """Linear Program Solver based on HiGHS.
+
+    A wrapper function providing a PYPOWER standardized interface for using
+    the HiGHS solvers shipped with SciPy (C{scipy.optimize.linprog} with
+    C{method='highs'} and C{scipy.optimize.milp}) to solve the following
+    LP (linear programming) or MILP (mixed-integer linear programming)
+    problem::
+
+        min c'*x
+         x
+
+    subject to::
+
+        l <= A*x <= u       (linear constraints)
+        xmin <= x <= xmax   (variable bounds)
+
+    HiGHS is not available for QPs through SciPy, so C{H} must be empty or
+    all zero.
+
+    Inputs (all optional except C{H}, C{c}, C{A} and C{l}):
+        - C{H} : matrix (possibly sparse) of quadratic cost coefficients,
+        must be all zero
+        - C{c} : vector of linear cost coefficients
+        - C{A, l, u} : define the optional linear constraints. Default
+        values for the elements of C{l} and C{u} are -Inf and Inf,
+        respectively.
+        - C{xmin}, C{xmax} : optional lower and upper bounds on the
+        C{x} variables, defaults are -Inf and Inf, respectively.
+        - C{x0} : optional starting value of optimization vector C{x},
+        ignored by HiGHS
+        - C{opt} : optional options dict with the following keys, all of
+        which are also optional (default values shown in parentheses)
+            - C{verbose} (0) - controls level of progress output displayed
+                - 0 = no progress output
+                - 1 = some progress output
+                - 2 = verbose progress output
+            - C{vtype} ('C') - string or list with the type of each
+            variable, 'C' (continuous), 'I' (integer) or 'B' (binary),
+            a single value applies to all variables
+            - C{highs_opt} - options dict passed to the SciPy HiGHS
+            interface, e.g. C{time_limit}, C{presolve}, value in
+            C{verbose} overrides the C{disp} option
+
+    Outputs:
+        - C{x} : solution vector
+        - C{f} : final objective function value
+        - C{exitflag} : exit flag
+            - 1 = converged
+            - 0 or negative values = negative of the SciPy status code
+        - C{output} : output dict with keys
+            - C{status} - SciPy status code
+            - C{message} - SciPy exit message
+            - C{mip} - C{True} if the problem had integer variables
+        - C{lmbda} : dict containing the Langrange and Kuhn-Tucker
+        multipliers on the constraints, with keys:
+            - C{mu_l} - lower (left-hand) limit on linear constraints
+            - C{mu_u} - upper (right-hand) limit on linear constraints
+            - C{lower} - lower bound on optimization variables
+            - C{upper} - upper bound on optimization variables
+
+    For a MILP the multipliers are those of the LP obtained by fixing the
+    integer variables at their optimal values.
+
+    @see: L{qps_pypower}
+    """
+    from scipy.optimize import linprog, milp, Bounds, LinearConstraint
+
+    ##----- input argument handling  -----
+    ## gather inputs
+    if isinstance(H, dict):       ## problem struct
+        p = H
+        if 'opt' in p: opt = p['opt']
+        if 'xmax' in p: xmax = p['xmax']
+        if 'xmin' in p: xmin = p['xmin']
+        if 'u' in p: u = p['u']
+        if 'l' in p: l = p['l']
+        if 'A' in p: A = p['A']
+        if 'c' in p: c = p['c']
+        H = p['H'] if 'H' in p else None
+    else:                         ## individual args
+        assert c is not None
+
+    if opt is None:
+        opt = {}
+
+    ## define nx, set default values for missing optional inputs
+    nx = len(c)
+    if H is not None and H.shape[0] > 0 and abs(H).sum() > 0:
+        stderr.write('qps_highs: HiGHS (via SciPy) cannot solve QPs, '
+                     'H must be all zero\n')
+        lmbda = {'mu_l': NaN * ones(0 if A is None else A.shape[0]),
+                 'mu_u': NaN * ones(0 if A is None else A.shape[0]),
+                 'lower': NaN * ones(nx), 'upper': NaN * ones(nx)}
+        return NaN * ones(nx), NaN, -1, \
+            {'status': -1, 'message': 'QP not supported', 'mip': False}, \
+            lmbda
+
+    if A is None or A.shape[0] == 0:
+        A = sparse((0, nx))
+    elif not issparse(A):
+        A = sparse(A)
+    nA = A.shape[0]                 ## number of original linear constraints
+    if l is None or len(l) == 0:
+        l = -Inf * ones(nA)
+    if u is None or len(u) == 0:
+        u = Inf * ones(nA)
+    if xmin is None or len(xmin) == 0:
+        xmin = -Inf * ones(nx)
+    if xmax is None or len(xmax) == 0:
+        xmax = Inf * ones(nx)
+
+    ## default options
+    verbose = opt.get('verbose', 0)
+    vtype = opt.get('vtype', 'C')
+    if len(vtype) == 1:
+        vtype = vtype * nx
+    highs_opt = dict(opt.get('highs_opt', {}))
+    highs_opt['disp'] = verbose > 1
+
+    ## split up linear constraints
+    ieq = find( abs(u - l) <= EPS )                         ## equality
+    iu  = find( (abs(u - l) > EPS) & (u <  1e10) )          ## upper bounded
+    il  = find( (abs(u - l) > EPS) & (l > -1e10) )          ## lower bounded
+    Aub = vstack([A[iu, :], -A[il, :]], 'csr') if len(iu) + len(il) else None
+    bub = r_[u[iu], -l[il]]
+    Aeq = A[ieq, :] if len(ieq) else None
+    beq = u[ieq]
+
+    ## integer variables, binaries are integers in [0, 1]
+    vtype = array(list(vtype))
+    iint = find((vtype == 'I') | (vtype == 'B'))
+    ib = find(vtype == 'B')
+    lb = xmin.copy()
+    ub = xmax.copy()
+    lb[ib] = maximum(lb[ib], 0)
+    ub[ib] = minimum(ub[ib], 1)
+
+    mip = len(iint) > 0
+    if verbose:
+        stdout.write('HiGHS (via SciPy) -- %s solver\n' %
+                     ('MILP' if mip else 'LP'))
+
+    if mip:
+        integrality = zeros(nx)
+        integrality[iint] = 1
+        res = milp(c, integrality=integrality, bounds=Bounds(lb, ub),
+                   constraints=LinearConstraint(A, l, u) if nA else None,
+                   options={k: v for k, v in highs_opt.items()
+                            if k in ('disp', 'presolve', 'time_limit',
+                                     'node_limit', 'mip_rel_gap')})
+        output = {'status': res.status, 'message': res.message, 'mip': True}
+        if res.status != 0 or res.x is None:
+            lmbda = {'mu_l': zeros(nA), 'mu_u': zeros(nA),
+                     'lower': zeros(nx), 'upper': zeros(nx)}
+            x = NaN * ones(nx) if res.x is None else res.x
+            return x, NaN if res.fun is None else res.fun, \
+                -max(res.status, 1), output, lmbda
+
+        ## fix the integer variables, re-solve the LP for the multipliers
+        lb[iint] = ub[iint] = res.x[iint].round()
+        x_mip = res.x
+
+    bounds = c_[lb, ub]
+    res_lp = linprog(c, A_ub=Aub, b_ub=bub if Aub is not None else None,
+                     A_eq=Aeq, b_eq=beq if Aeq is not None else None,
+                     bounds=bounds, method='highs',
+                     options={k: v for k, v in highs_opt.items()
+                              if k not in ('node_limit', 'mip_rel_gap')})
+    if not mip:
+        output = {'status': res_lp.status, 'message': res_lp.message,
+                  'mip': False, 'nit': res_lp.nit}
+
+    mu_l = zeros(nA)
+    mu_u = zeros(nA)
+    lower = zeros(nx)
+    upper = zeros(nx)
+    if res_lp.status == 0:
+        x = res_lp.x
+        f = dot(c, x)
+        eflag = 1
+
+        ## marginals are sensitivities of f to the right-hand sides,
+        ## non-positive for <= constraints, free for equalities
+        nu = len(iu)
+        if Aub is not None:
+            mu_u[iu] = -res_lp.ineqlin.marginals[:nu]
+            mu_l[il] = -res_lp.ineqlin.marginals[nu:]
+        if Aeq is not None:
+            y = -res_lp.eqlin.marginals
+            mu_u[ieq[y > 0]] = y[y > 0]
+            mu_l[ieq[y < 0]] = -y[y < 0]
+        lower = res_lp.lower.marginals.copy()
+        upper = -res_lp.upper.marginals
+    elif mip:
+        ## duals not available, keep the MILP solution
+        x = x_mip
+        f = dot(c, x)
+        eflag = 1
+    else:
+        x = NaN * ones(nx) if res_lp.x is None else res_lp.x
+        f = NaN
+        eflag = -res_lp.status
+
+    lmbda = {'mu_l': mu_l, 'mu_u': mu_u, 'lower': lower, 'upper': upper}
+
+    return x, f, eflag, output, lmbda
@@ -8,10 +8,6 @@
 import sys
 
 from pypower.qps_pips import qps_pips
-from pypower.qps_ipopt import qps_ipopt
-from pypower.qps_cplex import qps_cplex
-from pypower.qps_mosek import qps_mosek
-from pypower.qps_gurobi import qps_gurobi
 
 from pypower.util import have_fcn
 
@@ -44,7 +40,7 @@ def qps_pypower(H, c=None, A=None, l=None, u=None, xmin=None, xmax=None,
         all of which are also optional (default values shown in parentheses)
             - C{alg} (0) - determines which solver to use
                 -   0 = automatic, first available of BPMPD_MEX, CPLEX,
-                        Gurobi, PIPS
+                        Gurobi, HiGHS (LP only), PIPS
                 - 100 = BPMPD_MEX
                 - 200 = PIPS, Python Interior Point Solver
                 pure Python implementation of a primal-dual
@@ -55,6 +51,7 @@ def qps_pypower(H, c=None, A=None, l=None, u=None, xmin=None, xmax=None,
                 - 500 = CPLEX
                 - 600 = MOSEK
                 - 700 = Gurobi
+                - 800 = HiGHS (via SciPy), LP and MILP only
             - C{verbose} (0) - controls level of progress output displayed
                 - 0 = no progress output
                 - 1 = some progress output
@@ -67,6 +64,7 @@ def qps_pypower(H, c=None, A=None, l=None, u=None, xmin=None, xmax=None,
             - C{ipopt_opt} - options dict for IPOPT
             - C{pips_opt}  - options dict for L{qps_pips}
             - C{mosek_opt} - options dict for MOSEK
+            - C{highs_opt} - options dict for L{qps_highs}
             - C{ot_opt}    - options dict for QUADPROG/LINPROG
         - C{problem} : The inputs can alternatively be supplied in a single
         C{problem} dict with fields corresponding to the input arguments
@@ -127,7 +125,7 @@ def qps_pypower(H, c=None, A=None, l=None, u=None, xmin=None, xmax=None,
         if 'l' in p: l = p['l']
         if 'A' in p: A = p['A']
         if 'c' in p: c = p['c']
-        if 'H' in p: H = p['H']
+        H = p['H'] if 'H' in p else None
     else:                         ## individual args
 #        assert H is not None  zero dimensional sparse matrices not supported
         assert c is not None
@@ -161,6 +159,9 @@ def qps_pypower(H, c=None, A=None, l=None, u=None, xmin=None, xmax=None,
             alg = 600
         elif have_fcn('gurobipy'):   ## if not, then Gurobi, if available
             alg = 700
+        elif have_fcn('highs') and (H is None or H.shape[0] == 0 or
+                                    abs(H).sum() == 0):
+            alg = 800                ## if not, then HiGHS for an LP
         else:                        ## otherwise PIPS
             alg = 200
 
@@ -186,17 +187,25 @@ def qps_pypower(H, c=None, A=None, l=None, u=None, xmin=None, xmax=None,
         x, f, eflag, output, lmbda = \
             qps_pips(H, c, A, l, u, xmin, xmax, x0, pips_opt)
     elif alg == 400:                    ## use IPOPT
+        from pypower.qps_ipopt import qps_ipopt
         x, f, eflag, output, lmbda = \
             qps_ipopt(H, c, A, l, u, xmin, xmax, x0, opt)
     elif alg == 500:                    ## use CPLEX
+        from pypower.qps_cplex import qps_cplex
         x, f, eflag, output, lmbda = \
             qps_cplex(H, c, A, l, u, xmin, xmax, x0, opt)
     elif alg == 600:                    ## use MOSEK
+        from pypower.qps_mosek import qps_mosek
         x, f, eflag, output, lmbda = \
             qps_mosek(H, c, A, l, u, xmin, xmax, x0, opt)
-    elif 700:                           ## use Gurobi
+    elif alg == 700:                    ## use Gurobi
+        from pypower.qps_gurobi import qps_gurobi
         x, f, eflag, output, lmbda = \
             qps_gurobi(H, c, A, l, u, xmin, xmax, x0, opt)
+    elif alg == 800:                    ## use HiGHS
+        from pypower.qps_highs import qps_highs
+        x, f, eflag, output, lmbda = \
+            qps_highs(H, c, A, l, u, xmin, xmax, x0, opt)
     else:
         sys.stderr.write('qps_pypower: %d is not a valid algorithm code\n', alg)
 
@@ -0,0 +1,177 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Exports power flow results to CSV, NPZ or JSON-lines files.
+"""
+
+import json
+
+from os.path import exists, getsize, splitext
+from zipfile import ZipFile, ZIP_DEFLATED
+
+from numpy import array, asarray, c_, full, isfinite, savetxt
+from numpy.lib.format import write_array
+
+from pypower import idx_bus, idx_gen, idx_brch
+
+
+def _columns(module, exclude=()):
+    """Returns the names of the column index constants of C{module}, in
+    column order.
+    """
+    cols = [(v, k) for k, v in vars(module).items()
+            if k.isupper() and isinstance(v, int) and k not in exclude]
+    return [k for _, k in sorted(cols)]
+
+
+## names of the columns of the bus, gen and branch matrices
+COLUMNS = {
+    'bus':      _columns(idx_bus, ('PQ', 'PV', 'REF', 'NONE')),
+    'gen':      _columns(idx_gen),
+    'branch':   _columns(idx_brch)
+}
+
+## file name extensions of the export formats
+FORMATS = {'.csv': 'csv', '.npz': 'npz', '.jsonl': 'jsonl', '.json': 'jsonl'}
+
+
+def results_export(results, fname, fmt=None, append=False, step=None,
+                   prec=10):
+    """Exports power flow results to CSV, NPZ or JSON-lines files.
+
+    Writes the C{bus}, C{gen} and C{branch} matrices of the solved
+    C{results} dict returned by L{runpf}, L{runopf}, etc. as tables with
+    named columns, the names being those of the column index constants of
+    L{idx_bus}, L{idx_gen} and L{idx_brch} (e.g. C{BUS_I}, C{PD}, C{VM}),
+    along with a C{summary} of the scalar results C{baseMVA}, C{success},
+    C{et} and C{f} (OPF only). The format C{fmt} is one of:
+        - C{'csv'}      one CSV file per table, named C{<root>_bus.csv},
+                        C{<root>_gen.csv}, C{<root>_branch.csv} and
+                        C{<root>_summary.csv}, where C{<root>} is C{fname}
+                        without its C{.csv} extension
+        - C{'npz'}      a compressed NumPy C{.npz} file, with the matrices
+                        as C{bus}, C{gen} and C{branch}, the names of their
+                        columns as C{bus_columns}, etc. and the scalars as
+                        C{baseMVA}, C{success}, C{et} and C{f}
+        - C{'jsonl'}    a JSON-lines file with one object per bus, gen and
+                        branch, its C{table} key giving the table
+    and by default is given by the extension of C{fname}. For C{'jsonl'},
+    C{fname} can also be an open file.
+
+    If C{append} is true the results are appended to existing files, e.g.
+    for the steps of a time-series run, whose number can be given in
+    C{step}. For CSV and JSON-lines a C{STEP} column (key) is then added,
+    and the header row of a CSV file is only written if the file is new.
+    In an NPZ file the arrays of the C{n}-th appended results are named
+    with a C{_<n>} suffix (C{bus_0}, C{bus_1}, ...) and C{step} is saved
+    as C{step_<n>}.
+
+    Numbers are written to text files with C{prec} significant digits.
+    The tables are written with bulk NumPy I/O (C{savetxt}, C{write_array}).
+
+    Returns the list of names of the files written.
+
+    @see: L{printpf}, L{savecase}
+    """
+    if fmt is None:
+        fmt = FORMATS.get(splitext(fname)[1].lower())
+        if fmt is None:
+            raise ValueError('results_export: unknown format of file %s' %
+                             fname)
+
+    summary = {'baseMVA': float(results['baseMVA']),
+               'success': bool(results['success']),
+               'et': float(results['et'])}
+    if results.get('f') is not None:
+        summary['f'] = float(results['f'])
+
+    tables = []
+    for t in ('bus', 'gen', 'branch'):
+        A = asarray(results[t], float)
+        names = COLUMNS[t][:A.shape[1]]
+        names += ['C%d' % k for k in range(len(names), A.shape[1])]
+        tables.append((t, A, names))
+
+    if fmt == 'csv':
+        return _csv(fname, tables, summary, append, step, prec)
+    elif fmt == 'npz':
+        return _npz(fname, tables, summary, append, step)
+    elif fmt == 'jsonl':
+        return _jsonl(fname, tables, summary, append, step, prec)
+    else:
+        raise ValueError('results_export: unknown format %r' % fmt)
+
+
+def _csv(fname, tables, summary, append, step, prec):
+    root = fname[:-4] if fname.lower().endswith('.csv') else fname
+    tables = tables + [('summary', array([list(summary.values())], float),
+                        list(summary.keys()))]
+
+    files = []
+    for t, A, names in tables:
+        if step is not None:
+            A = c_[full(A.shape[0], step), A]
+            names = ['STEP'] + names
+        fn = '%s_%s.csv' % (root, t)
+        header = not (append and exists(fn) and getsize(fn) > 0)
+        with open(fn, 'a' if append else 'w') as fd:
+            savetxt(fd, A, '%%.%dg' % prec, ',', comments='',
+                    header=','.join(names) if header else '')
+        files.append(fn)
+
+    return files
+
+
+def _npz(fname, tables, summary, append, step):
+    arrays = [(t, A) for t, A, _ in tables]
+    arrays += [(k, array(v)) for k, v in summary.items()]
+    if step is not None:
+        arrays.append(('step', array(step)))
+
+    mode = 'a' if append and exists(fname) else 'w'
+    with ZipFile(fname, mode, ZIP_DEFLATED, allowZip64=True) as zf:
+        members = zf.namelist()
+        if append:
+            n = len([m for m in members if m.startswith('baseMVA')])
+            arrays = [('%s_%d' % (k, n), A) for k, A in arrays]
+        arrays += [(t + '_columns', array(names)) for t, _, names in tables
+                   if t + '_columns.npy' not in members]
+        for k, A in arrays:
+            with zf.open(k + '.npy', 'w', force_zip64=True) as fd:
+                write_array(fd, A, allow_pickle=False)
+
+    return [fname]
+
+
+def _jsonl(fname, tables, summary, append, step, prec):
+    if hasattr(fname, 'write'):
+        _jsonl_write(fname, tables, summary, step, prec)
+        return []
+
+    with open(fname, 'a' if append else 'w') as fd:
+        _jsonl_write(fd, tables, summary, step, prec)
+    return [fname]
+
+
+def _jsonl_write(fd, tables, summary, step, prec):
+    for t, A, names in tables:
+        if step is not None:
+            A = c_[full(A.shape[0], step), A]
+            names = ['STEP'] + names
+        if A.shape[0] == 0:
+            continue
+        if isfinite(A).all():
+            ## one row template, formatted by savetxt
+            row = ', '.join(['"%s": %%.%dg' % (k, prec) for k in names])
+            savetxt(fd, A, '{"table": "%s", %s}' % (t, row))
+        else:
+            ## json writes NaN and Infinity
+            fd.write(''.join([json.dumps(dict([('table', t)] +
+                                              list(zip(names, a)))) + '\n'
+                              for a in A.tolist()]))
+
+    s = dict(summary)
+    if step is not None:
+        s['STEP'] = step
+    fd.write(json.dumps(dict([('table', 'summary')] + list(s.items()))) + '\n')
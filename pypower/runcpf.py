@@ -7,7 +7,7 @@ from os.path import dirname, join
 
 from time import time
 
-from numpy import c_, r_, ix_, zeros, pi, ones, exp, linalg, angle, inf, nan, full
+from numpy import c_, r_, ix_, zeros, pi, ones, exp, bincount
 from numpy import flatnonzero as find
 
 from pypower.bustypes import bustypes
@@ -18,17 +18,15 @@ from pypower.makeYbus import makeYbus
 from pypower.newtonpf import newtonpf
 from pypower.ppoption import ppoption
 from pypower.ppver import ppver
-from pypower.cpf_predictor import cpf_predictor
-from pypower.cpf_corrector import cpf_corrector
+from pypower.cpf_trace import cpf_trace
 from pypower.pfsoln import pfsoln
-from pypower.i2e_data import i2e_data
 from pypower.int2ext import int2ext
 from pypower.printpf import printpf
 from pypower.savecase import savecase
 
-from pypower.idx_bus import VM, VA, PD, QD
-from pypower.idx_brch import PF, PT, QF, QT
-from pypower.idx_gen import PG, QG, VG, GEN_BUS, GEN_STATUS
+from pypower.idx_bus import VM, VA, PD, QD, VMAX, VMIN
+from pypower.idx_brch import F_BUS, T_BUS, RATE_A, PF, PT, QF, QT
+from pypower.idx_gen import PG, QG, VG, GEN_BUS, GEN_STATUS, QMAX, QMIN
 
 import pypower.cpf_callbacks as cpf_callbacks
 
@@ -44,10 +42,6 @@ def runcpf(basecasedata=None, targetcasedata=None, ppopt=None, fname='', solvedc
 
     # options
     verbose = ppopt["VERBOSE"]
-    step = ppopt["CPF_STEP"]
-    parameterization = ppopt["CPF_PARAMETERIZATION"]
-    adapt_step = ppopt["CPF_ADAPT_STEP"]
-    cb_args = ppopt["CPF_USER_CALLBACK_ARGS"]
 
     # set up callbacks
     callback_names = ["cpf_default_callback"]
@@ -62,7 +56,6 @@ def runcpf(basecasedata=None, targetcasedata=None, ppopt=None, fname='', solvedc
 
     # read base case data
     ppcbase = loadcase(basecasedata)
-    nb = ppcbase["bus"].shape[0]
 
     # add zero columns to branch for flows if needed
     if ppcbase["branch"].shape[1] < QT:
@@ -135,18 +128,12 @@ def runcpf(basecasedata=None, targetcasedata=None, ppopt=None, fname='', solvedc
     else:
         ppopt_pf = ppoption(ppopt, VERBOSE=max(0, verbose-2))
 
-    lam = 0
     V, success, iterations = newtonpf(Ybus, Sbusb, V0, ref, pv, pq, ppopt_pf)
     if verbose > 2:
         print('step %3d : lambda = %6.3f\n' % (0, 0))
     elif verbose > 1:
         print('step %3d : lambda = %6.3f, %2d Newton steps\n' % (0, 0, iterations))
 
-    lamprv = lam    # lam at previous step
-    Vprv = V    # V at previous step
-    continuation = 1
-    cont_steps = 0
-
     # input args for callbacks
     cb_data = {
         "ppc_base": ppcbase,
@@ -160,117 +147,34 @@ def runcpf(basecasedata=None, targetcasedata=None, ppopt=None, fname='', solvedc
         "pq": pq,
         "ppopt": ppopt
     }
-    cb_state = {}
-
-    # invoke callbacks
-    for k in range(len(callbacks)):
-        cb_state, _ = callbacks[k](cont_steps, V, lam, V, lam,
-                                   cb_data, cb_state, cb_args)
-
-    if linalg.norm(Sxfr) == 0:
-        if verbose:
-            print('base case and target case have identical load and generation\n')
-
-        continuation = 0
-        V0 = V
-        lam0 = lam
-
-    # tangent predictor z = [dx;dlam]
-    z = zeros(2*len(V)+1)
-    z[-1] = 1.0
-    while continuation:
-        cont_steps = cont_steps + 1
-        # prediction for next step
-        V0, lam0, z = cpf_predictor(V, lam, Ybus, Sxfr, pv, pq, step, z,
-                                    Vprv, lamprv, parameterization)
-
-        # save previous voltage, lambda before updating
-        Vprv = V
-        lamprv = lam
-
-        # correction
-        V, success, i, lam = cpf_corrector(Ybus, Sbusb, V0, ref, pv, pq,
-                                           lam0, Sxfr, Vprv, lamprv, z, step, parameterization, ppopt_pf)
-
-        if not success:
-            continuation = 0
-            if verbose:
-                print('step %3d : lambda = %6.3f, corrector did not converge in %d iterations\n' % (
-                    cont_steps, lam, i))
-            break
-
-        if verbose > 2:
-            print('step %3d : lambda = %6.3f\n' % (cont_steps, lam))
-        elif verbose > 1:
-            print('step %3d : lambda = %6.3f, %2d corrector Newton steps\n' %
-                  (cont_steps, lam, i))
-
-        # invoke callbacks
-        for k in range(len(callbacks)):
-            cb_state, _ = callbacks[k](cont_steps, V, lam, V0, lam0,
-                                       cb_data, cb_state, cb_args)
-
-        if isinstance(ppopt["CPF_STOP_AT"], str):
-            if ppopt["CPF_STOP_AT"].upper() == "FULL":
-                if abs(lam) < 1e-8:     # traced the full continuation curve
-                    if verbose:
-                        print(
-                            '\nTraced full continuation curve in %d continuation steps\n' % cont_steps)
-                    continuation = 0
-                elif lam < lamprv and lam - step < 0:    # next step will overshoot
-                    step = lam      # modify step-size
-                    parameterization = 1    # change to natural parameterization
-                    adapt_step = False      # disable step-adaptivity
-
-            else:   # == 'NOSE'
-                if lam < lamprv:    # reached the nose point
-                    if verbose:
-                        print(
-                            '\nReached steady state loading limit in %d continuation steps\n' % cont_steps)
-                    continuation = 0
 
+    # limits watched during the continuation
+    lims = {}
+    if ppopt["CPF_ENFORCE_Q_LIMS"]:
+        nb = busb.shape[0]
+        lims["Qmax"] = bincount(gbusb, genb[onb, QMAX], nb) / baseMVAb
+        lims["Qmin"] = bincount(gbusb, genb[onb, QMIN], nb) / baseMVAb
+        lims["Qd"] = busb[:, QD] / baseMVAb
+        lims["dQd"] = (bust[:, QD] - busb[:, QD]) / baseMVAb
+    if ppopt["CPF_ENFORCE_V_LIMS"]:
+        lims["Vmin"] = busb[:, VMIN]
+        lims["Vmax"] = busb[:, VMAX]
+    if ppopt["CPF_ENFORCE_FLOW_LIMS"]:
+        lims["Yf"], lims["Yt"] = Yf, Yt
+        lims["f"] = branchb[:, F_BUS].astype(int)
+        lims["t"] = branchb[:, T_BUS].astype(int)
+        lims["Smax"] = branchb[:, RATE_A] / baseMVAb
+
+    # trace the continuation curve
+    V, lam, success, cpf_results = cpf_trace(Ybus, Sbusb, Sxfr, V, ref, pv, pq,
+                                             ppopt, callbacks, cb_data, lims)
+
+    # limits reached, with external bus numbers and branch indices
+    for ev in cpf_results.get("events", []):
+        if ev["type"] == "FLOW":
+            ev["idx"] = ppctarget["order"]["branch"]["status"]["on"][ev["idx"]]
         else:
-            if lam < lamprv:
-                if verbose:
-                    print(
-                        '\nReached steady state loading limit in %d continuation steps\n' % cont_steps)
-                continuation = 0
-            elif abs(ppopt["CPF_STOP_AT"] - lam) < 1e-8:     # reached desired lambda
-                if verbose:
-                    print('\nReached desired lambda %3.2f in %d continuation steps\n' % (
-                        ppopt["CPF_STOP_AT"], cont_steps))
-                continuation = 0
-            # will reach desired lambda in next step
-            elif lam + step > ppopt["CPF_STOP_AT"]:
-                step = ppopt["CPF_STOP_AT"] - lam   # modify step-size
-                parameterization = 1    # change to natural parameterization
-                adapt_step = False      # disable step-adaptivity
-
-        if adapt_step and continuation:
-            pvpq = r_[pv, pq]
-            # Adapt stepsize
-            cpf_error = linalg.norm(r_[angle(V[pq]), abs(
-                V[pvpq]), lam] - r_[angle(V0[pq]), abs(V0[pvpq]), lam0], inf)
-            if cpf_error < ppopt["CPF_ERROR_TOL"]:
-                # Increase stepsize
-                step = step * ppopt["CPF_ERROR_TOL"] / cpf_error
-                if step > ppopt["CPF_STEP_MAX"]:
-                    step = ppopt["CPF_STEP_MAX"]
-            else:
-                # decrese stepsize
-                step = step * ppopt["CPF_ERROR_TOL"] / cpf_error
-                if step < ppopt["CPF_STEP_MIN"]:
-                    step = ppopt["CPF_STEP_MIN"]
-
-    # invoke callbacks
-    if success:
-        cpf_results = {}
-        for k in range(len(callbacks)):
-            cb_state, cpf_results = callbacks[k](cont_steps, V, lam, V0, lam0,
-                                                 cb_data, cb_state, cb_args, results=cpf_results, is_final=True)
-    else:
-        cpf_results = {}
-        cpf_results["iterations"] = i
+            ev["idx"] = int(ppctarget["order"]["bus"]["i2e"][ev["idx"]])
 
     # update bus and gen matrices to reflect the loading and generation
     # at the noise point
@@ -288,12 +192,6 @@ def runcpf(basecasedata=None, targetcasedata=None, ppopt=None, fname='', solvedc
     # -----  output results  -----
     # convert back to original bus numbering & print results
     ppctarget["bus"], ppctarget["gen"], ppctarget["branch"] = bust, gent, brancht
-    if success:
-        n = cpf_results["iterations"] + 1
-        cpf_results["V_p"] = i2e_data(
-            ppctarget, cpf_results["V_p"], full((nb, n), nan), "bus", 0)
-        cpf_results["V_c"] = i2e_data(
-            ppctarget, cpf_results["V_c"], full((nb, n), nan), "bus", 0)
     results = int2ext(ppctarget)
     results["cpf"] = cpf_results
 
@@ -0,0 +1,167 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Runs continuation power flows of one base case in several directions.
+"""
+
+from sys import stdout
+from os.path import dirname, join
+from time import time
+
+from multiprocessing import Pool, cpu_count
+
+from numpy import array, zeros, full, ones, pi, exp, nan, iscomplexobj
+from numpy import flatnonzero as find
+
+from pypower.loadcase import loadcase
+from pypower.ppoption import ppoption
+from pypower.ext2int import ext2int
+from pypower.bustypes import bustypes
+from pypower.makeYbus import makeYbus
+from pypower.makeSbus import makeSbus
+from pypower.newtonpf import newtonpf
+from pypower.cpf_trace import cpf_trace
+
+from pypower.idx_bus import VM, VA
+from pypower.idx_gen import GEN_BUS, GEN_STATUS, VG
+
+
+def runcpf_multi(basecasedata=None, directions=None, ppopt=None, workers=1):
+    """Runs continuation power flows of one base case in several directions.
+
+    Loads the base case, converts it to internal indexing and computes its
+    bus admittance matrix, bus types and power flow solution once, then
+    traces one continuation curve (see L{runcpf}) from this solution for
+    each entry of C{directions}, which is either a target case (a case dict
+    or the name of a case file, with the same buses as the base case) or a
+    complex vector C{Sxfr} of bus injection transfers in p.u., in the form
+    of the bus injections returned by L{makeSbus}, with one element per
+    row of the bus matrix of the base case. The continuations are run
+    concurrently in a pool of C{workers} processes (0 means one per CPU).
+
+    The C{CPF_*} options in C{ppopt} apply to each continuation, except for
+    the callback, plotting, trace and C{CPF_ENFORCE_*} limit options. By
+    default, each continuation stops at its nose point.
+
+    Returns a dict with one element (or column) per direction:
+        - C{max_lam}    maximum value of lambda reached
+        - C{V}          C{nb x nd} complex bus voltages at the point with the
+                        maximum lambda (NaN for buses not in the internal case)
+        - C{steps}      number of continuation steps
+        - C{success}    C{True} if no corrector failed
+    along with the base case power flow solution in C{V0}, the success flag
+    of the base case power flow in C{base_success} and the elapsed time
+    in C{et}.
+
+    @see: L{runcpf}, L{cpf_trace}
+    """
+    t0 = time()
+    if basecasedata is None:
+        basecasedata = join(dirname(__file__), 'case9')
+    if directions is None:
+        directions = [join(dirname(__file__), 'case9target')]
+    ppopt = ppoption(ppopt)
+    verbose = ppopt["VERBOSE"]
+    ppopt_pf = ppoption(ppopt, VERBOSE=max(0, verbose - 2))
+    ppopt_cpf = ppoption(ppopt, VERBOSE=0)
+    nw = workers if workers > 0 else cpu_count()
+
+    ##-----  prepare the base case once  -----
+    ppc = ext2int(loadcase(basecasedata))
+    baseMVA, bus, gen, branch = \
+        ppc["baseMVA"], ppc["bus"], ppc["gen"], ppc["branch"]
+    on_bus = ppc["order"]["bus"]["status"]["on"]
+    nb0 = ppc["order"]["ext"]["bus"].shape[0]
+
+    ref, pv, pq = bustypes(bus, gen)
+    on = find(gen[:, GEN_STATUS] > 0)
+    gbus = gen[on, GEN_BUS].astype(int)
+
+    V0 = bus[:, VM] * exp(1j * pi/180 * bus[:, VA])
+    vcb = ones(V0.shape)
+    vcb[pq] = 0
+    k = find(vcb[gbus])
+    V0[gbus[k]] = gen[on[k], VG] / abs(V0[gbus[k]]) * V0[gbus[k]]
+
+    Ybus, _, _ = makeYbus(baseMVA, bus, branch)
+    Sbus = makeSbus(baseMVA, bus, gen)
+    V, base_success, _ = newtonpf(Ybus, Sbus, V0, ref, pv, pq, ppopt_pf)
+
+    ##-----  transfer vectors, in internal indexing  -----
+    tasks = []
+    for d in directions:
+        if isinstance(d, (dict, str)):
+            ppct = ext2int(loadcase(d))
+            if ppct["bus"].shape[0] != bus.shape[0]:
+                raise ValueError('runcpf_multi: target case must have the '
+                                 'same buses as the base case')
+            Sxfr = makeSbus(ppct["baseMVA"], ppct["bus"], ppct["gen"]) - Sbus
+        else:
+            d = array(d)
+            if d.shape != (nb0,):
+                raise ValueError('runcpf_multi: transfer vector must have '
+                                 'one element per bus')
+            Sxfr = d[on_bus] if iscomplexobj(d) else d[on_bus] + 0j
+        tasks.append((Ybus, Sbus, Sxfr, V, ref, pv, pq, ppopt_cpf))
+
+    ##-----  continuations  -----
+    if nw > 1 and len(tasks) > 1:
+        pool = Pool(min(nw, len(tasks)))
+        res = pool.map(_cpf_direction, tasks)
+        pool.close()
+        pool.join()
+    else:
+        res = [_cpf_direction(task) for task in tasks]
+
+    nd = len(tasks)
+    results = {
+        'max_lam': zeros(nd),
+        'V': full((nb0, nd), nan, complex),
+        'steps': zeros(nd, int),
+        'success': zeros(nd, bool),
+        'V0': full(nb0, nan, complex),
+        'base_success': base_success
+    }
+    results['V0'][on_bus] = V
+    for d, (success, cpf) in enumerate(res):
+        results['max_lam'][d] = cpf['max_lam']
+        results['V'][on_bus, d] = cpf['V']
+        results['steps'][d] = cpf['iterations']
+        results['success'][d] = success
+
+    results['et'] = time() - t0
+    if verbose:
+        stdout.write('\n direction   max lambda   steps   min |V|\n')
+        stdout.write('-----------  ----------  -------  -------\n')
+        for d in range(nd):
+            stdout.write('%7d      %10.4f  %7d  %7.4f%s\n' % (d + 1,
+                results['max_lam'][d], results['steps'][d],
+                abs(results['V'][on_bus, d]).min(),
+                '' if results['success'][d] else '  (corrector failed)'))
+
+    return results
+
+
+def _cpf_direction(args):
+    """Traces the continuation curve in one direction for L{runcpf_multi}.
+    """
+    Ybus, Sbus, Sxfr, V, ref, pv, pq, ppopt = args
+    nose = {}
+    _, _, success, _ = cpf_trace(Ybus, Sbus, Sxfr, V, ref, pv, pq, ppopt,
+                                 [_nose_callback], nose)
+    return success, nose
+
+
+def _nose_callback(k, V_c, lam_c, V_p, lam_p, cb_data, cb_state, cb_args,
+                   results=None, is_final=False):
+    """Callback for L{cpf_trace}, keeps the point with the maximum lambda
+    and the number of steps in C{cb_data}, so that they are available even
+    if a corrector fails.
+    """
+    if not is_final:
+        if k == 0 or lam_c > cb_data['max_lam']:
+            cb_data['max_lam'] = lam_c
+            cb_data['V'] = V_c
+        cb_data['iterations'] = k
+    return cb_state, results
@@ -14,6 +14,9 @@ from pypower.runopf import runopf
 def rundcopf(casedata=None, ppopt=None, fname='', solvedcase=''):
     """Runs a DC optimal power flow.
 
+    If C{OPF_SCOPF} is set in C{ppopt}, solves the N-1 security-constrained
+    DC OPF instead, see L{dcscopf}.
+
     @see: L{runopf}, L{runduopf}
 
     @author: Ray Zimmerman (PSERC Cornell)
@@ -11,13 +11,20 @@ from os.path import dirname, join
 
 from pypower.ppoption import ppoption
 from pypower.opf import opf
+from pypower.dcscopf import dcscopf
 from pypower.printpf import printpf
+from pypower.results_export import results_export
 from pypower.savecase import savecase
 
 
 def runopf(casedata=None, ppopt=None, fname='', solvedcase=''):
     """Runs an optimal power flow.
 
+    The results are printed (see L{printpf}), to the file C{fname} if
+    given, or if the C{OUT_FORMAT} option is not C{'text'}, appended to
+    C{fname} in that format (see L{results_export}). If C{solvedcase} is
+    given the solved case is saved with L{savecase}.
+
     @see: L{rundcopf}, L{runuopf}
 
     @author: Ray Zimmerman (PSERC Cornell)
@@ -28,10 +35,16 @@ def runopf(casedata=None, ppopt=None, fname='', solvedcase=''):
     ppopt = ppoption(ppopt)
 
     ##-----  run the optimal power flow  -----
-    r = opf(casedata, ppopt)
+    if ppopt['PF_DC'] and ppopt['OPF_SCOPF']:
+        r = dcscopf(casedata, ppopt)
+    else:
+        r = opf(casedata, ppopt)
 
     ##-----  output results  -----
-    if fname:
+    if ppopt['OUT_FORMAT'] != 'text':
+        if fname:
+            results_export(r, fname, ppopt['OUT_FORMAT'], append=True)
+    elif fname:
         fd = None
         try:
             fd = open(fname, "a")
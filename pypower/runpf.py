@@ -29,6 +29,7 @@ from pypower.gausspf import gausspf
 from pypower.makeB import makeB
 from pypower.pfsoln import pfsoln
 from pypower.printpf import printpf
+from pypower.results_export import results_export
 from pypower.savecase import savecase
 from pypower.int2ext import int2ext
 
@@ -51,7 +52,9 @@ def runpf(casedata=None, ppopt=None, fname='', solvedcase=''):
     vector and can be used to specify the solution algorithm and output
     options among other things. If the 3rd argument is given the pretty
     printed output will be appended to the file whose name is given in
-    C{fname}. If C{solvedcase} is specified the solved case will be written
+    C{fname}, or if the C{OUT_FORMAT} option is not C{'text'}, the results
+    will be appended to C{fname} in that format (see L{results_export})
+    instead. If C{solvedcase} is specified the solved case will be written
     to a case file in PYPOWER format with the specified name. If C{solvedcase}
     ends with '.mat' it saves the case as a MAT-file otherwise it saves it
     as a Python-file.
@@ -208,9 +211,9 @@ def runpf(casedata=None, ppopt=None, fname='', solvedcase=''):
                 if len(mx) > 0 or len(mn) > 0:  ## we have some Q limit violations
                     # first check for INFEASIBILITY (all remaining gens violating)
                     infeas = union1d(mx, mn)
-                    remaining = find( gen_status & 
-                                     (bus[gen[:, GEN_BUS], BUS_TYPE] == PV | 
-                                      bus[gen[:, GEN_BUS], BUS_TYPE] == REF))
+                    gen_bt = bus[gen[:, GEN_BUS].astype(int), BUS_TYPE]
+                    remaining = find( gen_status &
+                                     ((gen_bt == PV) | (gen_bt == REF)))
                     if len(infeas) == len(remaining) or all(infeas == remaining):
                         if verbose:
                             print('All %d remaining gens exceed to their Q limits: INFEASIBLE PROBLEM\n' % len(infeas))
@@ -279,7 +282,7 @@ def runpf(casedata=None, ppopt=None, fname='', solvedcase=''):
             ## restore injections from limited gens [those at Q limits]
             gen[limited, QG] = fixedQg[limited]    ## restore Qg value,
             for i in range(len(limited)):               ## [one at a time, since they may be at same bus]
-                bi = gen[limited[i], GEN_BUS]           ## re-adjust load,
+                bi = int(gen[limited[i], GEN_BUS])      ## re-adjust load,
                 bus[bi, [PD, QD]] = bus[bi, [PD, QD]] + gen[limited[i], [PG, QG]]
                 gen[limited[i], GEN_STATUS] = 1           ## and turn gen back on
             
@@ -302,7 +305,10 @@ def runpf(casedata=None, ppopt=None, fname='', solvedcase=''):
     if len(results["order"]["branch"]["status"]["off"]) > 0:
         results["branch"][ix_(results["order"]["branch"]["status"]["off"], [PF, QF, PT, QT])] = 0
 
-    if fname:
+    if ppopt['OUT_FORMAT'] != 'text':
+        if fname:
+            results_export(results, fname, ppopt['OUT_FORMAT'], append=True)
+    elif fname:
         fd = None
         try:
             fd = open(fname, "a")
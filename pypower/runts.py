@@ -0,0 +1,355 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Runs a time series of power flows.
+"""
+
+from sys import stdout
+from os.path import dirname, join
+from time import time
+from itertools import islice
+from collections import deque
+from warnings import catch_warnings, simplefilter
+
+from multiprocessing import Pool, cpu_count
+
+from numpy import array, asarray, zeros, ones, load, fromstring, unique, \
+    exp, angle, conj, pi, nan, arange
+from numpy import flatnonzero as find
+from numpy.lib.format import open_memmap
+
+from scipy.sparse import csr_matrix as sparse
+
+from pypower._compat import PY2
+from pypower.loadcase import loadcase
+from pypower.ppoption import ppoption
+from pypower.ext2int import ext2int
+from pypower.bustypes import bustypes
+from pypower.makeYbus import makeYbus
+from pypower.newtonpf import newtonpf
+from pypower.runpf import runpf
+
+from pypower.idx_bus import PD, QD, VM, VA
+from pypower.idx_gen import GEN_BUS, PG, QG, QMAX, QMIN, VG
+from pypower.idx_brch import F_BUS, T_BUS
+
+
+if not PY2:
+    basestring = str
+
+## profiles and the matrix and column of the case they set
+PROFILES = {'PD': ('bus', PD), 'QD': ('bus', QD), 'PG': ('gen', PG)}
+
+## outputs, one row per step, and the matrix of the case they belong to
+OUTPUTS = (('VM', 'bus'), ('VA', 'bus'),
+           ('PF', 'branch'), ('QF', 'branch'),
+           ('PT', 'branch'), ('QT', 'branch'))
+
+## prepared network, set in each process by _init
+_prep = None
+
+
+def runts(casedata=None, profiles=None, ppopt=None, fname='', chunk=1000,
+          workers=1):
+    """Runs a time series of power flows.
+
+    Runs an AC (Newton) power flow of the case C{casedata} (a case dict or
+    the name of a case file) for each step of the load and generation
+    C{profiles}, a dict with any of the keys C{'PD'}, C{'QD'} (one column
+    per bus) and C{'PG'} (one column per generator), with one row per
+    step, that replace the corresponding column of the case in each step.
+    A profile with a single column scales the base case values instead.
+    The values not given by a profile are those of the base case.
+
+    Each profile is an array (or a name of a C{.npy} file, which is
+    memory-mapped) or the name of a comma separated C{.csv} file (lines
+    starting with '#' are ignored), read C{chunk} rows at a time.
+
+    The case is loaded, converted to internal indexing, and its bus
+    admittance matrix and bus types computed once; each step only builds
+    the bus injections and runs L{newtonpf}, starting from the solution of
+    the previous step of its chunk (or from the base case voltages, for the
+    first step of a chunk or after a step that failed to converge). If the
+    C{ENFORCE_Q_LIMS} option is set, steps with generator reactive power
+    outside of the limits at some bus are solved again by L{runpf}. The
+    chunks are independent and are run in a pool of C{workers} processes
+    (0 means one per CPU).
+
+    Returns a dict with the bus voltage magnitudes C{VM} and angles C{VA}
+    (degrees, NaN for isolated buses) and the branch flows C{PF}, C{QF},
+    C{PT} and C{QT} (zero for branches out of service), with one row per
+    step and one column per bus or branch of the case, the convergence
+    flags of the steps in C{success}, the Newton iterations in
+    C{iterations} (-1 for steps solved by L{runpf}) and the elapsed time in
+    C{et}. If C{fname} is given, the outputs are written, step by step as
+    the chunks complete, to the memory-mapped C{.npy} files
+    C{fname + '_VM.npy'} etc., which are returned.
+
+    @see: L{runpf}, L{newtonpf}
+    """
+    t0 = time()
+    if casedata is None:
+        casedata = join(dirname(__file__), 'case9')
+    ppopt = ppoption(ppopt)
+    verbose = ppopt["VERBOSE"]
+    if ppopt["PF_DC"] or ppopt["PF_ALG"] != 1:
+        raise ValueError('runts: only the AC power flow with Newton\'s '
+                         'method is supported')
+    nw = workers if workers > 0 else cpu_count()
+
+    ##-----  prepare the network once  -----
+    prep = _prepare(loadcase(casedata), ppopt)
+    size = {'bus': prep['bus0'].shape[0], 'gen': prep['gen0'].shape[0],
+            'branch': prep['nl0']}
+
+    ##-----  profiles  -----
+    if not profiles:
+        raise ValueError('runts: no profiles given')
+    nt, readers = None, {}
+    for key, p in profiles.items():
+        if key not in PROFILES:
+            raise ValueError('runts: unknown profile %r' % key)
+        n, readers[key] = _profile(p, chunk)
+        if nt is not None and n != nt:
+            raise ValueError('runts: profiles must have the same number of '
+                             'steps')
+        nt = n
+
+    ##-----  outputs  -----
+    results = {}
+    for name, table in OUTPUTS:
+        shape = (nt, size[table])
+        if fname:
+            results[name] = open_memmap('%s_%s.npy' % (fname, name), 'w+',
+                                        float, shape)
+        else:
+            results[name] = zeros(shape)
+    results['success'] = zeros(nt, bool)
+    results['iterations'] = zeros(nt, int)
+
+    ##-----  run the chunks  -----
+    tasks = _chunks(readers, prep)
+    if nw > 1:
+        pool = Pool(nw, _init, (prep,))
+        pending = deque()
+        for task in tasks:
+            pending.append(pool.apply_async(_run_chunk, (task,)))
+            if len(pending) >= 2 * nw:      ## bound the chunks in memory
+                _store(results, *pending.popleft().get())
+        while pending:
+            _store(results, *pending.popleft().get())
+        pool.close()
+        pool.join()
+    else:
+        _init(prep)
+        for task in tasks:
+            _store(results, *_run_chunk(task))
+
+    if fname:
+        for name, _ in OUTPUTS:
+            results[name].flush()
+
+    results['et'] = time() - t0
+    if verbose:
+        stdout.write('runts: %d steps, %d failed, %d solved by runpf, '
+                     'in %.2f s\n' % (nt, nt - results['success'].sum(),
+                     (results['iterations'] < 0).sum(), results['et']))
+
+    return results
+
+
+def _prepare(ppc, ppopt):
+    """Returns the network data shared by all of the steps.
+    """
+    ppci = ext2int(ppc)
+    baseMVA, bus, gen, branch = \
+        ppci["baseMVA"], ppci["bus"], ppci["gen"], ppci["branch"]
+    o = ppci["order"]
+
+    ref, pv, pq = bustypes(bus, gen)
+    gbus = gen[:, GEN_BUS].astype(int)  ## all internal gens are on
+    nb, ng = bus.shape[0], gen.shape[0]
+    Cg = sparse((ones(ng), (gbus, arange(ng))), (nb, ng))
+
+    ## initial voltages, as in runpf
+    V0 = bus[:, VM] * exp(1j * pi/180 * bus[:, VA])
+    vcb = ones(nb)
+    vcb[pq] = 0
+    k = find(vcb[gbus])
+    V0[gbus[k]] = gen[k, VG] / abs(V0[gbus[k]]) * V0[gbus[k]]
+
+    Ybus, Yf, Yt = makeYbus(baseMVA, bus, branch)
+
+    ## reactive power limits of the buses with voltage control
+    qbus = unique(gbus[vcb[gbus] > 0])
+    Qmax = (Cg * gen[:, QMAX])[qbus]
+    Qmin = (Cg * gen[:, QMIN])[qbus]
+
+    return {
+        'ppc': ppc, 'bus0': ppc["bus"], 'gen0': ppc["gen"],
+        'nl0': ppc["branch"].shape[0],
+        'baseMVA': baseMVA, 'Ybus': Ybus, 'Yf': Yf, 'Yt': Yt, 'Cg': Cg,
+        'V0': V0, 'ref': ref, 'pv': pv, 'pq': pq,
+        'f': branch[:, F_BUS].astype(int), 't': branch[:, T_BUS].astype(int),
+        'ibus': o["bus"]["status"]["on"],
+        'igen': o["gen"]["status"]["on"][o["gen"]["e2i"]],
+        'ibranch': o["branch"]["status"]["on"],
+        'Pd': bus[:, PD], 'Qd': bus[:, QD], 'Pg': gen[:, PG], 'Qg': gen[:, QG],
+        'qbus': qbus, 'Qmax': Qmax, 'Qmin': Qmin,
+        'ppopt': ppoption(ppopt, VERBOSE=0, OUT_ALL=0)
+    }
+
+
+def _profile(p, chunk):
+    """Returns the number of steps of a profile and an iterator over its
+    chunks of C{chunk} rows.
+    """
+    if isinstance(p, basestring):
+        if p.endswith('.csv'):
+            return _csv(p, chunk)
+        p = load(p, mmap_mode='r')
+    p = asarray(p)
+    if p.ndim == 1:
+        p = p[:, None]
+    return p.shape[0], (p[k:k + chunk] for k in range(0, p.shape[0], chunk))
+
+
+def _csv(fname, chunk):
+    def data(fd):
+        return (line for line in fd if line.strip() and line[0] != '#')
+
+    with open(fname) as fd:
+        nt = sum(1 for _ in data(fd))
+
+    def chunks():
+        with open(fname) as fd:
+            lines = data(fd)
+            while True:
+                block = list(islice(lines, chunk))
+                if not block:
+                    break
+                nc = len(block[0].split(','))
+                with catch_warnings():
+                    simplefilter('error', DeprecationWarning)
+                    try:
+                        a = fromstring(' '.join(block).replace(',', ' '),
+                                       sep=' ')
+                    except DeprecationWarning:
+                        a = array([])
+                if a.size != len(block) * nc:
+                    raise ValueError('runts: invalid CSV profile %s' % fname)
+                yield a.reshape((-1, nc))
+
+    return nt, chunks()
+
+
+def _chunks(readers, prep):
+    """Yields the first step and the (external) profile values of each
+    chunk.
+    """
+    k0 = 0
+    its = dict((key, iter(r)) for key, r in readers.items())
+    while True:
+        data = {}
+        for key, it in its.items():
+            a = next(it, None)
+            if a is None:
+                return
+            table, col = PROFILES[key]
+            base = prep[table + '0'][:, col]
+            a = asarray(a, float)
+            if a.shape[1] == 1:
+                a = a * base
+            elif a.shape[1] != len(base):
+                raise ValueError('runts: profile %r must have 1 or %d '
+                                 'columns' % (key, len(base)))
+            data[key] = a
+        yield k0, data
+        k0 += len(a)
+
+
+def _init(prep):
+    global _prep
+    _prep = prep
+
+
+def _run_chunk(args):
+    """Runs the power flows of one chunk of steps.
+    """
+    k0, data = args
+    p = _prep
+    n = len(next(iter(data.values())))
+    nb0, nl0 = p['bus0'].shape[0], p['nl0']
+    ibus, ibranch = p['ibus'], p['ibranch']
+
+    ## bus injections of all steps, in internal indexing
+    def values(key, rows, base):
+        return data[key][:, rows] if key in data else base[None, :]
+    Sd = values('PD', ibus, p['Pd']) + 1j * values('QD', ibus, p['Qd']) + \
+        zeros((n, 1))
+    Sg = values('PG', p['igen'], p['Pg']) + 1j * p['Qg'][None, :] + \
+        zeros((n, 1))
+    Sbus = ((p['Cg'] * Sg.T).T - Sd) / p['baseMVA']
+
+    qlim = p['ppopt']['ENFORCE_Q_LIMS']
+    tol = p['ppopt']['OPF_VIOLATION']
+    Ybus, V0 = p['Ybus'], p['V0']
+
+    out = dict((name, zeros((n, nb0 if table == 'bus' else nl0)))
+               for name, table in OUTPUTS)
+    out['VM'][:] = nan
+    out['VA'][:] = nan
+    success = zeros(n, bool)
+    iterations = zeros(n, int)
+    V = V0
+    Vs = zeros((n, len(V0)), complex)
+    for k in range(n):
+        V, success[k], iterations[k] = \
+            newtonpf(Ybus, Sbus[k], V, p['ref'], p['pv'], p['pq'], p['ppopt'])
+        if success[k] and qlim and len(p['qbus']):
+            q = p['qbus']
+            ## total Qg at each bus: injected Q + local Qd
+            Qg = (V[q] * conj(Ybus[q, :] * V)).imag * p['baseMVA'] + \
+                Sd[k, q].imag
+            if (Qg > p['Qmax'] + tol).any() or (Qg < p['Qmin'] - tol).any():
+                V, success[k] = _runpf_step(p, data, k)
+                iterations[k] = -1
+        Vs[k] = V
+        if not success[k]:
+            V = V0              ## start the next step afresh
+
+    ## voltages and branch flows of all steps
+    out['VM'][:, ibus] = abs(Vs)
+    out['VA'][:, ibus] = angle(Vs) * 180 / pi
+    Sf = Vs[:, p['f']] * conj((p['Yf'] * Vs.T).T) * p['baseMVA']
+    St = Vs[:, p['t']] * conj((p['Yt'] * Vs.T).T) * p['baseMVA']
+    out['PF'][:, ibranch] = Sf.real
+    out['QF'][:, ibranch] = Sf.imag
+    out['PT'][:, ibranch] = St.real
+    out['QT'][:, ibranch] = St.imag
+    out['success'] = success
+    out['iterations'] = iterations
+
+    return k0, out
+
+
+def _runpf_step(p, data, k):
+    """Solves step C{k} of a chunk with L{runpf}, enforcing the generator
+    reactive power limits. Returns the internal bus voltages and the
+    success flag.
+    """
+    ppc = dict(p['ppc'], bus=p['bus0'].astype(float),
+               gen=p['gen0'].astype(float))
+    for key, a in data.items():
+        table, col = PROFILES[key]
+        ppc[table][:, col] = a[k]
+    r, success = runpf(ppc, p['ppopt'])
+    V = r['bus'][p['ibus'], VM] * exp(1j * pi/180 * r['bus'][p['ibus'], VA])
+    return V, success
+
+
+def _store(results, k0, out):
+    n = len(out['success'])
+    for name in out:
+        results[name][k0:k0 + n] = out[name]
@@ -0,0 +1,94 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Saves a case dict to a binary case cache.
+"""
+
+import json
+
+from os import mkdir, rename, stat, getpid
+from os.path import join, exists, basename
+from shutil import rmtree
+from hashlib import sha1
+
+from numpy import ndarray, save, generic
+
+
+def save_case_cache(ppc, cachedir, source=''):
+    """Saves a case dict to a binary case cache.
+
+    Writes the case dict C{ppc} to the directory C{cachedir}, as one C{.npy}
+    file per array, which L{load_case_cache} can memory-map, a subdirectory
+    per nested dict, and a C{case.json} file holding the other (scalar,
+    string or list) values. If the name of the case file C{source} that
+    C{ppc} was loaded from is given, its modification time, size and SHA-1
+    hash are stored as the key of the cache. An existing cache is replaced.
+
+    Raises C{ValueError} if the case holds values which can not be cached,
+    e.g. object arrays or sparse matrices.
+
+    Returns C{cachedir}.
+
+    @see: L{load_case_cache}, L{loadcase}
+    """
+    key = case_cache_key(source) if source else None
+
+    ## write to a temporary directory, then move it in place
+    tmpdir = '%s.tmp%d' % (cachedir, getpid())
+    if exists(tmpdir):
+        rmtree(tmpdir)
+    try:
+        _save(ppc, tmpdir, key)
+    except Exception:
+        rmtree(tmpdir, ignore_errors=True)
+        raise
+    if exists(cachedir):
+        rmtree(cachedir)
+    rename(tmpdir, cachedir)
+
+    return cachedir
+
+
+def case_cache_key(source):
+    """Returns the key of a case cache for the case file C{source}.
+    """
+    st = stat(source)
+    h = sha1()
+    with open(source, 'rb') as fd:
+        for chunk in iter(lambda: fd.read(1 << 20), b''):
+            h.update(chunk)
+    return {'source': basename(source), 'mtime': st.st_mtime_ns,
+            'size': st.st_size, 'sha1': h.hexdigest()}
+
+
+def _save(d, path, key=None):
+    mkdir(path)
+    meta = {'arrays': [], 'dicts': [], 'values': {}}
+    if key is not None:
+        meta['key'] = key
+    for k, v in d.items():
+        if not isinstance(k, str) or '/' in k or '\\' in k or k.startswith('.'):
+            raise ValueError('save_case_cache: invalid key %r' % (k,))
+        if isinstance(v, ndarray):
+            if v.dtype.hasobject:
+                raise ValueError('save_case_cache: can not cache object '
+                                 'array %r' % k)
+            save(join(path, k + '.npy'), v, allow_pickle=False)
+            meta['arrays'].append(k)
+        elif isinstance(v, dict):
+            _save(v, join(path, k))
+            meta['dicts'].append(k)
+        else:
+            if isinstance(v, generic):
+                v = v.item()
+            try:
+                if json.loads(json.dumps(v)) != v:
+                    raise TypeError
+            except (TypeError, ValueError):
+                raise ValueError('save_case_cache: can not cache value of '
+                                 '%r' % k)
+            meta['values'][k] = v
+
+    with open(join(path, 'case.json'), 'w') as fd:
+        json.dump(meta, fd)
@@ -9,17 +9,17 @@ from sys import stderr
 
 from os.path import basename
 
-from numpy import array, c_, r_, any
+from numpy import array, asarray, c_, r_, any
 from scipy.io import savemat
 
 from pypower._compat import PY2
 from pypower.run_userfcn import run_userfcn
+from pypower.save_case_cache import save_case_cache
 
 from pypower.idx_bus import MU_VMIN, VMIN
 from pypower.idx_gen import PMIN, MU_PMAX, MU_PMIN, MU_QMIN, MU_QMAX, APF
 from pypower.idx_brch import \
-    MU_ST, MU_SF, BR_STATUS, PF, PT, QT, QF, ANGMAX, MU_ANGMAX
-from pypower.idx_area import PRICE_REF_BUS
+    MU_ST, MU_SF, BR_STATUS, PF, PT, QT, QF, ANGMAX, MU_ANGMIN, MU_ANGMAX
 from pypower.idx_cost import MODEL, NCOST, PW_LINEAR, POLYNOMIAL
 
 
@@ -29,6 +29,14 @@ if not PY2:
 else:
     writemode = "wb"
 
+## formats of the columns of the bus, gen and branch matrices
+BUS_FMT = ['%d', '%d', '%.9g', '%.9g', '%.9g', '%.9g', '%d', '%.9g', '%.9g',
+           '%.9g', '%d', '%.9g', '%.9g'] + ['%.4f'] * 4
+GEN_FMT = ['%d', '%.9g', '%.9g', '%.9g', '%.9g', '%.9g', '%.9g', '%d'] + \
+          ['%.9g'] * 13 + ['%.4f'] * 4
+BRANCH_FMT = ['%d', '%d'] + ['%.9g'] * 8 + ['%d', '%.9g', '%.9g'] + \
+             ['%.4f'] * 8
+
 
 def savecase(fname, ppc, comment=None, version='2'):
     """Saves a PYPOWER case file, given a filename and the data.
@@ -41,6 +49,11 @@ def savecase(fname, ppc, comment=None, version='2'):
     optional C{version} argument is '1' it will modify the data matrices to
     version 1 format before saving.
 
+    If C{fname} ends with '.cache' the case is saved in the binary case
+    format of L{save_case_cache} instead, in the directory C{fname}, which
+    L{loadcase} loads memory-mapped. Only the power flow and OPF data
+    matrices and the C{x} and C{f} results are saved.
+
     @author: Carlos E. Murillo-Sanchez (PSERC Cornell & Universidad
     Autonoma de Manizales)
     @author: Ray Zimmerman (PSERC Cornell)
@@ -76,6 +89,13 @@ def savecase(fname, ppc, comment=None, version='2'):
 #        tmp = array([PF, QF, PT, QT, MU_SF, MU_ST]) - shift
 #        PF, QF, PT, QT, MU_SF, MU_ST = tmp
 
+    ## binary case format
+    if fname.endswith('.cache'):
+        keys = ['version', 'baseMVA', 'bus', 'gen', 'branch', 'areas',
+                'gencost', 'z0', 'zl', 'zu', 'x', 'f']
+        return save_case_cache(dict([(k, ppc[k]) for k in keys if k in ppc]),
+                               fname)
+
     ## verify valid filename
     l = len(fname)
     rootname = ""
@@ -174,78 +194,50 @@ def savecase(fname, ppc, comment=None, version='2'):
 
         ## bus data
         ncols = bus.shape[1]
+        fmt = BUS_FMT[:VMIN + 1]
         fd.write('\n%s## bus data\n' % indent)
         fd.write('%s# bus_i type Pd Qd Gs Bs area Vm Va baseKV zone Vmax Vmin' % indent)
         if ncols >= MU_VMIN + 1:             ## opf SOLVED, save with lambda's & mu's
             fd.write('lam_P lam_Q mu_Vmax mu_Vmin')
+            fmt = BUS_FMT
         fd.write("\n%s%s['bus'] = array([\n" % (indent, prefix))
-        if ncols < MU_VMIN + 1:              ## opf NOT SOLVED, save without lambda's & mu's
-            for i in range(bus.shape[0]):
-                fd.write('%s[%d, %d, %.9g, %.9g, %.9g, %.9g, %d, %.9g, %.9g, %.9g, %d, %.9g, %.9g],\n' % ((indent2,) + tuple(bus[i, :VMIN + 1])))
-        else:                            ## opf SOLVED, save with lambda's & mu's
-            for i in range(bus.shape[0]):
-                fd.write('%s[%d, %d, %.9g, %.9g, %.9g, %.9g, %d, %.9g, %.9g, %.9g, %d, %.9g, %.9g, %.4f, %.4f, %.4f, %.4f],\n' % ((indent2,) + tuple(bus[i, :MU_VMIN + 1])))
+        fd.write(format_rows(bus, fmt, indent2))
         fd.write('%s])\n' % indent)
 
         ## generator data
         ncols = gen.shape[1]
+        fmt = GEN_FMT[:PMIN + 1]
         fd.write('\n%s## generator data\n' % indent)
         fd.write('%s# bus Pg Qg Qmax Qmin Vg mBase status Pmax Pmin' % indent)
         if ppc_ver != "1":
             fd.write(' Pc1 Pc2 Qc1min Qc1max Qc2min Qc2max ramp_agc ramp_10 ramp_30 ramp_q apf')
+            fmt = GEN_FMT[:APF + 1]
         if ncols >= MU_QMIN + 1:             # opf SOLVED, save with mu's
             fd.write(' mu_Pmax mu_Pmin mu_Qmax mu_Qmin')
+            fmt = fmt + GEN_FMT[MU_PMAX:]
         fd.write("\n%s%s['gen'] = array([\n" % (indent, prefix))
-        if ncols < MU_QMIN + 1:              ## opf NOT SOLVED, save without mu's
-            if ppc_ver == "1":
-                for i in range(gen.shape[0]):
-                    fd.write('%s[%d, %.9g, %.9g, %.9g, %.9g, %.9g, %.9g, %d, %.9g, %.9g],\n' % ((indent2,) + tuple(gen[i, :PMIN + 1])))
-            else:
-                for i in range(gen.shape[0]):
-                    fd.write('%s[%d, %.9g, %.9g, %.9g, %.9g, %.9g, %.9g, %d, %.9g, %.9g, %.9g, %.9g, %.9g, %.9g, %.9g, %.9g, %.9g, %.9g, %.9g, %.9g, %.9g],\n' % ((indent2,) + tuple(gen[i, :APF + 1])))
-        else:
-            if ppc_ver == "1":
-                for i in range(gen.shape[0]):
-                    fd.write('%s[%d, %.9g, %.9g, %.9g, %.9g, %.9g, %.9g, %d, %.9g, %.9g, %.4f, %.4f, %.4f, %.4f],\n' % ((indent2,) + tuple(gen[i, :MU_QMIN + 1])))
-            else:
-                for i in range(gen.shape[0]):
-                    fd.write('%s[%d, %.9g, %.9g, %.9g, %.9g, %.9g, %.9g, %d, %.9g, %.9g, %.9g, %.9g, %.9g, %.9g, %.9g, %.9g, %.9g, %.9g, %.9g, %.9g, %.9g, %.4f, %.4f, %.4f, %.4f],\n' % ((indent2,) + tuple(gen[i, :MU_QMIN + 1])))
+        fd.write(format_rows(gen, fmt, indent2))
         fd.write('%s])\n' % indent)
 
         ## branch data
         ncols = branch.shape[1]
+        fmt = BRANCH_FMT[:BR_STATUS + 1]
         fd.write('\n%s## branch data\n' % indent)
         fd.write('%s# fbus tbus r x b rateA rateB rateC ratio angle status' % indent)
         if ppc_ver != "1":
             fd.write(' angmin angmax')
+            fmt = BRANCH_FMT[:ANGMAX + 1]
         if ncols >= QT + 1:                  ## power flow SOLVED, save with line flows
             fd.write(' Pf Qf Pt Qt')
+            fmt = fmt + BRANCH_FMT[PF:QT + 1]
         if ncols >= MU_ST + 1:               ## opf SOLVED, save with mu's
             fd.write(' mu_Sf mu_St')
+            fmt = fmt + BRANCH_FMT[MU_SF:MU_ST + 1]
             if ppc_ver != "1":
                 fd.write(' mu_angmin mu_angmax')
+                fmt = fmt + BRANCH_FMT[MU_ANGMIN:MU_ANGMAX + 1]
         fd.write('\n%s%s[\'branch\'] = array([\n' % (indent, prefix))
-        if ncols < QT + 1:                   ## power flow NOT SOLVED, save without line flows or mu's
-            if ppc_ver == "1":
-                for i in range(branch.shape[0]):
-                    fd.write('%s[%d, %d, %.9g, %.9g, %.9g, %.9g, %.9g, %.9g, %.9g, %.9g, %d],\n' % ((indent2,) + tuple(branch[i, :BR_STATUS + 1])))
-            else:
-                for i in range(branch.shape[0]):
-                    fd.write('%s[%d, %d, %.9g, %.9g, %.9g, %.9g, %.9g, %.9g, %.9g, %.9g, %d, %.9g, %.9g],\n' % ((indent2,) + tuple(branch[i, :ANGMAX + 1])))
-        elif ncols < MU_ST + 1:            ## power flow SOLVED, save with line flows but without mu's
-            if ppc_ver == "1":
-                for i in range(branch.shape[0]):
-                    fd.write('%s[%d, %d, %.9g, %.9g, %.9g, %.9g, %.9g, %.9g, %.9g, %.9g, %d, %.4f, %.4f, %.4f, %.4f],\n' % ((indent2,) + tuple(branch[i, :QT + 1])))
-            else:
-                for i in range(branch.shape[0]):
-                    fd.write('%s[%d, %d, %.9g, %.9g, %.9g, %.9g, %.9g, %.9g, %.9g, %.9g, %d, %.9g, %.9g, %.4f, %.4f, %.4f, %.4f],\n' % ((indent2,) + tuple(branch[i, :QT + 1])))
-        else:                            ## opf SOLVED, save with lineflows & mu's
-            if ppc_ver == "1":
-                for i in range(branch.shape[0]):
-                    fd.write('%s[%d, %d, %.9g, %.9g, %.9g, %.9g, %.9g, %.9g, %.9g, %.9g, %d, %.4f, %.4f, %.4f, %.4f, %.4f, %.4f],\n' % ((indent2,) + tuple(branch[i, :MU_ST + 1])))
-            else:
-                for i in range(branch.shape[0]):
-                    fd.write('%s[%d, %d, %.9g, %.9g, %.9g, %.9g, %.9g, %.9g, %.9g, %.9g, %d, %.9g, %.9g, %.4f, %.4f, %.4f, %.4f, %.4f, %.4f, %.4f, %.4f],\n' % ((indent2,) + tuple(branch[i, :MU_ANGMAX + 1])))
+        fd.write(format_rows(branch, fmt, indent2))
         fd.write('%s])\n' % indent)
 
         ## OPF data
@@ -257,8 +249,7 @@ def savecase(fname, ppc, comment=None, version='2'):
             fd.write('%s# area refbus\n' % indent)
             fd.write("%s%s['areas'] = array([\n" % (indent, prefix))
             if len(areas) > 0:
-                for i in range(areas.shape[0]):
-                    fd.write('%s[%d, %d],\n' % ((indent2,) + tuple(areas[i, :PRICE_REF_BUS + 1])))
+                fd.write(format_rows(areas, ['%d', '%d'], indent2))
             fd.write('%s])\n' % indent)
         if gencost is not None and len(gencost) > 0:
             ## generator cost data
@@ -278,12 +269,8 @@ def savecase(fname, ppc, comment=None, version='2'):
                 n = int( max([n1, n2]) )
                 if gencost.shape[1] < n + 4:
                     stderr.write('savecase: gencost data claims it has more columns than it does\n')
-                template = '%s[%d, %.9g, %.9g, %d'
-                for i in range(n):
-                    template = template + ', %.9g'
-                template = template + '],\n'
-                for i in range(gencost.shape[0]):
-                    fd.write(template % ((indent2,) + tuple(gencost[i])))
+                fmt = ['%d', '%.9g', '%.9g', '%d'] + ['%.9g'] * n
+                fd.write(format_rows(gencost, fmt, indent2))
             fd.write('%s])\n' % indent)
 
         ## generalized OPF user data
@@ -363,6 +350,25 @@ def savecase(fname, ppc, comment=None, version='2'):
     return fname
 
 
+def format_rows(A, fmt, indent=''):
+    """Formats the rows of a matrix as Python lists, one per line.
+
+    Returns a string with one line per row of C{A}, of the form
+    C{'<indent>[a, b, ...],'}, with the C{j}-th element of each row
+    formatted with C{fmt[j]}. Only the first C{len(fmt)} columns of C{A}
+    are used; it is an error for C{A} to have fewer columns. The whole
+    matrix is formatted in a single operation.
+    """
+    A = asarray(A)
+    nf = len(fmt)
+    if A.shape[0] == 0:
+        return ''
+    if A.ndim != 2 or A.shape[1] < nf:
+        raise TypeError('not enough arguments for format string')
+    row = '%s[%s],\n' % (indent, ', '.join(fmt))
+    return (row * A.shape[0]) % tuple(A[:, :nf].ravel().tolist())
+
+
 def print_sparse(fd, varname, A):
     A = A.tocoo()
     i, j, s = A.row, A.col, A.data
@@ -0,0 +1,103 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Tests for C{Case}.
+"""
+
+from copy import deepcopy
+
+from numpy import int64, array_equal
+
+from pypower.Case import Case, COLUMNS
+from pypower.ppoption import ppoption
+from pypower.runpf import runpf
+from pypower.runopf import runopf
+from pypower.ext2int import ext2int
+from pypower.makeYbus import makeYbus
+from pypower.makeSbus import makeSbus
+from pypower.case9 import case9
+
+from pypower.idx_bus import BUS_I, VM, MU_VMIN
+from pypower.idx_gen import PG, MU_QMIN
+from pypower.idx_brch import F_BUS, PF, MU_ANGMAX
+
+from pypower.t.t_begin import t_begin
+from pypower.t.t_is import t_is
+from pypower.t.t_ok import t_ok
+from pypower.t.t_end import t_end
+
+
+def t_Case(quiet=False):
+    """Tests for C{Case}.
+    """
+    t_begin(19, quiet)
+
+    ppc = case9()
+    ppc0 = deepcopy(ppc)
+    ppopt = ppoption(VERBOSE=0, OUT_ALL=0)
+
+    t = 'Case(ppc) : '
+    case = Case(ppc)
+    t_ok(case.bus.shape == (9, MU_VMIN + 1) and
+         case.gen.shape == (3, MU_QMIN + 1) and
+         case.branch.shape == (9, MU_ANGMAX + 1), [t, 'full width'])
+    t_ok(case.bus.flags.f_contiguous and case.bus.dtype.kind == 'f',
+         [t, 'float64 column-major'])
+    t_is(case.branch[:, :PF], ppc['branch'], 12, [t, 'branch'])
+    t_ok(case.f.dtype == int64 and not case.f.flags.writeable,
+         [t, 'int64 read-only indices'])
+    t_is(case.f, ppc['branch'][:, F_BUS] - 1, 12, [t, 'f'])
+    t_is(case.gbus, [0, 1, 2], 12, [t, 'gbus'])
+    t_ok(Case(case.to_ppc()).bus is case.bus, [t, 'no copy'])
+
+    t = 'Case.col : '
+    Vm = case.col('bus', 'VM')
+    t_ok(Vm.flags.c_contiguous and COLUMNS['bus']['VM'] == VM and
+         'PQ' not in COLUMNS['bus'], [t, 'contiguous view'])
+    Vm[:] = 1.01
+    t_ok((case.bus[:, VM] == 1.01).all(), [t, 'assign'])
+    case.col('bus', 'VM')[:] = 1
+
+    t = 'Case.index : '
+    case.bus[:, BUS_I] += 10
+    case.branch[:, :2] += 10
+    case.gen[:, 0] += 10
+    case.index()
+    t_is(case.t, ppc['branch'][:, 1] - 1, 12, [t, 'renumbered'])
+    case.gen[0, 0] = 99
+    try:
+        case.index()
+        t_ok(0, [t, 'unknown bus'])
+    except ValueError:
+        t_ok(1, [t, 'unknown bus'])
+    case = Case(ppc)
+
+    t = 'makeYbus/makeSbus(Case) : '
+    ppci = ext2int(ppc)
+    Ybus, Yf, Yt = makeYbus(ppci['baseMVA'], ppci['bus'], ppci['branch'])
+    t_ok(abs(makeYbus(case)[0] - Ybus).max() < 1e-12, [t, 'Ybus'])
+    t_ok(abs(makeYbus(case)[1] - Yf).max() < 1e-12, [t, 'Yf'])
+    Sbus = makeSbus(ppci['baseMVA'], ppci['bus'], ppci['gen'])
+    t_ok(abs(makeSbus(case) - Sbus).max() < 1e-12, [t, 'Sbus'])
+
+    t = 'runpf(Case) : '
+    r0, success = runpf(ppc0, ppopt)
+    r, success = runpf(case, ppopt)
+    t_ok(success, [t, 'success'])
+    t_is(r['bus'][:, VM], r0['bus'][:, VM], 12, [t, 'voltages'])
+    t_ok(r['bus'].flags.f_contiguous and Case(r).branch is r['branch'],
+         [t, 'results not copied'])
+
+    t = 'runopf(Case) : '
+    r0 = runopf(ppc0, ppopt)
+    r = runopf(case, ppopt)
+    t_is(r['gen'][:, PG], r0['gen'][:, PG], 6, [t, 'Pg'])
+    t_ok(all(array_equal(getattr(case, k)[:, :ppc0[k].shape[1]], ppc0[k])
+             for k in ('bus', 'gen', 'branch')), [t, 'case unchanged'])
+
+    t_end()
+
+
+if __name__ == '__main__':
+    t_Case(quiet=False)
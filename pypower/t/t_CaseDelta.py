@@ -0,0 +1,118 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Tests for C{CaseDelta}.
+"""
+
+from copy import deepcopy
+
+from numpy import array_equal
+
+from pypower.CaseDelta import CaseDelta
+from pypower.ppoption import ppoption
+from pypower.runpf import runpf
+from pypower.ext2int import ext2int
+from pypower.makeYbus import makeYbus
+from pypower.makeSbus import makeSbus
+from pypower.case30 import case30
+
+from pypower.idx_bus import BUS_TYPE, PD, QD, VM, VA, VMAX, NONE, PQ, REF
+from pypower.idx_gen import PG, GEN_STATUS
+from pypower.idx_brch import BR_STATUS, RATE_B
+
+from pypower.t.t_begin import t_begin
+from pypower.t.t_is import t_is
+from pypower.t.t_ok import t_ok
+from pypower.t.t_end import t_end
+
+
+def t_CaseDelta(quiet=False):
+    """Tests for C{CaseDelta}.
+    """
+    t_begin(24, quiet)
+
+    ppopt = ppoption(VERBOSE=0, OUT_ALL=0)
+    base = case30()
+    base0 = deepcopy(base)
+
+    t = 'CaseDelta.apply : '
+    d = CaseDelta(base)
+    d.set_load([3, 6], Pd=[30, 25], Qd=5).set_status('branch', 10, 0)
+    d.set('bus', 'PD', 6, 20)
+    ppc = d.apply()
+    t_is(ppc['bus'][[3, 6], PD], [30, 20], 12, [t, 'later edit wins'])
+    t_ok((ppc['bus'][[3, 6], QD] == 5).all() and
+         ppc['branch'][10, BR_STATUS] == 0, [t, 'edits'])
+    t_ok(d.base['bus'] is base['bus'] and d.base['gen'] is base['gen'],
+         [t, 'base not copied'])
+    t_ok(ppc['gen'] is d.base['gen'] and ppc['bus'] is not d.base['bus'],
+         [t, 'copy-on-write'])
+    t_ok(all(array_equal(d.base[k], base0[k])
+             for k in ('bus', 'gen', 'branch')), [t, 'base unchanged'])
+    t_is(d.changed('bus'), [3, 6], 12, [t, 'changed rows'])
+
+    ppc1 = deepcopy(base)
+    ppc1['bus'][[3, 6], PD] = [30, 20]
+    ppc1['bus'][[3, 6], QD] = 5
+    ppc1['branch'][10, BR_STATUS] = 0
+    r1, success = runpf(ppc1, ppopt)
+    r, success = runpf(ppc, ppopt)
+    t_ok(success, [t, 'runpf success'])
+    t_is(r['bus'][:, VM], r1['bus'][:, VM], 12, [t, 'same as deepcopy'])
+
+    t = 'CaseDelta.invalidated : '
+    t_ok(d.invalidated() == set(['Sbus', 'order', 'Ybus', 'Bbus',
+                                 'opf_bounds']), [t, 'load and line trip'])
+    d = CaseDelta(base).set_load(3, Pd=60)
+    t_ok(d.invalidated() == set(['Sbus', 'opf_bounds']), [t, 'load'])
+    d = CaseDelta(base).set('bus', VMAX, 2, 1.1).set('branch', RATE_B, 0, 1)
+    t_ok(d.invalidated() == set(['opf_bounds']), [t, 'limits'])
+    d = CaseDelta(base).set_dispatch(1, base['gen'][1, PG])
+    t_ok(d.invalidated() == set(), [t, 'unchanged value'])
+    d = CaseDelta(base).set('bus', BUS_TYPE, 1, PQ)
+    t_ok(d.invalidated() == set(['bustypes', 'V0']), [t, 'PV to PQ'])
+    d = CaseDelta(base).set('bus', BUS_TYPE, 1, REF)
+    t_ok(d.invalidated() == set(['bustypes', 'opf_bounds']),
+         [t, 'PV to REF'])
+    d = CaseDelta(base).set('bus', VA, 0, 5)
+    t_ok(d.invalidated() == set(['V0', 'opf_bounds']), [t, 'REF angle'])
+    d = CaseDelta(base).set('bus', VA, 3, 5)
+    t_ok(d.invalidated() == set(['V0']), [t, 'PQ angle'])
+    d = CaseDelta(base).set('bus', BUS_TYPE, 2, NONE)
+    t_ok('Ybus' in d.invalidated() and 'order' in d.invalidated(),
+         [t, 'isolated bus'])
+    d = CaseDelta(base).set_status('gen', 3, 0)
+    t_ok(d.invalidated() == set(['order', 'Sbus', 'bustypes', 'V0',
+                                 'opf_bounds']), [t, 'gen status'])
+
+    t = 'CaseDelta.derived : '
+    cache = CaseDelta(base).derived()
+    d = CaseDelta(base).set_load(3, Pd=60)
+    dv = d.derived(cache)
+    t_ok(dv['Ybus'] is cache['Ybus'] and dv['Bbus'] is cache['Bbus'] and
+         dv['bustypes'] is cache['bustypes'], [t, 'reused'])
+    ppci = ext2int(d.apply())
+    Sbus = makeSbus(ppci['baseMVA'], ppci['bus'], ppci['gen'])
+    t_is(dv['Sbus'], Sbus, 12, [t, 'Sbus'])
+    d = CaseDelta(base).set_status('branch', 10, 0)
+    dv = d.derived(cache, ('Ybus', 'Sbus'))
+    ppci = ext2int(d.apply())
+    Ybus = makeYbus(ppci['baseMVA'], ppci['bus'], ppci['branch'])[0]
+    t_ok(abs(dv['Ybus'][0] - Ybus).max() < 1e-12 and
+         dv['Sbus'] is cache['Sbus'] and 'Bbus' not in dv, [t, 'Ybus'])
+
+    t = 'CaseDelta.set : '
+    for args in (('bus', 'XX', 0, 1), ('gen', GEN_STATUS, 6, 0),
+                 ('dcline', 0, 0, 0)):
+        try:
+            CaseDelta(base).set(*args)
+            t_ok(0, [t, 'invalid %s' % (args[:2],)])
+        except ValueError:
+            t_ok(1, [t, 'invalid %s' % (args[:2],)])
+
+    t_end()
+
+
+if __name__ == '__main__':
+    t_CaseDelta(quiet=False)
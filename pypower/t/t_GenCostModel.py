@@ -0,0 +1,87 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Tests for code in C{GenCostModel}.
+"""
+
+from numpy import array, zeros, linspace
+
+from pypower.GenCostModel import GenCostModel
+from pypower.polycost import polycost
+from pypower.case30 import case30
+
+from pypower.t.t_begin import t_begin
+from pypower.t.t_is import t_is
+from pypower.t.t_ok import t_ok
+from pypower.t.t_end import t_end
+
+
+def t_GenCostModel(quiet=False):
+    """Tests for code in C{GenCostModel}.
+    """
+    n_tests = 14
+
+    t_begin(n_tests, quiet)
+
+    ## generator cost data
+    #    1    startup    shutdown    n    x1    y1    ...    xn    yn
+    #    2    startup    shutdown    n    c(n-1)    ...    c0
+    gencost = array([
+        [2, 0, 0, 3,   0.01,   0.1,    1,     0,    0,     0,  0,    0],
+        [2, 0, 0, 5,   0.0006, 0.005,  0.04,  0.3,  2,     0,  0,    0],
+        [1, 0, 0, 4,   0,      0,     10,   200,   20,   600, 30, 1200],
+        [1, 0, 0, 4, -30,  -2400,    -20, -1800,  -10, -1000,  0,    0]
+    ])
+    gcm = GenCostModel(gencost)
+
+    t = 'GenCostModel.cost - '
+    t_is(gcm.cost(array([2, 2, 15, -15])), [1.24, 2.8096, 400, -1400], 8,
+         t + 'poly & pwl')
+    t_is(gcm.cost(array([0, 0, 35, -35])), [1, 2, 1500, -2700], 8,
+         t + 'pwl beyond breakpoints')
+    t_is(gcm.cost(array([0, 0, 10, -20])), [1, 2, 200, -1800], 8,
+         t + 'pwl at breakpoints')
+
+    t = 'GenCostModel.grad - '
+    t_is(gcm.grad(array([2, 2, 15, -15])), [0.14, 0.5392, 40, 80], 8,
+         t + 'poly & pwl')
+    t_is(gcm.grad(array([0, 0, -5, 5])), [0.1, 0.3, 20, 100], 8,
+         t + 'pwl beyond breakpoints')
+
+    t = 'GenCostModel.hess - '
+    t_is(gcm.hess(array([2, 2, 15, -15])), [0.02, 0.1688, 0, 0], 8,
+         t + 'poly & pwl')
+
+    t = 'GenCostModel.polycost - '
+    t_is(gcm.polycost(array([2, 2, 15, -15])), [1.24, 2.8096, 0, 0], 8,
+         t + 'pwl rows zero')
+
+    t = 'GenCostModel vs polycost - case30 : '
+    gencost = case30()['gencost']
+    gcm = GenCostModel(gencost)
+    x = linspace(0, 80, gencost.shape[0])
+    t_is(gcm.cost(x), polycost(gencost, x), 12, t + 'f')
+    t_is(gcm.grad(x), polycost(gencost, x, 1), 12, t + 'df')
+    t_is(gcm.hess(x), polycost(gencost, x, 2), 12, t + 'd2f')
+
+    t = 'GenCostModel - mixed polynomial orders : '
+    gencost = array([
+        [2, 0, 0, 1, 7,   0,   0],
+        [2, 0, 0, 2, 3,   5,   0],
+        [2, 0, 0, 3, 0.5, 3,   5]
+    ])
+    gcm = GenCostModel(gencost)
+    x = array([4, 4, 4])
+    t_is(gcm.cost(x), [7, 17, 25], 12, t + 'f')
+    t_is(gcm.grad(x), [0, 3, 7], 12, t + 'df')
+    t_is(gcm.hess(x), [0, 0, 1], 12, t + 'd2f')
+
+    t = 'GenCostModel - empty gencost'
+    t_ok(len(GenCostModel(zeros((0, 7))).cost(zeros(0))) == 0, t)
+
+    t_end()
+
+
+if __name__ == '__main__':
+    t_GenCostModel(quiet=False)
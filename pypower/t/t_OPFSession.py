@@ -0,0 +1,94 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Tests for code in C{OPFSession}.
+"""
+
+from pypower.ppoption import ppoption
+from pypower.opf import opf
+from pypower.OPFSession import OPFSession
+from pypower.case9 import case9
+from pypower.case30 import case30
+from pypower.case30pwl import case30pwl
+
+from pypower.idx_bus import PD, QD
+from pypower.idx_gen import PG, PMAX
+from pypower.idx_cost import MODEL, COST
+
+from pypower.t.t_begin import t_begin
+from pypower.t.t_is import t_is
+from pypower.t.t_ok import t_ok
+from pypower.t.t_end import t_end
+
+
+def t_OPFSession(quiet=False):
+    """Tests for code in C{OPFSession}.
+    """
+    n_tests = 27
+
+    t_begin(n_tests, quiet)
+
+    verbose = 0#not quiet
+
+    for dc, case in [(1, case30), (1, case30pwl), (0, case9)]:
+        t0 = '%s %s : ' % ('DC' if dc else 'AC', case.__name__)
+        ppopt = ppoption(VERBOSE=verbose, OUT_ALL=0, PF_DC=dc)
+        s = OPFSession(case(), ppopt)
+
+        t = t0 + 'initial : '
+        r = s.solve()
+        r0 = opf(case(), ppopt)
+        t_is(r['f'], r0['f'], 8, [t, 'f'])
+        t_is(r['gen'][:, PG], r0['gen'][:, PG], 6, [t, 'Pg'])
+
+        t = t0 + 'set_load : '
+        ppc = case()
+        ppc['gencost'] = ppc['gencost'].astype(float)
+        ppc['bus'][:, [PD, QD]] = 1.1 * ppc['bus'][:, [PD, QD]]
+        s.set_load(ppc['bus'][:, PD], ppc['bus'][:, QD])
+        r = s.solve()
+        r0 = opf(ppc, ppopt)
+        t_is(r['f'], r0['f'], 8, [t, 'f'])
+        t_is(r['gen'][:, PG], r0['gen'][:, PG], 6, [t, 'Pg'])
+
+        t = t0 + 'set_gen_limits : '
+        ppc['gen'][0, PMAX] = 0.5 * ppc['gen'][0, PMAX]
+        s.set_gen_limits(Pmax=ppc['gen'][:, PMAX])
+        r = s.solve()
+        r0 = opf(ppc, ppopt)
+        t_is(r['f'], r0['f'], 8, [t, 'f'])
+        t_is(r['gen'][:, PG], r0['gen'][:, PG], 6, [t, 'Pg'])
+
+        t = t0 + 'set_gencost : '
+        ppc['gencost'][:, COST:] = 1.5 * ppc['gencost'][:, COST:]
+        ppc['gencost'][0, COST:] = 2 * ppc['gencost'][0, COST:]
+        s.set_gencost(ppc['gencost'])
+        r = s.solve()
+        r0 = opf(ppc, ppopt)
+        t_is(r['f'], r0['f'], 8, [t, 'f'])
+        t_is(r['gen'][:, PG], r0['gen'][:, PG], 6, [t, 'Pg'])
+
+    t = 'set_gencost - change of cost model'
+    s = OPFSession(case30pwl(), ppoption(VERBOSE=0, OUT_ALL=0, PF_DC=1))
+    gencost = case30pwl()['gencost']
+    gencost[0, MODEL] = 2
+    try:
+        s.set_gencost(gencost)
+        t_ok(False, t)
+    except ValueError:
+        t_ok(True, t)
+
+    t = 'AC case30 (OPF_WARM_START) : '
+    ppopt = ppoption(VERBOSE=verbose, OUT_ALL=0, OPF_WARM_START=1)
+    s = OPFSession(case30(), ppopt)
+    r1 = s.solve()
+    r2 = s.solve()
+    t_ok(r1['success'] and r2['success'], [t, 'success'])
+    t_is(r2['f'], r1['f'], 4, [t, 'f'])
+
+    t_end()
+
+
+if __name__ == '__main__':
+    t_OPFSession(quiet=False)
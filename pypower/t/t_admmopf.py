@@ -0,0 +1,84 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Tests for area-decomposed optimal power flow by ADMM.
+"""
+
+from os.path import dirname, join
+
+from pypower.loadcase import loadcase
+from pypower.ppoption import ppoption
+from pypower.rundcopf import rundcopf
+from pypower.runopf import runopf
+from pypower.admmopf import admmopf
+
+from pypower.idx_bus import VM, VA, BUS_AREA
+from pypower.idx_gen import PG
+
+from pypower.t.t_begin import t_begin
+from pypower.t.t_is import t_is
+from pypower.t.t_ok import t_ok
+from pypower.t.t_end import t_end
+
+
+def t_admmopf(quiet=False):
+    """Tests for area-decomposed optimal power flow by ADMM.
+    """
+    num_tests = 17
+
+    t_begin(num_tests, quiet)
+
+    casefile = join(dirname(dirname(__file__)), 'case9')
+    verbose = 0#not quiet
+
+    ## two areas, tied by branches 6-7 and 9-4
+    ppc = loadcase(casefile)
+    ppc['bus'][:, BUS_AREA] = 1
+    ppc['bus'][[1, 6, 7, 8], BUS_AREA] = 2
+
+    ppopt = ppoption(VERBOSE=verbose, OUT_ALL=0)
+    r0 = rundcopf(ppc, ppopt)
+
+    t = 'AC ADMM OPF : '
+    ## stops when the residuals, in p.u. and radians, are below tol = 1e-4,
+    ## within 2e-4 of the centralized cost and 0.1 MW of its dispatch
+    r1 = runopf(ppc, ppopt)
+    r = admmopf(ppc, ppopt)
+    t_ok(r['success'], [t, 'success'])
+    t_ok(abs(r['f'] - r1['f']) < 2e-4 * r1['f'], [t, 'f'])
+    t_is(r['gen'][:, PG], r1['gen'][:, PG], 1, [t, 'Pg'])
+    t_is(r['bus'][:, VA], r1['bus'][:, VA], 1, [t, 'Va'])
+    t_is(r['bus'][:, VM], r1['bus'][:, VM], 3, [t, 'Vm'])
+
+    t = 'DC ADMM OPF : '
+    ## the dispatch error is about 5e3 * tol MW, so tol = 1e-6 is within
+    ## 0.01 MW of the centralized dispatch
+    ppopt = ppoption(ppopt, PF_DC=1)
+    r = admmopf(ppc, ppopt, tol=1e-6)
+    it = r['admm']['it']
+    t_ok(r['success'], [t, 'success'])
+    t_ok(it < 500, [t, 'converged'])
+    t_ok(abs(r['f'] - r0['f']) < 0.05, [t, 'f'])
+    t_is(r['gen'][:, PG], r0['gen'][:, PG], 2, [t, 'Pg'])
+    t_is(r['bus'][:, VA], r0['bus'][:, VA], 2, [t, 'Va'])
+    t_is(r['admm']['area'], [1, 2], 12, [t, 'areas'])
+    t_ok(len(r['admm']['r']) == it and len(r['admm']['s']) == it and
+         len(r['admm']['rho']) == it, [t, 'residual history'])
+    t_is(len(r['admm']['et']), it, 12, [t, 'solve times'])
+
+    t = 'DC ADMM OPF (max_it = 2) : '
+    r = admmopf(ppc, ppopt, max_it=2)
+    t_ok(not r['success'], [t, 'no success'])
+    t_is(r['admm']['it'], 2, 12, [t, 'iterations'])
+
+    t = 'DC ADMM OPF (workers = 2) : '
+    r2 = admmopf(ppc, ppopt, max_it=2, workers=2)
+    t_is(r2['admm']['r'], r['admm']['r'], 8, [t, 'residuals'])
+    t_is(r2['gen'][:, PG], r['gen'][:, PG], 8, [t, 'Pg'])
+
+    t_end()
+
+
+if __name__ == '__main__':
+    t_admmopf(quiet=False)
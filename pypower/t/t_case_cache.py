@@ -0,0 +1,112 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Tests for the binary case cache.
+"""
+
+import os
+
+from os.path import dirname, join, exists
+from shutil import copyfile, rmtree
+from tempfile import mkdtemp
+
+from numpy import memmap, array
+
+from pypower.loadcase import loadcase
+from pypower.save_case_cache import save_case_cache
+from pypower.load_case_cache import load_case_cache
+from pypower.ppoption import ppoption
+from pypower.runpf import runpf
+
+from pypower.idx_bus import PD
+
+from pypower.t.t_begin import t_begin
+from pypower.t.t_is import t_is
+from pypower.t.t_ok import t_ok
+from pypower.t.t_end import t_end
+
+
+def t_case_cache(quiet=False):
+    """Tests for C{save_case_cache}, C{load_case_cache} and the case cache
+    of C{loadcase}.
+    """
+    t_begin(26, quiet)
+
+    tdir = dirname(__file__)
+    tmpdir = mkdtemp()
+    try:
+        ## save/load round trip
+        t = 'save_case_cache/load_case_cache : '
+        ppc = loadcase(join(tdir, 't_case9_pf'))
+        ppc['userfcn'] = {'n': 2, 'x': array([1.0, 2.0])}
+        cachedir = join(tmpdir, 'c9.cache')
+        t_ok(save_case_cache(ppc, cachedir) == cachedir, [t, 'return value'])
+        t_ok(exists(join(cachedir, 'case.json')), [t, 'case.json'])
+        c = load_case_cache(cachedir)
+        t_ok(isinstance(c['bus'], memmap), [t, 'memory-mapped'])
+        t_is(c['bus'], ppc['bus'], 12, [t, 'bus'])
+        t_is(c['gen'], ppc['gen'], 12, [t, 'gen'])
+        t_is(c['branch'], ppc['branch'], 12, [t, 'branch'])
+        t_ok(c['baseMVA'] == ppc['baseMVA'], [t, 'baseMVA'])
+        t_ok(c['version'] == ppc['version'], [t, 'version'])
+        t_ok(c['userfcn']['n'] == 2, [t, 'nested value'])
+        t_is(c['userfcn']['x'], [1, 2], 12, [t, 'nested array'])
+        c['bus'][0, PD] = 1234
+        c = load_case_cache(cachedir, mmap_mode=None)
+        t_ok(c['bus'][0, PD] == ppc['bus'][0, PD], [t, 'copy-on-write'])
+        t_ok(load_case_cache(join(tmpdir, 'none')) is None, [t, 'no cache'])
+        t_ok(not [f for f in os.listdir(tmpdir) if '.tmp' in f],
+             [t, 'temporary files removed'])
+
+        ppc['bad'] = array([None])
+        try:
+            save_case_cache(ppc, cachedir)
+            t_ok(False, [t, 'object array'])
+        except ValueError:
+            t_ok(True, [t, 'object array'])
+        t_ok(load_case_cache(cachedir) is not None, [t, 'old cache kept'])
+
+        ## loadcase
+        t = 'loadcase(..., cache=True) : '
+        fname = join(tmpdir, 'case9.py')
+        copyfile(join(tdir, '..', 'case9.py'), fname)
+        ppc = loadcase(fname, cache=True)
+        t_ok(exists(fname + '.cache'), [t, 'cache created'])
+        c = loadcase(fname, cache=True)
+        t_ok(isinstance(c['bus'], memmap), [t, 'cache used'])
+        t_is(c['branch'], ppc['branch'], 12, [t, 'branch'])
+        t_is(c['gencost'], ppc['gencost'], 12, [t, 'gencost'])
+        c = loadcase(join(tmpdir, 'case9'), cache=True)
+        t_ok(isinstance(c['bus'], memmap), [t, 'no extension'])
+        c = loadcase(fname, cache=False)
+        t_ok(not isinstance(c['bus'], memmap), [t, 'cache=False'])
+
+        r, success = runpf(loadcase(fname, cache=True),
+                           ppoption(VERBOSE=0, OUT_ALL=0))
+        r0, _ = runpf(ppc, ppoption(VERBOSE=0, OUT_ALL=0))
+        t_ok(success, [t, 'runpf success'])
+        t_is(r['bus'], r0['bus'], 10, [t, 'runpf bus'])
+
+        ## touched, contents unchanged
+        st = os.stat(fname)
+        os.utime(fname, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+        c = loadcase(fname, cache=True)
+        t_ok(isinstance(c['bus'], memmap), [t, 'touched file'])
+
+        ## modified
+        with open(fname) as fd:
+            src = fd.read()
+        with open(fname, 'w') as fd:
+            fd.write(src.replace('[5, 1, 90,  30', '[5, 1, 91,  30'))
+        c = loadcase(fname, cache=True)
+        t_ok(not isinstance(c['bus'], memmap), [t, 'modified file'])
+        t_is(c['bus'][4, PD], 91, 12, [t, 'modified data'])
+    finally:
+        rmtree(tmpdir, ignore_errors=True)
+
+    t_end()
+
+
+if __name__ == '__main__':
+    t_case_cache(quiet=False)
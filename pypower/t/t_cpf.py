@@ -0,0 +1,232 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Tests for continuation power flow.
+"""
+
+import os
+
+from os.path import dirname, join
+
+import tempfile
+
+from numpy import array, r_, zeros, arange, exp, conj, abs, max, all, \
+    argmax, load
+from numpy.linalg import solve
+from numpy.random import RandomState
+
+from scipy.sparse import csr_matrix
+
+from pypower.ppoption import ppoption
+from pypower.loadcase import loadcase
+from pypower.ext2int import ext2int
+from pypower.bustypes import bustypes
+from pypower.makeYbus import makeYbus
+from pypower.makeSbus import makeSbus
+from pypower.dSbus_dV import dSbus_dV
+from pypower.runcpf import runcpf
+from pypower.runcpf_multi import runcpf_multi
+from pypower.CPFJacobian import CPFJacobian
+from pypower.CPFTrajectory import CPFTrajectory
+
+from pypower.idx_bus import VM
+from pypower.idx_gen import QG, QMAX
+from pypower.idx_brch import PF, QF, RATE_A
+
+from pypower.t.t_begin import t_begin
+from pypower.t.t_is import t_is
+from pypower.t.t_ok import t_ok
+from pypower.t.t_end import t_end
+
+
+def t_cpf(quiet=False):
+    """Tests for continuation power flow.
+    """
+    num_tests = 42
+
+    t_begin(num_tests, quiet)
+
+    casefile = join(dirname(dirname(__file__)), 'case30')
+    basefile = join(dirname(dirname(__file__)), 'case9')
+    targetfile = join(dirname(dirname(__file__)), 'case9target')
+    verbose = 0#not quiet
+
+    ##-----  bordered Jacobian  -----
+    t = 'CPFJacobian : '
+    ppc = ext2int(loadcase(casefile))
+    ref, pv, pq = bustypes(ppc['bus'], ppc['gen'])
+    Ybus, _, _ = makeYbus(ppc['baseMVA'], ppc['bus'], ppc['branch'])
+    nb = Ybus.shape[0]
+    rs = RandomState(42)
+    V = (1 + 0.05 * rs.rand(nb)) * exp(0.2j * rs.rand(nb))
+    Sxfr = makeSbus(ppc['baseMVA'], ppc['bus'], ppc['gen'])
+    jac = CPFJacobian(Ybus, Sxfr, pv, pq)
+    jac.update(V)
+
+    pvpq = r_[pv, pq]
+    dS_dVm, dS_dVa = dSbus_dV(Ybus, V)
+    J = r_[
+        r_['1', dS_dVa[pvpq, :][:, pvpq].real.toarray(),
+                dS_dVm[pvpq, :][:, pq].real.toarray()],
+        r_['1', dS_dVa[pq, :][:, pvpq].imag.toarray(),
+                dS_dVm[pq, :][:, pq].imag.toarray()]
+    ]
+    t_is(jac.J.toarray(), J, 12, [t, 'J'])
+
+    n = jac.n
+    c, f = rs.rand(n), rs.rand(n)
+    A = r_[r_['1', J, -r_[Sxfr[pvpq].real, Sxfr[pq].imag].reshape((-1, 1))],
+           r_[c, 0.5].reshape((1, -1))]
+    t_is(jac.solve(c, 0.5, f, 2.0), solve(A, r_[f, 2.0]), 10,
+         [t, 'block elimination'])
+    t_is(jac.solve(c, 0.5, zeros(n), 1.0), solve(A, r_[zeros(n), 1.0]), 10,
+         [t, 'tangent'])
+    lu = jac.lu
+    jac.lu = None
+    t_is(jac.solve(c, 0.5, f, 2.0), solve(A, r_[f, 2.0]), 10,
+         [t, 'full bordered solve'])
+    jac.lu = lu
+
+    ## singular J (PV bus at 90 degrees), nonsingular bordered matrix
+    t = 'CPFJacobian (singular J) : '
+    Y1 = csr_matrix(array([[1, -1], [-1, 1]]) * -10j)
+    jac = CPFJacobian(Y1, array([0, -1.0]), array([1]), array([], int))
+    jac.update(array([1, 1j]))
+    t_ok(jac.lu is None, [t, 'no factors'])
+    t_is(jac.solve([1], 0, [2], 1), [1, 2], 12, [t, 'solution'])
+
+    ##-----  runcpf  -----
+    for par in [2, 3]:
+        t = 'runcpf (CPF_PARAMETERIZATION = %d) : ' % par
+        ppopt = ppoption(VERBOSE=verbose, OUT_ALL=0, CPF_PARAMETERIZATION=par)
+        r, success = runcpf(basefile, targetfile, ppopt, '/dev/null')
+        cpf = r['cpf']
+        t_ok(success, [t, 'success'])
+        t_ok(abs(max(cpf['lam_c']) - 1) < 1e-3, [t, 'max lambda'])
+        t_ok(_mismatch(basefile, targetfile, cpf['V_c'][:, -1],
+                       cpf['lam_c'][-1]) < 1e-5, [t, 'corrected point'])
+
+    t = 'runcpf (CPF_STOP_AT = 0.5) : '
+    ppopt = ppoption(VERBOSE=verbose, OUT_ALL=0, CPF_STOP_AT=0.5)
+    r, success = runcpf(basefile, targetfile, ppopt, '/dev/null')
+    t_ok(success, [t, 'success'])
+    t_is(r['cpf']['lam_c'][-1], 0.5, 12, [t, 'lambda'])
+
+    ##-----  trajectory  -----
+    t = 'CPFTrajectory : '
+    tr = CPFTrajectory([2, -1, 0], size=2)
+    for k in range(40):
+        V = k + arange(3) * 1j
+        tr.record(k, V, k / 40., 2 * V, (k + 1) / 40.)
+    cpf = tr.results()
+    t_is(abs(cpf['V_c'][[0, 2], :]), abs(arange(40) + array([[2j], [0]])), 12,
+         [t, 'V_c'])
+    t_ok(all(cpf['V_c'][1, :] != cpf['V_c'][1, :]), [t, 'missing bus'])
+    t_is(cpf['V_p'].shape, [3, 40], 12, [t, 'V_p size'])
+    t_is(cpf['lam_p'], (arange(40) + 1) / 40., 12, [t, 'lam_p'])
+    t_is([cpf['iterations'], cpf['max_lam']], [39, 39 / 40.], 12,
+         [t, 'iterations, max_lam'])
+
+    t = 'runcpf (CPF_TRACE_*) : '
+    ppopt = ppoption(VERBOSE=verbose, OUT_ALL=0)
+    r, success = runcpf(basefile, targetfile, ppopt, '/dev/null')
+    cpf = r['cpf']
+    tmpdir = tempfile.mkdtemp()
+    fname = join(tmpdir, 'cpf')
+    ppopt = ppoption(ppopt, CPF_TRACE_BUSES=[5, 7], CPF_TRACE_EVERY=4,
+                     CPF_TRACE_MMAP=fname)
+    r, success = runcpf(basefile, targetfile, ppopt, '/dev/null')
+    cpf2 = r['cpf']
+    n = cpf['iterations']
+    steps = r_[arange(0, n, 4), n]
+    t_is(cpf2['steps'], steps, 12, [t, 'steps'])
+    t_ok(all(cpf2['V_c'] == cpf['V_c'][[4, 6], :][:, steps]), [t, 'V_c'])
+    t_is(cpf2['lam_c'], cpf['lam_c'][steps], 12, [t, 'lam_c'])
+    t_is(cpf2['max_lam'], cpf['max_lam'], 12, [t, 'max_lam'])
+    t_ok(all(load(fname + '_V_p.npy').T == cpf2['V_p']), [t, 'V_p file'])
+    t_ok(all(cpf['V_c'] == cpf['V_c']), [t, 'all buses'])
+    del r, cpf2
+    os.remove(fname + '_V_p.npy')
+    os.remove(fname + '_V_c.npy')
+    os.rmdir(tmpdir)
+
+    ##-----  multiple directions  -----
+    t = 'runcpf_multi : '
+    b = ext2int(loadcase(basefile))
+    Sb = makeSbus(b['baseMVA'], b['bus'], b['gen'])
+    bt = ext2int(loadcase(targetfile))
+    St = makeSbus(bt['baseMVA'], bt['bus'], bt['gen'])
+    Sxfr = zeros(9, complex)
+    Sxfr[[4, 6, 8]] = Sb[[4, 6, 8]]         ## load growth at buses 5, 7, 9
+    ppopt = ppoption(VERBOSE=verbose, OUT_ALL=0)
+    r = runcpf_multi(basefile, [targetfile, Sxfr, St - Sb], ppopt)
+    nose = argmax(cpf['lam_c'])
+    t_ok(all(r['success']), [t, 'success'])
+    t_is(r['max_lam'][[0, 2]], [cpf['max_lam']] * 2, 10, [t, 'max_lam'])
+    t_is(abs(r['V'][:, 0]), abs(cpf['V_c'][:, nose]), 8, [t, 'V'])
+    t_is(r['steps'][[0, 2]], [cpf['iterations']] * 2, 12, [t, 'steps'])
+    t_ok(r['max_lam'][1] > 1, [t, 'load growth max_lam'])
+
+    r2 = runcpf_multi(basefile, [targetfile, Sxfr, St - Sb], ppopt, workers=2)
+    t_is(r2['max_lam'], r['max_lam'], 12, [t, 'workers = 2'])
+
+    try:
+        runcpf_multi(basefile, [Sxfr[:8]], ppopt)
+        t_ok(False, [t, 'transfer vector size'])
+    except ValueError:
+        t_ok(True, [t, 'transfer vector size'])
+
+    ##-----  limits  -----
+    b = loadcase(basefile)
+    bt = loadcase(targetfile)
+    b['gen'][1:, QMAX] = bt['gen'][1:, QMAX] = [100, 80]
+
+    t = 'runcpf (CPF_ENFORCE_Q_LIMS) : '
+    ppopt = ppoption(VERBOSE=verbose, OUT_ALL=0, CPF_ENFORCE_Q_LIMS=1)
+    r, success = runcpf(b, bt, ppopt, '/dev/null')
+    ev = r['cpf']['events']
+    t_ok(success, [t, 'success'])
+    t_is([e['idx'] for e in ev], [3, 2], 12, [t, 'buses'])
+    t_ok([e['type'] for e in ev] == ['QMAX', 'QMAX'], [t, 'types'])
+    t_is(r['gen'][1:, QG], [100, 80], 4, [t, 'Qg at limits'])
+    t_ok(r['cpf']['max_lam'] < 0.75, [t, 'max lambda'])
+    r2, success = runcpf(b, bt, ppoption(ppopt, CPF_ADAPT_STEP=1), '/dev/null')
+    t_is(r2['cpf']['max_lam'], r['cpf']['max_lam'], 3, [t, 'adaptive step'])
+
+    t = 'runcpf (CPF_ENFORCE_V_LIMS) : '
+    ppopt = ppoption(VERBOSE=verbose, OUT_ALL=0, CPF_ENFORCE_V_LIMS=1)
+    r, success = runcpf(b, bt, ppopt, '/dev/null')
+    ev = r['cpf']['events']
+    t_ok(len(ev) == 1 and ev[0]['type'] == 'VMIN' and ev[0]['idx'] == 5,
+         [t, 'event'])
+    t_ok(abs(r['bus'][4, VM] - 0.9) <= 1e-4, [t, 'Vm at limit'])
+
+    t = 'runcpf (CPF_ENFORCE_FLOW_LIMS) : '
+    ppopt = ppoption(VERBOSE=verbose, OUT_ALL=0, CPF_ENFORCE_FLOW_LIMS=1)
+    r, success = runcpf(b, bt, ppopt, '/dev/null')
+    ev = r['cpf']['events']
+    t_ok(len(ev) == 1 and ev[0]['type'] == 'FLOW' and ev[0]['idx'] == 0,
+         [t, 'event'])
+    Sf = abs(r['branch'][0, PF] + 1j * r['branch'][0, QF])
+    t_ok(abs(Sf - r['branch'][0, RATE_A]) <= 1e-2, [t, 'flow at limit'])
+
+    t_end()
+
+
+def _mismatch(basefile, targetfile, V, lam):
+    """Returns the largest power flow mismatch of the PV and PQ buses at
+    voltage C{V} and loading C{lam} between the base and target cases.
+    """
+    b = ext2int(loadcase(basefile))
+    t = ext2int(loadcase(targetfile))
+    ref, pv, pq = bustypes(b['bus'], b['gen'])
+    Ybus, _, _ = makeYbus(b['baseMVA'], b['bus'], b['branch'])
+    Sb = makeSbus(b['baseMVA'], b['bus'], b['gen'])
+    St = makeSbus(t['baseMVA'], t['bus'], t['gen'])
+    mis = V * conj(Ybus.dot(V)) - Sb - lam * (St - Sb)
+    return max(abs(r_[mis[r_[pv, pq]].real, mis[pq].imag]))
+
+
+if __name__ == '__main__':
+    t_cpf(quiet=False)
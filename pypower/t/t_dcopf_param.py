@@ -0,0 +1,62 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Tests for DC optimal power flow for a batch of load vectors.
+"""
+
+from os.path import dirname, join
+
+from numpy import array, outer
+
+from pypower.ppoption import ppoption
+from pypower.loadcase import loadcase
+from pypower.rundcopf import rundcopf
+from pypower.dcopf_param import dcopf_param
+
+from pypower.idx_bus import PD, LAM_P
+from pypower.idx_gen import PG
+from pypower.idx_brch import PF
+
+from pypower.t.t_begin import t_begin
+from pypower.t.t_is import t_is
+from pypower.t.t_ok import t_ok
+from pypower.t.t_end import t_end
+
+
+def t_dcopf_param(quiet=False):
+    """Tests for DC optimal power flow for a batch of load vectors.
+    """
+    num_tests = 28
+
+    t_begin(num_tests, quiet)
+
+    tdir = dirname(__file__)
+    verbose = 0#not quiet
+
+    ppopt = ppoption(VERBOSE=verbose, OUT_ALL=0, OPF_ALG_DC=200)
+    sf = array([0.8, 0.85, 0.9, 1.0, 1.05, 1.1])
+
+    for casefile in [join(dirname(tdir), 'case30'), join(tdir, 't_case9_opf')]:
+        ppc = loadcase(casefile)
+        t0 = '%s : ' % casefile.split('/')[-1]
+        Pd = outer(sf, ppc['bus'][:, PD])
+
+        r = dcopf_param(ppc, Pd, ppopt)
+        t_ok(all(r['success']), t0 + 'success')
+        t_is(r['nqp'], 1, 12, t0 + 'single QP solve')
+
+        for s in [0, 3, 5]:
+            t = t0 + 'load vector %d : ' % s
+            ppc['bus'][:, PD] = Pd[s, :]
+            rr = rundcopf(ppc, ppopt)
+            t_is(r['f'][s], rr['f'], 3, t + 'f')
+            t_is(r['Pg'][s, :], rr['gen'][:, PG], 3, t + 'Pg')
+            t_is(r['Pf'][s, :], rr['branch'][:, PF], 3, t + 'Pf')
+            t_is(r['lam'][s, :], rr['bus'][:, LAM_P], 3, t + 'lam')
+
+    t_end()
+
+
+if __name__ == '__main__':
+    t_dcopf_param(quiet=False)
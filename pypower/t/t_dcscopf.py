@@ -0,0 +1,80 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Tests for N-1 security-constrained DC optimal power flow.
+"""
+
+from os.path import dirname, join
+
+from numpy import abs, all, newaxis, delete
+
+from pypower.ppoption import ppoption
+from pypower.loadcase import loadcase
+from pypower.ext2int import ext2int
+from pypower.rundcopf import rundcopf
+from pypower.makePTDF import makePTDF
+from pypower.makeLODF import makeLODF
+
+from pypower.idx_brch import PF, RATE_A
+
+from pypower.t.t_begin import t_begin
+from pypower.t.t_is import t_is
+from pypower.t.t_ok import t_ok
+from pypower.t.t_end import t_end
+
+
+def t_dcscopf(quiet=False):
+    """Tests for N-1 security-constrained DC optimal power flow.
+    """
+    num_tests = 12
+
+    t_begin(num_tests, quiet)
+
+    casefile = join(dirname(dirname(__file__)), 'case57')
+    verbose = 0#not quiet
+
+    ppc = loadcase(casefile)
+    ppc['branch'][:, RATE_A] = 200
+    ppopt = ppoption(VERBOSE=verbose, OUT_ALL=0, OPF_ALG_DC=200)
+
+    ## all branches are in-service, so internal and external branch order match
+    ppci = ext2int(ppc)
+    PTDF = makePTDF(ppci['baseMVA'], ppci['bus'], ppci['branch'])
+    LODF = makeLODF(ppci['branch'], PTDF)
+
+    t = 'DC OPF : '
+    r0 = rundcopf(ppc, ppopt)
+    t_ok(r0['success'], t + 'success')
+
+    t = 'DC SCOPF : '
+    r = rundcopf(ppc, ppoption(ppopt, OPF_SCOPF=1))
+    s = r['scopf']
+    t_ok(r['success'], t + 'success')
+    t_ok(r['f'] >= r0['f'], t + 'f >= base case f')
+    t_is(s['rounds'][0]['f'], r0['f'], 4, t + 'first round f')
+    t_ok(s['rounds'][0]['nviol'] > 0, t + 'base case violations')
+    t_is(s['rounds'][-1]['nviol'], 0, 12, t + 'no violations remain')
+    t_is(s['rounds'][-1]['nc'], sum([rd['nviol'] for rd in s['rounds']]),
+         12, t + 'constraint count')
+    t_ok(len(s['binding']) > 0, t + 'binding contingencies')
+
+    ## post-contingency flows, excluding the islanding outages
+    F = r['branch'][:, PF]
+    Fc = F[:, newaxis] + LODF * F
+    Fc = delete(Fc, s['skipped'], 1)
+    t_ok(all(abs(Fc) <= ppc['branch'][:, RATE_A, newaxis] + 1e-3),
+         t + 'post-contingency flow limits')
+    t_ok(all(abs(F) <= ppc['branch'][:, RATE_A] + 1e-3),
+         t + 'base case flow limits')
+
+    t = 'DC SCOPF (OPF_SCOPF_MAX_IT = 0) : '
+    r = rundcopf(ppc, ppoption(ppopt, OPF_SCOPF=1, OPF_SCOPF_MAX_IT=0))
+    t_ok(not r['success'], t + 'not success')
+    t_is(len(r['scopf']['rounds']), 1, 12, t + 'rounds')
+
+    t_end()
+
+
+if __name__ == '__main__':
+    t_dcscopf(quiet=False)
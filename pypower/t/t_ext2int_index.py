@@ -0,0 +1,97 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Tests for C{ext2int_index} and the copies made by C{ext2int} and
+C{int2ext}.
+"""
+
+from copy import deepcopy
+
+from numpy import array_equal
+
+from pypower.ext2int import ext2int
+from pypower.int2ext import int2ext
+from pypower.ext2int_index import ext2int_index, ORDER_CACHE_SIZE, MATRICES
+
+from pypower.idx_bus import BUS_I, VM, VA
+from pypower.idx_gen import GEN_BUS, PG, QG
+from pypower.idx_brch import F_BUS, RATE_A
+
+from pypower.t.t_case_ext import t_case_ext
+
+from pypower.t.t_begin import t_begin
+from pypower.t.t_is import t_is
+from pypower.t.t_ok import t_ok
+from pypower.t.t_end import t_end
+
+
+def t_ext2int_index(quiet=False):
+    """Tests for C{ext2int_index} and the copies made by C{ext2int} and
+    C{int2ext}.
+    """
+    t_begin(17, quiet)
+
+    ppce = t_case_ext()
+    ppc0 = deepcopy(ppce)
+
+    t = 'ext2int_index : '
+    o = ext2int_index(ppce['bus'], ppce['gen'], ppce['branch'], ppce['areas'])
+    t_is(o['bus']['status']['off'], [5], 12, [t, 'isolated buses'])
+    t_is(o['gen']['status']['off'], [2], 12, [t, 'off-line gens'])
+    t_is(o['branch']['status']['off'], [6], 12, [t, 'off-line branches'])
+    t_is(o['bus']['i2e'], ppce['bus'][[0, 1, 2, 3, 4, 6, 7, 8, 9], BUS_I], 12,
+         [t, 'bus i2e'])
+    o1 = ext2int_index(ppce['bus'], ppce['gen'], ppce['branch'], ppce['areas'])
+    t_ok(o1['bus']['e2i'] is o['bus']['e2i'] and o1['gen'] is not o['gen'],
+         [t, 'cached by topology'])
+    t_ok(not o['gen']['i2e'].flags.writeable, [t, 'read-only'])
+
+    ## a different topology
+    bus = ppce['bus'].copy()
+    bus[0, BUS_I] = 99
+    o2 = ext2int_index(bus, ppce['gen'], ppce['branch'], ppce['areas'])
+    t_ok(o2['bus']['i2e'][0] == 99, [t, 'new topology'])
+
+    ## least recently used topologies are dropped
+    for k in range(ORDER_CACHE_SIZE):
+        bus[0, BUS_I] = 100 + k
+        ext2int_index(bus, ppce['gen'], ppce['branch'], ppce['areas'])
+    o1 = ext2int_index(ppce['bus'], ppce['gen'], ppce['branch'], ppce['areas'])
+    t_ok(o1['bus']['e2i'] is not o['bus']['e2i'], [t, 'bounded cache'])
+
+    t = 'ext2int : '
+    ppci = ext2int(ppce)
+    t_ok(ppci['order']['ext']['bus'] is ppce['bus'] and
+         ppci['order']['ext']['gen'] is ppce['gen'], [t, 'ext matrices shared'])
+    ppci['bus'][:, VM] = 1.05
+    ppci['gen'][:, PG] = 10
+    ppci['branch'][:, RATE_A] = 5
+    t_ok(all(array_equal(ppce[k], ppc0[k]) for k in MATRICES),
+         [t, 'input unchanged'])
+
+    t = 'int2ext : '
+    int0 = deepcopy(ppci)
+    ppcx = int2ext(ppci)
+    t_ok(ppcx['order']['int']['bus'] is ppci['bus'], [t, 'int matrices shared'])
+    t_ok(ppci['order']['state'] == 'i' and 'ext' in ppci['order'] and
+         all(array_equal(ppci[k], int0[k]) for k in ('bus', 'gen', 'branch')),
+         [t, 'input unchanged'])
+    on = ppci['order']['bus']['status']['on']
+    off = ppci['order']['bus']['status']['off']
+    t_ok((ppcx['bus'][on, VM] == 1.05).all() and
+         (ppcx['gen'][ppci['order']['gen']['status']['on'], PG] == 10).all(),
+         [t, 'solution scattered'])
+    t_is(ppcx['bus'][off, [VM, VA]], ppce['bus'][off, [VM, VA]], 12,
+         [t, 'isolated buses restored'])
+    t_is(ppcx['bus'][:, BUS_I], ppce['bus'][:, BUS_I], 12, [t, 'bus numbers'])
+    t_is(ppcx['gen'][:, [GEN_BUS, QG]], ppce['gen'][:, [GEN_BUS, QG]], 12,
+         [t, 'gens restored'])
+    t_is(ppcx['branch'][:, F_BUS], ppce['branch'][:, F_BUS], 12,
+         [t, 'branch ends'])
+
+    t_end()
+
+
+if __name__ == '__main__':
+    t_ext2int_index(quiet=False)
@@ -0,0 +1,114 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Tests of the time taken and modules loaded by importing PYPOWER.
+"""
+
+import json
+import sys
+
+from os.path import dirname
+from subprocess import check_output
+
+from pypower._compat import PY2
+
+from pypower.t.t_begin import t_begin
+from pypower.t.t_ok import t_ok
+from pypower.t.t_skip import t_skip
+from pypower.t.t_end import t_end
+
+
+## import time budgets (seconds), best of 3 fresh interpreters
+IMPORT_BUDGET = {'pypower.api': 0.1, 'pypower.main': 0.2}
+
+## modules of the solver backends, imported when the solver is used
+SOLVER_MODULES = ['pypower.ipopt_options', 'pypower.cplex_options',
+                  'pypower.mosek_options', 'pypower.gurobi_options',
+                  'pypower.ipoptopf_solver', 'pypower.qps_ipopt',
+                  'pypower.qps_cplex', 'pypower.qps_mosek',
+                  'pypower.qps_gurobi', 'pypower.qps_highs']
+
+## imports a module in a fresh interpreter, printing the time taken and
+## the modules loaded
+SCRIPT = """
+import sys, json, time
+t0 = time.time()
+import %s
+t = time.time() - t0
+%s
+print(json.dumps([t, sorted(sys.modules)]))
+"""
+
+
+def _import(module, stmt=''):
+    """Returns the time taken to import C{module} in a fresh interpreter
+    and the modules loaded, after running C{stmt}.
+    """
+    root = dirname(dirname(dirname(__file__)))
+    out = check_output([sys.executable, '-c', SCRIPT % (module, stmt)],
+                       cwd=root)
+    t, modules = json.loads(out.decode().strip().splitlines()[-1])
+    return t, set(modules)
+
+
+def _cases(modules):
+    return [m for m in modules if m.startswith(('pypower.case', 'pypower.t.'))
+            and m != 'pypower.caseformat']
+
+
+def t_import(quiet=False):
+    """Tests of the time taken and modules loaded by importing PYPOWER.
+    """
+    t_begin(9, quiet)
+
+    if PY2:
+        t_skip(9, 'lazy imports require Python 3.7')
+        t_end()
+        return
+
+    t = 'import pypower.api : '
+    times = []
+    for _ in range(3):
+        tm, modules = _import('pypower.api')
+        times.append(tm)
+    t_ok(min(times) < IMPORT_BUDGET['pypower.api'],
+         [t, 'time %.3f s' % min(times)])
+    t_ok('numpy' not in modules and not _cases(modules), [t, 'lazy'])
+
+    t = 'pypower.api names : '
+    tm, modules = _import('pypower.api',
+                          'from pypower.api import runpf, case9')
+    t_ok('pypower.runpf' in modules and 'pypower.case9' in modules and
+         'pypower.case300' not in modules and
+         'pypower.t.test_pypower' not in modules, [t, 'imported on use'])
+
+    t = 'import pypower.main : '
+    times = []
+    for _ in range(3):
+        tm, modules = _import('pypower.main')
+        times.append(tm)
+    t_ok(min(times) < IMPORT_BUDGET['pypower.main'],
+         [t, 'time %.3f s' % min(times)])
+    t_ok(not _cases(modules), [t, 'no cases or tests'])
+    t_ok('pypower.runpf' not in modules, [t, 'no solvers'])
+
+    t = 'pypower.main.CASES : '
+    tm, modules = _import('pypower.main',
+                          "pypower.main.CASES['case9']()")
+    t_ok('pypower.case9' in modules and 'pypower.case300' not in modules,
+         [t, 'imported on use'])
+
+    t = 'import pypower.runopf : '
+    tm, modules = _import('pypower.runopf')
+    t_ok(not [m for m in SOLVER_MODULES if m in modules],
+         [t, 'no solver backends'])
+    tm, modules = _import('pypower.runopf', 'from pypower.api import *')
+    t_ok('pypower.ipopt_options' in modules and 'pypower.qps_cplex' in modules,
+         [t, 'from pypower.api import *'])
+
+    t_end()
+
+
+if __name__ == '__main__':
+    t_import(quiet=False)
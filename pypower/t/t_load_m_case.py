@@ -0,0 +1,226 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Tests for C{load_m_case}.
+"""
+
+from os.path import join
+from shutil import rmtree
+from tempfile import mkdtemp
+
+from numpy import inf
+
+from pypower.loadcase import loadcase
+from pypower.load_m_case import load_m_case
+from pypower.case9 import case9
+
+from pypower.idx_brch import ANGMIN, ANGMAX
+
+from pypower.t.t_begin import t_begin
+from pypower.t.t_is import t_is
+from pypower.t.t_ok import t_ok
+from pypower.t.t_end import t_end
+
+
+## case9 as a MATPOWER version 2 case file
+CASE9_M = """function mpc = t_case9m
+%T_CASE9M  Power flow data for 9 bus, 3 generator case.
+%   MATPOWER Case Format : Version 2
+
+%% MATPOWER Case Format : Version 2
+mpc.version = '2';
+
+%%-----  Power Flow Data  -----%%
+%% system MVA base
+mpc.baseMVA = 100;
+
+%% bus data
+%	bus_i	type	Pd	Qd	Gs	Bs	area	Vm	Va	baseKV	zone	Vmax	Vmin
+mpc.bus = [
+	1	3	0	0	0	0	1	1	0	345	1	1.1	0.9;
+	2	2	0	0	0	0	1	1	0	345	1	1.1	0.9;
+	3	2	0	0	0	0	1	1	0	345	1	1.1	0.9;
+	4	1	0	0	0	0	1	1	0	345	1	1.1	0.9;
+	5	1	90	30	0	0	1	1	0	345	1	1.1	0.9;
+	6	1	0	0	0	0	1	1	0	345	1	1.1	0.9;
+	7	1	100	35	0	0	1	1	0	345	1	1.1	0.9;
+	8	1	0	0	0	0	1	1	0	345	1	1.1	0.9;
+	9	1	125	50	0	0	1	1	0	345	1	1.1	0.9;
+];
+
+%% generator data
+%	bus	Pg	Qg	Qmax	Qmin	Vg	mBase	status	Pmax	Pmin	Pc1	Pc2	Qc1min	Qc1max	Qc2min	Qc2max	ramp_agc	ramp_10	ramp_30	ramp_q	apf
+mpc.gen = [
+	1	0	0	300	-300	1	100	1	250	10	0	0	0	0	0	0	0	0	0	0	0;
+	2	163	0	300	-300	1	100	1	300	10	0	0	0	0	0	0	0	0	0	0	0;
+	3	85	0	300	-300	1	100	1	270	10	0	0	0	0	0	0	0	0	0	0	0;
+];
+
+%% branch data
+%	fbus	tbus	r	x	b	rateA	rateB	rateC	ratio	angle	status	angmin	angmax
+mpc.branch = [
+	1	4	0	0.0576	0	250	250	250	0	0	1	-360	360;
+	4	5	0.017	0.092	0.158	250	250	250	0	0	1	-360	360;
+	5	6	0.039	0.17	0.358	150	150	150	0	0	1	-360	360;
+	3	6	0	0.0586	0	300	300	300	0	0	1	-360	360;
+	6	7	0.0119	0.1008	0.209	150	150	150	0	0	1	-360	360;
+	7	8	0.0085	0.072	0.149	250	250	250	0	0	1	-360	360;
+	8	2	0	0.0625	0	250	250	250	0	0	1	-360	360;
+	8	9	0.032	0.161	0.306	250	250	250	0	0	1	-360	360;
+	9	4	0.01	0.085	0.176	250	250	250	0	0	1	-360	360;
+];
+
+%%-----  OPF Data  -----%%
+%% area data
+%	area	refbus
+mpc.areas = [
+	1	5;
+];
+
+%% generator cost data
+%	1	startup	shutdown	n	x1	y1	...	xn	yn
+%	2	startup	shutdown	n	c(n-1)	...	c0
+mpc.gencost = [
+	2	1500	0	3	0.11	5	150;
+	2	2000	0	3	0.085	1.2	600;
+	2	3000	0	3	0.1225	1	335;
+];
+
+%% DC line data
+%	F_BUS	T_BUS	BR_STATUS	PF	PT	QF	QT	VF	VT	PMIN	PMAX	QMINF	QMAXF	QMINT	QMAXT	LOSS0	LOSS1
+mpc.dcline = [
+	2	8	1	10	8.9	0	0	1.01	1	1	100	-Inf	Inf	-Inf	Inf	1	0.01;
+	5	7, 0, 2, 1.7, 0, 0, 1, 1, 1, 50, -Inf, Inf, -Inf, Inf, 0, 0.1; % in one line
+];
+
+%% bus names
+mpc.bus_name = {
+	'Bus 1';
+	'Bus 2 % 100 MW';
+	'Bus ''3''';	% quoted
+	'Bus 4';	'Bus 5';
+	'Bus 6'; 'Bus 7'; 'Bus 8'; 'Bus 9';
+};
+"""
+
+## case9 as a MATPOWER version 1 case file, without gencost
+CASE9_M_V1 = """function [baseMVA, bus, gen, branch] = t_case9m1
+baseMVA = 100;
+bus = [1 3 0 0 0 0 1 1 0 345 1 1.1 0.9; 2 2 0 0 0 0 1 1 0 345 1 1.1 0.9;
+       3 2 0 0 0 0 1 1 0 345 1 1.1 0.9; 4 1 0 0 0 0 1 1 0 345 1 1.1 0.9;
+       5 1 90 30 0 0 1 1 0 345 1 1.1 0.9; 6 1 0 0 0 0 1 1 0 345 1 1.1 0.9;
+       7 1 100 35 0 0 1 1 0 345 1 1.1 0.9; 8 1 0 0 0 0 1 1 0 345 1 1.1 0.9;
+       9 1 125 50 0 0 1 1 0 345 1 1.1 0.9];
+gen = [
+	1	0	0	300	-300	1	100	1	250	10;
+	2	163	0	300	-300	1	100	1	300	10;
+	3	85	0	300	-300	1	100	1	270	10;
+];
+branch = [
+	1	4	0	0.0576	0	250	250	250	0	0	1;
+	4	5	0.017	0.092	0.158	250	250	250	0	0	1;
+	5	6	0.039	0.17	0.358	150	150	150	0	0	1;
+	3	6	0	0.0586	0	300	300	300	0	0	1;
+	6	7	0.0119	0.1008	0.209	150	150	150	0	0	1;
+	7	8	0.0085	0.072	0.149	250	250	250	0	0	1;
+	8	2	0	0.0625	0	250	250	250	0	0	1;
+	8	9	0.032	0.161	0.306	250	250	250	0	0	1;
+	9	4	0.01	0.085	0.176	250	250	250	0	0	1;
+];
+"""
+
+## rows ended by comments or on the line of the assignment
+ROWS_M = """function mpc = t_rows
+mpc.a = [
+1 2 3%c
+4 5 6%c
+7 8 9%c
+10 11 12
+];
+mpc.b = [1 2 3
+4 5 6];
+"""
+
+
+def t_load_m_case(quiet=False):
+    """Tests for C{load_m_case}.
+    """
+    t_begin(22, quiet)
+
+    ppc = case9()
+    tmpdir = mkdtemp()
+    try:
+        fname = join(tmpdir, 't_case9m.m')
+        with open(fname, 'w') as fd:
+            fd.write(CASE9_M)
+        fname1 = join(tmpdir, 't_case9m1.m')
+        with open(fname1, 'w') as fd:
+            fd.write(CASE9_M_V1)
+
+        t = 'load_m_case(v2) : '
+        s = load_m_case(fname)
+        t_ok(s['version'] == '2', [t, 'version'])
+        t_ok(s['baseMVA'] == 100, [t, 'baseMVA'])
+        for k in ('bus', 'gen', 'branch', 'areas', 'gencost'):
+            t_is(s[k], ppc[k], 12, [t, k])
+        t_ok(s['dcline'].shape == (2, 17), [t, 'dcline shape'])
+        t_ok((s['dcline'][:, 11:15] == [-inf, inf, -inf, inf]).all(),
+             [t, 'dcline Inf'])
+        t_is(s['dcline'][1, :5], [5, 7, 0, 2, 1.7], 12, [t, 'dcline commas'])
+        t_ok(s['bus_name'] == ['Bus 1', 'Bus 2 % 100 MW', "Bus '3'"] +
+             ['Bus %d' % k for k in range(4, 10)], [t, 'bus_name'])
+
+        t = 'loadcase(.m) : '
+        ppc1 = loadcase(fname)
+        t_is(ppc1['bus'], ppc['bus'], 12, [t, 'bus'])
+        t_is(ppc1['gencost'], ppc['gencost'], 12, [t, 'gencost'])
+        ppc1 = loadcase(fname[:-2])
+        t_is(ppc1['branch'], ppc['branch'], 12, [t, 'without extension'])
+
+        t = 'loadcase(.m v1) : '
+        ppc1 = loadcase(fname1)
+        t_ok(ppc1['version'] == '2', [t, 'version'])
+        t_is(ppc1['gen'], ppc['gen'], 12, [t, 'gen'])
+        t_is(ppc1['branch'][:, [ANGMIN, ANGMAX]], [[-360, 360]] * 9, 12,
+             [t, 'branch angle limits'])
+
+        t = 'load_m_case(rows) : '
+        fname2 = join(tmpdir, 't_rows.m')
+        with open(fname2, 'w') as fd:
+            fd.write(ROWS_M)
+        s = load_m_case(fname2)
+        t_is(s['a'], [[1, 2, 3], [4, 5, 6], [7, 8, 9], [10, 11, 12]], 12,
+             [t, 'rows ended by comments'])
+        t_is(s['b'], [[1, 2, 3], [4, 5, 6]], 12, [t, 'first row on [ line'])
+
+        t = 'load_m_case(errors) : '
+        with open(fname, 'w') as fd:
+            fd.write(CASE9_M + 'mpc.branch(:, 6) = 0;\n')
+        try:
+            load_m_case(fname)
+            t_ok(0, [t, 'indexed assignment'])
+        except ValueError:
+            t_ok(1, [t, 'indexed assignment'])
+        with open(fname, 'w') as fd:
+            fd.write(CASE9_M.replace('0.9;\n];', '0.9;\n 10 1 ];'))
+        try:
+            load_m_case(fname)
+            t_ok(0, [t, 'ragged matrix'])
+        except ValueError:
+            t_ok(1, [t, 'ragged matrix'])
+        with open(fname, 'w') as fd:
+            fd.write('function mpc = t_case\nmpc.a = [1 2 3; 4 5; 6 7 8 9];\n')
+        try:
+            load_m_case(fname)
+            t_ok(0, [t, 'ragged matrix, whole number of rows'])
+        except ValueError:
+            t_ok(1, [t, 'ragged matrix, whole number of rows'])
+    finally:
+        rmtree(tmpdir, ignore_errors=True)
+
+    t_end()
+
+
+if __name__ == '__main__':
+    t_load_m_case(quiet=False)
@@ -0,0 +1,91 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Tests for multi-period optimal power flow.
+"""
+
+from os.path import dirname, join
+
+from numpy import array, ones, outer, diff, Inf, all, abs
+
+from pypower.ppoption import ppoption
+from pypower.loadcase import loadcase
+from pypower.opf import opf
+from pypower.mpopf import mpopf
+
+from pypower.idx_bus import PD, QD
+from pypower.idx_gen import PG
+
+from pypower.t.t_begin import t_begin
+from pypower.t.t_is import t_is
+from pypower.t.t_ok import t_ok
+from pypower.t.t_end import t_end
+
+
+def t_mpopf(quiet=False):
+    """Tests for multi-period optimal power flow.
+    """
+    num_tests = 24
+
+    t_begin(num_tests, quiet)
+
+    tdir = dirname(__file__)
+    casefile = join(tdir, 't_case9_opf')
+    verbose = 0#not quiet
+
+    ppc = loadcase(casefile)
+    ng = ppc['gen'].shape[0]
+    sf = array([0.7, 1.0, 0.8])
+    nt = len(sf)
+
+    for dc in [1, 0]:
+        if dc:
+            t0 = 'DC multi-period OPF : '
+            ppopt = ppoption(VERBOSE=verbose, OUT_ALL=0, PF_DC=1,
+                             OPF_ALG_DC=200)
+        else:
+            t0 = 'AC multi-period OPF : '
+            ppopt = ppoption(VERBOSE=verbose, OUT_ALL=0, OPF_ALG=560)
+
+        ## separate OPF for each period
+        rr = []
+        for t in range(nt):
+            ppc_t = loadcase(casefile)
+            ppc_t['bus'][:, PD] = sf[t] * ppc_t['bus'][:, PD]
+            ppc_t['bus'][:, QD] = sf[t] * ppc_t['bus'][:, QD]
+            rr.append(opf(ppc_t, ppopt))
+        f0 = sum([r['f'] for r in rr])
+
+        ## no ramp limits
+        r = mpopf(casefile, sf, ppopt, Inf * ones(ng))
+        t_ok(r['success'], t0 + 'no ramp limits : success')
+        t_is(r['f'], f0, 2, t0 + 'no ramp limits : f')
+        for t in range(nt):
+            t_is(r['period'][t]['gen'][:, PG], rr[t]['gen'][:, PG], 3,
+                 t0 + 'no ramp limits : Pg(%d)' % t)
+        t_is(r['period'][1]['f'], rr[1]['f'], 2,
+             t0 + 'no ramp limits : f(1)')
+
+        ## bus demand matrix instead of scale factors
+        Pd = outer(sf, ppc['bus'][:, PD])
+        r = mpopf(casefile, Pd, ppopt, Inf * ones(ng))
+        t_ok(r['success'], t0 + 'bus demands : success')
+        t_is(r['f'], f0, 2, t0 + 'bus demands : f')
+
+        ## tight ramp limits
+        lim = 40 * ones(ng)
+        r = mpopf(casefile, sf, ppopt, lim)
+        Pg = array([rp['gen'][:, PG] for rp in r['period']])
+        t_ok(r['success'], t0 + 'ramp limits : success')
+        t_ok(all(abs(diff(Pg, axis=0)) <= lim + 1e-4),
+             t0 + 'ramp limits : respected')
+        t_ok(r['f'] >= f0 - 1e-4, t0 + 'ramp limits : f >= uncoupled f')
+        t_ok((r['ramp']['mu']['l'] + r['ramp']['mu']['u']).max() > 1e-3,
+             t0 + 'ramp limits : binding')
+
+    t_end()
+
+
+if __name__ == '__main__':
+    t_mpopf(quiet=False)
@@ -0,0 +1,66 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Tests for AC optimal power flow with branch flow screening.
+"""
+
+from os.path import dirname, join
+
+from pypower.ppoption import ppoption
+from pypower.runopf import runopf
+
+from pypower.idx_bus import VM, VA, LAM_P
+from pypower.idx_gen import PG
+from pypower.idx_brch import RATE_A, MU_SF, MU_ST
+
+from pypower.t.t_begin import t_begin
+from pypower.t.t_is import t_is
+from pypower.t.t_ok import t_ok
+from pypower.t.t_end import t_end
+
+
+def t_opf_flow_screen(quiet=False):
+    """Tests for AC optimal power flow with branch flow screening.
+    """
+    num_tests = 19
+
+    t_begin(num_tests, quiet)
+
+    casefile = join(dirname(dirname(__file__)), 'case30')
+    verbose = 0#not quiet
+
+    ppopt = ppoption(VERBOSE=verbose, OUT_ALL=0, OPF_ALG=560)
+    r0 = runopf(casefile, ppopt)
+    nlim = sum(r0['branch'][:, RATE_A] > 0)
+
+    t = 'no screening : '
+    t_ok('screen' not in r0['raw']['output'], [t, 'no screen output'])
+
+    for lim in [0, 2]:
+        t = 'screening (OPF_FLOW_LIM = %d) : ' % lim
+        ppopt = ppoption(ppopt, OPF_FLOW_LIM=lim)
+        r0 = runopf(casefile, ppopt)
+        r = runopf(casefile, ppoption(ppopt, OPF_FLOW_SCREEN=0.9))
+        screen = r['raw']['output']['screen']
+        t_ok(r['success'], [t, 'success'])
+        t_ok(len(screen) > 1, [t, 're-solved'])
+        t_ok(screen[-1] < nlim, [t, 'fewer monitored branches'])
+        t_is(r['f'], r0['f'], 3, [t, 'f'])
+        t_is(r['gen'][:, PG], r0['gen'][:, PG], 2, [t, 'Pg'])
+        t_is(r['bus'][:, [VM, VA]], r0['bus'][:, [VM, VA]], 2, [t, 'Vm, Va'])
+        t_is(r['bus'][:, LAM_P], r0['bus'][:, LAM_P], 2, [t, 'lam_P'])
+        t_is(r['branch'][:, [MU_SF, MU_ST]], r0['branch'][:, [MU_SF, MU_ST]],
+             2, [t, 'mu_Sf, mu_St'])
+
+    t = 'screening (OPF_FLOW_SCREEN_MAX_IT = 0) : '
+    r = runopf(casefile, ppoption(ppopt, OPF_FLOW_LIM=0, OPF_FLOW_SCREEN=0.9,
+                                  OPF_FLOW_SCREEN_MAX_IT=0))
+    t_ok(not r['success'], [t, 'no success'])
+    t_is(len(r['raw']['output']['screen']), 1, 12, [t, 'single solve'])
+
+    t_end()
+
+
+if __name__ == '__main__':
+    t_opf_flow_screen(quiet=False)
@@ -0,0 +1,83 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Tests for C{printpf}.
+"""
+
+from io import StringIO
+
+from numpy import array, r_
+
+from pypower.ppoption import ppoption
+from pypower.runpf import runpf
+from pypower.runopf import runopf
+from pypower.printpf import printpf
+from pypower.case9 import case9
+
+from pypower.idx_bus import BUS_I, VM, VA, PD, QD
+from pypower.idx_gen import PG, QG, PMIN, PMAX
+
+from pypower.t.t_begin import t_begin
+from pypower.t.t_ok import t_ok
+from pypower.t.t_end import t_end
+
+
+def t_printpf(quiet=False):
+    """Tests for C{printpf}.
+    """
+    t_begin(9, quiet)
+
+    ## two generators at bus 2
+    ppc = case9()
+    ppc['gen'] = r_[ppc['gen'], ppc['gen'][1:2]]
+    ppc['gen'][[1, 3], PG] = [100, 63]
+    ppc['gencost'] = r_[ppc['gencost'], ppc['gencost'][1:2]]
+
+    t = 'printpf(PF) : '
+    r, success = runpf(ppc, ppoption(VERBOSE=0, OUT_ALL=0))
+    fd = StringIO()
+    printpf(r, fd, ppoption(OUT_ALL=1))
+    s = fd.getvalue()
+    lines = s.split('\n')
+    t_ok(s.startswith('\nConverged in '), [t, 'header'])
+    b, g = r['bus'], r['gen']
+    line = '%5d%7.3f%9.3f %9.2f%10.2f       -         -   ' % \
+        (b[1, BUS_I], b[1, VM], b[1, VA], g[1, PG] + g[3, PG], g[1, QG] + g[3, QG])
+    t_ok(line in lines, [t, 'bus with 2 generators'])
+    line = '%5d%7.3f%9.3f       -         -  %10.2f%10.2f ' % \
+        (b[4, BUS_I], b[4, VM], b[4, VA], b[4, PD], b[4, QD])
+    t_ok(line in lines, [t, 'bus with load'])
+    t_ok('  3      2      1  %9.2f%10.2f' % (g[3, PG], g[3, QG]) in lines,
+         [t, 'generator'])
+
+    ## dispatchable load at bus 5
+    ppc = case9()
+    ppc['bus'][4, [PD, QD]] = 0
+    gen = array([[5, -90, -30, 0, -30, 1, 100, 1, 0, -90, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0]])
+    ppc['gen'] = r_[ppc['gen'], gen]
+    ppc['gencost'] = r_[ppc['gencost'], array([[2, 0, 0, 3, 0, 50, 0]])]
+
+    t = 'printpf(OPF w/disp load) : '
+    r = runopf(ppc, ppoption(VERBOSE=0, OUT_ALL=0))
+    fd = StringIO()
+    printpf(r, fd, ppoption(OUT_ALL=1))
+    s = fd.getvalue()
+    lines = s.split('\n')
+    g = r['gen']
+    t_ok('Dispatchable Load Data' in s, [t, 'load data'])
+    t_ok('Dispatchable Load Constraints' in s, [t, 'load constraints'])
+    line = '%10.2f*%9.2f*' % (-g[3, PG], -g[3, QG])
+    t_ok(any([l.startswith('    5 ') and line in l for l in lines]),
+         [t, 'bus with disp load'])
+    lines = s[s.index('Dispatchable Load Constraints'):].split('\n')
+    line = [l for l in lines if l.startswith('  3    5')]
+    t_ok(len(line) == 2, [t, 'load P and Q limits'])
+    t_ok('%10.2f%10.2f%10.2f' % (g[3, PMIN], g[3, PG], g[3, PMAX]) in line[0],
+         [t, 'load P limits'])
+
+    t_end()
+
+
+if __name__ == '__main__':
+    t_printpf(quiet=False)
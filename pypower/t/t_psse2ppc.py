@@ -0,0 +1,190 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Tests for C{psse2ppc}.
+"""
+
+from os.path import join
+from shutil import rmtree
+from tempfile import mkdtemp
+
+from pypower.ppoption import ppoption
+from pypower.runpf import runpf
+from pypower.loadcase import loadcase
+from pypower.psse2ppc import psse2ppc
+from pypower.case9 import case9
+
+from pypower.idx_bus import BUS_I, BUS_TYPE, PD, QD, BS, VM, VA, NONE
+from pypower.idx_gen import PMAX, MBASE
+from pypower.idx_brch import F_BUS, T_BUS, BR_X, RATE_A, TAP, BR_STATUS
+
+from pypower.t.t_begin import t_begin
+from pypower.t.t_is import t_is
+from pypower.t.t_ok import t_ok
+from pypower.t.t_end import t_end
+
+
+def raw9(rev):
+    """Returns case9 as a PSS/E RAW file of revision C{rev}, with the
+    branches 1-4, 3-6 and 2-8 as transformers (the last with a turns ratio
+    of 1.05) and a three-winding transformer out of service.
+    """
+    nreg = ' 0,' if rev == 34 else ''
+    lines = [
+        "0, 100.0, %d, 0, 0, 60.00     / PSS(R)E-%d RAW created" % (rev, rev),
+        "CASE9 AS A PSS/E RAW FILE",
+        "TEST CASE",
+        "@!   I,'NAME        ', BASKV, IDE,AREA,ZONE,OWNER, VM,        VA",
+        "     1,'BUS, ONE    ', 345.0, 3, 1, 1, 1, 1.0, 0.0, 1.1, 0.9",
+        "     2,'BUS 2       ', 345.0, 2, 1, 1, 1, 1.0, 0.0, 1.1, 0.9",
+        "     3,'BUS 3       ', 345.0, 2, 1, 1, 1, 1.0, 0.0, 1.1, 0.9",
+        "     4,'BUS 4       ', 345.0, 1, 1, 1, 1, 1.0, 0.0, 1.1, 0.9",
+        "     5,'BUS 5 / LOAD', 345.0, 1, 1, 1, 1, 1.0, 0.0, 1.1, 0.9",
+        "     6 'BUS 6' 345.0 1 1 1 1 1.0 0.0 1.1 0.9   / no commas",
+        "     7,'BUS 7       ', 345.0, 1, 1, 1, 1, 1.0, 0.0, 1.1, 0.9",
+        "     8,'BUS 8       ', 345.0, 1, 1, 1, 1, 1.0, 0.0, 1.1, 0.9",
+        "     9,'BUS 9       ', 345.0, 1, 1, 1, 1, 1.0, 0.0, 1.1, 0.9",
+        "0 / END OF BUS DATA, BEGIN LOAD DATA",
+        "     5,'1 ', 1, 1, 1, 60.0, 20.0, 30.0, 10.0, 0.0, 0.0, 1, 1, 0",
+        "     7,'1 ', 1, 1, 1, 100.0, 35.0, 0.0, 0.0, 0.0, 0.0, 1, 1, 0",
+        "     9,'1 ', 1, 1, 1, 125.0, 50.0",
+        "     9,'2 ', 0, 1, 1, 500.0, 50.0, 0.0, 0.0, 0.0, 0.0, 1, 1, 0",
+        "0 / END OF LOAD DATA, BEGIN FIXED SHUNT DATA",
+        "     9,'1 ', 1, 0.0, 10.0",
+        "0 / END OF FIXED SHUNT DATA, BEGIN GENERATOR DATA",
+        "     1,'1 ', 0.0, 0.0, 300.0, -300.0, 1.0, 0,%s 100.0, 0, 1, 0, 0, "
+        "1, 1, 100, 250.0, 10.0" % nreg,
+        "     2,'1 ', 163.0, 0.0, 300.0, -300.0, 1.0, 0,%s 100.0, 0, 1, 0, 0, "
+        "1, 1, 100, 300.0, 10.0" % nreg,
+        "     3,'1 ', 85.0, 0.0, 300.0, -300.0, 1.0, 0,%s 200.0, 0, 1, 0, 0, "
+        "1, 1, 100, 270.0, 10.0" % nreg,
+        "0 / END OF GENERATOR DATA, BEGIN BRANCH DATA",
+    ]
+    for f, t, r, x, b, rate in [(4, 5, 0.017, 0.092, 0.158, 250),
+                                (5, 6, 0.039, 0.17, 0.358, 150),
+                                (6, 7, 0.0119, 0.1008, 0.209, 150),
+                                (7, 8, 0.0085, 0.072, 0.149, 250),
+                                (8, 9, 0.032, 0.161, 0.306, 250),
+                                (9, 4, 0.01, 0.085, 0.176, 250)]:
+        if rev == 33:
+            lines.append("%d, %d,'1 ', %g, %g, %g, %g, %g, %g, 0, 0, 0, 0, "
+                         "1, 1, 0.0, 1, 1" % (f, t, r, x, b, rate, rate, rate))
+        else:
+            lines.append("%d, %d,'1 ', %g, %g, %g,'LINE', %g, %g, %g, 0, 0, "
+                         "0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 1, 0.0, 1, 1"
+                         % (f, t, r, x, b, rate, rate, rate))
+    lines.append("0 / END OF BRANCH DATA, BEGIN TRANSFORMER DATA")
+    if rev == 34:
+        lines[-1] = "0 / END OF BRANCH DATA, BEGIN SYSTEM SWITCHING DEVICE DATA"
+        lines.append("0 / END OF SYSTEM SWITCHING DEVICE DATA")
+    lines += [
+        ## CW = 1, CZ = 1
+        "     1, 4, 0,'1 ', 1, 1, 1, 0.0, 0.0, 2,'T1', 1, 1, 1.0",
+        "0.0, 0.0576, 100.0",
+        "1.0, 0.0, 0.0, 250.0, 250.0, 250.0, 0, 0, 1.1, 0.9, 1.1, 0.9, 33, 0",
+        "1.0, 0.0",
+        ## CW = 2, CZ = 2
+        "     3, 6, 0,'1 ', 2, 2, 1, 0.0, 0.0, 2,'T2', 1, 1, 1.0",
+        "0.0, 0.1172, 200.0",
+        "345.0, 0.0, 0.0, 300.0, 300.0, 300.0",
+        "345.0, 0.0",
+        ## turns ratio 1.05, winding 2 off-nominal
+        "     2, -8, 0,'1 ', 1, 1, 1, 0.0, 0.0, 2,'T3', 1, 1, 1.0",
+        "0.0, %.12g, 100.0" % (0.0625 / 1.02**2),
+        "%.12g, 0.0, 0.0, 250.0, 250.0, 250.0" % (1.05 * 1.02),
+        "1.02, 0.0",
+        ## three-winding, out of service
+        "     7, 8, 9,'1 ', 1, 1, 1, 0.0, 0.0, 2,'T4', 0, 1, 1.0",
+        "0.0, 0.03, 100.0, 0.0, 0.05, 100.0, 0.0, 0.04, 100.0, 1.0, 0.0",
+        "1.0, 0.0, 0.0, 100.0, 100.0, 100.0",
+        "1.0, 0.0, 0.0, 200.0, 200.0, 200.0",
+        "1.0, 0.0, 0.0, 300.0, 300.0, 300.0",
+        "0 / END OF TRANSFORMER DATA, BEGIN AREA DATA",
+        "     1, 1, 0.0, 10.0,'AREA 1'",
+        "0 / END OF AREA DATA, BEGIN TWO-TERMINAL DC DATA",
+    ]
+    lines += ["0 / END OF DATA"] * 9
+    if rev == 33:
+        lines.append("     9, 0, 0, 1, 1.1, 0.9, 0, 100,'', -10.0, 1, -10.0")
+    else:
+        lines.append("     9, 0, 0, 1, 1.1, 0.9, 0, 0, 100,'', -10.0, 1, "
+                     "-10.0")
+    lines += ["0 / END OF SWITCHED SHUNT DATA", "Q"]
+    return '\n'.join(lines) + '\n'
+
+
+def t_psse2ppc(quiet=False):
+    """Tests for C{psse2ppc}.
+    """
+    t_begin(24, quiet)
+
+    ## expected case
+    ppc = case9()
+    ppc['branch'][6, [F_BUS, T_BUS, TAP]] = [2, 8, 1.05]
+    ppc['gen'][2, MBASE] = 200
+    ppopt = ppoption(VERBOSE=0, OUT_ALL=0)
+    r, success = runpf(ppc, ppopt)
+
+    tmpdir = mkdtemp()
+    try:
+        for rev in (33, 34):
+            t = 'psse2ppc(v%d) : ' % rev
+            fname = join(tmpdir, 'case9_%d.raw' % rev)
+            with open(fname, 'w') as fd:
+                fd.write(raw9(rev))
+
+            mpc = psse2ppc(fname)
+            bus, gen, branch = mpc['bus'], mpc['gen'], mpc['branch']
+            t_ok(mpc['baseMVA'] == 100 and bus.shape[0] == 10, [t, 'size'])
+            t_is(bus[:9, [PD, QD]], ppc['bus'][:, [PD, QD]], 12, [t, 'loads'])
+            t_ok(abs(bus[8, BS]) < 1e-12, [t, 'shunts'])
+            t_is(gen[:, [PMAX, MBASE]], ppc['gen'][:, [PMAX, MBASE]], 12,
+                 [t, 'gen'])
+            t_ok(mpc['bus_name'][:2] == ['BUS, ONE', 'BUS 2'] and
+                 mpc['bus_name'][5] == 'BUS 6', [t, 'bus names'])
+            t_is(branch[6:9, [F_BUS, T_BUS, BR_X, RATE_A, TAP]],
+                 [[1, 4, 0.0576, 250, 1], [3, 6, 0.0586, 300, 1],
+                  [2, 8, 0.0625, 250, 1.05]], 10, [t, 'transformers'])
+
+            ## three-winding transformer
+            t_ok(bus[9, BUS_I] == 10 and bus[9, BUS_TYPE] == NONE,
+                 [t, 'star bus'])
+            t_is(branch[9:, [F_BUS, T_BUS, BR_X, RATE_A, BR_STATUS]],
+                 [[7, 10, 0.01, 100, 0], [8, 10, 0.02, 200, 0],
+                  [9, 10, 0.03, 300, 0]], 12, [t, '3-winding'])
+
+            rr, success = runpf(mpc, ppopt)
+            t_ok(success, [t, 'runpf success'])
+            t_is(rr['bus'][:9, [VM, VA]], r['bus'][:, [VM, VA]], 8,
+                 [t, 'runpf voltages'])
+
+        t = 'loadcase(.raw) : '
+        mpc = loadcase(fname)
+        t_is(mpc['areas'], [[1, 1]], 12, [t, 'areas'])
+
+        t = 'psse2ppc(blank-separated header) : '
+        with open(fname, 'w') as fd:
+            fd.write(raw9(34).replace('0, 100.0, 34, 0, 0, 60.00',
+                                      '0  50.0  34  0  0  60.00'))
+        mpc = psse2ppc(fname)
+        t_ok(mpc['baseMVA'] == 50, [t, 'baseMVA'])
+        t_is(mpc['branch'][6:9, [F_BUS, T_BUS, TAP]],
+             [[1, 4, 1], [3, 6, 1], [2, 8, 1.05]], 10, [t, 'revision 34'])
+
+        t = 'psse2ppc(v32) : '
+        with open(fname, 'w') as fd:
+            fd.write(raw9(33).replace(', 33, 0, 0, 60', ', 32, 0, 0, 60'))
+        try:
+            psse2ppc(fname)
+            t_ok(0, [t, 'unsupported revision'])
+        except ValueError:
+            t_ok(1, [t, 'unsupported revision'])
+    finally:
+        rmtree(tmpdir, ignore_errors=True)
+
+    t_end()
+
+
+if __name__ == '__main__':
+    t_psse2ppc(quiet=False)
@@ -0,0 +1,118 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Tests of C{qps_highs} LP/MILP solver and DC OPF using HiGHS.
+"""
+
+from os.path import dirname, join
+
+from numpy import array, zeros, shape
+
+from scipy.sparse import csr_matrix as sparse
+
+from pypower.ppoption import ppoption
+from pypower.qps_pypower import qps_pypower
+from pypower.rundcopf import rundcopf
+from pypower.util import have_fcn
+
+from pypower.idx_bus import LAM_P
+from pypower.idx_gen import PG, MU_PMAX, MU_PMIN
+from pypower.idx_brch import PF, MU_SF, MU_ST
+
+from pypower.t.t_begin import t_begin
+from pypower.t.t_is import t_is
+from pypower.t.t_ok import t_ok
+from pypower.t.t_skip import t_skip
+from pypower.t.t_end import t_end
+
+
+def t_qps_highs(quiet=False):
+    """Tests of C{qps_highs} LP/MILP solver and DC OPF using HiGHS.
+    """
+    num_tests = 25
+
+    t_begin(num_tests, quiet)
+
+    if not have_fcn('highs'):
+        t_skip(num_tests, 'HiGHS (SciPy >= 1.9) not available')
+        t_end()
+        return
+
+    opt = {'verbose': 0, 'alg': 800}
+
+    t = 'HiGHS - 3-d LP : '
+    ## example from 'doc linprog'
+    c = array([-5, -4, -6], float)
+    A = sparse([[1, -1,  1],
+                [3,  2,  4],
+                [3,  2,  0]], dtype=float)
+    u = array([20, 42, 30], float)
+    xmin = array([0, 0, 0], float)
+    x, f, s, _, lam = qps_pypower(None, c, A, None, u, xmin, None, None, opt)
+    t_is(s, 1, 12, [t, 'success'])
+    t_is(x, [0, 15, 3], 6, [t, 'x'])
+    t_is(f, -78, 6, [t, 'f'])
+    t_is(lam['mu_l'], [0, 0, 0], 13, [t, 'lam.mu_l'])
+    t_is(lam['mu_u'], [0, 1.5, 0.5], 9, [t, 'lam.mu_u'])
+    t_is(lam['lower'], [1, 0, 0], 9, [t, 'lam.lower'])
+    t_is(lam['upper'], zeros(shape(x)), 13, [t, 'lam.upper'])
+
+    t = 'HiGHS - infeasible LP : '
+    p = {'A': sparse([1, 1]), 'c': array([1, 1]), 'u': array([-1]),
+         'xmin': array([0, 0]), 'opt': opt}
+    x, f, s, _, lam = qps_pypower(p)
+    t_ok(s <= 0, [t, 'no success'])
+
+    t = 'HiGHS - 2-d MILP : '
+    ## max 3x + 2y s.t. 2x + 2y <= 9, 3x + y <= 11, x, y >= 0 integer
+    c = array([-3, -2], float)
+    A = sparse([[2, 2], [3, 1]], dtype=float)
+    u = array([9, 11], float)
+    xmin = array([0, 0], float)
+    opt_mip = {'verbose': 0, 'alg': 800, 'vtype': 'I'}
+    x, f, s, out, lam = qps_pypower(None, c, A, None, u, xmin, None, None,
+                                    opt_mip)
+    t_is(s, 1, 12, [t, 'success'])
+    t_ok(out['mip'], [t, 'mip'])
+    t_is(x, [3, 1], 8, [t, 'x'])
+    t_is(f, -11, 8, [t, 'f'])
+    t_is(lam['mu_u'], [0, 0], 8, [t, 'lam.mu_u (integers fixed)'])
+
+    t = 'HiGHS - binary variable : '
+    opt_mip['vtype'] = 'BC'
+    x, f, s, out, lam = qps_pypower(None, c, A, None, u, xmin, None, None,
+                                    opt_mip)
+    t_is(s, 1, 12, [t, 'success'])
+    t_is(x, [1, 3.5], 8, [t, 'x'])
+
+    t = 'HiGHS - QP : '
+    H = sparse([[1, 0], [0, 1]], dtype=float)
+    x, f, s, _, lam = qps_pypower(H, c, A, None, u, xmin, None, None, opt)
+    t_ok(s <= 0, [t, 'not supported'])
+
+    t = 'DC OPF (HiGHS) : '
+    casefile = join(dirname(__file__), 't_case9_opf')
+    ppopt = ppoption(VERBOSE=0, OUT_ALL=0, OPF_ALG_DC=200)
+    r0 = rundcopf(casefile, ppopt)
+    r = rundcopf(casefile, ppoption(ppopt, OPF_ALG_DC=800))
+    t_ok(r['success'], [t, 'success'])
+    t_is(r['raw']['output']['alg'], 800, 12, [t, 'alg'])
+    t_is(r['f'], r0['f'], 3, [t, 'f'])
+    t_is(r['gen'][:, PG], r0['gen'][:, PG], 3, [t, 'Pg'])
+    t_is(r['branch'][:, PF], r0['branch'][:, PF], 3, [t, 'Pf'])
+    t_is(r['bus'][:, LAM_P], r0['bus'][:, LAM_P], 3, [t, 'lam_P'])
+    t_is(r['gen'][:, [MU_PMIN, MU_PMAX]], r0['gen'][:, [MU_PMIN, MU_PMAX]],
+         3, [t, 'mu_Pg'])
+    t_is(r['branch'][:, [MU_SF, MU_ST]], r0['branch'][:, [MU_SF, MU_ST]],
+         3, [t, 'mu_Pf'])
+
+    t = 'DC OPF (default, LP cost) : '
+    r = rundcopf(casefile, ppoption(ppopt, OPF_ALG_DC=0))
+    t_is(r['raw']['output']['alg'], 800, 12, [t, 'alg'])
+
+    t_end()
+
+
+if __name__ == '__main__':
+    t_qps_highs(quiet=False)
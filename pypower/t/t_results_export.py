@@ -0,0 +1,124 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Tests for C{results_export}.
+"""
+
+import json
+
+from os.path import join
+from shutil import rmtree
+from tempfile import mkdtemp
+
+from numpy import loadtxt, load, nan
+
+from pypower.ppoption import ppoption
+from pypower.runpf import runpf
+from pypower.runopf import runopf
+from pypower.results_export import results_export, COLUMNS
+from pypower.case9 import case9
+from pypower.case30 import case30
+
+from pypower.idx_bus import BUS_I, VM, MU_VMIN
+from pypower.idx_gen import PG, MU_QMIN
+from pypower.idx_brch import PF, MU_ANGMAX
+
+from pypower.t.t_begin import t_begin
+from pypower.t.t_is import t_is
+from pypower.t.t_ok import t_ok
+from pypower.t.t_end import t_end
+
+
+def t_results_export(quiet=False):
+    """Tests for C{results_export}.
+    """
+    t_begin(24, quiet)
+
+    t = 'COLUMNS : '
+    t_ok(COLUMNS['bus'][BUS_I] == 'BUS_I' and COLUMNS['bus'][VM] == 'VM' and
+         len(COLUMNS['bus']) == MU_VMIN + 1, [t, 'bus'])
+    t_ok(COLUMNS['gen'][PG] == 'PG' and len(COLUMNS['gen']) == MU_QMIN + 1,
+         [t, 'gen'])
+    t_ok(COLUMNS['branch'][PF] == 'PF' and
+         len(COLUMNS['branch']) == MU_ANGMAX + 1, [t, 'branch'])
+
+    ppopt = ppoption(VERBOSE=0, OUT_ALL=0)
+    r = runopf(case30(), ppopt)
+    tmpdir = mkdtemp()
+    try:
+        ## CSV
+        t = 'results_export(csv) : '
+        fname = join(tmpdir, 'r.csv')
+        files = results_export(r, fname)
+        t_ok(len(files) == 4, [t, 'files'])
+        for tbl in ('bus', 'gen', 'branch'):
+            fn = join(tmpdir, 'r_%s.csv' % tbl)
+            with open(fn) as fd:
+                header = fd.readline().strip().split(',')
+            t_ok(header == COLUMNS[tbl][:r[tbl].shape[1]], [t, tbl + ' header'])
+            t_is(loadtxt(fn, delimiter=',', skiprows=1), r[tbl], 8, [t, tbl])
+        s = loadtxt(join(tmpdir, 'r_summary.csv'), delimiter=',', skiprows=1)
+        t_is(s, [r['baseMVA'], 1, r['et'], r['f']], 6, [t, 'summary'])
+
+        ## CSV time series
+        t = 'results_export(csv, append) : '
+        fname = join(tmpdir, 'ts.csv')
+        for k in range(3):
+            results_export(r, fname, append=True, step=k)
+        with open(join(tmpdir, 'ts_bus.csv')) as fd:
+            lines = fd.read().splitlines()
+        t_ok(lines[0].startswith('STEP,BUS_I,') and
+             len(lines) == 3 * r['bus'].shape[0] + 1, [t, 'one header'])
+        A = loadtxt(join(tmpdir, 'ts_bus.csv'), delimiter=',', skiprows=1)
+        t_ok((A[-r['bus'].shape[0]:, 0] == 2).all(), [t, 'step column'])
+
+        ## JSON lines
+        t = 'results_export(jsonl) : '
+        fname = join(tmpdir, 'r.jsonl')
+        results_export(r, fname)
+        with open(fname) as fd:
+            rows = [json.loads(l) for l in fd]
+        nb, ng, nl = r['bus'].shape[0], r['gen'].shape[0], r['branch'].shape[0]
+        t_ok(len(rows) == nb + ng + nl + 1, [t, 'one object per element'])
+        t_is([e['VM'] for e in rows if e['table'] == 'bus'], r['bus'][:, VM], 8,
+             [t, 'VM'])
+        t_is([e['PF'] for e in rows if e['table'] == 'branch'], r['branch'][:, PF],
+             8, [t, 'PF'])
+        t_ok(abs(rows[-1]['f'] - r['f']) < 1e-6, [t, 'summary'])
+        r2 = dict(r, bus=r['bus'].copy())
+        r2['bus'][0, VM] = nan
+        results_export(r2, fname)
+        with open(fname) as fd:
+            e = json.loads(fd.readline())
+        t_ok(e['VM'] != e['VM'] and e['BUS_I'] == 1, [t, 'NaN'])
+
+        ## NPZ
+        t = 'results_export(npz) : '
+        fname = join(tmpdir, 'r.npz')
+        results_export(r, fname)
+        with load(fname) as d:
+            t_is(d['gen'], r['gen'], 12, [t, 'gen'])
+            t_ok(list(d['branch_columns']) == COLUMNS['branch'], [t, 'columns'])
+            t_ok(abs(d['f'] - r['f']) < 1e-9, [t, 'f'])
+        fname = join(tmpdir, 'ts.npz')
+        for k in range(2):
+            results_export(r, fname, append=True, step=10 + k)
+        with load(fname) as d:
+            t_ok('bus_1' in d.files and 'bus' not in d.files, [t, 'append'])
+            t_ok(d['step_1'] == 11, [t, 'step'])
+
+        ## runpf option
+        t = "runpf(OUT_FORMAT='csv') : "
+        fname = join(tmpdir, 'pf.csv')
+        r, success = runpf(case9(), ppoption(ppopt, OUT_FORMAT='csv'), fname)
+        t_is(loadtxt(join(tmpdir, 'pf_bus.csv'), delimiter=',', skiprows=1),
+             r['bus'], 8, [t, 'bus'])
+    finally:
+        rmtree(tmpdir, ignore_errors=True)
+
+    t_end()
+
+
+if __name__ == '__main__':
+    t_results_export(quiet=False)
@@ -0,0 +1,126 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Tests for C{runts}.
+"""
+
+from os.path import join, exists
+from shutil import rmtree
+from tempfile import mkdtemp
+
+from numpy import linspace, save, savetxt, c_, isnan
+
+from pypower.ppoption import ppoption
+from pypower.runpf import runpf
+from pypower.runts import runts
+from pypower.case9 import case9
+
+from pypower.idx_bus import PD, QD, VM, VA, BUS_TYPE, NONE
+from pypower.idx_gen import PG, QMAX
+from pypower.idx_brch import PF, QF, PT, QT
+
+from pypower.t.t_begin import t_begin
+from pypower.t.t_is import t_is
+from pypower.t.t_ok import t_ok
+from pypower.t.t_end import t_end
+
+
+def _runpf(ppc, k, profiles, ppopt):
+    """Returns the results of L{runpf} for step C{k} of C{profiles}.
+    """
+    for key, col, table in (('PD', PD, 'bus'), ('QD', QD, 'bus'),
+                            ('PG', PG, 'gen')):
+        if key in profiles:
+            p = profiles[key]
+            ppc[table] = ppc[table].astype(float)
+            if p.ndim == 1:
+                ppc[table][:, col] = ppc[table][:, col] * p[k]
+            else:
+                ppc[table][:, col] = p[k]
+    r, success = runpf(ppc, ppopt)
+    return r
+
+
+def t_runts(quiet=False):
+    """Tests for C{runts}.
+    """
+    t_begin(15, quiet)
+
+    ppopt = ppoption(VERBOSE=0, OUT_ALL=0)
+    nt = 24
+    f = linspace(0.8, 1.2, nt)
+    ppc = case9()
+    profiles = {
+        'PD': f,
+        'PG': ppc['gen'][:, PG] * f[:, None] ** 0.5
+    }
+
+    t = 'runts : '
+    r = runts(case9(), profiles, ppopt, chunk=5)
+    t_ok(r['VM'].shape == (nt, 9) and r['PF'].shape == (nt, 9),
+         [t, 'output size'])
+    t_ok(r['success'].all(), [t, 'success'])
+    t_ok((r['iterations'][1:5] < r['iterations'][0]).all(), [t, 'warm start'])
+    for k in (0, 6, nt - 1):
+        rr = _runpf(case9(), k, profiles, ppopt)
+        t_is(r['VA'][k], rr['bus'][:, VA], 5, [t, 'VA step %d' % k])
+    rr = _runpf(case9(), 10, profiles, ppopt)
+    t_is(c_[r['PF'][10], r['QF'][10], r['PT'][10], r['QT'][10]],
+         rr['branch'][:, [PF, QF, PT, QT]], 5, [t, 'branch flows'])
+
+    t = 'runts(workers=2) : '
+    r2 = runts(case9(), profiles, ppopt, chunk=5, workers=2)
+    t_is(r2['VM'], r['VM'], 12, [t, 'same as serial'])
+
+    t = 'runts(ENFORCE_Q_LIMS) : '
+    ppc = case9()
+    ppc['gen'][1, QMAX] = 5
+    ppopt_q = ppoption(ppopt, ENFORCE_Q_LIMS=1)
+    r = runts(ppc, profiles, ppopt_q, chunk=10)
+    t_ok(r['success'].all() and (r['iterations'] < 0).any(),
+         [t, 'steps solved by runpf'])
+    k = nt - 1
+    rr = _runpf(dict(ppc, bus=ppc['bus'].copy(), gen=ppc['gen'].copy()), k,
+                profiles, ppopt_q)
+    t_is(r['VM'][k], rr['bus'][:, VM], 5, [t, 'VM'])
+
+    t = 'runts(isolated bus) : '
+    ppc = case9()
+    ppc['bus'][4, BUS_TYPE] = NONE
+    r = runts(ppc, {'QD': f}, ppopt)
+    t_ok(isnan(r['VM'][:, 4]).all() and not isnan(r['VM'][:, 3]).any(),
+         [t, 'NaN voltages'])
+    t_ok((r['PF'][:, [1, 2]] == 0).all(), [t, 'zero flows'])
+
+    tmpdir = mkdtemp()
+    try:
+        t = 'runts(files) : '
+        fpd = join(tmpdir, 'pd.csv')
+        pd = ppc['bus'][:, PD] * f[:, None]
+        with open(fpd, 'w') as fd:
+            fd.write('# PD by bus\n')
+            savetxt(fd, pd, delimiter=',')
+        fpg = join(tmpdir, 'pg.npy')
+        save(fpg, profiles['PG'])
+        fname = join(tmpdir, 'out')
+        r = runts(case9(), {'PD': fpd, 'PG': fpg}, ppopt, fname, chunk=7)
+        r0 = runts(case9(), {'PD': pd, 'PG': profiles['PG']}, ppopt,
+                   chunk=7)
+        t_is(r['VM'], r0['VM'], 12, [t, 'CSV and NPY profiles'])
+        t_ok(exists(fname + '_QT.npy') and hasattr(r['QT'], 'filename'),
+             [t, 'memory-mapped output'])
+        try:
+            runts(case9(), {'PD': f, 'QD': f[:-1]}, ppopt)
+            t_ok(0, [t, 'different lengths'])
+        except ValueError:
+            t_ok(1, [t, 'different lengths'])
+        del r
+    finally:
+        rmtree(tmpdir, ignore_errors=True)
+
+    t_end()
+
+
+if __name__ == '__main__':
+    t_runts(quiet=False)
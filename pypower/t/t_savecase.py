@@ -11,6 +11,8 @@ from os.path import join
 
 import tempfile
 
+from shutil import rmtree
+
 import numpy as np
 
 from numpy import array
@@ -21,7 +23,7 @@ from pypower.loadcase import loadcase
 from pypower.ppoption import ppoption
 from pypower.runpf import runpf
 from pypower.runopf import runopf
-from pypower.savecase import savecase
+from pypower.savecase import savecase, format_rows
 
 from pypower.t.t_begin import t_begin
 from pypower.t.t_ok import t_ok
@@ -30,11 +32,12 @@ from pypower.t.t_ok import t_ok
 def t_savecase(quiet=False):
     """Tests that C{savecase} saves case files in MAT and PY file formats."""
 
-    t_begin(12, quiet)
+    t_begin(23, quiet)
 
     MATCASE = 'test_savedcase.mat'
     PYCASE = 'test_savedcase.py'
-    file_formats = [MATCASE, PYCASE]
+    CACHECASE = 'test_savedcase.cache'
+    file_formats = [MATCASE, PYCASE, CACHECASE]
 
     pf_case = {'case': case24_ieee_rts(),
                'run_func': runpf,
@@ -86,11 +89,22 @@ def t_savecase(quiet=False):
                 saved_case_matches_ppc = verify_saved_case(loaded_case, ppc)
                 t_ok(saved_case_matches_ppc, msg_prefix + msg_desc)
 
-                os.remove(path)
+                if file_format == 'cache':
+                    t_ok(isinstance(loaded_case['bus'], np.memmap),
+                         msg_prefix + ' memory-mapped')
+                    rmtree(path)
+                else:
+                    os.remove(path)
             finally:
                 os.umask(saved_umask)
     os.rmdir(tmpdir)
 
+    t = 'format_rows : '
+    A = array([[1, 2.5, 1 / 3.], [2, -1e-12, 4]])
+    t_ok(format_rows(A, ['%d', '%.9g', '%.4f'], '  ') ==
+         '  [1, 2.5, 0.3333],\n  [2, -1e-12, 4.0000],\n', [t, 'rows'])
+    t_ok(format_rows(A[:0], ['%d']) == '', [t, 'no rows'])
+
 
 def save_format(file):
     """Return 'mat' or 'py' based on file name extension."""
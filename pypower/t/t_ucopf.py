@@ -0,0 +1,115 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Tests for DC unit commitment.
+"""
+
+from os.path import dirname, join
+
+from numpy import array, diff, maximum, r_, all, any, abs
+from numpy import flatnonzero as find
+
+from pypower.ppoption import ppoption
+from pypower.loadcase import loadcase
+from pypower.rundcopf import rundcopf
+from pypower.ucopf import ucopf
+from pypower.util import have_fcn
+
+from pypower.idx_gen import PG, GEN_STATUS, PMIN, PMAX
+from pypower.idx_cost import COST, STARTUP
+
+from pypower.t.t_begin import t_begin
+from pypower.t.t_is import t_is
+from pypower.t.t_ok import t_ok
+from pypower.t.t_skip import t_skip
+from pypower.t.t_end import t_end
+
+
+def t_ucopf(quiet=False):
+    """Tests for DC unit commitment.
+    """
+    num_tests = 15
+
+    t_begin(num_tests, quiet)
+
+    casefile = join(dirname(dirname(__file__)), 'case30')
+    verbose = 0#not quiet
+
+    if not have_fcn('highs'):
+        t_skip(num_tests, 'HiGHS (via SciPy) not available')
+        t_end()
+        return
+
+    ## add no-load costs and raise Pmin so that decommitment pays off
+    ppc = loadcase(casefile)
+    ppc['gencost'][:, COST + 2] = array([100, 200, 300, 400, 500, 600])
+    ppc['gen'][:, PMIN] = 0.5 * ppc['gen'][:, PMAX]
+    ppopt = ppoption(VERBOSE=verbose, OUT_ALL=0)
+
+    t = 'single period : '
+    r = ucopf(ppc, None, ppopt, npts=20)
+    p = loadcase(ppc)
+    p['gen'][3:, GEN_STATUS] = 0
+    r0 = rundcopf(p, ppopt)
+    t_ok(r['success'], [t, 'success'])
+    t_is(r['uc']['u'], [[1, 1, 1, 0, 0, 0]], 12, [t, 'commitment'])
+    t_is(r['period'][0]['gen'][:, GEN_STATUS], [1, 1, 1, 0, 0, 0], 12,
+         [t, 'GEN_STATUS'])
+    t_is(r['f'], r0['f'], 1, [t, 'f'])
+    t_is(r['period'][0]['gen'][:, PG], r0['gen'][:, PG], 0, [t, 'Pg'])
+
+    t = 'multi-period : '
+    sf = array([0.6, 0.8, 1.0, 1.1, 0.9, 0.7])
+    ppc['gencost'][:, STARTUP] = 50
+    ramp = 30 * array([1, 1, 1, 1, 1, 1])
+    r = ucopf(ppc, sf, ppopt, ramp=ramp, minup=[3] * 6, mindown=[2] * 6)
+    u, v, w = r['uc']['u'], r['uc']['v'], r['uc']['w']
+    du = diff(r_[[[1] * 6], u], axis=0)     ## all initially on
+    Pg = array([rp['gen'][:, PG] for rp in r['period']])
+    t_ok(r['success'], [t, 'success'])
+    t_is(v, maximum(du, 0), 12, [t, 'startups'])
+    t_is(w, maximum(-du, 0), 12, [t, 'shutdowns'])
+    t_ok(_min_time(u, 3), [t, 'minimum up time'])
+    t_ok(_min_time(1 - u, 2), [t, 'minimum down time'])
+    t_ok(all(abs(diff(Pg, axis=0))[u[1:] * u[:-1] > 0] <= 30 + 1e-6),
+         [t, 'ramp limits'])
+    t_ok(all(Pg[u == 0] == 0), [t, 'decommitted Pg'])
+    t_is(sum([rp['f'] for rp in r['period']]), r['f'], 6,
+         [t, 'sum of period costs'])
+
+    ## light load, so the commitment is AC feasible in every period
+    t = 'AC check : '
+    sf = array([0.5, 0.6, 0.5])
+    r = ucopf(ppc, sf, ppopt, ramp=ramp, minup=[3] * 6, mindown=[2] * 6,
+              ac=True)
+    u = r['uc']['u']
+    t_ok(len(r['ac']) == len(sf) and
+         all([r['ac'][k]['success'] for k in range(len(sf))]),
+         [t, 'success'])
+    t_ok(any(u == 0) and
+         all([(ra['gen'][u[k] == 0, PG] == 0).all() and
+              (ra['gen'][:, GEN_STATUS] == u[k]).all()
+              for k, ra in enumerate(r['ac'])]), [t, 'commitment'])
+
+    t_end()
+
+
+def _min_time(u, T):
+    """Returns C{True} if each run of ones in the columns of C{u} that
+    starts after the first period lasts at least C{T} periods (or until the
+    last one).
+    """
+    nt, ng = u.shape
+    for k in range(ng):
+        x = r_[0, u[:, k], 0]
+        d = diff(x)
+        starts, ends = find(d > 0), find(d < 0)
+        for s, e in zip(starts, ends):
+            if s > 0 and e < nt and e - s < T:
+                return False
+    return True
+
+
+if __name__ == '__main__':
+    t_ucopf(quiet=False)
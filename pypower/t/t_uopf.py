@@ -0,0 +1,75 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Tests for combined unit decommitment / optimal power flow.
+"""
+
+from os.path import dirname, join
+
+from numpy import array
+from numpy import flatnonzero as find
+
+from pypower.ppoption import ppoption
+from pypower.loadcase import loadcase
+from pypower.uopf import uopf
+
+from pypower.idx_gen import GEN_STATUS, PMIN, PMAX
+from pypower.idx_cost import COST
+
+from pypower.t.t_begin import t_begin
+from pypower.t.t_is import t_is
+from pypower.t.t_ok import t_ok
+from pypower.t.t_end import t_end
+
+
+def t_uopf(quiet=False):
+    """Tests for combined unit decommitment / optimal power flow.
+    """
+    num_tests = 19
+
+    t_begin(num_tests, quiet)
+
+    casefile = join(dirname(dirname(__file__)), 'case30')
+    verbose = 0#not quiet
+
+    ## add no-load costs and raise Pmin so that decommitment pays off
+    ppc = loadcase(casefile)
+    ppc['gencost'][:, COST + 2] = array([100, 200, 300, 400, 500, 600])
+    ppc['gen'][:, PMIN] = 0.5 * ppc['gen'][:, PMAX]
+
+    for dc, f, off in [(1, 1810.14975, [2, 5]), (0, 2621.97179, [0])]:
+        t0 = 'DC ' if dc else 'AC '
+        ppopt = ppoption(VERBOSE=verbose, OUT_ALL=0, PF_DC=dc)
+
+        t = t0 + 'uopf (serial) : '
+        r = uopf(loadcase(ppc), ppopt)
+        t_ok(r['success'], t + 'success')
+        t_is(r['f'], f, 3, t + 'f')
+        t_is(find(r['gen'][:, GEN_STATUS] == 0), off, 12, t + 'decommitted')
+
+        t = t0 + 'uopf (3 workers) : '
+        r = uopf(loadcase(ppc), ppoption(ppopt, UOPF_WORKERS=3))
+        t_ok(r['success'], t + 'success')
+        t_is(r['f'], f, 3, t + 'f')
+        t_is(find(r['gen'][:, GEN_STATUS] == 0), off, 12, t + 'decommitted')
+
+        t = t0 + 'uopf (early termination) : '
+        r = uopf(loadcase(ppc), ppoption(ppopt, UOPF_WORKERS=2,
+                                         UOPF_EARLY_TERM=1))
+        t_ok(r['success'], t + 'success')
+        t_is(r['f'], f, 3, t + 'f')
+
+    ## the MILP finds a cheaper commitment than the heuristic
+    t = 'DC uopf (UOPF_MILP) : '
+    ppopt = ppoption(VERBOSE=verbose, OUT_ALL=0, PF_DC=1, UOPF_MILP=1)
+    r = uopf(loadcase(ppc), ppopt)
+    t_ok(r['success'], t + 'success')
+    t_is(r['f'], 1221.57333, 3, t + 'f')
+    t_is(find(r['gen'][:, GEN_STATUS] == 0), [3, 4, 5], 12, t + 'decommitted')
+
+    t_end()
+
+
+if __name__ == '__main__':
+    t_uopf(quiet=False)
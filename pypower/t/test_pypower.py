@@ -21,18 +21,29 @@ def test_pypower(verbose=False):
 
     ## PYPOWER base test
     tests.append('t_loadcase')
+    tests.append('t_case_cache')
+    tests.append('t_load_m_case')
+    tests.append('t_psse2ppc')
+    tests.append('t_import')
+    tests.append('t_ext2int_index')
+    tests.append('t_Case')
+    tests.append('t_CaseDelta')
     # tests.append('t_ext2int2ext')
     tests.append('t_jacobian')
     tests.append('t_hessian')
     tests.append('t_totcost')
+    tests.append('t_GenCostModel')
     tests.append('t_modcost')
     tests.append('t_hasPQcap')
     tests.append('t_savecase')
+    tests.append('t_printpf')
+    tests.append('t_results_export')
 
     # tests.append('t_pips')
 
     # tests.append('t_qps_pypower')
     # tests.append('t_pf')
+    tests.append('t_runts')
 
     if have_fcn('gurobipy'):
         tests.append('t_opf_dc_gurobi')
@@ -73,6 +84,8 @@ def test_pf(verbose=False):
     tests.append('t_ext2int2ext')
     tests.append('t_jacobian')
     tests.append('t_pf')
+    tests.append('t_cpf')
+    tests.append('t_runts')
 
     return t_run_tests(tests, verbose)
 
@@ -84,10 +97,12 @@ def test_opf(verbose=False, *others):
     tests.append('t_ext2int2ext')
     tests.append('t_hessian')
     tests.append('t_totcost')
+    tests.append('t_GenCostModel')
     tests.append('t_modcost')
     tests.append('t_hasPQcap')
 
     tests.append('t_qps_pypower')
+    tests.append('t_qps_highs')
 
     if have_fcn('gurobipy'):
         tests.append('t_opf_dc_gurobi')
@@ -99,6 +114,7 @@ def test_opf(verbose=False, *others):
 
     tests.append('t_opf_pips')
     tests.append('t_opf_pips_sc')
+    tests.append('t_opf_flow_screen')
 
     if have_fcn('pyipopt'):
         tests.append('t_opf_ipopt')
@@ -108,6 +124,13 @@ def test_opf(verbose=False, *others):
         tests.append('t_opf_dc_mosek')
 
     tests.append('t_runopf_w_res')
+    tests.append('t_mpopf')
+    tests.append('t_dcscopf')
+    tests.append('t_uopf')
+    tests.append('t_dcopf_param')
+    tests.append('t_admmopf')
+    tests.append('t_ucopf')
+    tests.append('t_OPFSession')
 
     tests.append('t_makePTDF')
     tests.append('t_makeLODF')
@@ -5,11 +5,9 @@
 """Computes total cost for generators at given output level.
 """
 
-from numpy import zeros, arange
-from numpy import flatnonzero as find
+from numpy import asarray
 
-from pypower.polycost import polycost
-from pypower.idx_cost import PW_LINEAR, POLYNOMIAL, COST, NCOST, MODEL
+from pypower.GenCostModel import GenCostModel
 
 
 def totcost(gencost, Pg):
@@ -20,34 +18,10 @@ def totcost(gencost, Pg):
     same dimensions as PG. Each row of C{gencost} is used to evaluate the
     cost at the points specified in the corresponding row of C{Pg}.
 
+    @see: L{GenCostModel}
+
     @author: Ray Zimmerman (PSERC Cornell)
     @author: Carlos E. Murillo-Sanchez (PSERC Cornell & Universidad
     Autonoma de Manizales)
     """
-    ng, m = gencost.shape
-    totalcost = zeros(ng)
-
-    if len(gencost) > 0:
-        ipwl = find(gencost[:, MODEL] == PW_LINEAR)
-        ipol = find(gencost[:, MODEL] == POLYNOMIAL)
-        if len(ipwl) > 0:
-            p = gencost[:, COST:(m-1):2]
-            c = gencost[:, (COST+1):m:2]
-
-            for i in ipwl:
-                ncost = gencost[i, NCOST]
-                for k in arange(ncost - 1,dtype=int):
-                    p1, p2 = p[i, k], p[i, k+1]
-                    c1, c2 = c[i, k], c[i, k+1]
-                    m = (c2 - c1) / (p2 - p1)
-                    b = c1 - m * p1
-                    Pgen = Pg[i]
-                    if Pgen < p2:
-                        totalcost[i] = m * Pgen + b
-                        break
-                    totalcost[i] = m * Pgen + b
-
-        if len(ipol) > 0:
-            totalcost[ipol] = polycost(gencost[ipol, :], Pg[ipol])
-
-    return totalcost
+    return GenCostModel(gencost).cost(asarray(Pg, float))
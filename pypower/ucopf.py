@@ -0,0 +1,426 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Solves a multi-period DC unit commitment as a mixed-integer LP.
+"""
+
+from time import time
+
+from numpy import ones, zeros, arange, asarray, array, outer, tile, ceil, \
+    diff, minimum, maximum, r_, c_, ix_, isnan, any, Inf
+from numpy import flatnonzero as find
+
+from scipy.sparse import block_diag, kron, hstack, vstack, eye, diags, \
+    csr_matrix as sparse
+
+from pypower.loadcase import loadcase
+from pypower.ppoption import ppoption
+from pypower.ext2int import ext2int
+from pypower.int2ext import int2ext
+from pypower.opf_setup import opf_setup
+from pypower.opf_execute import opf_package
+from pypower.dcopf_solver import dcopf_qp_cost, dcopf_results
+from pypower.qps_pypower import qps_pypower
+from pypower.GenCostModel import GenCostModel
+from pypower.util import have_fcn
+from pypower.opf import opf
+
+from pypower.idx_bus import PD, QD, MU_VMIN
+from pypower.idx_gen import PG, QG, PMIN, PMAX, GEN_STATUS, RAMP_30, \
+    MU_PMAX, MU_PMIN, MU_QMIN
+from pypower.idx_brch import PF, QF, PT, QT, MU_SF, MU_ST, MU_ANGMIN, \
+    MU_ANGMAX
+from pypower.idx_cost import MODEL, NCOST, COST, STARTUP, SHUTDOWN, \
+    POLYNOMIAL
+
+
+def ucopf(casedata, load=None, ppopt=None, ramp=None, dt=1.0, minup=None,
+          mindown=None, u0=None, npts=5, ac=False):
+    """Solves a multi-period DC unit commitment as a mixed-integer LP.
+
+    Decides the on/off status and dispatch of each generator for C{nt}
+    consecutive periods of C{dt} hours, minimizing the total generation,
+    startup and shutdown cost subject to the DC network constraints of each
+    period, generator limits that depend on the commitment, ramp limits
+    and minimum up and down times. The problem is a mixed-integer linear
+    program (MILP), solved with the HiGHS MILP solver of SciPy (algorithm
+    800 of L{qps_pypower}), which is the only PYPOWER QP/LP solver interface
+    that handles integer variables. Raises C{ImportError} if it is not
+    available.
+
+    C{load}, C{ramp} and C{dt} are as for L{mpopf}, by default a single
+    period with the loads of the case. C{minup} and C{mindown} are optional
+    vectors with the minimum up and down time (in hours) of each generator
+    and C{u0} the on/off status of each generator before the first period,
+    all in external generator order. By default there are no minimum up or
+    down times and all generators in service are initially on. Startup and
+    shutdown costs are taken from the C{STARTUP} and C{SHUTDOWN} columns of
+    C{gencost}. Dispatchable loads are always committed and out-of-service
+    generators are never committed.
+
+    An OPF model object is built by L{opf_setup} for each period with the
+    generator costs removed, to which variable sets C{u} (binary
+    commitment), C{v} (startup), C{w} (shutdown) and C{c} (generator cost)
+    are added, along with the linear constraints::
+
+        Pmin * u <= Pg <= Pmax * u          (Pgmin, Pgmax)
+        m_j * Pg + b_j * u <= c             (ccost)
+
+    and a linear user cost on C{c}, C{v} and C{w}. The cost of each
+    generator is the piece-wise linear function given by its points in
+    C{gencost}, or for polynomial costs, by C{npts} evenly spaced points
+    between C{Pmin} and C{Pmax}, with segment slopes C{m_j} and intercepts
+    C{b_j}, so the cost of a unit that is off is zero. As in L{mpopf}, the
+    problems of all periods are stacked, with the startup, shutdown,
+    minimum up and down time and ramp constraints coupling the C{u}, C{v},
+    C{w} and C{Pg} variables of different periods.
+
+    If C{ac} is true, the AC feasibility of the commitment is checked by
+    solving the AC OPF of each period with L{opf}, with the decommitted
+    generators out of service.
+
+    Returns a C{results} dict with the following keys:
+        - C{period}     list of C{nt} results dicts, one for each period,
+                        in the form returned by L{opf} (external indexing),
+                        with C{GEN_STATUS} set to the commitment
+        - C{f}          total cost of all periods
+        - C{success}    C{True} if the solver converged successfully
+        - C{et}         elapsed time in seconds
+        - C{uc}
+            - C{u}      C{nt x ng} matrix of commitment, 1 = on, 0 = off
+            - C{v}      C{nt x ng} matrix of startups
+            - C{w}      C{nt x ng} matrix of shutdowns
+        - C{ac}         (only if C{ac} is true) list of C{nt} AC OPF
+                        results dicts of the committed units
+        - C{raw}        raw solver output of the combined problem
+
+    @see: L{mpopf}, L{uopf}, L{opf_setup}, L{qps_highs}
+    """
+    ##----- initialization -----
+    t0 = time()         ## start timer
+
+    ppc = loadcase(casedata)
+    ppopt = ppoption(ppopt, PF_DC=1)
+    if load is None:
+        load = [1.0]
+
+    if not have_fcn('highs'):
+        raise ImportError('ucopf: requires the HiGHS MILP solver of SciPy '
+                          '1.9 or later')
+
+    ## add zero columns to bus, gen, branch for multipliers, etc if needed
+    nb = ppc['bus'].shape[0]
+    nl = ppc['branch'].shape[0]
+    ng = ppc['gen'].shape[0]
+    if ppc['bus'].shape[1] < MU_VMIN + 1:
+        ppc['bus'] = c_[ppc['bus'],
+                        zeros((nb, MU_VMIN + 1 - ppc['bus'].shape[1]))]
+
+    if ppc['gen'].shape[1] < MU_QMIN + 1:
+        ppc['gen'] = c_[ppc['gen'],
+                        zeros((ng, MU_QMIN + 1 - ppc['gen'].shape[1]))]
+
+    if ppc['branch'].shape[1] < MU_ANGMAX + 1:
+        ppc['branch'] = c_[ppc['branch'],
+                           zeros((nl, MU_ANGMAX + 1 - ppc['branch'].shape[1]))]
+
+    ## ramp limits in MW per period, min up/down times and initial status,
+    ## external gen order
+    if ramp is None:
+        ramp = 2 * dt * ppc['gen'][:, RAMP_30]
+        ramp[ramp == 0] = Inf
+    ramp = asarray(ramp, float)
+    minup = zeros(ng) if minup is None else asarray(minup, float)
+    mindown = zeros(ng) if mindown is None else asarray(mindown, float)
+    u0 = ones(ng) if u0 is None else asarray(u0, float)
+
+    ##-----  convert to internal numbering, remove out-of-service stuff  -----
+    ppc = ext2int(ppc)
+    o = ppc['order']
+    baseMVA = ppc['baseMVA']
+    nb = ppc['bus'].shape[0]
+    ng = ppc['gen'].shape[0]
+    gon = o['gen']['status']['on'][o['gen']['e2i'][:ng]]   ## ext idx of gens
+    gen = ppc['gen']
+    gencost = ppc['gencost'][:ng, :]
+    Pmin = gen[:, PMIN] / baseMVA
+    Pmax = gen[:, PMAX] / baseMVA
+    ild = find(gen[:, PMIN] < 0)            ## dispatchable loads
+
+    ## demand for each period, in internal bus order
+    load = asarray(load, float)
+    nt = load.shape[0]
+    Pd0 = ppc['bus'][:, PD]
+    Qd0 = ppc['bus'][:, QD]
+    if load.ndim == 1:              ## scale factors
+        Pd = outer(load, Pd0)
+        Qd = outer(load, Qd0)
+    else:                           ## bus demands, MW
+        Pd = load[:, o['bus']['status']['on']]
+        Qd = tile(Qd0, (nt, 1))
+        k = find(Pd0 != 0)
+        Qd[:, k] = Qd[:, k] * Pd[:, k] / Pd0[k]
+
+    ##-----  piece-wise linear generator costs  -----
+    ## points of each cost, npts between Pmin and Pmax for polynomials
+    gcm = GenCostModel(gencost)
+    ipol = gcm.ipol
+    ipwl = gcm.ipwl
+    pts = []
+    p = zeros((len(ipol), npts))
+    y = zeros((len(ipol), npts))
+    Pk = zeros(ng)
+    for k in range(npts):
+        Pk[ipol] = gen[ipol, PMIN] + \
+            (gen[ipol, PMAX] - gen[ipol, PMIN]) * k / max(npts - 1, 1)
+        p[:, k] = Pk[ipol]
+        y[:, k] = gcm.polycost(Pk)[ipol]
+    for j, i in enumerate(ipol):
+        pts.append((i, p[j, :], y[j, :]))
+    for i in ipwl:
+        n = int(gencost[i, NCOST])
+        pts.append((i, gencost[i, COST:COST + 2 * n:2],
+                    gencost[i, COST + 1:COST + 2 * n:2]))
+
+    ## rows m_j * Pg + b_j * u - c <= 0 of each segment, in p.u. for Pg
+    jg, mj, bj = [], [], []
+    for i, p, y in pts:
+        dp = diff(p)
+        k = find(dp > 0)
+        if len(k) == 0:                 ## Pmin == Pmax, constant cost
+            m, b = zeros(1), y[:1]
+        else:
+            m = diff(y)[k] / dp[k]
+            b = y[k] - m * p[k]
+        jg.append(i * ones(len(m), int))
+        mj.append(m * baseMVA)
+        bj.append(b)
+    jg = r_[tuple(jg)].astype(int)
+    nseg = len(jg)
+    Acc = hstack([
+        sparse((r_[tuple(mj)], (arange(nseg), jg)), (nseg, ng)),
+        sparse((r_[tuple(bj)], (arange(nseg), jg)), (nseg, ng)),
+        sparse((-ones(nseg), (arange(nseg), jg)), (nseg, ng))
+    ], 'csr')
+
+    ##-----  construct an OPF model object for each period  -----
+    nocost = zeros((ng, COST + 1))
+    nocost[:, MODEL] = POLYNOMIAL
+    nocost[:, NCOST] = 1
+    ulo = zeros(ng)
+    ulo[ild] = 1                    ## dispatchable loads always on
+    Ig = eye(ng, format='csr')
+
+    oms = []
+    for t in range(nt):
+        ppc_t = ppc.copy()
+        for key in ['bus', 'gen', 'branch']:
+            ppc_t[key] = ppc[key].copy()
+        ppc_t['gencost'] = nocost
+        ppc_t['bus'][:, PD] = Pd[t, :]
+        ppc_t['bus'][:, QD] = Qd[t, :]
+
+        om = opf_setup(ppc_t, ppopt)
+        om.add_vars('u', ng, ones(ng), ulo, ones(ng))
+        om.add_vars('v', ng, zeros(ng), zeros(ng), ones(ng))
+        om.add_vars('w', ng, zeros(ng), zeros(ng), ones(ng))
+        om.add_vars('c', ng)
+        om.add_constraints('Pgmin', hstack([Ig, -diags(Pmin)], 'csr'),
+                           zeros(ng), Inf * ones(ng), ['Pg', 'u'])
+        om.add_constraints('Pgmax', hstack([Ig, -diags(Pmax)], 'csr'),
+                           -Inf * ones(ng), zeros(ng), ['Pg', 'u'])
+        om.add_constraints('ccost', Acc, -Inf * ones(nseg), zeros(nseg),
+                           ['Pg', 'u', 'c'])
+        om.add_costs('uccost', {'N': eye(3 * ng, format='csr'),
+                                'Cw': r_[ones(ng), gencost[:, STARTUP],
+                                         gencost[:, SHUTDOWN]]},
+                     ['c', 'v', 'w'])
+        om.build_cost_params()
+        oms.append(om)
+
+    vv, ll, _, _ = oms[0].get_idx()
+    nx = oms[0].getN('var')     ## number of variables per period
+    nlin = oms[0].getN('lin')   ## number of linear constraints per period
+
+    ## stacked variable bounds and linear constraints, with the Pg bounds
+    ## relaxed to include zero, enforced by Pgmin and Pgmax instead
+    x0 = zeros(nt * nx)
+    xmin = zeros(nt * nx)
+    xmax = zeros(nt * nx)
+    As, ls, us = [], [], []
+    for t, om in enumerate(oms):
+        x0[t * nx:(t + 1) * nx], xmin[t * nx:(t + 1) * nx], \
+            xmax[t * nx:(t + 1) * nx] = om.getv()
+        xmin[t * nx + vv['i1']['Pg'] + arange(ng)] = minimum(Pmin, 0)
+        xmax[t * nx + vv['i1']['Pg'] + arange(ng)] = maximum(Pmax, 0)
+        A, l, u = om.linear_constraints()
+        As.append(A)
+        ls.append(l)
+        us.append(u)
+
+    ##-----  inter-period constraints  -----
+    def sel(name, k=None):
+        """Selects the vars in set C{name} of gens C{k} of a period."""
+        k = arange(ng) if k is None else k
+        return sparse((ones(len(k)), (arange(len(k)), vv['i1'][name] + k)),
+                      (len(k), nx))
+
+    It = eye(nt, format='csr')
+    Lag = sparse((ones(nt - 1), (arange(1, nt), arange(nt - 1))), (nt, nt))
+    u0_int = u0[gon]
+
+    ## startup and shutdown,
+    ##   v(t) - u(t) + u(t-1) >= 0,  w(t) + u(t) - u(t-1) >= 0
+    Asu = kron(It, sel('v') - sel('u')) + kron(Lag, sel('u'))
+    Asd = kron(It, sel('w') + sel('u')) - kron(Lag, sel('u'))
+    lsu = r_[-u0_int, zeros((nt - 1) * ng)]
+    lsd = r_[u0_int, zeros((nt - 1) * ng)]
+
+    ## minimum up and down times, in periods,
+    ##   sum(v(t-UT+1..t)) <= u(t),  sum(w(t-DT+1..t)) <= 1 - u(t)
+    UT = ceil(minup[gon] / dt).astype(int)
+    DT = ceil(mindown[gon] / dt).astype(int)
+    Amu, Amd = sparse((0, nt * nx)), sparse((0, nt * nx))
+    umd = zeros(0)
+    iu = find(UT > 1)
+    if len(iu):
+        S = [sel('v', iu) if k else sel('v', iu) - sel('u', iu)
+             for k in range(UT.max())]
+        Amu = _window(S, UT[iu], nt)
+    idn = find(DT > 1)
+    if len(idn):
+        S = [sel('w', idn) if k else sel('w', idn) + sel('u', idn)
+             for k in range(DT.max())]
+        Amd = _window(S, DT[idn], nt)
+        umd = ones(Amd.shape[0])
+
+    ## ramp limits, relaxed to Pmin (or the ramp limit, if greater) for
+    ## startups and shutdowns, t = 2..nt,
+    ##    Pg(t) - Pg(t-1) - R * u(t-1) - SU * v(t) <= 0
+    ##   -Pg(t) + Pg(t-1) - R * u(t)   - SD * w(t) <= 0
+    ramp_int = ramp[gon] / baseMVA
+    ir = find(ramp_int < Inf)
+    nr = len(ir)
+    Ar = sparse((0, nt * nx))
+    if nr and nt > 1:
+        R = diags(ramp_int[ir])
+        SU = diags(maximum(ramp_int[ir], Pmin[ir]))
+        D1 = sparse((ones(nt - 1), (arange(nt - 1), arange(1, nt))),
+                    (nt - 1, nt))
+        D0 = sparse((ones(nt - 1), (arange(nt - 1), arange(nt - 1))),
+                    (nt - 1, nt))
+        Pg = sel('Pg', ir)
+        Ar = vstack([
+            kron(D1, Pg - SU * sel('v', ir)) - kron(D0, Pg + R * sel('u', ir)),
+            kron(D0, Pg) - kron(D1, Pg + R * sel('u', ir) + SU * sel('w', ir))
+        ], 'csr')
+
+    A = vstack([block_diag(As, 'csr'), Asu, Asd, Amu, Amd, Ar], 'csr')
+    l = r_[r_[tuple(ls)], lsu, lsd, -Inf * ones(Amu.shape[0] + Amd.shape[0] +
+                                                 Ar.shape[0])]
+    u = r_[r_[tuple(us)], Inf * ones(2 * nt * ng), zeros(Amu.shape[0]), umd,
+           zeros(Ar.shape[0])]
+
+    ##-----  solve the MILP  -----
+    CC, C0 = [], []
+    for om in oms:
+        _, CC_t, C0_t = dcopf_qp_cost(om)
+        CC.append(CC_t)
+        C0.append(C0_t)
+    CC = r_[tuple(CC)]
+
+    vtype = array(['C'] * nx)
+    vtype[vv['i1']['u']:vv['iN']['u']] = 'B'
+    opt = {'alg': 800, 'verbose': ppopt['VERBOSE'],
+           'vtype': ''.join(vtype) * nt}
+    x, f, info, output, lmbda = \
+        qps_pypower(None, CC, A, l, u, xmin, xmax, x0, opt)
+    success = (info == 1)
+    if not any(isnan(x)):
+        f = f + sum(C0)
+    alg = 800
+
+    ##-----  package up results for each period  -----
+    period = []
+    uc = {'u': zeros((nt, len(ramp))), 'v': zeros((nt, len(ramp))),
+          'w': zeros((nt, len(ramp)))}
+    for t, om in enumerate(oms):
+        ix = arange(t * nx, (t + 1) * nx)
+        il_t = arange(t * nlin, (t + 1) * nlin)
+        lmbda_t = {
+            'mu_l': lmbda['mu_l'][il_t],
+            'mu_u': lmbda['mu_u'][il_t],
+            'lower': lmbda['lower'][ix],
+            'upper': lmbda['upper'][ix]
+        }
+        x_t = x[ix]
+        f_t = CC[ix].dot(x_t)
+        results, _, raw = dcopf_results(om, x_t, f_t, C0[t], info, output,
+                                        lmbda_t)
+
+        ## commitment and multipliers on the commitment dependent limits
+        for key in ['u', 'v', 'w']:
+            uc[key][t, gon] = abs(x_t[vv['i1'][key]:vv['iN'][key]].round())
+        results['gen'][:, GEN_STATUS] = uc['u'][t, gon]
+        results['gen'][:, MU_PMIN] = \
+            lmbda_t['mu_l'][ll['i1']['Pgmin']:ll['iN']['Pgmin']] / baseMVA
+        results['gen'][:, MU_PMAX] = \
+            lmbda_t['mu_u'][ll['i1']['Pgmax']:ll['iN']['Pgmax']] / baseMVA
+        results, raw = opf_package(om, ppopt, results, success, raw, alg)
+
+        ##-----  revert to original ordering, incl. out-of-service stuff  -----
+        results = int2ext(results)
+
+        ## zero out result fields of out-of-service gens & branches
+        off = results['order']['gen']['status']['off']
+        if len(off) > 0:
+            results['gen'][ix_(off, [PG, QG, MU_PMAX, MU_PMIN])] = 0
+
+        off = results['order']['branch']['status']['off']
+        if len(off) > 0:
+            results['branch'][ix_(off, [PF, QF, PT, QT, MU_SF, MU_ST,
+                                        MU_ANGMIN, MU_ANGMAX])] = 0
+
+        results['success'] = success
+        results['raw'] = raw
+        period.append(results)
+
+    results = {
+        'period': period,
+        'f': f,
+        'success': success,
+        'uc': uc,
+        'raw': {'xr': x, 'info': info, 'output': output}
+    }
+
+    ##-----  AC feasibility check of the commitment  -----
+    if ac:
+        ppopt_ac = ppoption(ppopt, PF_DC=0)
+        results['ac'] = []
+        for r in period:
+            ppc_t = {'version': '2', 'baseMVA': r['baseMVA']}
+            for key in ['bus', 'gen', 'branch', 'gencost']:
+                ppc_t[key] = r[key].copy()
+            results['ac'].append(opf(ppc_t, ppopt_ac))
+
+    results['et'] = time() - t0
+
+    return results
+
+
+def _window(S, T, nt):
+    """Builds the rows of a minimum up or down time constraint.
+
+    C{S[k]} selects the vars of the current period (C{k = 0}) or of the
+    period C{k} periods earlier from the vars of a single period, with one
+    row per generator with a minimum time of C{T} periods. Returns the
+    C{nt*ng x nt*nx} matrix summing C{S[k]} over the C{T} periods ending in
+    each period.
+    """
+    A = 0
+    for k in range(T.max()):
+        ## k-th lag, for gens with a window longer than k periods
+        Lk = sparse((ones(nt - k), (arange(k, nt), arange(nt - k))), (nt, nt))
+        A = A + kron(Lk, diags((T > k).astype(float)) * S[k])
+    return sparse(A)
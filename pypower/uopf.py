@@ -7,8 +7,9 @@
 
 from time import time
 
-from copy import deepcopy
+from multiprocessing import Pool, cpu_count
 
+from numpy import argsort, ix_
 from numpy import flatnonzero as find
 
 from pypower.opf_args import opf_args2
@@ -17,6 +18,7 @@ from pypower.isload import isload
 from pypower.totcost import totcost
 from pypower.fairmax import fairmax
 from pypower.opf import opf
+from pypower.ucopf import ucopf
 
 from pypower.idx_bus import PD
 from pypower.idx_gen import GEN_STATUS, PG, QG, PMIN, MU_PMIN
@@ -36,7 +38,19 @@ def uopf(*args):
     If C{verbose} in ppopt (see L{ppoption} is C{true}, it prints progress
     info, if it is > 1 it prints the output of each individual opf.
 
-    @see: L{opf}, L{runuopf}
+    The candidates of a stage are independent, so they are evaluated in
+    batches of C{UOPF_WORKERS} concurrent processes (0 means one per CPU),
+    in decreasing order of their C{MU_PMIN} multipliers. Each candidate
+    OPF is warm started from the voltages and dispatch of the best case of
+    the stage. If C{UOPF_EARLY_TERM} is set, a stage ends with the first
+    batch in which shutting down a candidate lowers the cost, instead of
+    after all candidates have been evaluated.
+
+    If C{UOPF_MILP} is set, the units to shut down are instead chosen by
+    solving the single period DC unit commitment MILP of L{ucopf}, followed
+    by an OPF (AC or DC, as specified by C{PF_DC}) of the committed units.
+
+    @see: L{opf}, L{runuopf}, L{ucopf}
 
     @author: Ray Zimmerman (PSERC Cornell)
     """
@@ -50,9 +64,24 @@ def uopf(*args):
     verbose = ppopt["VERBOSE"]
     if verbose:      ## turn down verbosity one level for calls to opf
         ppopt = ppoption(ppopt, VERBOSE=verbose - 1)
+    nw = ppopt["UOPF_WORKERS"]
+    if nw == 0:
+        nw = cpu_count()
+    early_term = ppopt["UOPF_EARLY_TERM"]
 
     ##-----  do combined unit commitment/optimal power flow  -----
 
+    ## commitment by unit commitment MILP
+    if ppopt["UOPF_MILP"]:
+        uc = ucopf(ppc, None, ppopt)
+        off = find((ppc["gen"][:, GEN_STATUS] > 0) & (uc["uc"]["u"][0] == 0))
+        if verbose:
+            print('Shutting down generators %s.\n' % off)
+        ppc["gen"][ix_(off, [PG, QG, GEN_STATUS])] = 0
+        results = opf(ppc, ppopt)
+        results['et'] = time() - t0
+        return results
+
     ## check for sum(Pmin) > total load, decommit as necessary
     on   = find( (ppc["gen"][:, GEN_STATUS] > 0) & ~isload(ppc["gen"]) )   ## gens in service
     onld = find( (ppc["gen"][:, GEN_STATUS] > 0) &  isload(ppc["gen"]) )   ## disp loads in serv
@@ -77,49 +106,71 @@ def uopf(*args):
     ## run initial opf
     results = opf(ppc, ppopt)
 
+    ## warm start candidate OPFs from the best case of the stage
+    ppopt = ppoption(ppopt, OPF_WARM_START=True)
+
+    ## process pool for evaluating candidates concurrently
+    pool = Pool(nw) if nw > 1 else None
+
     ## best case so far
-    results1 = deepcopy(results)
+    results1 = results
 
     ## best case for this stage (ie. with n gens shut down, n=0,1,2 ...)
-    results0 = deepcopy(results1)
+    results0 = results1
     ppc["bus"] = results0["bus"].copy()     ## use these V as starting point for OPF
 
-    while True:
-        ## get candidates for shutdown
-        candidates = find((results0["gen"][:, MU_PMIN] > 0) & (results0["gen"][:, PMIN] > 0))
-        if len(candidates) == 0:
-            break
-
-        ## do not check for further decommitment unless we
-        ##  see something better during this stage
-        done = True
-
-        for k in candidates:
-            ## start with best for this stage
-            ppc["gen"] = results0["gen"].copy()
-
-            ## shut down gen k
-            ppc["gen"][k, [PG, QG, GEN_STATUS]] = 0
-
-            ## run opf
-            results = opf(ppc, ppopt)
-
-            ## something better?
-            if results['success'] and (results["f"] < results1["f"]):
-                results1 = deepcopy(results)
-                k1 = k
-                done = False   ## make sure we check for further decommitment
-
-        if done:
-            ## decommits at this stage did not help, so let's quit
-            break
-        else:
-            ## shutting something else down helps, so let's keep going
-            if verbose:
-                print('Shutting down generator %d.\n' % k1)
-
-            results0 = deepcopy(results1)
-            ppc["bus"] = results0["bus"].copy()     ## use these V as starting point for OPF
+    try:
+        while True:
+            ## get candidates for shutdown, largest MU_PMIN first
+            candidates = find((results0["gen"][:, MU_PMIN] > 0) & (results0["gen"][:, PMIN] > 0))
+            if len(candidates) == 0:
+                break
+            candidates = candidates[argsort(-results0["gen"][candidates, MU_PMIN], kind='stable')]
+
+            ## do not check for further decommitment unless we
+            ##  see something better during this stage
+            done = True
+
+            for i in range(0, len(candidates), nw):
+                ## one case for each candidate of the batch, starting
+                ## with best for this stage, with gen k shut down
+                cases = []
+                for k in candidates[i:i + nw]:
+                    ppck = ppc.copy()
+                    ppck["gen"] = results0["gen"].copy()
+                    ppck["gen"][k, [PG, QG, GEN_STATUS]] = 0
+                    cases.append((ppck, ppopt))
+
+                ## run opfs
+                if pool is None:
+                    batch = [_opf(c) for c in cases]
+                else:
+                    batch = pool.map(_opf, cases)
+
+                ## something better?
+                for k, results in zip(candidates[i:i + nw], batch):
+                    if results['success'] and (results["f"] < results1["f"]):
+                        results1 = results
+                        k1 = k
+                        done = False   ## make sure we check for further decommitment
+
+                if early_term and not done:
+                    break
+
+            if done:
+                ## decommits at this stage did not help, so let's quit
+                break
+            else:
+                ## shutting something else down helps, so let's keep going
+                if verbose:
+                    print('Shutting down generator %d.\n' % k1)
+
+                results0 = results1
+                ppc["bus"] = results0["bus"].copy()     ## use these V as starting point for OPF
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
 
     ## compute elapsed time
     et = time() - t0
@@ -128,3 +179,9 @@ def uopf(*args):
     results0['et'] = et
 
     return results0
+
+
+def _opf(args):
+    """Runs the OPF for a single decommitment candidate.
+    """
+    return opf(*args)
@@ -25,6 +25,14 @@ def feval(func, *args, **kw_args):
 
 
 def have_fcn(name):
+    """Returns C{True} if the optional package C{name} is available.
+
+    C{'highs'} tests for the HiGHS solvers shipped with SciPy (1.9 or later).
+    """
+    if name == 'highs':
+        import scipy.optimize
+        return hasattr(scipy.optimize, 'milp')
+
     try:
         __import__(name)
         return True